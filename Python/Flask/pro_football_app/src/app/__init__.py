@@ -28,11 +28,20 @@ def create_app():
     # Flask-Migrate
     Migrate(app, sqla, render_as_batch=True)
 
-    from app.flask import home_controller, season_controller
+    from app.flask import commands, home_controller, season_controller
 
     app.register_blueprint(home_controller.blueprint, url_prefix='/home')
     app.register_blueprint(season_controller.blueprint, url_prefix='/seasons')
 
+    app.cli.add_command(commands.import_games_command)
+    app.cli.add_command(commands.benchmark_import_command)
+    app.cli.add_command(commands.benchmark_weekly_update_command)
+    app.cli.add_command(commands.rebuild_team_seasons_command)
+    app.cli.add_command(commands.backfill_weekly_updates_command)
+    app.cli.add_command(commands.run_weekly_update_command)
+    app.cli.add_command(commands.run_season_weekly_update_command)
+    app.cli.add_command(commands.weekly_update_runs_command)
+
     app.add_url_rule('/', endpoint='index')
 
     return app
@@ -23,6 +23,10 @@ class Game(sqla.Model):
     is_playoff = sqla.Column(sqla.Boolean, nullable=False, default=False)
     notes = sqla.Column(sqla.String(256))
 
+    __table_args__ = (
+        sqla.UniqueConstraint('season_id', 'week', 'guest_name', 'host_name', name='uk_game_natural_key'),
+    )
+
     # guest = sqla.relationship('Team')
     # host = sqla.relationship('Team')
     # winner = sqla.relationship('Team')
@@ -62,3 +66,11 @@ class Game(sqla.Model):
         :return: True if the current Game object is a tie, otherwise false.
         """
         return self.guest_score == self.host_score
+
+    def natural_key(self) -> tuple:
+        """
+        Gets the values that identify the current Game object independently of its id.
+
+        :return: The game's season_id, week, guest_name, and host_name.
+        """
+        return self.season_id, self.week, self.guest_name, self.host_name
@@ -0,0 +1,17 @@
+from app.data.sqla import sqla
+from app.data.timestamps import utc_now
+
+
+class JobCheckpoint(sqla.Model):
+    """
+    Class to represent the last unit of work completed by a long-running job, such as a backfill or rebuild over a
+    range of seasons, so the job can resume from it after a restart.
+    """
+    __tablename__ = 'job_checkpoint'
+
+    id = sqla.Column(sqla.Integer, primary_key=True, autoincrement=True, nullable=False)
+    job_name = sqla.Column(sqla.String(100), unique=True, nullable=False)
+    season_id = sqla.Column(sqla.SmallInteger, nullable=False)
+    league_id = sqla.Column(sqla.String(5))
+    phase = sqla.Column(sqla.String(50), nullable=False)
+    updated_at = sqla.Column(sqla.DateTime, nullable=False, default=utc_now, onupdate=utc_now)
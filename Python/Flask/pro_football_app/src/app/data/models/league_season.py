@@ -15,6 +15,9 @@ class LeagueSeason(sqla.Model):
     total_games = sqla.Column(sqla.SmallInteger, nullable=False, default=0)
     total_points = sqla.Column(sqla.SmallInteger, nullable=False, default=0)
     average_points = sqla.Column(sqla.Float, nullable=True)
+    version_id = sqla.Column(sqla.Integer, nullable=False, default=1)
+
+    __mapper_args__ = {'version_id_col': version_id}
 
     @validates('team_id', 'season_id')
     def validate_not_empty(self, key, value):
@@ -33,6 +33,13 @@ class TeamSeason(sqla.Model):
     defensive_factor = sqla.Column(sqla.Float)
     defensive_index = sqla.Column(sqla.Float)
     final_expected_winning_percentage = sqla.Column(sqla.Float)
+    version_id = sqla.Column(sqla.Integer, nullable=False, default=1)
+
+    # The version_id the row was given when its rankings were last written by an incremental weekly update; while the
+    # two match, nothing has changed the row since its rankings were calculated.
+    ranked_version_id = sqla.Column(sqla.Integer)
+
+    __mapper_args__ = {'version_id_col': version_id}
 
     @validates('team_id', 'season_id', 'league_id')
     def validate_not_empty(self, key, value):
@@ -66,6 +73,29 @@ class TeamSeason(sqla.Model):
         else:
             self.winning_percentage = (2 * self.wins + self.ties) / (2 * self.games)
 
+    def calculate_stale_derived_fields(self) -> None:
+        """
+        Calculates the current TeamSeason object's winning percentage and Pythagorean wins and losses, if they were
+        marked stale since they were last calculated.
+
+        :return: None
+        """
+        if not getattr(self, '_has_stale_derived_fields', False):
+            return
+
+        self._has_stale_derived_fields = False
+        self.calculate_winning_percentage()
+        self.calculate_expected_wins_and_losses()
+
+    def mark_derived_fields_stale(self) -> None:
+        """
+        Marks the current TeamSeason object's winning percentage and Pythagorean wins and losses as stale, so they are
+        calculated once by the next call to calculate_stale_derived_fields.
+
+        :return: None
+        """
+        self._has_stale_derived_fields = True
+
     def update_rankings(self, team_season_schedule_average_points_for: float,
                         team_season_schedule_average_points_against: float,
                         league_season_average_points: float) -> None:
@@ -0,0 +1,249 @@
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.data.models.team_season import EXPONENT, TeamSeason
+
+ArrayLike = np.ndarray | Sequence[float | None]
+
+RANKINGS = (
+    'offensive_average', 'offensive_factor', 'offensive_index',
+    'defensive_average', 'defensive_factor', 'defensive_index',
+    'final_expected_winning_percentage'
+)
+
+
+class TeamSeasonRatings:
+    """
+    Holds the rankings of many team seasons, of one season or many, as one array per TeamSeason rankings column.
+
+    Rankings that cannot be calculated, which the scalar functions in app.data.models.team_season return as None, are
+    NaN.
+    """
+
+    def __init__(self,
+                 games: ArrayLike,
+                 points_for: ArrayLike,
+                 points_against: ArrayLike,
+                 schedule_average_points_for: ArrayLike,
+                 schedule_average_points_against: ArrayLike,
+                 league_average_points: ArrayLike | float) -> None:
+        """
+        Initializes a new instance of the TeamSeasonRatings class, and calculates the rankings of each team season
+        with the same arithmetic as TeamSeason.update_rankings.
+
+        :param games: The games played by each team.
+        :param points_for: The points scored by each team.
+        :param points_against: The points allowed by each team.
+        :param schedule_average_points_for: The average points scored per game by each team's opponents.
+        :param schedule_average_points_against: The average points allowed per game by each team's opponents.
+        :param league_average_points: The average points per game of each team's league season, or of all of them.
+        """
+        games = _to_array(games)
+        league_average_points = _to_array(league_average_points)
+
+        self.offensive_average, self.offensive_factor, self.offensive_index = update_rankings(
+            _to_array(points_for), games, _to_array(schedule_average_points_against), league_average_points
+        )
+        self.defensive_average, self.defensive_factor, self.defensive_index = update_rankings(
+            _to_array(points_against), games, _to_array(schedule_average_points_for), league_average_points
+        )
+        self.final_expected_winning_percentage = \
+            calculate_expected_winning_percentage(self.offensive_index, self.defensive_index)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(team_seasons={len(self)})"
+
+    def __len__(self):
+        return len(self.offensive_average)
+
+    @classmethod
+    def from_team_seasons(cls,
+                          team_seasons: Sequence[TeamSeason],
+                          schedule_average_points_for: ArrayLike,
+                          schedule_average_points_against: ArrayLike,
+                          league_average_points: ArrayLike | float) -> 'TeamSeasonRatings':
+        """
+        Calculates the rankings of a sequence of team seasons.
+
+        :param team_seasons: The team seasons to rank.
+        :param schedule_average_points_for: The average points scored per game by each team's opponents.
+        :param schedule_average_points_against: The average points allowed per game by each team's opponents.
+        :param league_average_points: The average points per game of each team's league season, or of all of them.
+
+        :return: The rankings, in the order of team_seasons.
+        """
+        return cls(
+            games=[team_season.games for team_season in team_seasons],
+            points_for=[team_season.points_for for team_season in team_seasons],
+            points_against=[team_season.points_against for team_season in team_seasons],
+            schedule_average_points_for=schedule_average_points_for,
+            schedule_average_points_against=schedule_average_points_against,
+            league_average_points=league_average_points
+        )
+
+    @classmethod
+    def reindex(cls, team_seasons: Sequence[TeamSeason],
+                league_average_points: ArrayLike | float) -> 'TeamSeasonRatings':
+        """
+        Calculates the indices and final expected winning percentages of a sequence of team seasons from their stored
+        averages and factors, which depend only on the teams' results and schedules, and a new league average.
+
+        :param team_seasons: The team seasons to rank.
+        :param league_average_points: The average points per game of each team's league season, or of all of them.
+
+        :return: The rankings, in the order of team_seasons.
+        """
+        return cls.from_factors(
+            offensive_average=[team_season.offensive_average for team_season in team_seasons],
+            offensive_factor=[team_season.offensive_factor for team_season in team_seasons],
+            defensive_average=[team_season.defensive_average for team_season in team_seasons],
+            defensive_factor=[team_season.defensive_factor for team_season in team_seasons],
+            league_average_points=league_average_points
+        )
+
+    @classmethod
+    def from_factors(cls,
+                     offensive_average: ArrayLike,
+                     offensive_factor: ArrayLike,
+                     defensive_average: ArrayLike,
+                     defensive_factor: ArrayLike,
+                     league_average_points: ArrayLike | float) -> 'TeamSeasonRatings':
+        """
+        Calculates the indices and final expected winning percentages of many team seasons from their averages and
+        factors.
+
+        :param offensive_average: The average points scored by each team.
+        :param offensive_factor: The factor of each team's offensive average over its opponents' defenses.
+        :param defensive_average: The average points allowed by each team.
+        :param defensive_factor: The factor of each team's defensive average over its opponents' offenses.
+        :param league_average_points: The average points per game of each team's league season, or of all of them.
+
+        :return: The rankings, in the order of the arrays.
+        """
+        ratings = cls.__new__(cls)
+        ratings.offensive_average = _to_array(offensive_average)
+        ratings.offensive_factor = _to_array(offensive_factor)
+        ratings.offensive_index = \
+            calculate_index(ratings.offensive_average, ratings.offensive_factor, league_average_points)
+        ratings.defensive_average = _to_array(defensive_average)
+        ratings.defensive_factor = _to_array(defensive_factor)
+        ratings.defensive_index = \
+            calculate_index(ratings.defensive_average, ratings.defensive_factor, league_average_points)
+        ratings.final_expected_winning_percentage = \
+            calculate_expected_winning_percentage(ratings.offensive_index, ratings.defensive_index)
+        return ratings
+
+    def take(self, positions: Sequence[int]) -> 'TeamSeasonRatings':
+        """
+        Gets the rankings of some of the team seasons.
+
+        :param positions: The positions of the team seasons whose rankings will be taken.
+
+        :return: The rankings, in the order of positions.
+        """
+        ratings = type(self).__new__(type(self))
+        for name in RANKINGS:
+            setattr(ratings, name, getattr(self, name)[list(positions)])
+        return ratings
+
+    def get_row(self, i: int) -> dict:
+        """
+        Gets the rankings of one team season, with None in place of NaN.
+
+        The final expected winning percentage is left out when it cannot be calculated, since TeamSeason.update_rankings
+        leaves it unchanged in that case.
+
+        :param i: The position of the team season.
+
+        :return: The rankings, keyed by TeamSeason column name.
+        """
+        row = {name: _to_value(getattr(self, name)[i]) for name in RANKINGS}
+        if row['final_expected_winning_percentage'] is None:
+            del row['final_expected_winning_percentage']
+        return row
+
+    def apply_to(self, team_seasons: Iterable[TeamSeason]) -> List[TeamSeason]:
+        """
+        Sets the rankings of a sequence of team seasons, as TeamSeason.update_rankings would have.
+
+        :param team_seasons: The team seasons that were ranked, in the order in which they were ranked.
+
+        :return: The team seasons whose rankings changed.
+        """
+        changed_team_seasons = []
+        for i, team_season in enumerate(team_seasons):
+            row = self.get_row(i)
+            if any(getattr(team_season, name) != value for name, value in row.items()):
+                changed_team_seasons.append(team_season)
+                for name, value in row.items():
+                    setattr(team_season, name, value)
+        return changed_team_seasons
+
+
+def calculate_expected_winning_percentage(points_for: ArrayLike, points_against: ArrayLike) -> np.ndarray:
+    """
+    Calculates the Pythagorean winning percentage of each pair of points for and against.
+
+    :param points_for: The points for, or offensive indices.
+    :param points_against: The points against, or defensive indices.
+
+    :return: The expected winning percentages, NaN where either value is NaN or both are 0.
+    """
+    with np.errstate(invalid='ignore'):
+        o = np.power(_to_array(points_for), EXPONENT)
+        d = np.power(_to_array(points_against), EXPONENT)
+    return divide(o, o + d)
+
+
+def divide(numerator: ArrayLike, denominator: ArrayLike) -> np.ndarray:
+    """
+    Divides two arrays element by element.
+
+    :param numerator: The numerators.
+    :param denominator: The denominators.
+
+    :return: The quotients, NaN where the denominator is 0 or either value is NaN.
+    """
+    numerator, denominator = np.broadcast_arrays(_to_array(numerator), _to_array(denominator))
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator != 0)
+
+
+def update_rankings(points: ArrayLike, games: ArrayLike, team_season_schedule_average_points: ArrayLike,
+                    league_season_average_points: ArrayLike | float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates the average, factor, and index of each team's points, for or against.
+
+    :param points: The points scored, or allowed, by each team.
+    :param games: The games played by each team.
+    :param team_season_schedule_average_points: The average points allowed, or scored, by each team's opponents.
+    :param league_season_average_points: The average points per game of each team's league season, or of all of them.
+
+    :return: The averages, factors, and indices, NaN where they cannot be calculated.
+    """
+    average = divide(points, games)
+    factor = divide(average, team_season_schedule_average_points)
+    return average, factor, calculate_index(average, factor, league_season_average_points)
+
+
+def calculate_index(average: ArrayLike, factor: ArrayLike,
+                    league_season_average_points: ArrayLike | float) -> np.ndarray:
+    """
+    Calculates the offensive or defensive index of each team from its average and factor.
+
+    :param average: The average points scored, or allowed, by each team.
+    :param factor: The factor of each team's average over its opponents' average.
+    :param league_season_average_points: The average points per game of each team's league season, or of all of them.
+
+    :return: The indices, NaN where the average or factor is NaN.
+    """
+    return (_to_array(average) + _to_array(factor) * _to_array(league_season_average_points)) / 2
+
+
+def _to_array(values: ArrayLike | float | None) -> np.ndarray:
+    # None, as stored for an unknown value, becomes NaN.
+    return np.asarray(np.nan if values is None else values, dtype=float)
+
+
+def _to_value(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
@@ -0,0 +1,25 @@
+from app.data.sqla import sqla
+
+
+class TeamSeasonWeekRating(sqla.Model):
+    """
+    Class to represent the ratings of one pro football team season as they stood after one week of its season, as
+    written by the weekly update of that week.
+    """
+    __tablename__ = 'team_season_week_rating'
+
+    id = sqla.Column(sqla.Integer, primary_key=True, autoincrement=True, nullable=False)
+    team_id = sqla.Column(sqla.String(50), nullable=False)
+    season_id = sqla.Column(sqla.SmallInteger, nullable=False)
+    league_id = sqla.Column(sqla.String(5), nullable=False)
+    week = sqla.Column(sqla.SmallInteger, nullable=False)
+    offensive_index = sqla.Column(sqla.Float)
+    defensive_index = sqla.Column(sqla.Float)
+    final_expected_winning_percentage = sqla.Column(sqla.Float)
+
+    __table_args__ = (
+        # Keeps one row per team season and week, and serves the history of one team season.
+        sqla.UniqueConstraint('team_id', 'season_id', 'week', name='uk_team_season_week_rating_team_season_week'),
+        # Serves the rankings of a whole week.
+        sqla.Index('ix_team_season_week_rating_season_week', 'season_id', 'week', 'team_id'),
+    )
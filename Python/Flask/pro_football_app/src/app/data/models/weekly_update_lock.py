@@ -0,0 +1,16 @@
+from app.data.sqla import sqla
+
+
+class WeeklyUpdateLock(sqla.Model):
+    """
+    Class to represent the lock on the weekly update of one pro football league season, held by at most one process
+    on any host at a time, and any request for another update made while it is held.
+    """
+    __tablename__ = 'weekly_update_lock'
+
+    league_id = sqla.Column(sqla.String(5), primary_key=True, nullable=False)
+    season_id = sqla.Column(sqla.SmallInteger, primary_key=True, autoincrement=False, nullable=False)
+    owner = sqla.Column(sqla.String(100))
+    expires_at = sqla.Column(sqla.DateTime)
+    rerun_requested = sqla.Column(sqla.Boolean, nullable=False, default=False)
+    rerun_incremental = sqla.Column(sqla.Boolean, nullable=False, default=True)
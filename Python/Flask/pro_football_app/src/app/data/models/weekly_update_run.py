@@ -0,0 +1,31 @@
+from app.data.sqla import sqla
+from app.data.timestamps import utc_now
+
+
+class WeeklyUpdateRun(sqla.Model):
+    """
+    Class to represent the history of one weekly update of a pro football league season, or of every league season of
+    a season: how long each of its phases took, how many statements it executed, and how many rows it wrote.
+    """
+    __tablename__ = 'weekly_update_run'
+
+    id = sqla.Column(sqla.Integer, primary_key=True, autoincrement=True, nullable=False)
+    league_id = sqla.Column(sqla.String(5), nullable=True)
+    season_id = sqla.Column(sqla.SmallInteger, nullable=False)
+    started_at = sqla.Column(sqla.DateTime, nullable=False, default=utc_now)
+    incremental = sqla.Column(sqla.Boolean, nullable=False, default=False)
+    solved = sqla.Column(sqla.Boolean, nullable=False, default=False)
+    attempts = sqla.Column(sqla.SmallInteger, nullable=False, default=1)
+    elapsed_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    league_totals_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    week_count_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    schedule_totals_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    schedule_averages_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    ranking_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    persistence_seconds = sqla.Column(sqla.Float, nullable=False, default=0)
+    query_count = sqla.Column(sqla.Integer, nullable=False, default=0)
+    rows_touched = sqla.Column(sqla.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        sqla.Index('ix_weekly_update_run_league_season', 'league_id', 'season_id', 'started_at'),
+    )
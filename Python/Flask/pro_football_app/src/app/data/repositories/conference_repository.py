@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import exists, update
 
 from app.data.models.conference import Conference
 from app.data.sqla import sqla
@@ -84,16 +84,20 @@ class ConferenceRepository:
 
         :return: The updated conference.
         """
-        if not self.conference_exists(conference.id):
+        result = sqla.session.execute(
+            update(Conference)
+            .where(Conference.id == conference.id)
+            .values(
+                short_name=conference.short_name,
+                long_name=conference.long_name,
+                league_id=conference.league_id,
+                first_season_id=conference.first_season_id,
+                last_season_id=conference.last_season_id
+            )
+        )
+        if result.rowcount == 0:
             return conference
 
-        conference_to_update = self.get_conference(conference.id)
-        conference_to_update.short_name = conference.short_name
-        conference_to_update.long_name = conference.long_name
-        conference_to_update.league_id = conference.league_id
-        conference_to_update.first_season_id = conference.first_season_id
-        conference_to_update.last_season_id = conference.last_season_id
-        sqla.session.add(conference_to_update)
         sqla.session.commit()
         return conference
 
@@ -105,10 +109,10 @@ class ConferenceRepository:
 
         :return: The deleted conference.
         """
-        if not self.conference_exists(id):
+        conference = sqla.session.get(Conference, id)
+        if conference is None:
             return None
 
-        conference = self.get_conference(id)
         sqla.session.delete(conference)
         sqla.session.commit()
         return conference
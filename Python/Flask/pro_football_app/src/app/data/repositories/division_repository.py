@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import exists, update
 
 from app.data.models.division import Division
 from app.data.sqla import sqla
@@ -84,16 +84,20 @@ class DivisionRepository:
 
         :return: The updated division.
         """
-        if not self.division_exists(division.id):
+        result = sqla.session.execute(
+            update(Division)
+            .where(Division.id == division.id)
+            .values(
+                name=division.name,
+                league_id=division.league_id,
+                conference_id=division.conference_id,
+                first_season_id=division.first_season_id,
+                last_season_id=division.last_season_id
+            )
+        )
+        if result.rowcount == 0:
             return division
 
-        division_to_update = self.get_division(division.id)
-        division_to_update.name = division.name
-        division_to_update.league_id = division.league_id
-        division_to_update.conference_id = division.conference_id
-        division_to_update.first_season_id = division.first_season_id
-        division_to_update.last_season_id = division.last_season_id
-        sqla.session.add(division_to_update)
         sqla.session.commit()
         return division
 
@@ -105,10 +109,10 @@ class DivisionRepository:
 
         :return: The deleted division.
         """
-        if not self.division_exists(id):
+        division = sqla.session.get(Division, id)
+        if division is None:
             return None
 
-        division = self.get_division(id)
         sqla.session.delete(division)
         sqla.session.commit()
         return division
@@ -1,6 +1,6 @@
-from typing import List
+from typing import Iterable, List, Set
 
-from sqlalchemy import exists
+from sqlalchemy import Row, case, delete, exists, func, insert, select, union_all, update
 
 from app.data.models.game import Game
 from app.data.sqla import sqla
@@ -38,6 +38,50 @@ class GameRepository:
             return None
         return Game.query.get(id)
 
+    def get_games_by_season(self, season_id: int) -> List[Game]:
+        """
+        Gets the games in the data store with the specified season_id.
+
+        :param season_id: The season_id of the games to fetch.
+
+        :return: The fetched games.
+        """
+        return Game.query.filter_by(season_id=season_id).all()
+
+    def get_team_season_results(self, first_season_id: int, last_season_id: int) -> List[Row]:
+        """
+        Totals the results of every team in each season in the specified range, in one aggregate query over the game
+        table.
+
+        :param first_season_id: The first season_id of the games to total.
+        :param last_season_id: The last season_id of the games to total.
+
+        :return: One row per team and season, with team_id, season_id, games, wins, losses, ties, points_for, and
+        points_against.
+        """
+        in_range = Game.season_id.between(first_season_id, last_season_id)
+        results = union_all(
+            select(Game.guest_name.label('team_id'), Game.season_id.label('season_id'),
+                   Game.guest_score.label('points_for'), Game.host_score.label('points_against'))
+            .where(in_range),
+            select(Game.host_name, Game.season_id, Game.host_score, Game.guest_score)
+            .where(in_range)
+        ).subquery()
+
+        return sqla.session.execute(
+            select(
+                results.c.team_id,
+                results.c.season_id,
+                func.count().label('games'),
+                func.sum(case((results.c.points_for > results.c.points_against, 1), else_=0)).label('wins'),
+                func.sum(case((results.c.points_for < results.c.points_against, 1), else_=0)).label('losses'),
+                func.sum(case((results.c.points_for == results.c.points_against, 1), else_=0)).label('ties'),
+                func.sum(results.c.points_for).label('points_for'),
+                func.sum(results.c.points_against).label('points_against')
+            )
+            .group_by(results.c.team_id, results.c.season_id)
+        ).all()
+
     def add_game(self, game: Game) -> Game:
         """
         Adds a game to the data store.
@@ -63,28 +107,78 @@ class GameRepository:
         sqla.session.commit()
         return games
 
-    def update_game(self, game: Game) -> Game | None:
+    def insert_games(self, games: tuple, commit: bool = True) -> tuple:
+        """
+        Inserts a collection of games into the data store in one batched statement, without adding them to the
+        session, and sets each game's id.
+
+        :param games: The games to insert.
+        :param commit: True to commit the insert, or False to leave it in the current transaction.
+
+        :return: The inserted games.
+        """
+        if len(games) > 0:
+            ids = sqla.session.execute(
+                insert(Game).returning(Game.id, sort_by_parameter_order=True),
+                [_get_values(game) for game in games]
+            ).scalars().all()
+            for game, id in zip(games, ids):
+                game.id = id
+
+        if commit:
+            sqla.session.commit()
+        return games
+
+    def update_game(self, game: Game, commit: bool = True) -> Game | None:
         """
         Updates a game in the data store.
 
         :param game: The game to update.
+        :param commit: True to commit the update, or False to leave it in the current transaction.
 
         :return: The updated game.
         """
-        if not self.game_exists(game.id):
+        result = sqla.session.execute(
+            update(Game)
+            .where(Game.id == game.id)
+            .values(
+                season_id=game.season_id,
+                week=game.week,
+                guest_name=game.guest_name,
+                guest_score=game.guest_score,
+                host_name=game.host_name,
+                host_score=game.host_score,
+                winner_name=game.winner_name,
+                winner_score=game.winner_score,
+                loser_name=game.loser_name,
+                loser_score=game.loser_score,
+                is_playoff=game.is_playoff or False,
+                notes=game.notes
+            )
+        )
+        if result.rowcount == 0:
             return game
 
-        game_to_update = self.get_game(game.id)
-        game_to_update.season_id = game.season_id
-        game_to_update.week = game.week
-        game_to_update.guest_name = game.guest_name
-        game_to_update.guest_score = game.guest_score
-        game_to_update.host_name = game.host_name
-        game_to_update.host_score = game.host_score
-        sqla.session.add(game_to_update)
-        sqla.session.commit()
+        if commit:
+            sqla.session.commit()
         return game
 
+    def update_games(self, games: tuple, commit: bool = True) -> tuple:
+        """
+        Updates a collection of games in the data store in one batched statement.
+
+        :param games: The games to update.
+        :param commit: True to commit the update, or False to leave it in the current transaction.
+
+        :return: The updated games.
+        """
+        if len(games) > 0:
+            sqla.session.execute(update(Game), [dict(id=game.id, **_get_values(game)) for game in games])
+
+        if commit:
+            sqla.session.commit()
+        return games
+
     def delete_game(self, id: int) -> Game | None:
         """
         Deletes a game from the data store.
@@ -93,14 +187,52 @@ class GameRepository:
 
         :return: The deleted game.
         """
-        if not self.game_exists(id):
+        game = sqla.session.execute(
+            delete(Game).where(Game.id == id).returning(Game)
+        ).scalar_one_or_none()
+        if game is None:
             return None
 
-        game = self.get_game(id)
-        sqla.session.delete(game)
+        sqla.session.expunge(game)
         sqla.session.commit()
         return game
 
+    def delete_games(self, ids: Iterable[int], commit: bool = True) -> None:
+        """
+        Deletes a collection of games from the data store in one statement.
+
+        :param ids: The ids of the games to delete.
+        :param commit: True to commit the delete, or False to leave it in the current transaction.
+
+        :return: None
+        """
+        ids = list(ids)
+        if len(ids) > 0:
+            sqla.session.execute(delete(Game).where(Game.id.in_(ids)))
+
+        if commit:
+            sqla.session.commit()
+
+    def delete_games_by_season_and_week(self, season_id: int, week: int, commit: bool = True) -> List[Game]:
+        """
+        Deletes the games with the specified season_id and week from the data store in one statement.
+
+        :param season_id: The season_id of the games to delete.
+        :param week: The week of the games to delete.
+        :param commit: True to commit the delete, or False to leave it in the current transaction.
+
+        :return: The deleted games.
+        """
+        games = sqla.session.execute(
+            delete(Game).where(Game.season_id == season_id, Game.week == week).returning(Game)
+        ).scalars().all()
+        for game in games:
+            sqla.session.expunge(game)
+
+        if commit:
+            sqla.session.commit()
+        return games
+
     def game_exists(self, id: int) -> bool:
         """
         Checks to verify whether a specific game exists in the data store.
@@ -110,3 +242,47 @@ class GameRepository:
         :return: True if the game with the specified id exists in the data store; otherwise false.
         """
         return sqla.session.query(exists().where(Game.id == id)).scalar()
+
+    def get_existing_natural_keys(self, games: Iterable[Game]) -> Set[tuple]:
+        """
+        Finds which of a collection of games are already in the data store, as identified by their natural keys.
+
+        The games are checked with a single query against the game table's natural-key index.
+
+        :param games: The games to check.
+
+        :return: The natural keys of the games that already exist in the data store.
+        """
+        natural_keys = {game.natural_key() for game in games}
+        if len(natural_keys) == 0:
+            return set()
+
+        # SQL Server has no row-value IN, so each key column is filtered on its own and exact matches are kept here.
+        season_ids, weeks, guest_names, host_names = (set(values) for values in zip(*natural_keys))
+        rows = sqla.session.execute(
+            select(Game.season_id, Game.week, Game.guest_name, Game.host_name)
+            .where(
+                Game.season_id.in_(season_ids),
+                Game.week.in_(weeks),
+                Game.guest_name.in_(guest_names),
+                Game.host_name.in_(host_names)
+            )
+        ).all()
+        return {tuple(row) for row in rows} & natural_keys
+
+
+def _get_values(game: Game) -> dict:
+    return dict(
+        season_id=game.season_id,
+        week=game.week,
+        guest_name=game.guest_name,
+        guest_score=game.guest_score,
+        host_name=game.host_name,
+        host_score=game.host_score,
+        winner_name=game.winner_name,
+        winner_score=game.winner_score,
+        loser_name=game.loser_name,
+        loser_score=game.loser_score,
+        is_playoff=game.is_playoff or False,
+        notes=game.notes
+    )
@@ -0,0 +1,63 @@
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.sqla import sqla
+
+
+class JobCheckpointRepository:
+    """
+    Provides CRUD access to an external data store.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the JobCheckpointRepository class.
+        """
+        pass
+
+    def get_job_checkpoint(self, job_name: str) -> JobCheckpoint | None:
+        """
+        Gets the checkpoint of a job.
+
+        :param job_name: The name of the job whose checkpoint will be fetched.
+
+        :return: The fetched job_checkpoint, or None if the job has none.
+        """
+        return JobCheckpoint.query.filter_by(job_name=job_name).first()
+
+    def save_job_checkpoint(self, job_name: str, season_id: int, league_id: str | None,
+                            phase: str) -> JobCheckpoint:
+        """
+        Records the last unit of work completed by a job, replacing its earlier checkpoint, and commits it.
+
+        :param job_name: The name of the job.
+        :param season_id: The season_id of the last completed unit.
+        :param league_id: The league_id of the last completed unit, or None if the whole season is complete.
+        :param phase: The phase of the job that completed the unit.
+
+        :return: The saved job_checkpoint.
+        """
+        job_checkpoint = self.get_job_checkpoint(job_name)
+        if job_checkpoint is None:
+            job_checkpoint = JobCheckpoint(job_name=job_name)
+            sqla.session.add(job_checkpoint)
+
+        job_checkpoint.season_id = season_id
+        job_checkpoint.league_id = None if league_id is None else str(league_id)
+        job_checkpoint.phase = phase
+        sqla.session.commit()
+        return job_checkpoint
+
+    def delete_job_checkpoint(self, job_name: str) -> JobCheckpoint | None:
+        """
+        Deletes the checkpoint of a job, such as when the job has finished.
+
+        :param job_name: The name of the job whose checkpoint will be deleted.
+
+        :return: The deleted job_checkpoint, or None if the job had none.
+        """
+        job_checkpoint = self.get_job_checkpoint(job_name)
+        if job_checkpoint is None:
+            return None
+
+        sqla.session.delete(job_checkpoint)
+        sqla.session.commit()
+        return job_checkpoint
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import exists, update
 
 from app.data.models.league import League
 from app.data.sqla import sqla
@@ -84,15 +84,19 @@ class LeagueRepository:
 
         :return: The updated league.
         """
-        if not self.league_exists(league.id):
+        result = sqla.session.execute(
+            update(League)
+            .where(League.id == league.id)
+            .values(
+                short_name=league.short_name,
+                long_name=league.long_name,
+                first_season_id=league.first_season_id,
+                last_season_id=league.last_season_id
+            )
+        )
+        if result.rowcount == 0:
             return league
 
-        league_to_update = self.get_league(league.id)
-        league_to_update.short_name = league.short_name
-        league_to_update.long_name = league.long_name
-        league_to_update.first_season_id = league.first_season_id
-        league_to_update.last_season_id = league.last_season_id
-        sqla.session.add(league_to_update)
         sqla.session.commit()
         return league
 
@@ -104,10 +108,10 @@ class LeagueRepository:
 
         :return: The deleted league.
         """
-        if not self.league_exists(id):
+        league = sqla.session.get(League, id)
+        if league is None:
             return None
 
-        league = self.get_league(id)
         sqla.session.delete(league)
         sqla.session.commit()
         return league
@@ -1,6 +1,7 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import delete, exists, update
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.data.models.league_season import LeagueSeason
 from app.data.sqla import sqla
@@ -52,6 +53,27 @@ class LeagueSeasonRepository:
             return None
         return LeagueSeason.query.filter_by(league_id=league_id, season_id=season_id).first()
 
+    def get_league_seasons_by_season(self, season_id: int) -> List[LeagueSeason]:
+        """
+        Gets the league_seasons in the data store with the specified season_id.
+
+        :param season_id: The season_id of the league_seasons to fetch.
+
+        :return: The fetched league_seasons.
+        """
+        return LeagueSeason.query.filter_by(season_id=season_id).all()
+
+    def get_league_seasons_by_season_range(self, first_season_id: int, last_season_id: int) -> List[LeagueSeason]:
+        """
+        Gets the league_seasons in the data store with a season_id in the specified range.
+
+        :param first_season_id: The first season_id of the league_seasons to fetch.
+        :param last_season_id: The last season_id of the league_seasons to fetch.
+
+        :return: The fetched league_seasons.
+        """
+        return LeagueSeason.query.filter(LeagueSeason.season_id.between(first_season_id, last_season_id)).all()
+
     def add_league_season(self, league_season: LeagueSeason) -> LeagueSeason:
         """
         Adds a league_season to the data store.
@@ -77,25 +99,49 @@ class LeagueSeasonRepository:
         sqla.session.commit()
         return league_seasons
 
-    def update_league_season(self, league_season: LeagueSeason) -> LeagueSeason | None:
+    def update_league_season(self, league_season: LeagueSeason, commit: bool = True) -> LeagueSeason | None:
         """
         Updates a league_season in the data store.
 
         :param league_season: The league_season to update.
+        :param commit: True to commit the update, or False to write it in the current transaction and leave it there.
 
         :return: The updated league_season.
+
+        :raises StaleDataError: If the league_season was changed in the data store after it was read.
         """
-        if not self.league_season_exists(league_season.id):
+        if league_season in sqla.session:
+            # Loaded through this session, so the unit of work writes it with its version check.
+            if commit:
+                sqla.session.commit()
+            else:
+                sqla.session.flush()
             return league_season
 
-        league_season_to_update = self.get_league_season(league_season.id)
-        league_season_to_update.league_id = league_season.league_id
-        league_season_to_update.season_id = league_season.season_id
-        league_season_to_update.total_games = league_season.total_games
-        league_season_to_update.total_points = league_season.total_points
-        league_season_to_update.average_points = league_season.average_points
-        sqla.session.add(league_season_to_update)
-        sqla.session.commit()
+        statement = update(LeagueSeason).where(LeagueSeason.id == league_season.id)
+        if league_season.version_id is not None:
+            statement = statement.where(LeagueSeason.version_id == league_season.version_id)
+
+        result = sqla.session.execute(
+            statement.values(
+                league_id=league_season.league_id,
+                season_id=league_season.season_id,
+                total_games=league_season.total_games,
+                total_points=league_season.total_points,
+                average_points=league_season.average_points,
+                version_id=LeagueSeason.version_id + 1
+            )
+        )
+        if result.rowcount == 0:
+            if league_season.version_id is not None and self.league_season_exists(league_season.id):
+                raise StaleDataError(
+                    f"LeagueSeason with id={league_season.id} was modified after version "
+                    f"{league_season.version_id} was read."
+                )
+            return league_season
+
+        if commit:
+            sqla.session.commit()
         return league_season
 
     def delete_league_season(self, id: int) -> LeagueSeason | None:
@@ -106,11 +152,13 @@ class LeagueSeasonRepository:
 
         :return: The deleted league_season.
         """
-        if not self.league_season_exists(id):
+        league_season = sqla.session.execute(
+            delete(LeagueSeason).where(LeagueSeason.id == id).returning(LeagueSeason)
+        ).scalar_one_or_none()
+        if league_season is None:
             return None
 
-        league_season = self.get_league_season(id)
-        sqla.session.delete(league_season)
+        sqla.session.expunge(league_season)
         sqla.session.commit()
         return league_season
 
@@ -1,4 +1,7 @@
+from typing import Dict
+
 from app.data.models.league_season_totals import LeagueSeasonTotals
+from app.data.models.team_season import TeamSeason
 from app.data.sqla import sqla
 
 
@@ -25,6 +28,23 @@ class LeagueSeasonTotalsRepository:
         totals = sqla.session.execute(statement).first()
         return LeagueSeasonTotals(total_games=totals[0], total_points=totals[1])
 
+    def get_league_season_totals_by_season(self, season_id: int) -> Dict[str, LeagueSeasonTotals]:
+        """
+        Gets the league_season_totals of every league in the specified season, summed from its team_seasons as
+        sp_GetLeagueSeasonTotals does, in one grouped query.
+
+        :param season_id: The season_id of the league_season_totals to fetch.
+
+        :return: The fetched league_season_totals, keyed by league_id as a string, as in league_season.
+        """
+        statement = sqla.select(
+            TeamSeason.league_id, sqla.func.sum(TeamSeason.games), sqla.func.sum(TeamSeason.points_for)
+        ).where(TeamSeason.season_id == season_id).group_by(TeamSeason.league_id)
+        return {
+            str(league_id): LeagueSeasonTotals(total_games=total_games, total_points=total_points)
+            for league_id, total_games, total_points in sqla.session.execute(statement)
+        }
+
 
 if __name__ == '__main__':
     repo = LeagueSeasonTotalsRepository()
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import exists, update
 
 from app.data.models.season import Season
 from app.data.models.game import Game
@@ -79,21 +79,31 @@ class SeasonRepository:
         sqla.session.commit()
         return seasons
 
-    def update_season(self, season: Season) -> Season | None:
+    def update_season(self, season: Season, commit: bool = True) -> Season | None:
         """
         Updates a season in the data store.
 
         :param season: The season to update.
+        :param commit: True to commit the update, or False to write it in the current transaction and leave it there.
 
         :return: The updated season.
         """
-        if not self.season_exists(season.id):
+        result = sqla.session.execute(
+            update(Season)
+            .where(Season.id == season.id)
+            .values(
+                year=season.year,
+                num_of_weeks_scheduled=season.num_of_weeks_scheduled,
+                num_of_weeks_completed=season.num_of_weeks_completed
+            )
+        )
+        if result.rowcount == 0:
             return season
 
-        season_to_update = self.get_season(season.id)
-        season_to_update.year = season.year
-        sqla.session.add(season_to_update)
-        sqla.session.commit()
+        if commit:
+            sqla.session.commit()
+        else:
+            sqla.session.flush()
         return season
 
     def delete_season(self, id: int) -> Season | None:
@@ -104,10 +114,10 @@ class SeasonRepository:
 
         :return: The deleted season.
         """
-        if not self.season_exists(id):
+        season = sqla.session.get(Season, id)
+        if season is None:
             return None
 
-        season = self.get_season(id)
         sqla.session.delete(season)
         sqla.session.commit()
         return season
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import exists
+from sqlalchemy import exists, update
 
 from app.data.models.team import Team
 from app.data.sqla import sqla
@@ -84,12 +84,16 @@ class TeamRepository:
 
         :return: The updated team.
         """
-        if not self.team_exists(team.id):
+        result = sqla.session.execute(
+            update(Team)
+            .where(Team.id == team.id)
+            .values(
+                name=team.name
+            )
+        )
+        if result.rowcount == 0:
             return team
 
-        team_to_update = self.get_team(team.id)
-        team_to_update.name = team.name
-        sqla.session.add(team_to_update)
         sqla.session.commit()
         return team
 
@@ -101,10 +105,10 @@ class TeamRepository:
 
         :return: The deleted team.
         """
-        if not self.team_exists(id):
+        team = sqla.session.get(Team, id)
+        if team is None:
             return None
 
-        team = self.get_team(id)
         sqla.session.delete(team)
         sqla.session.commit()
         return team
@@ -0,0 +1,165 @@
+from typing import Dict, List, Set
+from weakref import WeakSet
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.data.models.team_season import TeamSeason
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+
+WRITTEN_SEASONS = 'team_season_membership_written_seasons'
+ALL_SEASONS = None
+MEMBERSHIP_COLUMNS = ('team_id', 'season_id', 'league_id')
+
+
+class TeamSeasonMembershipIndex:
+    """
+    An in-memory index of the teams that have a team season in each season.
+
+    Each season's teams are loaded with one query the first time that season is checked. Every live index forgets a
+    season when a transaction that adds, deletes, or moves team seasons in that season commits. Writes that leave
+    every team season's team, season, and league as they were, such as those of a game's results, forget nothing.
+    """
+
+    _indexes = WeakSet()
+
+    def __init__(self, team_season_repository: TeamSeasonRepository = None) -> None:
+        """
+        Initializes a new instance of the TeamSeasonMembershipIndex class.
+
+        :param team_season_repository: The repository by which each season's teams will be fetched.
+        """
+        self._team_season_repository = team_season_repository or TeamSeasonRepository()
+        self._team_ids_by_season: Dict[int, Set[str]] = {}
+        TeamSeasonMembershipIndex._indexes.add(self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(team_season_repository={self._team_season_repository})"
+
+    def contains(self, team_id: str, season_id: int) -> bool:
+        """
+        Checks to see if a team has a team season in a season.
+
+        :param team_id: The team_id to check.
+        :param season_id: The season_id to check.
+
+        :return: True if the team has a team season in the season, otherwise false.
+        """
+        team_ids = self._team_ids_by_season.get(season_id)
+        if team_ids is None:
+            team_ids = set(self._team_season_repository.get_team_ids_by_season(season_id))
+            self._team_ids_by_season[season_id] = team_ids
+
+        return team_id in team_ids
+
+    def invalidate(self, season_id: int | None = ALL_SEASONS) -> None:
+        """
+        Forgets the teams loaded for a season, so they are loaded again the next time that season is checked.
+
+        :param season_id: The season_id to forget, or None to forget every season.
+
+        :return: None
+        """
+        if season_id is ALL_SEASONS:
+            self._team_ids_by_season.clear()
+        else:
+            self._team_ids_by_season.pop(season_id, None)
+
+    @classmethod
+    def invalidate_all(cls, season_id: int | None = ALL_SEASONS) -> None:
+        """
+        Forgets the teams loaded for a season in every live TeamSeasonMembershipIndex.
+
+        :param season_id: The season_id to forget, or None to forget every season.
+
+        :return: None
+        """
+        for index in list(cls._indexes):
+            index.invalidate(season_id)
+
+
+def _record_written_seasons(session: Session, season_ids: Set[int | None]) -> None:
+    session.info.setdefault(WRITTEN_SEASONS, set()).update(season_ids)
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_team_season_membership_changes(session: Session, flush_context) -> None:
+    # The new, dirty, and deleted collections still hold their pre-flush contents here.
+    season_ids = {obj.season_id for obj in session.new if isinstance(obj, TeamSeason)}
+    season_ids.update(obj.season_id for obj in session.deleted if isinstance(obj, TeamSeason))
+    for obj in session.dirty:
+        if isinstance(obj, TeamSeason):
+            attrs = inspect(obj).attrs
+            if any(attrs[name].history.has_changes() for name in MEMBERSHIP_COLUMNS):
+                season_ids.update(attrs.season_id.history.sum())
+    if season_ids:
+        _record_written_seasons(session, season_ids)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_team_season_bulk_changes(orm_execute_state: ORMExecuteState) -> None:
+    if not (
+        (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete)
+        and orm_execute_state.bind_mapper is not None
+        and orm_execute_state.bind_mapper.class_ is TeamSeason
+    ):
+        return
+
+    rows = _get_written_membership_rows(orm_execute_state)
+    if orm_execute_state.is_update and not any(rows):
+        # Only totals or rankings are written, so no season gains or loses a team.
+        return
+
+    if orm_execute_state.is_insert:
+        season_ids = {row.get('season_id', ALL_SEASONS) for row in rows}
+    elif isinstance(orm_execute_state.parameters, list):
+        # The rows each parameter set matches cannot be read before they are written.
+        season_ids = {ALL_SEASONS}
+    else:
+        season_ids = _get_changed_season_ids(orm_execute_state, rows[0])
+
+    if season_ids:
+        _record_written_seasons(orm_execute_state.session, season_ids)
+
+
+def _get_written_membership_rows(orm_execute_state: ORMExecuteState) -> List[Dict]:
+    # Statements compiled without parameters hold the values they were given; executemany rows override them.
+    values = orm_execute_state.statement.compile().params
+    parameters = orm_execute_state.parameters
+    parameter_sets = parameters if isinstance(parameters, list) else [parameters or {}]
+    return [
+        {name: row[name] for name in MEMBERSHIP_COLUMNS if name in row}
+        for row in ({**values, **parameter_set} for parameter_set in parameter_sets)
+    ]
+
+
+def _get_changed_season_ids(orm_execute_state: ORMExecuteState, written_row: Dict) -> Set[int | None]:
+    # The matched rows are read before they are written, so only the seasons a team season leaves, joins, or is
+    # deleted from are forgotten.
+    query = select(*(getattr(TeamSeason, name) for name in MEMBERSHIP_COLUMNS))
+    if orm_execute_state.statement.whereclause is not None:
+        query = query.where(orm_execute_state.statement.whereclause)
+
+    season_ids = set()
+    for old_row in orm_execute_state.session.execute(query).mappings():
+        if orm_execute_state.is_delete:
+            season_ids.add(old_row['season_id'])
+        elif any(old_row[name] != value for name, value in written_row.items()):
+            season_ids.update((old_row['season_id'], written_row.get('season_id', old_row['season_id'])))
+    return season_ids
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_written_seasons(session: Session) -> None:
+    season_ids = session.info.pop(WRITTEN_SEASONS, set())
+    if ALL_SEASONS in season_ids:
+        TeamSeasonMembershipIndex.invalidate_all()
+        return
+
+    for season_id in season_ids:
+        TeamSeasonMembershipIndex.invalidate_all(season_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_written_seasons(session: Session, previous_transaction) -> None:
+    session.info.pop(WRITTEN_SEASONS, None)
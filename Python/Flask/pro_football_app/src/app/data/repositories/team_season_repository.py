@@ -1,6 +1,8 @@
-from typing import List
+from typing import Iterable, List
 
-from sqlalchemy import exists
+from sqlalchemy import bindparam, delete, exists, select, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.data.models.team_season import TeamSeason
 from app.data.sqla import sqla
@@ -49,7 +51,60 @@ class TeamSeasonRepository:
         team_seasons = self.get_team_seasons()
         if len(team_seasons) == 0:
             return None
-        return TeamSeason.query.filter_by(season_id=season_id).fetchall()
+        return TeamSeason.query.filter_by(season_id=season_id).all()
+
+    def get_team_ids_by_season(self, season_id: int) -> List[str]:
+        """
+        Gets the team_ids of the team_seasons in the data store with the specified season_id.
+
+        :param season_id: The season_id of the team_seasons whose team_ids will be fetched.
+
+        :return: The fetched team_ids.
+        """
+        return sqla.session.execute(select(TeamSeason.team_id).where(TeamSeason.season_id == season_id)).scalars().all()
+
+    def get_team_seasons_by_season_and_teams(self, season_id: int, team_ids: Iterable[str]) -> List[TeamSeason]:
+        """
+        Gets the team_seasons in the data store with the specified season_id and any of the specified team_ids.
+
+        :param season_id: The season_id of the team_seasons to fetch.
+        :param team_ids: The team_ids of the team_seasons to fetch.
+
+        :return: The fetched team_seasons.
+        """
+        return TeamSeason.query.filter(TeamSeason.season_id == season_id, TeamSeason.team_id.in_(team_ids)).all()
+
+    def lock_team_seasons_by_season_and_teams(self, season_id: int, team_ids: Iterable[str]) -> List[TeamSeason]:
+        """
+        Gets the team_seasons in the data store with the specified season_id and any of the specified team_ids, and
+        locks them for update until the current transaction ends.
+
+        Rows are locked in team_id order, so writers that lock overlapping sets of team_seasons, one season at a time
+        in season_id order, cannot deadlock. Data stores that cannot lock rows, such as SQLite, read them unlocked.
+
+        :param season_id: The season_id of the team_seasons to lock.
+        :param team_ids: The team_ids of the team_seasons to lock.
+
+        :return: The locked team_seasons, with their current values.
+        """
+        return TeamSeason.query \
+            .filter(TeamSeason.season_id == season_id, TeamSeason.team_id.in_(team_ids)) \
+            .order_by(TeamSeason.team_id) \
+            .with_hint(TeamSeason, 'WITH (UPDLOCK, ROWLOCK)', 'mssql') \
+            .with_for_update() \
+            .populate_existing() \
+            .all()
+
+    def get_team_seasons_by_season_range(self, first_season_id: int, last_season_id: int) -> List[TeamSeason]:
+        """
+        Gets the team_seasons in the data store with a season_id in the specified range.
+
+        :param first_season_id: The first season_id of the team_seasons to fetch.
+        :param last_season_id: The last season_id of the team_seasons to fetch.
+
+        :return: The fetched team_seasons.
+        """
+        return TeamSeason.query.filter(TeamSeason.season_id.between(first_season_id, last_season_id)).all()
 
     def get_team_season_by_team_and_season(self, team_id: int, season_id: int) -> TeamSeason | None:
         """
@@ -97,36 +152,189 @@ class TeamSeasonRepository:
         :param team_season: The team_season to update.
 
         :return: The updated team_season.
+
+        :raises StaleDataError: If the team_season was changed in the data store after it was read.
         """
-        if not self.team_season_exists(team_season.id):
+        if team_season in sqla.session:
+            # Loaded through this session, so the unit of work writes it with its version check.
+            sqla.session.commit()
+            return team_season
+
+        statement = update(TeamSeason).where(TeamSeason.id == team_season.id)
+        if team_season.version_id is not None:
+            statement = statement.where(TeamSeason.version_id == team_season.version_id)
+
+        result = sqla.session.execute(
+            statement.values(
+                team_id=team_season.team_id,
+                season_id=team_season.season_id,
+                league_id=team_season.league_id,
+                conference_id=team_season.conference_id,
+                division_id=team_season.division_id,
+                games=team_season.games,
+                wins=team_season.wins,
+                losses=team_season.losses,
+                ties=team_season.ties,
+                winning_percentage=team_season.winning_percentage,
+                points_for=team_season.points_for,
+                points_against=team_season.points_against,
+                expected_wins=team_season.expected_wins,
+                expected_losses=team_season.expected_losses,
+                offensive_average=team_season.offensive_average,
+                offensive_factor=team_season.offensive_factor,
+                offensive_index=team_season.offensive_index,
+                defensive_average=team_season.defensive_average,
+                defensive_factor=team_season.defensive_factor,
+                defensive_index=team_season.defensive_index,
+                final_expected_winning_percentage=team_season.final_expected_winning_percentage,
+                version_id=TeamSeason.version_id + 1
+            )
+        )
+        if result.rowcount == 0:
+            if team_season.version_id is not None and self.team_season_exists(team_season.id):
+                raise StaleDataError(
+                    f"TeamSeason with id={team_season.id} was modified after version "
+                    f"{team_season.version_id} was read."
+                )
             return team_season
 
-        team_season_to_update = self.get_team_season(team_season.id)
-        team_season_to_update.team_id = team_season.team_id
-        team_season_to_update.season_id = team_season.season_id
-        team_season_to_update.league_id = team_season.league_id
-        team_season_to_update.conference_id = team_season.conference_id
-        team_season_to_update.division_id = team_season.division_id
-        team_season_to_update.games = team_season.games
-        team_season_to_update.wins = team_season.wins
-        team_season_to_update.losses = team_season.losses
-        team_season_to_update.ties = team_season.ties
-        team_season_to_update.winning_percentage = team_season.winning_percentage
-        team_season_to_update.points_for = team_season.points_for
-        team_season_to_update.points_against = team_season.points_against
-        team_season_to_update.expected_wins = team_season.expected_wins
-        team_season_to_update.expected_losses = team_season.expected_losses
-        team_season_to_update.offensive_average = team_season.offensive_average
-        team_season_to_update.offensive_factor = team_season.offensive_factor
-        team_season_to_update.offensive_index = team_season.offensive_index
-        team_season_to_update.defensive_average = team_season.defensive_average
-        team_season_to_update.defensive_factor = team_season.defensive_factor
-        team_season_to_update.defensive_index = team_season.defensive_index
-        team_season_to_update.final_expected_winning_percentage = team_season.final_expected_winning_percentage
-        sqla.session.add(team_season_to_update)
         sqla.session.commit()
         return team_season
 
+    def update_team_seasons(self, team_seasons: tuple) -> tuple:
+        """
+        Updates a collection of team_seasons, previously fetched from the data store, in one transaction.
+
+        :param team_seasons: The team_seasons to update.
+
+        :return: The updated team_seasons.
+
+        :raises StaleDataError: If any of the team_seasons was changed in the data store after it was read.
+        """
+        for team_season in team_seasons:
+            sqla.session.add(team_season)
+        sqla.session.commit()
+        return team_seasons
+
+    def update_team_season_totals(self, team_seasons: Iterable[TeamSeason], commit: bool = True) -> None:
+        """
+        Writes the totals, winning percentage, and expected wins and losses of a collection of team_seasons to the
+        data store in one batched statement, without reading them first.
+
+        Each row's version_id is incremented, so writers holding an earlier version of a row will see a conflict, but
+        the rows are written whatever their current version. Other columns, such as rankings, are left as they are.
+
+        :param team_seasons: The team_seasons to write.
+        :param commit: True to commit the update, or False to leave it in the current transaction.
+
+        :return: None
+        """
+        rows = [
+            dict(
+                b_id=team_season.id,
+                games=team_season.games,
+                wins=team_season.wins,
+                losses=team_season.losses,
+                ties=team_season.ties,
+                winning_percentage=team_season.winning_percentage,
+                points_for=team_season.points_for,
+                points_against=team_season.points_against,
+                expected_wins=team_season.expected_wins,
+                expected_losses=team_season.expected_losses
+            )
+            for team_season in team_seasons
+        ]
+        if len(rows) > 0:
+            table = TeamSeason.__table__
+            sqla.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('b_id'))
+                .values(
+                    {name: bindparam(name) for name in rows[0] if name != 'b_id'}
+                    | {'version_id': table.c.version_id + 1}
+                ),
+                rows
+            )
+
+        if commit:
+            sqla.session.commit()
+
+    def update_team_season_rankings(self, team_seasons: Iterable[TeamSeason], commit: bool = True,
+                                    record_ranked_version: bool = True) -> None:
+        """
+        Writes the rankings of a collection of team_seasons to the data store in batched statements, and records each
+        row's new version_id as its ranked_version_id.
+
+        Each row is only written if its version_id is unchanged since it was read. Team_seasons attached to the session
+        are left holding the written values, so the session does not write them again.
+
+        :param team_seasons: The team_seasons to write.
+        :param commit: True to commit the update, or False to leave it in the current transaction.
+
+        :param record_ranked_version:
+        True to record the rows as ranked, or False to leave their ranked_version_id as it was, so an incremental
+        weekly update recalculates them.
+
+        :return: None
+
+        :raises StaleDataError: If any of the team_seasons was changed in the data store after it was read.
+        """
+        team_seasons = list(team_seasons)
+        rows = [
+            dict(
+                b_id=team_season.id,
+                b_version_id=team_season.version_id,
+                offensive_average=team_season.offensive_average,
+                offensive_factor=team_season.offensive_factor,
+                offensive_index=team_season.offensive_index,
+                defensive_average=team_season.defensive_average,
+                defensive_factor=team_season.defensive_factor,
+                defensive_index=team_season.defensive_index,
+                final_expected_winning_percentage=team_season.final_expected_winning_percentage
+            )
+            for team_season in team_seasons
+        ]
+        if len(rows) > 0:
+            table = TeamSeason.__table__
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam('b_id'), table.c.version_id == bindparam('b_version_id'))
+                .values(
+                    {name: bindparam(name) for name in rows[0] if not name.startswith('b_')}
+                    | {'version_id': table.c.version_id + 1}
+                    | ({'ranked_version_id': table.c.version_id + 1} if record_ranked_version else {})
+                )
+            )
+
+            with sqla.session.no_autoflush:
+                if sqla.engine.dialect.supports_sane_multi_rowcount:
+                    rowcount = sqla.session.execute(statement, rows).rowcount
+                else:
+                    # The driver cannot count the rows matched by a batch, so each row is checked on its own.
+                    rowcount = sum(sqla.session.execute(statement, row).rowcount for row in rows)
+
+            if rowcount < len(rows):
+                raise StaleDataError(
+                    f"{len(rows) - rowcount} of {len(rows)} TeamSeason rows were modified after they were read."
+                )
+
+            for team_season in team_seasons:
+                version_id = team_season.version_id + 1
+                if team_season in sqla.session:
+                    for name in rows[0]:
+                        if not name.startswith('b_'):
+                            set_committed_value(team_season, name, getattr(team_season, name))
+                    set_committed_value(team_season, 'version_id', version_id)
+                    if record_ranked_version:
+                        set_committed_value(team_season, 'ranked_version_id', version_id)
+                else:
+                    team_season.version_id = version_id
+                    if record_ranked_version:
+                        team_season.ranked_version_id = version_id
+
+        if commit:
+            sqla.session.commit()
+
     def delete_team_season(self, id: int) -> TeamSeason | None:
         """
         Deletes a team_season from the data store.
@@ -135,11 +343,13 @@ class TeamSeasonRepository:
 
         :return: The deleted team_season.
         """
-        if not self.team_season_exists(id):
+        team_season = sqla.session.execute(
+            delete(TeamSeason).where(TeamSeason.id == id).returning(TeamSeason)
+        ).scalar_one_or_none()
+        if team_season is None:
             return None
 
-        team_season = self.get_team_season(id)
-        sqla.session.delete(team_season)
+        sqla.session.expunge(team_season)
         sqla.session.commit()
         return team_season
 
@@ -157,10 +367,12 @@ class TeamSeasonRepository:
         """
         Checks to verify whether a specific team_season exists in the data store.
 
-        :param id: The id of the team_season to verify.
+        :param team_id: The team_id of the team_season to verify.
+        :param season_id: The season_id of the team_season to verify.
 
-        :return: True if the team_season with the specified id exists in the data store; otherwise false.
+        :return: True if the team_season with the specified team_id and season_id exists in the data store;
+        otherwise false.
         """
         return sqla.session.query(
-            exists().where(TeamSeason.team_id == team_id and TeamSeason.season_id == season_id)
+            exists().where(TeamSeason.team_id == team_id, TeamSeason.season_id == season_id)
         ).scalar()
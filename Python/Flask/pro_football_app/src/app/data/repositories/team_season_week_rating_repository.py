@@ -0,0 +1,92 @@
+from typing import Iterable, List
+
+from sqlalchemy import delete, insert
+
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_week_rating import TeamSeasonWeekRating
+from app.data.sqla import sqla
+
+
+class TeamSeasonWeekRatingRepository:
+    """
+    Provides CRUD access to an external data store.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the TeamSeasonWeekRatingRepository class.
+        """
+        pass
+
+    def get_team_season_week_ratings_by_team_and_season(self, team_id: str,
+                                                        season_id: int) -> List[TeamSeasonWeekRating]:
+        """
+        Gets the rating of a team season after each week of its season, in week order.
+
+        :param team_id: The team_id of the team_season_week_ratings to fetch.
+        :param season_id: The season_id of the team_season_week_ratings to fetch.
+
+        :return: The fetched team_season_week_ratings.
+        """
+        return TeamSeasonWeekRating.query.filter_by(team_id=team_id, season_id=season_id) \
+            .order_by(TeamSeasonWeekRating.week).all()
+
+    def get_team_season_week_ratings_by_season_and_week(self, season_id: int, week: int,
+                                                        league_id: str = None) -> List[TeamSeasonWeekRating]:
+        """
+        Gets the ratings of every team season of a season after one week, best first.
+
+        :param season_id: The season_id of the team_season_week_ratings to fetch.
+        :param week: The week of the team_season_week_ratings to fetch.
+
+        :param league_id:
+        The league_id of the team_season_week_ratings to fetch, or None to fetch those of every league.
+
+        :return:
+        The fetched team_season_week_ratings, in descending order of final expected winning percentage, with those
+        that have none last.
+        """
+        query = TeamSeasonWeekRating.query.filter_by(season_id=season_id, week=week)
+        if league_id is not None:
+            query = query.filter_by(league_id=str(league_id))
+        return query.order_by(
+            TeamSeasonWeekRating.final_expected_winning_percentage.is_(None),
+            TeamSeasonWeekRating.final_expected_winning_percentage.desc(),
+            TeamSeasonWeekRating.team_id
+        ).all()
+
+    def replace_team_season_week_ratings(self, season_id: int, week: int, team_seasons: Iterable[TeamSeason],
+                                         commit: bool = True) -> int:
+        """
+        Records the current ratings of a collection of team_seasons as their ratings after one week, in place of any
+        recorded for that week before, in batched statements.
+
+        :param season_id: The season_id of the team_seasons.
+        :param week: The week after which the team_seasons were rated.
+        :param team_seasons: The team_seasons whose ratings will be recorded.
+        :param commit: True to commit the ratings, or False to leave them in the current transaction.
+
+        :return: The number of team_season_week_ratings recorded.
+        """
+        rows = [
+            dict(
+                team_id=team_season.team_id,
+                season_id=season_id,
+                league_id=str(team_season.league_id),
+                week=week,
+                offensive_index=team_season.offensive_index,
+                defensive_index=team_season.defensive_index,
+                final_expected_winning_percentage=team_season.final_expected_winning_percentage
+            )
+            for team_season in team_seasons
+        ]
+
+        table = TeamSeasonWeekRating.__table__
+        with sqla.session.no_autoflush:
+            sqla.session.execute(delete(table).where(table.c.season_id == season_id, table.c.week == week))
+            if len(rows) > 0:
+                sqla.session.execute(insert(table), rows)
+
+        if commit:
+            sqla.session.commit()
+        return len(rows)
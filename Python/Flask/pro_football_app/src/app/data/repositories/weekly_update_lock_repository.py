@@ -0,0 +1,154 @@
+from datetime import datetime
+
+from sqlalchemy import case, update
+from sqlalchemy.exc import IntegrityError
+
+from app.data.models.weekly_update_lock import WeeklyUpdateLock
+from app.data.sqla import sqla
+
+
+class WeeklyUpdateLockRepository:
+    """
+    Provides CRUD access to an external data store.
+
+    Each method changes the lock with one conditional statement and commits it at once, so every process and host
+    sharing the data store sees the same holder.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateLockRepository class.
+        """
+        pass
+
+    def acquire_weekly_update_lock(self, league_id: str, season_id: int, owner: str, now: datetime,
+                                   expires_at: datetime) -> bool:
+        """
+        Takes the lock on a league season's weekly update, if no one holds it or its holder's lease has expired.
+
+        :param league_id: The league_id of the league season to lock.
+        :param season_id: The season_id of the league season to lock.
+        :param owner: A name unique to the caller, by which it will later renew or release the lock.
+        :param now: The current time.
+        :param expires_at: The time after which the lock may be taken from the caller.
+
+        :return: True if the caller now holds the lock; otherwise false.
+        """
+        league_id = str(league_id)
+        if WeeklyUpdateLock.query.filter_by(league_id=league_id, season_id=season_id).first() is None:
+            try:
+                sqla.session.add(WeeklyUpdateLock(league_id=league_id, season_id=season_id, owner=owner,
+                                                  expires_at=expires_at, rerun_requested=False))
+                sqla.session.commit()
+                return True
+            except IntegrityError:
+                # Another process added the lock first.
+                sqla.session.rollback()
+
+        result = sqla.session.execute(
+            update(WeeklyUpdateLock)
+            .where(WeeklyUpdateLock.league_id == league_id, WeeklyUpdateLock.season_id == season_id,
+                   (WeeklyUpdateLock.owner.is_(None)) | (WeeklyUpdateLock.expires_at < now))
+            .values(owner=owner, expires_at=expires_at, rerun_requested=False)
+        )
+        sqla.session.commit()
+        return result.rowcount == 1
+
+    def request_weekly_update_rerun(self, league_id: str, season_id: int, incremental: bool) -> bool:
+        """
+        Asks the holder of the lock on a league season's weekly update to run the update once more when it finishes.
+
+        Requests made during the same run are combined into one, which is incremental only if all of them are.
+
+        :param league_id: The league_id of the locked league season.
+        :param season_id: The season_id of the locked league season.
+        :param incremental: True if the requested update only needs to recalculate rankings that may have changed.
+
+        :return: True if the lock is held, and its holder will run the update again; otherwise false.
+        """
+        rerun_incremental = case((WeeklyUpdateLock.rerun_requested.is_(True), WeeklyUpdateLock.rerun_incremental),
+                                 else_=True) if incremental else False
+        result = sqla.session.execute(
+            update(WeeklyUpdateLock)
+            .where(WeeklyUpdateLock.league_id == str(league_id), WeeklyUpdateLock.season_id == season_id,
+                   WeeklyUpdateLock.owner.is_not(None))
+            .values(rerun_requested=True, rerun_incremental=rerun_incremental)
+        )
+        sqla.session.commit()
+        return result.rowcount == 1
+
+    def renew_weekly_update_lock(self, league_id: str, season_id: int, owner: str, expires_at: datetime) -> bool:
+        """
+        Extends the caller's lease on the lock on a league season's weekly update.
+
+        :param league_id: The league_id of the locked league season.
+        :param season_id: The season_id of the locked league season.
+        :param owner: The name by which the caller took the lock.
+        :param expires_at: The time after which the lock may be taken from the caller.
+
+        :return: True if the caller still held the lock, and its lease was extended; otherwise false.
+        """
+        result = sqla.session.execute(
+            update(WeeklyUpdateLock)
+            .where(WeeklyUpdateLock.league_id == str(league_id), WeeklyUpdateLock.season_id == season_id,
+                   WeeklyUpdateLock.owner == owner)
+            .values(expires_at=expires_at)
+        )
+        sqla.session.commit()
+        return result.rowcount == 1
+
+    def take_weekly_update_rerun(self, league_id: str, season_id: int, owner: str,
+                                 expires_at: datetime) -> bool | None:
+        """
+        Clears the request for another run of a league season's weekly update, if any, and renews the caller's lease.
+
+        :param league_id: The league_id of the locked league season.
+        :param season_id: The season_id of the locked league season.
+        :param owner: The name by which the caller took the lock.
+        :param expires_at: The time after which the lock may be taken from the caller.
+
+        :return: None if no run was requested; otherwise true if the requested run is incremental.
+        """
+        lock = WeeklyUpdateLock.query.filter_by(league_id=str(league_id), season_id=season_id, owner=owner).first()
+        if lock is None or not lock.rerun_requested:
+            sqla.session.commit()
+            return None
+
+        incremental = lock.rerun_incremental
+        result = sqla.session.execute(
+            update(WeeklyUpdateLock)
+            .where(WeeklyUpdateLock.league_id == lock.league_id, WeeklyUpdateLock.season_id == lock.season_id,
+                   WeeklyUpdateLock.owner == owner, WeeklyUpdateLock.rerun_requested.is_(True),
+                   WeeklyUpdateLock.rerun_incremental == incremental)
+            .values(rerun_requested=False, rerun_incremental=True, expires_at=expires_at)
+        )
+        sqla.session.commit()
+        if result.rowcount == 0:
+            # A request changed the lock since it was read, so it is read again.
+            return self.take_weekly_update_rerun(league_id, season_id, owner, expires_at)
+        return incremental
+
+    def release_weekly_update_lock(self, league_id: str, season_id: int, owner: str, force: bool = False) -> bool:
+        """
+        Releases the caller's lock on a league season's weekly update, unless another run has been requested.
+
+        :param league_id: The league_id of the locked league season.
+        :param season_id: The season_id of the locked league season.
+        :param owner: The name by which the caller took the lock.
+        :param force: True to release the lock, and drop any requested run, such as after the update failed.
+
+        :return: True if the lock was released; otherwise false.
+        """
+        statement = (
+            update(WeeklyUpdateLock)
+            .where(WeeklyUpdateLock.league_id == str(league_id), WeeklyUpdateLock.season_id == season_id,
+                   WeeklyUpdateLock.owner == owner)
+        )
+        if not force:
+            statement = statement.where(WeeklyUpdateLock.rerun_requested.is_(False))
+
+        result = sqla.session.execute(
+            statement.values(owner=None, expires_at=None, rerun_requested=False, rerun_incremental=True)
+        )
+        sqla.session.commit()
+        return result.rowcount == 1
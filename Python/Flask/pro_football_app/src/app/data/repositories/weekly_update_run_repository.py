@@ -0,0 +1,46 @@
+from typing import List
+
+from app.data.models.weekly_update_run import WeeklyUpdateRun
+from app.data.sqla import sqla
+
+
+class WeeklyUpdateRunRepository:
+    """
+    Provides CRUD access to an external data store.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateRunRepository class.
+        """
+        pass
+
+    def get_weekly_update_runs(self, league_id: str = None, season_id: int = None,
+                               limit: int = None) -> List[WeeklyUpdateRun]:
+        """
+        Gets the weekly_update_runs in the data store, most recent first.
+
+        :param league_id: The league_id of the weekly_update_runs to fetch, or None to fetch those of every league.
+        :param season_id: The season_id of the weekly_update_runs to fetch, or None to fetch those of every season.
+        :param limit: The largest number of weekly_update_runs to fetch, or None to fetch them all.
+
+        :return: The fetched weekly_update_runs.
+        """
+        query = WeeklyUpdateRun.query
+        if league_id is not None:
+            query = query.filter_by(league_id=str(league_id))
+        if season_id is not None:
+            query = query.filter_by(season_id=season_id)
+        return query.order_by(WeeklyUpdateRun.started_at.desc(), WeeklyUpdateRun.id.desc()).limit(limit).all()
+
+    def add_weekly_update_run(self, weekly_update_run: WeeklyUpdateRun) -> WeeklyUpdateRun:
+        """
+        Adds a weekly_update_run to the data store.
+
+        :param weekly_update_run: The weekly_update_run to add.
+
+        :return: The added weekly_update_run.
+        """
+        sqla.session.add(weekly_update_run)
+        sqla.session.commit()
+        return weekly_update_run
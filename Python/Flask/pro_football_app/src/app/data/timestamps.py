@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """
+    Gets the current time in UTC, without a time zone, as the data store's DateTime columns hold it.
+
+    Every timestamp written to or compared with the data store comes from here, so naive and aware times are never
+    mixed.
+
+    :return: The current UTC time.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
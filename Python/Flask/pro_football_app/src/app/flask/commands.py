@@ -0,0 +1,280 @@
+import click
+
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.repositories.weekly_update_run_repository import WeeklyUpdateRunRepository
+from app.services.game_import_service.game_import_service import DEFAULT_CHUNK_SIZE, FILE_FORMATS, \
+    GameImportService, GameImportSummary
+from app.services.game_import_service.ingestion_benchmark import DEFAULT_SEASON_COUNT, DEFAULT_WORKER_COUNTS, \
+    benchmark_parallel_ingestion
+from app.services.game_service.game_service import GameService
+from app.services.team_season_rebuild_service.team_season_rebuild_service import TeamSeasonRebuildService
+from app.services.weekly_update_backfill_service.weekly_update_backfill_service import SeasonBackfillResult, \
+    WeeklyUpdateBackfillService, WeeklyUpdateBackfillSummary
+from app.services.weekly_update_service.team_season_ratings_solver import DEFAULT_MAX_ITERATIONS, DEFAULT_TOLERANCE, \
+    TeamSeasonRatingsSolver
+from app.services.weekly_update_service.weekly_update_benchmark import DEFAULT_BENCHMARK_SEASON_COUNT, \
+    DEFAULT_MATCH_TOLERANCE, benchmark_weekly_update_paths
+from app.services.weekly_update_service.weekly_update_coordinator import WeeklyUpdateCoordinator
+from app.services.weekly_update_service.weekly_update_report import PHASES
+from app.services.weekly_update_service.weekly_update_scheduler import DEFAULT_MAX_DELAY_SECONDS, \
+    DEFAULT_QUIET_SECONDS, WeeklyUpdateScheduler
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+
+@click.command('import-games')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(FILE_FORMATS), default=None,
+              help="The format of the results file. Inferred from the file's extension by default.")
+@click.option('--chunk-size', type=click.IntRange(min=1), default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help="The number of games to commit in each transaction.")
+@click.option('--workers', type=click.IntRange(min=1), default=1, show_default=True,
+              help="The number of threads that commit chunks at once. SQLite always uses one writer.")
+@click.option('--auto-weekly-update', is_flag=True,
+              help="Run the weekly update of each season whose games are imported, once its games stop changing, "
+                   "and of any still pending when the import finishes.")
+@click.option('--quiet-seconds', type=click.FloatRange(min=0), default=DEFAULT_QUIET_SECONDS, show_default=True,
+              help="The time without game writes after which a season's weekly update runs.")
+@click.option('--max-delay-seconds', type=click.FloatRange(min=0), default=DEFAULT_MAX_DELAY_SECONDS,
+              show_default=True, help="The longest a season's weekly update waits while its games keep changing.")
+@with_appcontext
+def import_games_command(path: str, file_format: str, chunk_size: int, workers: int, auto_weekly_update: bool,
+                         quiet_seconds: float, max_delay_seconds: float) -> None:
+    """
+    Imports the games in a CSV, JSON, or JSON Lines results file.
+    """
+    if max_delay_seconds < quiet_seconds:
+        raise click.BadParameter("must not be less than --quiet-seconds.", param_hint='--max-delay-seconds')
+
+    scheduler = None
+    if auto_weekly_update:
+        scheduler = WeeklyUpdateScheduler(current_app._get_current_object(), quiet_seconds=quiet_seconds,
+                                          max_delay_seconds=max_delay_seconds)
+
+    service = GameImportService(GameService(weekly_update_scheduler=scheduler), chunk_size=chunk_size,
+                                workers=workers)
+    try:
+        summary = service.import_file(path, file_format, progress=_echo_progress)
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+
+    for error in summary.errors:
+        click.echo(error, err=True)
+    if summary.rows_rejected > len(summary.errors):
+        click.echo(f"... and {summary.rows_rejected - len(summary.errors)} more rejected rows.", err=True)
+
+    click.echo(f"Imported {summary.games_imported} of {summary.rows_read} games in {summary.elapsed_seconds:.2f}s "
+               f"({summary.games_per_second:.1f} games/s); {summary.games_skipped} already imported, "
+               f"{summary.rows_rejected} rows rejected.")
+
+
+@click.command('benchmark-import')
+@click.option('--database-uri', default=None,
+              help="The URI of a scratch database whose tables will be created and dropped. "
+                   "A temporary SQLite file by default.")
+@click.option('--scratch', is_flag=True,
+              help="Confirm that every table of the database given by --database-uri may be dropped.")
+@click.option('--workers', 'worker_counts', default=','.join(str(count) for count in DEFAULT_WORKER_COUNTS),
+              show_default=True, help="A comma-separated list of the worker counts to measure.")
+@click.option('--seasons', 'season_count', type=click.IntRange(min=1), default=DEFAULT_SEASON_COUNT,
+              show_default=True, help="The number of seasons of games to import in each run.")
+@with_appcontext
+def benchmark_import_command(database_uri: str | None, scratch: bool, worker_counts: str, season_count: int) -> None:
+    """
+    Measures game import throughput at several worker counts, against a scratch database.
+    """
+    if database_uri is not None and not scratch:
+        raise click.UsageError("--database-uri drops every table of the database, so it requires --scratch.")
+
+    try:
+        worker_counts = [int(count) for count in worker_counts.split(',')]
+    except ValueError:
+        raise click.BadParameter("must be a comma-separated list of integers.", param_hint='--workers')
+
+    try:
+        results = benchmark_parallel_ingestion(database_uri, worker_counts, season_count)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint='--database-uri')
+
+    for workers, writers, summary in results:
+        click.echo(f"{workers} workers ({writers} writers): {summary.games_imported} games in "
+                   f"{summary.elapsed_seconds:.2f}s ({summary.games_per_second:.1f} games/s)")
+
+
+@click.command('benchmark-weekly-update')
+@click.option('--database-uri', default=None,
+              help="The URI of a scratch SQLite database whose tables will be created and dropped. "
+                   "A temporary SQLite file by default.")
+@click.option('--scratch', is_flag=True,
+              help="Confirm that every table of the database given by --database-uri may be dropped.")
+@click.option('--seasons', 'season_count', type=click.IntRange(min=1), default=DEFAULT_BENCHMARK_SEASON_COUNT,
+              show_default=True, help="The number of seasons of games to update in each mode.")
+@click.option('--tolerance', type=click.FloatRange(min=0), default=DEFAULT_MATCH_TOLERANCE,
+              show_default=True, help="The largest difference at which two written values are taken to match.")
+@click.option('--max-mismatches', type=click.IntRange(min=0), default=20, show_default=True,
+              help="The number of mismatched values to list.")
+@with_appcontext
+def benchmark_weekly_update_command(database_uri: str | None, scratch: bool, season_count: int, tolerance: float,
+                                    max_mismatches: int) -> None:
+    """
+    Runs the weekly updates of the same seasons through SQLite translations of the stored procedures and in process,
+    compares everything each wrote, and measures the time, queries, and peak memory of each. Exits with status 1 if
+    any value differs.
+    """
+    if database_uri is not None and not scratch:
+        raise click.UsageError("--database-uri drops every table of the database, so it requires --scratch.")
+
+    try:
+        summary = benchmark_weekly_update_paths(database_uri, season_count, tolerance)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint='--database-uri')
+
+    for result in summary.results.values():
+        click.echo(str(result))
+    for mismatch in summary.mismatches[:max_mismatches]:
+        click.echo(mismatch, err=True)
+    if len(summary.mismatches) > max_mismatches:
+        click.echo(f"... and {len(summary.mismatches) - max_mismatches} more mismatches.", err=True)
+
+    click.echo(f"{summary.fields_compared - len(summary.mismatches)} of {summary.fields_compared} values matched "
+               f"within {summary.tolerance:g} (largest difference {summary.max_difference:.3g}).")
+    if not summary.matched:
+        raise SystemExit(1)
+
+
+@click.command('rebuild-team-seasons')
+@click.argument('first_season_id', type=int)
+@click.argument('last_season_id', type=int, required=False)
+@click.option('--restart', is_flag=True,
+              help="Discard the checkpoint of an earlier, unfinished rebuild of the range instead of resuming it.")
+@with_appcontext
+def rebuild_team_seasons_command(first_season_id: int, last_season_id: int | None, restart: bool) -> None:
+    """
+    Rebuilds the team season totals for a season, or range of seasons, from the games in the data store.
+    """
+    service = TeamSeasonRebuildService()
+    drifts = service.rebuild_team_seasons(first_season_id, last_season_id, checkpoint=True, restart=restart)
+
+    if service.last_resumed_checkpoint is not None:
+        click.echo(f"Resumed after season {service.last_resumed_checkpoint.season_id}.")
+
+    for drift in drifts:
+        click.echo(str(drift))
+    click.echo(f"Rebuilt team seasons; {len(drifts)} had drifted from their games.")
+
+
+@click.command('backfill-weekly-updates')
+@click.argument('first_season_id', type=int)
+@click.argument('last_season_id', type=int, required=False)
+@click.option('--workers', type=click.IntRange(min=1), default=1, show_default=True,
+              help="The number of processes that update seasons at once. SQLite always uses one.")
+@click.option('--solve', is_flag=True,
+              help="Iterate each season's indices to a fixed point instead of ranking each team in one pass.")
+@click.option('--tolerance', type=click.FloatRange(min=0, min_open=True), default=DEFAULT_TOLERANCE,
+              show_default=True, help="The largest index change at which a solved season has converged.")
+@click.option('--max-iterations', type=click.IntRange(min=1), default=DEFAULT_MAX_ITERATIONS, show_default=True,
+              help="The number of iterations after which a season's solver stops.")
+@click.option('--restart', is_flag=True,
+              help="Discard the checkpoint of an earlier, unfinished backfill of the range instead of resuming it.")
+@with_appcontext
+def backfill_weekly_updates_command(first_season_id: int, last_season_id: int | None, workers: int, solve: bool,
+                                    tolerance: float, max_iterations: int, restart: bool) -> None:
+    """
+    Runs the weekly update of every league season in a season, or range of seasons, recalculating all rankings.
+    """
+    ratings_solver = TeamSeasonRatingsSolver(tolerance, max_iterations) if solve else None
+    service = WeeklyUpdateBackfillService(workers=workers, ratings_solver=ratings_solver)
+    summary = service.backfill(first_season_id, last_season_id, progress=_echo_season_progress, checkpoint=True,
+                               restart=restart)
+
+    if summary.resumed_checkpoint is not None:
+        click.echo(f"Resumed after {_format_checkpoint(summary.resumed_checkpoint)}.")
+
+    click.echo(f"Updated {summary.league_seasons_updated} league seasons in {len(summary.seasons)} seasons in "
+               f"{summary.elapsed_seconds:.2f}s ({summary.seasons_per_second:.2f} seasons/s) with "
+               f"{summary.workers} workers.")
+
+
+@click.command('run-weekly-update')
+@click.argument('league_id')
+@click.argument('season_id', type=int)
+@click.option('--incremental', is_flag=True,
+              help="Only recalculate the rankings that may have changed since the last update.")
+@click.option('--solve', is_flag=True,
+              help="Iterate the season's indices to a fixed point instead of ranking each team in one pass.")
+@with_appcontext
+def run_weekly_update_command(league_id: str, season_id: int, incremental: bool, solve: bool) -> None:
+    """
+    Runs the weekly update of a league season, and reports the time taken by each of its phases. If the league
+    season is already being updated, the running update is asked to run once more instead.
+    """
+    service = WeeklyUpdateService(ratings_solver=TeamSeasonRatingsSolver() if solve else None)
+    reports = WeeklyUpdateCoordinator(service).request_weekly_update(league_id, season_id, incremental=incremental)
+
+    if not reports:
+        click.echo(f"League {league_id} season {season_id} is already being updated; it will be updated once more "
+                   f"when that update finishes.")
+    for report in reports:
+        click.echo(str(report))
+    if service.last_ratings_solver_report is not None:
+        click.echo(f"  {service.last_ratings_solver_report}")
+
+
+@click.command('run-season-weekly-update')
+@click.argument('season_id', type=int)
+@click.option('--incremental', is_flag=True,
+              help="Only recalculate the rankings that may have changed since the last update.")
+@click.option('--solve', is_flag=True,
+              help="Iterate the season's indices to a fixed point instead of ranking each team in one pass.")
+@with_appcontext
+def run_season_weekly_update_command(season_id: int, incremental: bool, solve: bool) -> None:
+    """
+    Runs the weekly update of every league season of a season in one pass, and reports the time taken by each of its
+    phases.
+    """
+    service = WeeklyUpdateService(ratings_solver=TeamSeasonRatingsSolver() if solve else None)
+    report = service.run_season_weekly_update(season_id, incremental=incremental)
+
+    click.echo(str(report))
+    if service.last_ratings_solver_report is not None:
+        click.echo(f"  {service.last_ratings_solver_report}")
+
+
+@click.command('weekly-update-runs')
+@click.option('--league', 'league_id', default=None, help="Only show the runs of this league.")
+@click.option('--season', 'season_id', type=int, default=None, help="Only show the runs of this season.")
+@click.option('--limit', type=click.IntRange(min=1), default=10, show_default=True,
+              help="The number of most recent runs to show.")
+@with_appcontext
+def weekly_update_runs_command(league_id: str | None, season_id: int | None, limit: int) -> None:
+    """
+    Summarizes the most recent weekly updates, with the time taken by each phase, so a slow phase stands out.
+    """
+    runs = WeeklyUpdateRunRepository().get_weekly_update_runs(league_id, season_id, limit)
+
+    click.echo(f"{'Started':<19} {'League':<6} {'Season':>6} {'Total':>8} "
+               + ' '.join(f"{phase:>17}" for phase in PHASES) + f" {'Queries':>8} {'Rows':>6} {'Tries':>5}")
+    for run in runs:
+        click.echo(f"{run.started_at:%Y-%m-%d %H:%M:%S} {run.league_id or 'all':<6} {run.season_id:>6} "
+                   f"{run.elapsed_seconds:>7.3f}s "
+                   + ' '.join(f"{getattr(run, f'{phase}_seconds'):>16.3f}s" for phase in PHASES)
+                   + f" {run.query_count:>8} {run.rows_touched:>6} {run.attempts:>5}")
+
+
+def _format_checkpoint(job_checkpoint: JobCheckpoint) -> str:
+    if job_checkpoint.league_id is None:
+        return f"season {job_checkpoint.season_id}"
+    return f"league {job_checkpoint.league_id} of season {job_checkpoint.season_id}"
+
+
+def _echo_progress(summary: GameImportSummary) -> None:
+    click.echo(f"Imported {summary.games_imported} games ({summary.games_per_second:.1f} games/s)...")
+
+
+def _echo_season_progress(summary: WeeklyUpdateBackfillSummary, result: SeasonBackfillResult) -> None:
+    click.echo(f"Season {result.season_id}: {len(result.league_ids)} league seasons in {result.elapsed_seconds:.2f}s")
+    if result.ratings_solver_report is not None:
+        click.echo(f"  {result.ratings_solver_report}")
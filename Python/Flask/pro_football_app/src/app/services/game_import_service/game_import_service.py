@@ -0,0 +1,365 @@
+import csv
+import json
+import os
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from flask import Flask, current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.data.errors import EntityNotFoundError
+from app.data.models.game import Game
+from app.data.repositories.team_repository import TeamRepository
+from app.data.sqla import sqla
+from app.services.game_service.game_service import GameService
+from app.services.utilities import guard
+from app.services.utilities.concurrency import supports_row_locking
+
+CSV = 'csv'
+JSON = 'json'
+JSON_LINES = 'jsonl'
+FILE_FORMATS = (CSV, JSON, JSON_LINES)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+READ_BUFFER_SIZE = 64 * 1024
+
+_FILE_FORMATS_BY_EXTENSION = {
+    '.csv': CSV,
+    '.json': JSON,
+    '.jsonl': JSON_LINES,
+    '.ndjson': JSON_LINES,
+}
+
+
+class GameImportSummary:
+    """
+    Class to report the progress and throughput of a game import.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the GameImportSummary class.
+        """
+        self.rows_read = 0
+        self.games_imported = 0
+        self.games_skipped = 0
+        self.rows_rejected = 0
+        self.errors = []
+        self.elapsed_seconds = 0.0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rows_read={self.rows_read}, games_imported={self.games_imported}, " \
+               f"games_skipped={self.games_skipped}, rows_rejected={self.rows_rejected}, " \
+               f"elapsed_seconds={self.elapsed_seconds})"
+
+    @property
+    def games_per_second(self) -> float:
+        """
+        Gets the number of games imported per second so far.
+
+        :return: The import throughput, or 0 if no time has elapsed.
+        """
+        if self.elapsed_seconds == 0:
+            return 0.0
+        return self.games_imported / self.elapsed_seconds
+
+    def reject(self, row_number: int, message: str) -> None:
+        """
+        Records a row that could not be imported.
+
+        Only the first MAX_REPORTED_ERRORS messages are kept, so memory use does not grow with the size of the file.
+
+        :param row_number: The number of the rejected row in the source file.
+        :param message: The reason the row was rejected.
+
+        :return: None
+        """
+        self.rows_rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Row {row_number}: {message}")
+
+
+class GameImportService:
+    """
+    A service to import game results files of any size into the data store.
+    """
+
+    def __init__(self,
+                 game_service: GameService = None,
+                 team_repository: TeamRepository = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: int = 1) -> None:
+        """
+        Initializes a new instance of the GameImportService class.
+
+        :param game_service: The service by which games will be added to the data store.
+        :param team_repository: The repository by which team names will be resolved.
+        :param chunk_size: The number of games that will be added to the data store in each transaction.
+        :param workers:
+        The number of threads that will add chunks to the data store at once. On data stores that cannot lock rows,
+        such as SQLite, the chunks are instead queued for a single writer thread.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"{type(self).__name__}: chunk_size must be at least 1.")
+        if workers < 1:
+            raise ValueError(f"{type(self).__name__}: workers must be at least 1.")
+
+        self._game_service = game_service or GameService()
+        self._team_repository = team_repository or TeamRepository()
+        self._chunk_size = chunk_size
+        self._workers = workers
+
+    def __repr__(self):
+        return f"{type(self).__name__}(game_service={self._game_service}, " \
+               f"team_repository={self._team_repository}, chunk_size={self._chunk_size}, workers={self._workers})"
+
+    def import_file(self, path: str, file_format: str = None,
+                    progress: Callable[[GameImportSummary], None] = None) -> GameImportSummary:
+        """
+        Imports the games in a CSV, JSON, or JSON Lines results file.
+
+        :param path: The path of the file to import.
+        :param file_format: The format of the file, or None to infer it from the file's extension.
+        :param progress: A function to call with the running summary after each chunk has been committed.
+
+        :return: A summary of the import.
+
+        :raises ValueError: If the file format is not supported.
+        """
+        file_format = file_format or get_file_format(path)
+        with open(path, newline='', encoding='utf-8') as stream:
+            return self.import_stream(stream, file_format, progress)
+
+    def import_stream(self, stream: TextIO, file_format: str,
+                      progress: Callable[[GameImportSummary], None] = None) -> GameImportSummary:
+        """
+        Imports the games in a stream of CSV, JSON, or JSON Lines results.
+
+        :param stream: The stream to read.
+        :param file_format: The format of the stream.
+        :param progress: A function to call with the running summary after each chunk has been committed.
+
+        :return: A summary of the import.
+
+        :raises ValueError: If the file format is not supported.
+        """
+        return self.import_rows(read_rows(stream, file_format), progress)
+
+    def import_rows(self, rows: Iterable[Dict], progress: Callable[[GameImportSummary], None] = None
+                    ) -> GameImportSummary:
+        """
+        Imports a stream of game rows, committing them to the data store one chunk at a time.
+
+        Rows are consumed lazily and only one chunk of games is held at a time, so memory use does not depend on the
+        number of rows. Rows that fail validation, including games in which neither team has a team season for the
+        game's season, are skipped and reported in the summary, as are games that are already in the data store, so a
+        file can safely be imported again after a partial failure.
+
+        :param rows: The rows to import, each a mapping of Game column names to values.
+        :param progress: A function to call with the running summary after each chunk has been committed.
+
+        :return: A summary of the import.
+
+        :raises ValueError: If the rows argument is None.
+        """
+        guard.raise_if_none(rows, f"{type(self).__name__}.import_rows: rows")
+
+        summary = GameImportSummary()
+        team_names = self._get_team_names()
+        start_time = time.perf_counter()
+
+        executor = self._create_executor()
+        pending = deque()
+        try:
+            chunk = []
+            for row_number, row in enumerate(rows, start=1):
+                summary.rows_read += 1
+                try:
+                    game = _create_game(row, team_names)
+                    self._game_service.raise_if_no_team_season(game)
+                except (EntityNotFoundError, KeyError, TypeError, ValueError) as e:
+                    summary.reject(row_number, str(e))
+                    continue
+
+                chunk.append(game)
+
+                if len(chunk) == self._chunk_size:
+                    self._add_chunk(chunk, executor, pending, summary, start_time, progress)
+                    chunk = []
+
+            if chunk:
+                self._add_chunk(chunk, executor, pending, summary, start_time, progress)
+
+            while pending:
+                chunk, future = pending.popleft()
+                self._record_chunk(chunk, future.result(), summary, start_time, progress)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        summary.elapsed_seconds = time.perf_counter() - start_time
+        return summary
+
+    def _create_executor(self) -> ThreadPoolExecutor | None:
+        if self._workers == 1:
+            return None
+
+        # Without row locks, concurrent writers would only fail on each other's locks, so one writer takes the chunks
+        # in turn while the rows are read.
+        workers = self._workers if supports_row_locking() else 1
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='game-import')
+
+    def _add_chunk(self, chunk: List[Game], executor: ThreadPoolExecutor | None,
+                   pending: Deque[Tuple[List[Game], Future]], summary: GameImportSummary, start_time: float,
+                   progress: Callable[[GameImportSummary], None] | None) -> None:
+        if executor is None:
+            self._record_chunk(chunk, self._game_service.add_games(chunk), summary, start_time, progress)
+            return
+
+        pending.append(
+            (chunk, executor.submit(self._add_chunk_in_app_context, current_app._get_current_object(), chunk))
+        )
+
+        # Only a few chunks wait for a writer at a time, so memory use still does not depend on the number of rows.
+        while len(pending) > 2 * self._workers:
+            chunk, future = pending.popleft()
+            self._record_chunk(chunk, future.result(), summary, start_time, progress)
+
+    def _add_chunk_in_app_context(self, app: Flask, chunk: List[Game]) -> tuple:
+        with app.app_context():
+            try:
+                return self._game_service.add_games(chunk, lock_team_seasons=True)
+            except IntegrityError:
+                # Another writer added one of these games after this one checked for it; checking again skips it.
+                # The games keep the ids and other state of the failed flush, so they are added again as new games.
+                sqla.session.rollback()
+                return self._game_service.add_games([_copy_game(game) for game in chunk], lock_team_seasons=True)
+
+    def _record_chunk(self, chunk: List[Game], added_games: tuple, summary: GameImportSummary, start_time: float,
+                      progress: Callable[[GameImportSummary], None] | None) -> None:
+        summary.games_imported += len(added_games)
+        summary.games_skipped += len(chunk) - len(added_games)
+        summary.elapsed_seconds = time.perf_counter() - start_time
+        if progress is not None:
+            progress(summary)
+
+    def _get_team_names(self) -> Dict[str, str]:
+        return {team.name.casefold(): team.name for team in self._team_repository.get_teams()}
+
+
+def get_file_format(path: str) -> str:
+    """
+    Infers the format of a results file from its extension.
+
+    :param path: The path of the results file.
+
+    :return: The format of the file.
+
+    :raises ValueError: If the file's extension is not that of a supported format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _FILE_FORMATS_BY_EXTENSION:
+        raise ValueError(f"Cannot infer the format of {path}; expected one of {', '.join(_FILE_FORMATS_BY_EXTENSION)}.")
+    return _FILE_FORMATS_BY_EXTENSION[extension]
+
+
+def read_rows(stream: TextIO, file_format: str) -> Iterator[Dict]:
+    """
+    Lazily reads the rows of a CSV, JSON, or JSON Lines results stream.
+
+    :param stream: The stream to read.
+    :param file_format: The format of the stream.
+
+    :return: An iterator over the rows in the stream.
+
+    :raises ValueError: If the file format is not supported.
+    """
+    if file_format == CSV:
+        return csv.DictReader(stream)
+    if file_format == JSON:
+        return _read_json_array(stream)
+    if file_format == JSON_LINES:
+        return (json.loads(line) for line in stream if line.strip())
+    raise ValueError(f"Unsupported file format {file_format!r}; expected one of {', '.join(FILE_FORMATS)}.")
+
+
+def _read_json_array(stream: TextIO) -> Iterator[Dict]:
+    # Decodes the elements of a top-level JSON array one at a time, so the whole array is never held in memory.
+    decoder = json.JSONDecoder()
+    buffer = ''
+    is_eof = False
+    is_in_array = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if buffer and not is_in_array:
+            if buffer[0] != '[':
+                raise ValueError("A JSON results file must contain an array of games.")
+            buffer = buffer[1:]
+            is_in_array = True
+            continue
+
+        if buffer and buffer[0] == ']':
+            return
+        if buffer and buffer[0] == ',':
+            buffer = buffer[1:]
+            continue
+
+        if buffer:
+            try:
+                row, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if is_eof:
+                    raise
+            else:
+                yield row
+                buffer = buffer[end:]
+                continue
+
+        if is_eof:
+            raise ValueError("A JSON results file must contain an array of games.")
+
+        data = stream.read(READ_BUFFER_SIZE)
+        is_eof = not data
+        buffer += data
+
+
+def _create_game(row: Dict, team_names: Dict[str, str]) -> Game:
+    return Game(
+        season_id=int(row['season_id']),
+        week=int(row['week']),
+        guest_name=_resolve_team_name(row['guest_name'], team_names),
+        guest_score=int(row['guest_score']),
+        host_name=_resolve_team_name(row['host_name'], team_names),
+        host_score=int(row['host_score']),
+        is_playoff=_parse_bool(row.get('is_playoff')),
+        notes=row.get('notes') or None
+    )
+
+
+def _copy_game(game: Game) -> Game:
+    return Game(season_id=game.season_id, week=game.week, guest_name=game.guest_name, guest_score=game.guest_score,
+                host_name=game.host_name, host_score=game.host_score, is_playoff=game.is_playoff, notes=game.notes)
+
+
+def _resolve_team_name(name: str, team_names: Dict[str, str]) -> str:
+    resolved_name = team_names.get(str(name).strip().casefold())
+    if resolved_name is None:
+        raise ValueError(f"Team {name!r} could not be found.")
+    return resolved_name
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None or str(value).strip() == '':
+        return False
+    if str(value).strip().lower() in ('1', 'true', 'yes', 'y'):
+        return True
+    if str(value).strip().lower() in ('0', 'false', 'no', 'n'):
+        return False
+    raise ValueError(f"{value!r} is not a valid is_playoff value.")
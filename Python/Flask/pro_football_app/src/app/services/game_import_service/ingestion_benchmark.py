@@ -0,0 +1,108 @@
+import os
+import random
+import tempfile
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from flask import Flask
+
+from app.data.models.league import League
+from app.data.models.league_season import LeagueSeason
+from app.data.models.season import Season
+from app.data.models.team import Team
+from app.data.models.team_season import TeamSeason
+from app.data.sqla import sqla
+from app.services.game_import_service.game_import_service import GameImportService, GameImportSummary
+from app.services.utilities.concurrency import supports_row_locking
+from app.services.utilities.utils import is_app_database
+
+DEFAULT_WORKER_COUNTS = (1, 2, 4, 8)
+DEFAULT_SEASON_COUNT = 20
+TEAM_COUNT = 32
+WEEK_COUNT = 17
+GAMES_PER_SEASON = WEEK_COUNT * TEAM_COUNT // 2
+LEAGUE_ID = 1
+
+
+def benchmark_parallel_ingestion(database_uri: str = None,
+                                 worker_counts: Iterable[int] = DEFAULT_WORKER_COUNTS,
+                                 season_count: int = DEFAULT_SEASON_COUNT,
+                                 chunk_size: int = GAMES_PER_SEASON) -> List[Tuple[int, int, GameImportSummary]]:
+    """
+    Measures the throughput of a game import at each of several worker counts.
+
+    Each run creates the schema in a scratch database, seeds it with season_count synthetic seasons of 32 teams,
+    imports one full schedule of games for each season, and drops the schema again, so every run starts from the same
+    state. With the default chunk_size, each chunk holds one season's games, so parallel writers lock disjoint team
+    seasons.
+
+    :param database_uri:
+    The URI of the scratch database, whose tables will be created and dropped. None to use a temporary SQLite file. It
+    must not be the database of the current app, if any.
+    :param worker_counts: The worker counts to measure.
+    :param season_count: The number of seasons of games to import in each run.
+    :param chunk_size: The number of games that will be added to the data store in each transaction.
+
+    :return: The requested worker count, the number of writers actually used, and the import summary of each run.
+
+    :raises ValueError: If database_uri is that of the current app's database.
+    """
+    if database_uri is not None and is_app_database(database_uri):
+        raise ValueError("database_uri must not be the app's database, whose tables the benchmark drops.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config.from_mapping(
+            SQLALCHEMY_DATABASE_URI=database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.sqlite3')}",
+            SQLALCHEMY_TRACK_MODIFICATIONS=False
+        )
+        sqla.init_app(app)
+
+        results = []
+        with app.app_context():
+            for workers in worker_counts:
+                sqla.create_all()
+                try:
+                    _seed(season_count)
+                    service = GameImportService(chunk_size=chunk_size, workers=workers)
+                    summary = service.import_rows(_generate_rows(season_count))
+                    writers = workers if supports_row_locking() else 1
+                    results.append((workers, writers, summary))
+                finally:
+                    sqla.session.remove()
+                    sqla.drop_all()
+
+            sqla.engine.dispose()
+        return results
+
+
+def _seed(season_count: int) -> None:
+    for season_id in range(1, season_count + 1):
+        sqla.session.add(Season(id=season_id, year=2000 + season_id, num_of_weeks_scheduled=WEEK_COUNT))
+    sqla.session.flush()
+
+    sqla.session.add(League(id=LEAGUE_ID, short_name='BL', long_name='Benchmark League', first_season_id=1))
+    for team_name in _get_team_names():
+        sqla.session.add(Team(name=team_name))
+    for season_id in range(1, season_count + 1):
+        sqla.session.add(LeagueSeason(league_id=LEAGUE_ID, season_id=season_id))
+        for team_name in _get_team_names():
+            sqla.session.add(TeamSeason(team_id=team_name, season_id=season_id, league_id=LEAGUE_ID))
+    sqla.session.commit()
+
+
+def _generate_rows(season_count: int) -> Iterator[Dict]:
+    # Seeded, so every run imports the same games.
+    generator = random.Random(season_count)
+    team_names = _get_team_names()
+    for season_id in range(1, season_count + 1):
+        for week in range(1, WEEK_COUNT + 1):
+            order = generator.sample(team_names, TEAM_COUNT)
+            for i in range(0, TEAM_COUNT, 2):
+                yield dict(season_id=season_id, week=week,
+                           guest_name=order[i], guest_score=generator.randint(0, 45),
+                           host_name=order[i + 1], host_score=generator.randint(0, 45))
+
+
+def _get_team_names() -> List[str]:
+    return [f"Team {i:02d}" for i in range(1, TEAM_COUNT + 1)]
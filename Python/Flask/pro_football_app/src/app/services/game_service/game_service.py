@@ -1,12 +1,22 @@
+from typing import Callable, Dict, Iterable, TypeVar
+
 from app import create_app
 from app.data.errors import EntityNotFoundError
 from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
 from app.data.repositories.game_repository import GameRepository
+from app.data.repositories.team_season_membership_index import TeamSeasonMembershipIndex
 from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.sqla import sqla
 from app.services.constants import Direction
 from app.services.game_service.process_game_strategy.process_game_strategy_factory \
     import ProcessGameStrategyFactory
+from app.services.game_service.team_season_delta import TeamSeasonDelta, TeamSeasonKey, fold_games
 from app.services.utilities import guard
+from app.services.utilities.concurrency import retry_on_conflict
+from app.services.weekly_update_service.weekly_update_scheduler import WeeklyUpdateScheduler
+
+T = TypeVar('T')
 
 
 class GameService:
@@ -17,7 +27,9 @@ class GameService:
     def __init__(self,
                  game_repository: GameRepository = None,
                  team_season_repository: TeamSeasonRepository = None,
-                 process_game_strategy_factory: ProcessGameStrategyFactory = None):
+                 process_game_strategy_factory: ProcessGameStrategyFactory = None,
+                 team_season_membership_index: TeamSeasonMembershipIndex = None,
+                 weekly_update_scheduler: WeeklyUpdateScheduler = None):
         """
         Initializes a new instance of the GameService class.
 
@@ -27,10 +39,20 @@ class GameService:
         The repository by which team_season data will be accessed.
 
         :param process_game_strategy_factory: The factory that will initialize the needed ProcessGameStrategy subclass.
+
+        :param team_season_membership_index:
+        The index by which the teams in a game will be checked for team seasons in that game's season.
+
+        :param weekly_update_scheduler:
+        The scheduler that will be told of each season whose games are written, or None to leave weekly updates to be
+        run by hand.
         """
         self._game_repository = game_repository or GameRepository()
         self._team_season_repository = team_season_repository or TeamSeasonRepository()
         self._process_game_strategy_factory = process_game_strategy_factory or ProcessGameStrategyFactory()
+        self._team_season_membership_index = \
+            team_season_membership_index or TeamSeasonMembershipIndex(self._team_season_repository)
+        self._weekly_update_scheduler = weekly_update_scheduler
 
     def __repr__(self):
         return f"{type(self).__name__}(game_repository={self._game_repository}, " \
@@ -38,31 +60,72 @@ class GameService:
 
     def add_game(self, new_game: Game | None) -> None:
         """
-        Adds a game to the data store
+        Adds a game to the data store, unless a game with the same season, week, guest, and host is already there.
 
         :param new_game: The game to be added to the data store.
 
         :return: None
 
+        :raises EntityNotFoundError: When neither team in the game has a team season for the game's season.
         :raises ValueError: When the new_game argument is None.
         """
         guard.raise_if_none(new_game, f"{type(self).__name__}.add_game: new_game")
 
-        if not (
-            self._team_season_repository.team_season_exists_with_team_and_season(new_game.guest_name,
-                                                                                 new_game.season_id)
-            or self._team_season_repository.team_season_exists_with_team_and_season(new_game.host_name,
-                                                                                    new_game.season_id)
-        ):
-            raise EntityNotFoundError()
+        if new_game.natural_key() in self._game_repository.get_existing_natural_keys((new_game,)):
+            return
+
+        self.raise_if_no_team_season(new_game)
 
         new_game.decide_winner_and_loser()
+        season_id = new_game.season_id
         self._game_repository.add_game(new_game)
         self._edit_teams(Direction.UP, new_game)
+        self._mark_seasons_dirty((season_id,))
+
+    def add_games(self, new_games: list | tuple | None, lock_team_seasons: bool = False) -> tuple:
+        """
+        Adds a batch of games to the data store, applying their combined results to each affected team season once,
+        in one transaction.
+
+        Games already in the data store, and repeats of a game within the batch, are skipped, so importing the same
+        games again changes nothing.
+
+        :param new_games: The games to be added to the data store.
+        :param lock_team_seasons:
+        True to lock the affected team seasons while they are updated, so batches can be added by several threads or
+        processes at once; otherwise False.
+
+        :return: The games that were added.
+
+        :raises EntityNotFoundError: When neither team in one of the games has a team season for that game's season.
+        :raises ValueError: When the new_games argument is None.
+        """
+        guard.raise_if_none(new_games, f"{type(self).__name__}.add_games: new_games")
+
+        new_games = self._remove_existing_games(new_games)
+        if len(new_games) == 0:
+            return new_games
+
+        for new_game in new_games:
+            self.raise_if_no_team_season(new_game)
+            new_game.decide_winner_and_loser()
+
+        deltas = fold_games(new_games)
+
+        def add() -> None:
+            self._game_repository.insert_games(new_games, commit=False)
+
+            # Commits the inserted games along with the team seasons.
+            self._apply_team_season_deltas(deltas, lock_team_seasons)
+
+        self._write_in_one_transaction(add)
+        self._mark_seasons_dirty(season_id for _, season_id in deltas)
+        return new_games
 
     def edit_game(self, new_game: Game | None, old_game: Game | None) -> None:
         """
-        Edits a game in the data store.
+        Edits a game in the data store, applying the net change in each affected team season's results once, in one
+        transaction.
 
         :param new_game: The game containing data to be added to the data store.
         :param old_game: The game containing data to be removed from the data store.
@@ -81,9 +144,22 @@ class GameService:
                 f"{type(self).__name__}.edit_game: A game with id={id} could not be found.")
 
         new_game.decide_winner_and_loser()
-        self._game_repository.update_game(new_game)
-        self._edit_teams(Direction.DOWN, old_game)
-        self._edit_teams(Direction.UP, new_game)
+        season_ids = (old_game.season_id, new_game.season_id)
+
+        def edit() -> None:
+            # Only the net change between the old and new results is written, so an edit that leaves every team
+            # season's totals as they were (e.g., a change to the notes or week) writes no team seasons at all.
+            deltas = fold_games((old_game,), sign=-1)
+            fold_games((new_game,), deltas=deltas)
+            deltas = {key: delta for key, delta in deltas.items() if not delta.is_empty()}
+
+            self._game_repository.update_game(new_game, commit=not deltas)
+            if deltas:
+                # Commits the edited game along with the team seasons.
+                self._apply_team_season_deltas(deltas)
+
+        self._write_in_one_transaction(edit)
+        self._mark_seasons_dirty(season_ids)
 
     def delete_game(self, id: int) -> None:
         """
@@ -101,13 +177,142 @@ class GameService:
             raise EntityNotFoundError(
                 f"{type(self).__name__}.delete_game: A game with id={id} could not be found.")
 
+        season_id = old_game.season_id
         self._edit_teams(Direction.DOWN, old_game)
         self._game_repository.delete_game(id)
+        self._mark_seasons_dirty((season_id,))
+
+    def delete_week(self, season_id: int, week: int) -> tuple:
+        """
+        Deletes all the games of one week from the data store, subtracting their combined results from each affected
+        team season once, in one transaction.
+
+        :param season_id: The season_id of the games to be deleted.
+        :param week: The week of the games to be deleted.
+
+        :return: The games that were deleted.
+        """
+        return self.replace_week(season_id, week, ())
+
+    def replace_week(self, season_id: int, week: int, new_games: list | tuple | None) -> tuple:
+        """
+        Replaces all the games of one week in the data store with a new set of games, applying the net change in
+        each affected team season's results once, in one transaction.
+
+        Repeats of a game within new_games are skipped.
+
+        :param season_id: The season_id of the games to be replaced.
+        :param week: The week of the games to be replaced.
+        :param new_games: The games that will replace them.
+
+        :return: The games that were deleted.
+
+        :raises EntityNotFoundError: When neither team in one of the new games has a team season for that game's season.
+        :raises ValueError: When the new_games argument is None, or one of the new games is not of the specified season
+        and week.
+        """
+        guard.raise_if_none(new_games, f"{type(self).__name__}.replace_week: new_games")
+
+        new_games = self._remove_repeated_games(new_games)
+        for new_game in new_games:
+            if new_game.season_id != season_id or new_game.week != week:
+                raise ValueError(
+                    f"{type(self).__name__}.replace_week: The game {new_game.natural_key()} is not of "
+                    f"season_id={season_id}, week={week}.")
+
+            self.raise_if_no_team_season(new_game)
+            new_game.decide_winner_and_loser()
+
+        def replace() -> tuple:
+            old_games = self._game_repository.delete_games_by_season_and_week(season_id, week, commit=False)
+            self._game_repository.insert_games(new_games, commit=False)
+
+            deltas = fold_games(old_games, sign=-1)
+            fold_games(new_games, deltas=deltas)
+            deltas = {key: delta for key, delta in deltas.items() if not delta.is_empty()}
+
+            # Commits the deleted and inserted games along with the team seasons.
+            self._apply_team_season_deltas(deltas)
+            return tuple(old_games)
+
+        old_games = self._write_in_one_transaction(replace)
+        self._mark_seasons_dirty((season_id,))
+        return old_games
 
     def _edit_teams(self, direction: int, game: Game) -> None:
         process_game_strategy = self._process_game_strategy_factory.create_strategy(direction)
         process_game_strategy.process_game(game)
 
+    def _apply_team_season_deltas(self, deltas: Dict[TeamSeasonKey, TeamSeasonDelta],
+                                  lock_team_seasons: bool = False) -> None:
+        team_seasons = self._get_team_seasons(deltas.keys(), lock_team_seasons)
+        for key, team_season in team_seasons.items():
+            deltas[key].apply_to(team_season)
+
+        self._team_season_repository.update_team_seasons(tuple(team_seasons.values()))
+
+    def _write_in_one_transaction(self, write: Callable[[], T]) -> T:
+        try:
+            return retry_on_conflict(write)
+        except BaseException:
+            # Nothing the failed write left in the session may be committed by a later one.
+            sqla.session.rollback()
+            raise
+
+    def _mark_seasons_dirty(self, season_ids: Iterable[int]) -> None:
+        if self._weekly_update_scheduler is not None:
+            for season_id in sorted(set(season_ids)):
+                self._weekly_update_scheduler.mark_season_dirty(season_id)
+
+    def raise_if_no_team_season(self, game: Game) -> None:
+        """
+        Checks that at least one team in a game has a team season for that game's season.
+
+        :param game: The game to check.
+
+        :return: None
+
+        :raises EntityNotFoundError: When neither team in the game has a team season for the game's season.
+        """
+        if not (
+            self._team_season_membership_index.contains(game.guest_name, game.season_id)
+            or self._team_season_membership_index.contains(game.host_name, game.season_id)
+        ):
+            raise EntityNotFoundError(
+                f"{type(self).__name__}: Neither {game.guest_name} nor {game.host_name} has a team season for "
+                f"season_id={game.season_id}.")
+
+    def _remove_existing_games(self, games: list | tuple) -> tuple:
+        return self._remove_repeated_games(games, self._game_repository.get_existing_natural_keys(games))
+
+    def _remove_repeated_games(self, games: list | tuple, natural_keys: set = None) -> tuple:
+        natural_keys = set() if natural_keys is None else natural_keys
+        remaining_games = []
+        for game in games:
+            natural_key = game.natural_key()
+            if natural_key not in natural_keys:
+                natural_keys.add(natural_key)
+                remaining_games.append(game)
+        return tuple(remaining_games)
+
+    def _get_team_seasons(self, keys: Iterable[TeamSeasonKey],
+                          lock_team_seasons: bool = False) -> Dict[TeamSeasonKey, TeamSeason]:
+        team_ids_by_season = {}
+        for team_id, season_id in keys:
+            team_ids_by_season.setdefault(season_id, set()).add(team_id)
+
+        if lock_team_seasons:
+            get_team_seasons = self._team_season_repository.lock_team_seasons_by_season_and_teams
+        else:
+            get_team_seasons = self._team_season_repository.get_team_seasons_by_season_and_teams
+
+        # Seasons are read in season_id order, so writers that lock their team seasons always lock them in one order.
+        return {
+            (team_season.team_id, team_season.season_id): team_season
+            for season_id, team_ids in sorted(team_ids_by_season.items())
+            for team_season in get_team_seasons(season_id, team_ids)
+        }
+
 
 if __name__ == '__main__':
     from app.data.models.league_season import LeagueSeason
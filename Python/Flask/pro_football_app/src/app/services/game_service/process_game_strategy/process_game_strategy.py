@@ -2,6 +2,7 @@ from app.data.models.game import Game
 from app.data.models.team_season import TeamSeason
 from app.data.repositories.team_season_repository import TeamSeasonRepository
 from app.services.utilities import guard
+from app.services.utilities.concurrency import retry_on_conflict
 
 
 class ProcessGameStrategy:
@@ -32,6 +33,9 @@ class ProcessGameStrategy:
         """
         guard.raise_if_none(game, f"{type(self).__name__}.process_game: game")
 
+        retry_on_conflict(lambda: self._process_game(game))
+
+    def _process_game(self, game: Game) -> None:
         season_year = game.season_id
         guest_season = self._team_season_repository.get_team_season_by_team_and_season(game.guest_name, season_year)
         host_season = self._team_season_repository.get_team_season_by_team_and_season(game.host_name, season_year)
@@ -0,0 +1,107 @@
+from typing import Dict, Iterable, Tuple
+
+from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
+
+TeamSeasonKey = Tuple[str, int]
+
+
+class TeamSeasonDelta:
+    """
+    Accumulates the changes that a batch of games makes to one team season, so they can be applied in one write.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the TeamSeasonDelta class.
+        """
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.points_for = 0
+        self.points_against = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(games={self.games}, wins={self.wins}, losses={self.losses}, " \
+               f"ties={self.ties}, points_for={self.points_for}, points_against={self.points_against})"
+
+    def add_result(self, team_score: int, opponent_score: int, sign: int = 1) -> None:
+        """
+        Folds one game result into the current TeamSeasonDelta object.
+
+        :param team_score: The points scored in the game by the team.
+        :param opponent_score: The points scored in the game by the team's opponent.
+        :param sign: 1 to add the game to the team season, or -1 to subtract it.
+
+        :return: None
+        """
+        self.games += sign
+        if team_score > opponent_score:
+            self.wins += sign
+        elif team_score < opponent_score:
+            self.losses += sign
+        else:
+            self.ties += sign
+
+        self.points_for += sign * team_score
+        self.points_against += sign * opponent_score
+
+    def is_empty(self) -> bool:
+        """
+        Checks to see if applying the current TeamSeasonDelta object would change anything.
+
+        :return: True if every total is zero, otherwise false.
+        """
+        return not (self.games or self.wins or self.losses or self.ties or self.points_for or self.points_against)
+
+    def apply_to(self, team_season: TeamSeason) -> None:
+        """
+        Applies the current TeamSeasonDelta object to a team season and recalculates its derived fields once.
+
+        :param team_season: The team season to which the changes will be applied.
+
+        :return: None
+        """
+        self.add_to(team_season)
+        team_season.calculate_winning_percentage()
+        team_season.calculate_expected_wins_and_losses()
+
+    def add_to(self, team_season: TeamSeason) -> None:
+        """
+        Adds the current TeamSeasonDelta object's totals to a team season, without recalculating its derived fields.
+
+        :param team_season: The team season to which the totals will be added.
+
+        :return: None
+        """
+        team_season.games += self.games
+        team_season.wins += self.wins
+        team_season.losses += self.losses
+        team_season.ties += self.ties
+        team_season.points_for += self.points_for
+        team_season.points_against += self.points_against
+
+
+def fold_games(games: Iterable[Game], sign: int = 1,
+               deltas: Dict[TeamSeasonKey, TeamSeasonDelta] | None = None) -> Dict[TeamSeasonKey, TeamSeasonDelta]:
+    """
+    Folds a collection of games into one TeamSeasonDelta per (team_id, season_id).
+
+    :param games: The games to fold.
+    :param sign: 1 to add the games to their team seasons, or -1 to subtract them.
+    :param deltas: Existing deltas into which the games will be folded, if any.
+
+    :return: The deltas, keyed by (team_id, season_id).
+    """
+    if deltas is None:
+        deltas = {}
+
+    for game in games:
+        guest_delta = deltas.setdefault((game.guest_name, game.season_id), TeamSeasonDelta())
+        guest_delta.add_result(game.guest_score, game.host_score, sign)
+
+        host_delta = deltas.setdefault((game.host_name, game.season_id), TeamSeasonDelta())
+        host_delta.add_result(game.host_score, game.guest_score, sign)
+
+    return deltas
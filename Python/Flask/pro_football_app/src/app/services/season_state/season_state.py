@@ -0,0 +1,366 @@
+import threading
+from typing import Dict, List, Tuple
+
+from flask import Flask
+
+from app.data.errors import EntityNotFoundError
+from app.data.models.game import Game
+from app.data.models.league_season import LeagueSeason
+from app.data.models.team_season import TeamSeason
+from app.data.repositories.game_repository import GameRepository
+from app.data.repositories.league_season_repository import LeagueSeasonRepository
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.sqla import sqla
+from app.services.game_service.team_season_delta import fold_games
+from app.services.utilities import guard
+
+GAME_VALUES = (
+    'season_id', 'week', 'guest_name', 'guest_score', 'host_name', 'host_score', 'winner_name', 'winner_score',
+    'loser_name', 'loser_score', 'is_playoff', 'notes'
+)
+
+GameKey = Tuple[int, int, str, str]
+
+
+class SeasonState:
+    """
+    Holds the team seasons, league seasons, and games of one season in memory, applies game changes to them there, and
+    writes the changed rows back to the data store in batches.
+
+    The rows are loaded once and detached from the session, so reads never touch the data store. Game changes update
+    the affected team seasons with the same arithmetic as the process game strategies, and are only written when the
+    state is flushed, either on demand or by a background timer. A SeasonState object is safe to share between
+    threads.
+
+    While a SeasonState object is in use, it should be the only writer of its season's games and team season totals.
+    """
+
+    def __init__(self,
+                 season_id: int,
+                 game_repository: GameRepository = None,
+                 team_season_repository: TeamSeasonRepository = None,
+                 league_season_repository: LeagueSeasonRepository = None) -> None:
+        """
+        Initializes a new instance of the SeasonState class.
+
+        :param season_id: The id of the season whose state will be held.
+        :param game_repository: The repository by which game data will be accessed.
+        :param team_season_repository: The repository by which team_season data will be accessed.
+        :param league_season_repository: The repository by which league_season data will be accessed.
+        """
+        self.season_id = season_id
+        self._game_repository = game_repository or GameRepository()
+        self._team_season_repository = team_season_repository or TeamSeasonRepository()
+        self._league_season_repository = league_season_repository or LeagueSeasonRepository()
+
+        self._lock = threading.RLock()
+        self._team_seasons: Dict[str, TeamSeason] = {}
+        self._league_seasons: List[LeagueSeason] = []
+        self._games_by_id: Dict[int, Game] = {}
+        self._games_by_key: Dict[GameKey, Game] = {}
+
+        self._dirty_team_ids = set()
+        self._inserted_games: List[Game] = []
+        self._updated_game_ids = set()
+        self._deleted_game_ids = set()
+
+        self._auto_flush_thread = None
+        self._auto_flush_stopped = threading.Event()
+        self.last_flush_error = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(season_id={self.season_id}, game_repository={self._game_repository}, " \
+               f"team_season_repository={self._team_season_repository}, " \
+               f"league_season_repository={self._league_season_repository})"
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Checks to see if the current SeasonState object holds changes that have not been flushed.
+
+        :return: True if any changes have not been flushed; otherwise false.
+        """
+        with self._lock:
+            return bool(
+                self._dirty_team_ids or self._inserted_games or self._updated_game_ids or self._deleted_game_ids
+            )
+
+    def load(self) -> 'SeasonState':
+        """
+        Loads the season's team seasons, league seasons, and games from the data store, discarding any changes that
+        have not been flushed.
+
+        :return: The current SeasonState object.
+        """
+        with self._lock:
+            team_seasons = self._team_season_repository.get_team_seasons_by_season_range(
+                self.season_id, self.season_id
+            )
+            league_seasons = self._league_season_repository.get_league_seasons_by_season(self.season_id)
+            games = self._game_repository.get_games_by_season(self.season_id)
+
+            # Detached, so commits made by this object or anyone else never expire them.
+            for obj in (*team_seasons, *league_seasons, *games):
+                sqla.session.expunge(obj)
+
+            self._team_seasons = {team_season.team_id: team_season for team_season in team_seasons}
+            self._league_seasons = list(league_seasons)
+            self._games_by_id = {game.id: game for game in games}
+            self._games_by_key = {game.natural_key(): game for game in games}
+            self._clear_changes()
+            return self
+
+    def get_team_season(self, team_id: str) -> TeamSeason | None:
+        """
+        Gets the team season in memory with the specified team_id.
+
+        :param team_id: The team_id of the team season to get.
+
+        :return: The team season, or None if the team has no team season in the current season.
+        """
+        with self._lock:
+            team_season = self._team_seasons.get(team_id)
+            if team_season is not None:
+                team_season.calculate_stale_derived_fields()
+            return team_season
+
+    def get_team_seasons(self) -> List[TeamSeason]:
+        """
+        Gets all the team seasons in memory.
+
+        :return: A list of the team seasons.
+        """
+        with self._lock:
+            team_seasons = list(self._team_seasons.values())
+            for team_season in team_seasons:
+                team_season.calculate_stale_derived_fields()
+            return team_seasons
+
+    def get_league_seasons(self) -> List[LeagueSeason]:
+        """
+        Gets all the league seasons in memory.
+
+        :return: A list of the league seasons.
+        """
+        with self._lock:
+            return list(self._league_seasons)
+
+    def get_games(self, week: int = None) -> List[Game]:
+        """
+        Gets the games in memory, including games that have not yet been flushed.
+
+        :param week: The week of the games to get, or None to get the games of every week.
+
+        :return: A list of the games.
+        """
+        with self._lock:
+            return [game for game in self._games_by_key.values() if week is None or game.week == week]
+
+    def get_game(self, id: int) -> Game | None:
+        """
+        Gets the game in memory with the specified id.
+
+        :param id: The id of the game to get.
+
+        :return: The game, or None if no game in memory has that id. Games have no id until they have been flushed.
+        """
+        with self._lock:
+            return self._games_by_id.get(id)
+
+    def add_game(self, new_game: Game | None) -> bool:
+        """
+        Adds a game to the current season, unless a game with the same week, guest, and host is already there.
+
+        :param new_game: The game to add.
+
+        :return: True if the game was added; false if it was already there.
+
+        :raises EntityNotFoundError: When neither team in the game has a team season in the current season.
+        :raises ValueError: When the new_game argument is None, or is not a game of the current season.
+        """
+        guard.raise_if_none(new_game, f"{type(self).__name__}.add_game: new_game")
+        self._raise_if_other_season(new_game)
+
+        with self._lock:
+            if new_game.natural_key() in self._games_by_key:
+                return False
+
+            if new_game.guest_name not in self._team_seasons and new_game.host_name not in self._team_seasons:
+                raise EntityNotFoundError(
+                    f"{type(self).__name__}.add_game: Neither {new_game.guest_name} nor {new_game.host_name} has a "
+                    f"team season for season_id={self.season_id}.")
+
+            new_game.decide_winner_and_loser()
+            self._games_by_key[new_game.natural_key()] = new_game
+            self._inserted_games.append(new_game)
+            self._apply_games((new_game,), 1)
+            return True
+
+    def edit_game(self, new_game: Game | None) -> None:
+        """
+        Replaces a game in memory with a changed copy of it, applying the net change to each affected team season.
+
+        :param new_game: The game containing the changed data, with the id of the game to replace.
+
+        :return: None
+
+        :raises EntityNotFoundError: If no game in memory has the id of new_game.
+        :raises ValueError: When the new_game argument is None, is not a game of the current season, or would have the
+        same week, guest, and host as another game.
+        """
+        guard.raise_if_none(new_game, f"{type(self).__name__}.edit_game: new_game")
+        self._raise_if_other_season(new_game)
+
+        with self._lock:
+            selected_game = self._games_by_id.get(new_game.id)
+            if selected_game is None:
+                raise EntityNotFoundError(
+                    f"{type(self).__name__}.edit_game: A game with id={new_game.id} could not be found.")
+
+            old_key = selected_game.natural_key()
+            new_key = new_game.natural_key()
+            if new_key != old_key and new_key in self._games_by_key:
+                raise ValueError(
+                    f"{type(self).__name__}.edit_game: Another game already has the natural key {new_key}.")
+
+            self._apply_games((selected_game,), -1)
+            new_game.decide_winner_and_loser()
+            for name in GAME_VALUES:
+                setattr(selected_game, name, getattr(new_game, name))
+            self._apply_games((selected_game,), 1)
+
+            del self._games_by_key[old_key]
+            self._games_by_key[new_key] = selected_game
+            self._updated_game_ids.add(selected_game.id)
+
+    def delete_game(self, id: int) -> None:
+        """
+        Deletes a game from memory, removing its result from each affected team season.
+
+        :param id: The id of the game to delete.
+
+        :return: None
+
+        :raises EntityNotFoundError: If no game in memory has the specified id.
+        """
+        with self._lock:
+            old_game = self._games_by_id.pop(id, None)
+            if old_game is None:
+                raise EntityNotFoundError(
+                    f"{type(self).__name__}.delete_game: A game with id={id} could not be found.")
+
+            del self._games_by_key[old_game.natural_key()]
+            self._apply_games((old_game,), -1)
+            self._updated_game_ids.discard(id)
+            self._deleted_game_ids.add(id)
+
+    def flush(self) -> None:
+        """
+        Writes every change held in memory to the data store in one transaction, using one batched statement per kind
+        of change.
+
+        If the write fails, the transaction is rolled back and the changes are kept, so the next flush writes them
+        again.
+
+        :return: None
+        """
+        with self._lock:
+            if not self.is_dirty:
+                return
+
+            team_seasons = [self._team_seasons[team_id] for team_id in self._dirty_team_ids]
+            for team_season in team_seasons:
+                team_season.calculate_stale_derived_fields()
+
+            try:
+                # Deleted first, so a game can be deleted and added again with the same week, guest, and host.
+                self._game_repository.delete_games(self._deleted_game_ids, commit=False)
+                self._game_repository.update_games(
+                    tuple(self._games_by_id[id] for id in self._updated_game_ids), commit=False
+                )
+                self._game_repository.insert_games(tuple(self._inserted_games), commit=False)
+                self._team_season_repository.update_team_season_totals(team_seasons, commit=False)
+                sqla.session.commit()
+            except Exception:
+                sqla.session.rollback()
+                for game in self._inserted_games:
+                    game.id = None
+                raise
+
+            for game in self._inserted_games:
+                self._games_by_id[game.id] = game
+            for team_season in team_seasons:
+                team_season.version_id += 1
+            self._clear_changes()
+
+    def start_auto_flush(self, app: Flask, interval_seconds: float) -> None:
+        """
+        Starts a background thread that flushes the current SeasonState object at a fixed interval.
+
+        A failed flush is recorded in last_flush_error, and its changes are written by the next one.
+
+        :param app: The application in whose context the flushes will run.
+        :param interval_seconds: The number of seconds between flushes.
+
+        :return: None
+
+        :raises ValueError: If interval_seconds is not positive.
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"{type(self).__name__}.start_auto_flush: interval_seconds must be positive.")
+
+        with self._lock:
+            if self._auto_flush_thread is not None:
+                return
+
+            self._auto_flush_stopped.clear()
+            self._auto_flush_thread = threading.Thread(
+                target=self._auto_flush, args=(app, interval_seconds), daemon=True
+            )
+            self._auto_flush_thread.start()
+
+    def stop_auto_flush(self) -> None:
+        """
+        Stops the background flush thread, if it is running. Changes made since its last flush are not written.
+
+        :return: None
+        """
+        with self._lock:
+            thread, self._auto_flush_thread = self._auto_flush_thread, None
+
+        if thread is not None:
+            self._auto_flush_stopped.set()
+            thread.join()
+
+    def _auto_flush(self, app: Flask, interval_seconds: float) -> None:
+        while not self._auto_flush_stopped.wait(interval_seconds):
+            with app.app_context():
+                try:
+                    self.flush()
+                    self.last_flush_error = None
+                except Exception as e:
+                    self.last_flush_error = e
+                finally:
+                    sqla.session.remove()
+
+    def _apply_games(self, games: Tuple[Game, ...], sign: int) -> None:
+        for (team_id, season_id), delta in fold_games(games, sign).items():
+            team_season = self._team_seasons.get(team_id)
+            if team_season is None:
+                continue
+
+            delta.add_to(team_season)
+            team_season.mark_derived_fields_stale()
+            self._dirty_team_ids.add(team_id)
+
+    def _clear_changes(self) -> None:
+        self._dirty_team_ids = set()
+        self._inserted_games = []
+        self._updated_game_ids = set()
+        self._deleted_game_ids = set()
+
+    def _raise_if_other_season(self, game: Game) -> None:
+        if game.season_id != self.season_id:
+            raise ValueError(
+                f"{type(self).__name__}: The game's season_id={game.season_id} is not "
+                f"season_id={self.season_id}.")
@@ -0,0 +1,155 @@
+from typing import Dict, List, Tuple
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.repositories.game_repository import GameRepository
+from app.data.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.services.utilities.concurrency import retry_on_conflict
+
+TOTALS = ('games', 'wins', 'losses', 'ties', 'points_for', 'points_against')
+
+DEFAULT_SEASONS_PER_CHUNK = 10
+PHASE = 'rebuild'
+
+
+class TeamSeasonDrift:
+    """
+    Class to report a team season whose stored totals did not match the totals of its games.
+    """
+
+    def __init__(self, team_id: str, season_id: int, differences: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Initializes a new instance of the TeamSeasonDrift class.
+
+        :param team_id: The team_id of the drifted team season.
+        :param season_id: The season_id of the drifted team season.
+        :param differences: The (stored, rebuilt) values of each total that differed, keyed by total name.
+        """
+        self.team_id = team_id
+        self.season_id = season_id
+        self.differences = differences
+
+    def __repr__(self):
+        return f"{type(self).__name__}(team_id={self.team_id!r}, season_id={self.season_id}, " \
+               f"differences={self.differences})"
+
+    def __str__(self):
+        differences = ", ".join(
+            f"{name} {stored} -> {rebuilt}" for name, (stored, rebuilt) in self.differences.items()
+        )
+        return f"{self.team_id} (season_id={self.season_id}): {differences}"
+
+
+class TeamSeasonRebuildService:
+    """
+    A service to rebuild team season totals from the games in the data store.
+    """
+
+    def __init__(self,
+                 game_repository: GameRepository = None,
+                 team_season_repository: TeamSeasonRepository = None,
+                 job_checkpoint_repository: JobCheckpointRepository = None,
+                 seasons_per_chunk: int = DEFAULT_SEASONS_PER_CHUNK) -> None:
+        """
+        Initializes a new instance of the TeamSeasonRebuildService class.
+
+        :param game_repository: The repository by which game results will be totaled.
+        :param team_season_repository: The repository by which team_season data will be accessed.
+        :param job_checkpoint_repository: The repository by which a rebuild's progress will be checkpointed.
+        :param seasons_per_chunk: The number of seasons to rebuild in each transaction.
+
+        :raises ValueError: If seasons_per_chunk is less than 1.
+        """
+        if seasons_per_chunk < 1:
+            raise ValueError("seasons_per_chunk must be at least 1.")
+
+        self._game_repository = game_repository or GameRepository()
+        self._team_season_repository = team_season_repository or TeamSeasonRepository()
+        self._job_checkpoint_repository = job_checkpoint_repository or JobCheckpointRepository()
+        self._seasons_per_chunk = seasons_per_chunk
+        self.last_resumed_checkpoint: JobCheckpoint | None = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(game_repository={self._game_repository}, " \
+               f"team_season_repository={self._team_season_repository}, " \
+               f"job_checkpoint_repository={self._job_checkpoint_repository}, " \
+               f"seasons_per_chunk={self._seasons_per_chunk})"
+
+    def rebuild_team_seasons(self, first_season_id: int, last_season_id: int = None, checkpoint: bool = False,
+                             restart: bool = False) -> List[TeamSeasonDrift]:
+        """
+        Recomputes the totals, winning percentage, and expected wins and losses of every team season in a range of
+        seasons from the game table, and writes them back in one commit per chunk of seasons.
+
+        With checkpointing, the last season of each chunk is recorded once the chunk is committed, and a rebuild of
+        the same range starts after its checkpoint, which is deleted once the rebuild finishes. A chunk is rebuilt
+        from its games alone, so one that was interrupted can safely be rebuilt again. The checkpoint resumed from is
+        kept in last_resumed_checkpoint.
+
+        :param first_season_id: The first season_id of the team seasons to rebuild.
+        :param last_season_id: The last season_id of the team seasons to rebuild, or None to rebuild only the first.
+        :param checkpoint: True to checkpoint the rebuild's progress, and resume from an earlier run's checkpoint.
+        :param restart: True to discard an earlier run's checkpoint, and start from first_season_id.
+
+        :return: The team seasons whose stored totals differed from the totals of their games.
+
+        :raises ValueError: If last_season_id is less than first_season_id.
+        """
+        if last_season_id is None:
+            last_season_id = first_season_id
+        if last_season_id < first_season_id:
+            raise ValueError(f"{type(self).__name__}.rebuild_team_seasons: last_season_id must not be less than "
+                             f"first_season_id.")
+
+        job_name = f"rebuild-team-seasons:{first_season_id}-{last_season_id}" if checkpoint else None
+        self.last_resumed_checkpoint = None
+        if job_name is not None:
+            if restart:
+                self._job_checkpoint_repository.delete_job_checkpoint(job_name)
+            else:
+                self.last_resumed_checkpoint = self._job_checkpoint_repository.get_job_checkpoint(job_name)
+
+        start_season_id = first_season_id
+        if self.last_resumed_checkpoint is not None:
+            start_season_id = self.last_resumed_checkpoint.season_id + 1
+
+        drifts = []
+        for chunk_first_season_id in range(start_season_id, last_season_id + 1, self._seasons_per_chunk):
+            chunk_last_season_id = min(chunk_first_season_id + self._seasons_per_chunk - 1, last_season_id)
+            drifts.extend(retry_on_conflict(
+                lambda: self._rebuild_team_seasons(chunk_first_season_id, chunk_last_season_id)
+            ))
+            if job_name is not None:
+                self._job_checkpoint_repository.save_job_checkpoint(job_name, chunk_last_season_id, None, PHASE)
+
+        if job_name is not None:
+            self._job_checkpoint_repository.delete_job_checkpoint(job_name)
+
+        return drifts
+
+    def _rebuild_team_seasons(self, first_season_id: int, last_season_id: int) -> List[TeamSeasonDrift]:
+        results = {
+            (result.team_id, result.season_id): result
+            for result in self._game_repository.get_team_season_results(first_season_id, last_season_id)
+        }
+
+        drifts = []
+        team_seasons = self._team_season_repository.get_team_seasons_by_season_range(first_season_id, last_season_id)
+        for team_season in team_seasons:
+            result = results.get((team_season.team_id, team_season.season_id))
+            differences = {}
+            for name in TOTALS:
+                stored = getattr(team_season, name)
+                rebuilt = 0 if result is None else getattr(result, name)
+                if stored != rebuilt:
+                    differences[name] = (stored, rebuilt)
+                    setattr(team_season, name, rebuilt)
+
+            if differences:
+                drifts.append(TeamSeasonDrift(team_season.team_id, team_season.season_id, differences))
+
+            team_season.calculate_winning_percentage()
+            team_season.calculate_expected_wins_and_losses()
+
+        self._team_season_repository.update_team_seasons(tuple(team_seasons))
+        return drifts
@@ -0,0 +1,43 @@
+from typing import Callable, TypeVar
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.data.sqla import sqla
+
+MAX_ATTEMPTS = 5
+
+T = TypeVar('T')
+
+
+def retry_on_conflict(action: Callable[[], T], max_attempts: int = MAX_ATTEMPTS) -> T:
+    """
+    Runs an action that writes versioned rows, retrying it when another writer has changed those rows since they
+    were read.
+
+    Each failed attempt rolls back the session, which expires every loaded object, so the next attempt re-reads
+    current values before applying its changes again.
+
+    :param action: The action to run. It must re-read any rows it changes, and be safe to run more than once.
+    :param max_attempts: The maximum number of times the action will be run.
+
+    :return: The value returned by the action.
+
+    :raises StaleDataError: If the action still conflicts after max_attempts attempts.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return action()
+        except StaleDataError:
+            sqla.session.rollback()
+            if attempt == max_attempts:
+                raise
+
+
+def supports_row_locking() -> bool:
+    """
+    Checks to see if the data store can lock individual rows for update, so several writers can safely change
+    different rows at once.
+
+    :return: True if the data store can lock rows; false if it can only serialize writers, as SQLite does.
+    """
+    return sqla.engine.dialect.name != 'sqlite'
@@ -0,0 +1,37 @@
+import threading
+
+from sqlalchemy import event
+
+from app.data.sqla import sqla
+
+
+class QueryCounter:
+    """
+    Counts the statements this thread executes through the data store's engine while the counter is entered.
+
+    Statements run by other threads on the same engine, such as a concurrent ingestion, are not counted.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the QueryCounter class.
+        """
+        self.count = 0
+        self._engine = None
+        self._thread_id = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(count={self.count})"
+
+    def __enter__(self) -> 'QueryCounter':
+        self._engine = sqla.engine
+        self._thread_id = threading.get_ident()
+        event.listen(self._engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        event.remove(self._engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args) -> None:
+        if threading.get_ident() == self._thread_id:
+            self.count += 1
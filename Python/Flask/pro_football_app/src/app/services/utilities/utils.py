@@ -1,2 +1,14 @@
+from flask import current_app, has_app_context
+from sqlalchemy.engine import make_url
+
+
 def typename(obj):
     return type(obj).__name__
+
+
+def is_app_database(database_uri: str) -> bool:
+    if not has_app_context():
+        return False
+
+    app_database_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI')
+    return app_database_uri is not None and make_url(database_uri) == make_url(app_database_uri)
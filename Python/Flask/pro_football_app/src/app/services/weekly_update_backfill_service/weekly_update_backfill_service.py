@@ -0,0 +1,295 @@
+import multiprocessing
+import time
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List
+
+from flask import Flask, current_app
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.data.repositories.league_season_repository import LeagueSeasonRepository
+from app.data.sqla import sqla
+from app.services.utilities.concurrency import supports_row_locking
+from app.services.weekly_update_service.team_season_ratings_solver import RatingsSolverReport, \
+    TeamSeasonRatingsSolver
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+PHASE = 'weekly_update'
+
+# Set in each worker process by _initialize_worker.
+_worker_service: WeeklyUpdateService | None = None
+
+
+class SeasonBackfillResult:
+    """
+    Class to report the weekly updates of one season in a backfill.
+    """
+
+    def __init__(self, season_id: int, league_ids: List[int], elapsed_seconds: float,
+                 ratings_solver_report: RatingsSolverReport = None) -> None:
+        """
+        Initializes a new instance of the SeasonBackfillResult class.
+
+        :param season_id: The season_id of the updated season.
+        :param league_ids: The league_ids of the updated league seasons.
+        :param elapsed_seconds: The time taken to update the season.
+        :param ratings_solver_report: The report of the season's last ratings solve, if the season was solved.
+        """
+        self.season_id = season_id
+        self.league_ids = league_ids
+        self.elapsed_seconds = elapsed_seconds
+        self.ratings_solver_report = ratings_solver_report
+
+    def __repr__(self):
+        return f"{type(self).__name__}(season_id={self.season_id}, league_ids={self.league_ids}, " \
+               f"elapsed_seconds={self.elapsed_seconds})"
+
+
+class WeeklyUpdateBackfillSummary:
+    """
+    Class to report the progress and throughput of a weekly update backfill.
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateBackfillSummary class.
+
+        :param workers: The number of processes that ran the weekly updates.
+        """
+        self.workers = workers
+        self.seasons: List[SeasonBackfillResult] = []
+        self.elapsed_seconds = 0.0
+        self.resumed_checkpoint: JobCheckpoint | None = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(workers={self.workers}, seasons={len(self.seasons)}, " \
+               f"elapsed_seconds={self.elapsed_seconds})"
+
+    @property
+    def league_seasons_updated(self) -> int:
+        """
+        Gets the number of league seasons updated so far.
+
+        :return: The number of league seasons updated.
+        """
+        return sum(len(result.league_ids) for result in self.seasons)
+
+    @property
+    def seasons_per_second(self) -> float:
+        """
+        Gets the number of seasons updated per second so far.
+
+        :return: The backfill throughput, or 0 if no time has elapsed.
+        """
+        if self.elapsed_seconds == 0:
+            return 0.0
+        return len(self.seasons) / self.elapsed_seconds
+
+
+class WeeklyUpdateBackfillService:
+    """
+    A service to run the weekly update of every league season in a range of seasons, such as after a change to the
+    rankings formulas.
+    """
+
+    def __init__(self,
+                 league_season_repository: LeagueSeasonRepository = None,
+                 weekly_update_service: WeeklyUpdateService = None,
+                 workers: int = 1,
+                 ratings_solver: TeamSeasonRatingsSolver = None,
+                 job_checkpoint_repository: JobCheckpointRepository = None) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateBackfillService class.
+
+        :param league_season_repository: The repository by which LeagueSeason data will be accessed.
+
+        :param weekly_update_service:
+        The service by which seasons will be updated when there is one worker. Each worker process creates its own.
+
+        :param workers:
+        The number of processes that update seasons at once. SQLite, which serializes writers, always uses one.
+
+        :param ratings_solver:
+        The solver by which each season's indices will be iterated to a fixed point, or None to rank each team season
+        in one pass.
+
+        :param job_checkpoint_repository: The repository by which the backfill's progress will be checkpointed.
+
+        :raises ValueError: If workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+
+        self._league_season_repository = league_season_repository or LeagueSeasonRepository()
+        self._weekly_update_service = weekly_update_service or _create_weekly_update_service(ratings_solver)
+        self._workers = workers
+        self._ratings_solver = ratings_solver
+        self._job_checkpoint_repository = job_checkpoint_repository or JobCheckpointRepository()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(league_season_repository={self._league_season_repository}, " \
+               f"weekly_update_service={self._weekly_update_service}, workers={self._workers}, " \
+               f"ratings_solver={self._ratings_solver}, " \
+               f"job_checkpoint_repository={self._job_checkpoint_repository})"
+
+    def backfill(self, first_season_id: int, last_season_id: int = None,
+                 progress: Callable[[WeeklyUpdateBackfillSummary, SeasonBackfillResult], None] = None,
+                 checkpoint: bool = False, restart: bool = False) -> WeeklyUpdateBackfillSummary:
+        """
+        Runs the weekly update of every league season in a range of seasons, one season at a time, recalculating
+        every team season's rankings once per season and writing each season's rankings in one batched transaction.
+
+        Seasons are independent of each other, so with more than one worker they are shared among a pool of
+        processes, each with its own engine and session, and finish in no particular order.
+
+        With checkpointing, the last season updated is recorded after each season, or, with more than one worker, the
+        last season before which every season has finished. A backfill of the same range, with or without a solver as
+        before, skips everything up to its checkpoint, and the checkpoint is deleted once the backfill finishes. Each
+        season's update is written in one transaction and can safely be run again, so an update that was interrupted,
+        or finished after the checkpoint was recorded, is just run again.
+
+        :param first_season_id: The first season_id of the league seasons to update.
+        :param last_season_id: The last season_id of the league seasons to update, or None to update only the first.
+        :param progress: A function that will be called with the summary and the result of each season as it finishes.
+        :param checkpoint: True to checkpoint the backfill's progress, and resume from an earlier run's checkpoint.
+        :param restart: True to discard an earlier run's checkpoint, and start from first_season_id.
+
+        :return: The timings of each season, and the throughput of the whole backfill.
+
+        :raises ValueError: If last_season_id is less than first_season_id.
+        """
+        if last_season_id is None:
+            last_season_id = first_season_id
+        if last_season_id < first_season_id:
+            raise ValueError(f"{type(self).__name__}.backfill: last_season_id must not be less than "
+                             f"first_season_id.")
+
+        league_ids_by_season: Dict[int, List[int]] = {}
+        for league_season in self._league_season_repository.get_league_seasons_by_season_range(first_season_id,
+                                                                                               last_season_id):
+            league_ids_by_season.setdefault(league_season.season_id, []).append(league_season.league_id)
+        for league_ids in league_ids_by_season.values():
+            league_ids.sort()
+
+        job_name = None
+        job_checkpoint = None
+        if checkpoint:
+            job_name = f"backfill-weekly-updates:{first_season_id}-{last_season_id}" \
+                       f"{':solve' if self._ratings_solver is not None else ''}"
+            if restart:
+                self._job_checkpoint_repository.delete_job_checkpoint(job_name)
+            else:
+                job_checkpoint = self._job_checkpoint_repository.get_job_checkpoint(job_name)
+            if job_checkpoint is not None:
+                league_ids_by_season = _skip_checkpointed_seasons(league_ids_by_season, job_checkpoint)
+
+        start_time = time.perf_counter()
+        executor = self._create_executor()
+        summary = WeeklyUpdateBackfillSummary(workers=1 if executor is None else self._workers)
+        summary.resumed_checkpoint = job_checkpoint
+        try:
+            if executor is None:
+                for season_id, league_ids in sorted(league_ids_by_season.items()):
+                    result = _backfill_season(self._weekly_update_service, season_id, league_ids)
+                    if job_name is not None:
+                        self._job_checkpoint_repository.save_job_checkpoint(job_name, season_id, None, PHASE)
+                    self._record_season(result, summary, start_time, progress)
+            else:
+                futures: List[Future] = [
+                    executor.submit(_backfill_season_in_worker, season_id, league_ids)
+                    for season_id, league_ids in sorted(league_ids_by_season.items())
+                ]
+                unfinished_season_ids = sorted(league_ids_by_season)
+                finished_season_ids = set()
+                for future in as_completed(futures):
+                    result = future.result()
+                    self._record_season(result, summary, start_time, progress)
+
+                    # Seasons finish out of order, so the checkpoint only passes a season once all before it are done.
+                    finished_season_ids.add(result.season_id)
+                    finished_season_id = None
+                    while unfinished_season_ids and unfinished_season_ids[0] in finished_season_ids:
+                        finished_season_id = unfinished_season_ids.pop(0)
+                    if job_name is not None and finished_season_id is not None:
+                        self._job_checkpoint_repository.save_job_checkpoint(job_name, finished_season_id, None,
+                                                                            PHASE)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if job_name is not None:
+            self._job_checkpoint_repository.delete_job_checkpoint(job_name)
+
+        return summary
+
+    def _create_executor(self) -> Executor | None:
+        if self._workers == 1 or not supports_row_locking():
+            return None
+
+        # Spawned, not forked, so no worker shares the connections of this process's engine.
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_initialize_worker,
+            initargs=(current_app.config['SQLALCHEMY_DATABASE_URI'],
+                      current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+                      self._ratings_solver)
+        )
+
+    def _record_season(self, result: SeasonBackfillResult, summary: WeeklyUpdateBackfillSummary, start_time: float,
+                       progress: Callable[[WeeklyUpdateBackfillSummary, SeasonBackfillResult], None] | None) -> None:
+        summary.seasons.append(result)
+        summary.elapsed_seconds = time.perf_counter() - start_time
+        if progress is not None:
+            progress(summary, result)
+
+
+def _create_weekly_update_service(ratings_solver: TeamSeasonRatingsSolver | None) -> WeeklyUpdateService:
+    return WeeklyUpdateService(ratings_solver=ratings_solver)
+
+
+def _skip_checkpointed_seasons(league_ids_by_season: Dict[int, List[int]],
+                               job_checkpoint: JobCheckpoint) -> Dict[int, List[int]]:
+    # Seasons are updated whole, so a checkpoint with a league_id, left by a backfill that updated one league season
+    # at a time, only covers the seasons before its own, which is run again.
+    last_season_id = job_checkpoint.season_id
+    if job_checkpoint.league_id is not None:
+        last_season_id -= 1
+
+    return {
+        season_id: league_ids for season_id, league_ids in league_ids_by_season.items() if season_id > last_season_id
+    }
+
+
+def _backfill_season(service: WeeklyUpdateService, season_id: int, league_ids: List[int]) -> SeasonBackfillResult:
+    # Every league season of the season is recalculated in one full update, so each team season is ranked once.
+    start_time = time.perf_counter()
+    service.last_ratings_solver_report = None
+    service.run_season_weekly_update(season_id)
+    return SeasonBackfillResult(season_id, league_ids, time.perf_counter() - start_time,
+                                service.last_ratings_solver_report)
+
+
+def _initialize_worker(database_uri: str, engine_options: dict,
+                       ratings_solver: TeamSeasonRatingsSolver | None) -> None:
+    global _worker_service
+
+    app = Flask(__name__)
+    app.config.from_mapping(
+        SQLALCHEMY_DATABASE_URI=database_uri,
+        SQLALCHEMY_ENGINE_OPTIONS=engine_options,
+        SQLALCHEMY_TRACK_MODIFICATIONS=False
+    )
+    sqla.init_app(app)
+
+    # The context lasts as long as the worker process, so the worker keeps one engine and session throughout.
+    app.app_context().push()
+    _worker_service = _create_weekly_update_service(ratings_solver)
+
+
+def _backfill_season_in_worker(season_id: int, league_ids: List[int]) -> SeasonBackfillResult:
+    try:
+        return _backfill_season(_worker_service, season_id, league_ids)
+    finally:
+        sqla.session.remove()
@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, Set
+
+from app.data.models.game import Game
+
+
+class OpponentGraph:
+    """
+    Records which teams played each other in a season, so the teams whose schedules depend on a team's results can be
+    found.
+
+    A team's schedule totals and averages depend on its own games and on the season totals of each of its opponents,
+    so a change to a team's results reaches the rankings of the team and its opponents, and no further.
+    """
+
+    def __init__(self, games: Iterable[Game]) -> None:
+        """
+        Initializes a new instance of the OpponentGraph class.
+
+        :param games: All the games of the season.
+        """
+        self._opponents: Dict[str, Set[str]] = {}
+        for game in games:
+            self._opponents.setdefault(game.guest_name, set()).add(game.host_name)
+            self._opponents.setdefault(game.host_name, set()).add(game.guest_name)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(teams={len(self._opponents)})"
+
+    def get_opponents(self, team_id: str) -> Set[str]:
+        """
+        Gets the teams that played the specified team.
+
+        :param team_id: The id of the team whose opponents will be fetched.
+
+        :return: The ids of the team's opponents.
+        """
+        return set(self._opponents.get(team_id, ()))
+
+    def get_affected_team_ids(self, changed_team_ids: Iterable[str]) -> Set[str]:
+        """
+        Gets the teams whose rankings depend on the results of any of the specified teams.
+
+        :param changed_team_ids: The ids of the teams whose results have changed.
+
+        :return: The ids of the changed teams and all their opponents.
+        """
+        affected_team_ids = set()
+        for team_id in changed_team_ids:
+            affected_team_ids.add(team_id)
+            affected_team_ids.update(self._opponents.get(team_id, ()))
+        return affected_team_ids
@@ -0,0 +1,149 @@
+import time
+
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_ratings import ArrayLike, TeamSeasonRatings, calculate_index, divide
+
+DEFAULT_TOLERANCE = 1e-9
+DEFAULT_MAX_ITERATIONS = 100
+
+
+class RatingsSolverReport:
+    """
+    Class to report how a TeamSeasonRatingsSolver reached its ratings.
+    """
+
+    def __init__(self, teams: int, iterations: int, converged: bool, residual: float, elapsed_seconds: float) -> None:
+        """
+        Initializes a new instance of the RatingsSolverReport class.
+
+        :param teams: The number of team seasons rated.
+        :param iterations: The number of iterations run.
+        :param converged: True if the last iteration changed no index by more than the tolerance.
+        :param residual: The largest change to any index in the last iteration.
+        :param elapsed_seconds: The time taken to build the game matrix and iterate.
+        """
+        self.teams = teams
+        self.iterations = iterations
+        self.converged = converged
+        self.residual = residual
+        self.elapsed_seconds = elapsed_seconds
+
+    def __repr__(self):
+        return f"{type(self).__name__}(teams={self.teams}, iterations={self.iterations}, " \
+               f"converged={self.converged}, residual={self.residual}, elapsed_seconds={self.elapsed_seconds})"
+
+    def __str__(self):
+        outcome = "Converged" if self.converged else "Stopped without converging"
+        return f"{outcome} after {self.iterations} iterations over {self.teams} teams " \
+               f"(residual {self.residual:.3g}) in {self.elapsed_seconds * 1000:.1f} ms"
+
+
+class TeamSeasonRatingsSolver:
+    """
+    Rates the teams of a season by iterating their offensive and defensive indices to a fixed point.
+
+    TeamSeason.update_rankings divides each team's average by its opponents' raw averages, which are not themselves
+    adjusted for the strength of the opponents' schedules. Here, each team's offensive factor is its average points
+    scored over the mean defensive index of its opponents, weighted by the games played against each, and its
+    defensive factor is its average points allowed over the mean offensive index of its opponents. Indices are then
+    calculated from the factors as in update_rankings, and the opponents' indices are replaced by the new ones until
+    no index changes by more than the tolerance.
+
+    Each iteration is a product of the season's team by opponent game matrix with the index vectors. Unlike the
+    schedule procedures, games against an opponent are not left out of the opponent's index, and each game is counted
+    once.
+    """
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE, max_iterations: int = DEFAULT_MAX_ITERATIONS) -> None:
+        """
+        Initializes a new instance of the TeamSeasonRatingsSolver class.
+
+        :param tolerance: The largest change to any index at which the indices are taken to have converged.
+        :param max_iterations: The number of iterations after which the solver stops, converged or not.
+
+        :raises ValueError: If tolerance is not greater than 0, or max_iterations is less than 1.
+        """
+        if tolerance <= 0:
+            raise ValueError("tolerance must be greater than 0.")
+        if max_iterations < 1:
+            raise ValueError("max_iterations must be at least 1.")
+
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+
+    def __repr__(self):
+        return f"{type(self).__name__}(tolerance={self._tolerance}, max_iterations={self._max_iterations})"
+
+    def solve(self, team_seasons: Sequence[TeamSeason], games: Iterable[Game],
+              league_average_points: ArrayLike | float) -> Tuple[TeamSeasonRatings, RatingsSolverReport]:
+        """
+        Rates the team seasons of one season.
+
+        :param team_seasons: All the team seasons of the season.
+        :param games: All the games of the season. Games against teams with no team season are left out.
+        :param league_average_points: The average points per game of each team's league season, or of all of them.
+
+        :return: The ratings, in the order of team_seasons, and a report of the iterations.
+        """
+        start_time = time.perf_counter()
+
+        positions = {team_season.team_id: i for i, team_season in enumerate(team_seasons)}
+        matrix = np.zeros((len(team_seasons), len(team_seasons)))
+        for game in games:
+            guest = positions.get(game.guest_name)
+            host = positions.get(game.host_name)
+            if guest is not None and host is not None:
+                matrix[guest, host] += 1
+                matrix[host, guest] += 1
+
+        # Each row holds the share of a team's games played against each opponent.
+        games_against_team_seasons = matrix.sum(axis=1, keepdims=True)
+        weights = np.divide(matrix, games_against_team_seasons, out=np.zeros_like(matrix),
+                            where=games_against_team_seasons > 0)
+
+        team_games = [team_season.games for team_season in team_seasons]
+        offensive_average = divide([team_season.points_for for team_season in team_seasons], team_games)
+        defensive_average = divide([team_season.points_against for team_season in team_seasons], team_games)
+
+        offensive_index = offensive_average
+        defensive_index = defensive_average
+        offensive_factor = defensive_factor = np.full(len(team_seasons), np.nan)
+        iterations = 0
+        residual = 0.0
+        for iterations in range(1, self._max_iterations + 1):
+            # A team with no index yet stands in for an opponent at its raw average.
+            offensive_factor = divide(offensive_average, weights @ _get_strength(defensive_index, defensive_average))
+            defensive_factor = divide(defensive_average, weights @ _get_strength(offensive_index, offensive_average))
+
+            next_offensive_index = calculate_index(offensive_average, offensive_factor, league_average_points)
+            next_defensive_index = calculate_index(defensive_average, defensive_factor, league_average_points)
+            residual = max(_get_largest_change(offensive_index, next_offensive_index),
+                           _get_largest_change(defensive_index, next_defensive_index))
+
+            offensive_index = next_offensive_index
+            defensive_index = next_defensive_index
+            if residual <= self._tolerance:
+                break
+
+        ratings = TeamSeasonRatings.from_factors(offensive_average, offensive_factor, defensive_average,
+                                                 defensive_factor, league_average_points)
+        report = RatingsSolverReport(teams=len(team_seasons), iterations=iterations,
+                                     converged=residual <= self._tolerance, residual=residual,
+                                     elapsed_seconds=time.perf_counter() - start_time)
+        return ratings, report
+
+
+def _get_strength(index: np.ndarray, average: np.ndarray) -> np.ndarray:
+    # Teams with no games have no average either, but they have no weight in any row, so they count as 0.
+    return np.nan_to_num(np.where(np.isnan(index), average, index))
+
+
+def _get_largest_change(index: np.ndarray, next_index: np.ndarray) -> float:
+    changes = np.abs(next_index - index)
+    changes = changes[~np.isnan(changes)]
+    return float(changes.max()) if changes.size > 0 else 0.0
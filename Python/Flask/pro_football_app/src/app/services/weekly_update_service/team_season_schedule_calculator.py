@@ -0,0 +1,148 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Collection, Dict, Iterable, List, Tuple
+
+from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_schedule_averages import TeamSeasonScheduleAverages
+from app.data.models.team_season_schedule_totals import TeamSeasonScheduleTotals
+
+AVERAGE_PLACES = Decimal('0.01')
+WINNING_PERCENTAGE_PLACES = Decimal('1e-11')
+
+
+class TeamSeasonScheduleCalculator:
+    """
+    Calculates the schedule totals and averages of every team in a season in one pass over the season's games, in
+    place of one call per team to sp_GetTeamSeasonScheduleTotals and sp_GetTeamSeasonScheduleAverages.
+
+    The results match the stored procedures exactly. Each opponent's weighted games and points exclude that
+    opponent's game against the team, as in fn_GetTeamSeasonScheduleData, and, as in fn_GetTeamSeasonScheduleTotals,
+    which joins the team's games to its schedule data by opponent, each of the n games against the same opponent is
+    counted n times. Games against teams with no team season in the season are left out.
+    """
+
+    def __init__(self, games: Iterable[Game], team_seasons: Iterable[TeamSeason],
+                 team_ids: Collection[str] = None) -> None:
+        """
+        Initializes a new instance of the TeamSeasonScheduleCalculator class, and calculates the schedule totals and
+        averages of each team season.
+
+        :param games: All the games of the season.
+        :param team_seasons: All the team seasons of the season.
+        :param team_ids: The teams whose schedules will be calculated, or None to calculate every team's schedule.
+        """
+        team_seasons = {team_season.team_id: team_season for team_season in team_seasons}
+
+        # The points for and against of each team's games, grouped by opponent.
+        results_by_opponent: Dict[str, Dict[str, List[Tuple[int, int]]]] = {}
+        for game in games:
+            results_by_opponent.setdefault(game.guest_name, {}).setdefault(game.host_name, []).append(
+                (game.guest_score, game.host_score)
+            )
+            results_by_opponent.setdefault(game.host_name, {}).setdefault(game.guest_name, []).append(
+                (game.host_score, game.guest_score)
+            )
+
+        self._totals: Dict[Tuple[str, int], TeamSeasonScheduleTotals] = {}
+        self._averages: Dict[Tuple[str, int], TeamSeasonScheduleAverages] = {}
+        for team_id, team_season in team_seasons.items():
+            if team_ids is not None and team_id not in team_ids:
+                continue
+
+            totals = _calculate_totals(results_by_opponent.get(team_id, {}), team_seasons)
+            self._totals[(team_id, team_season.season_id)] = totals
+            self._averages[(team_id, team_season.season_id)] = _calculate_averages(totals)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(team_seasons={len(self._totals)})"
+
+    def get_team_season_schedule_totals(self, team_id: str, season_id: int) -> TeamSeasonScheduleTotals:
+        """
+        Gets the TeamSeasonScheduleTotals of the team season with the specified team_id and season_id.
+
+        :param team_id: The id of the team for which this TeamSeasonScheduleTotals will be fetched.
+        :param season_id: The id of the season for which this TeamSeasonScheduleTotals will be fetched.
+
+        :return: The fetched TeamSeasonScheduleTotals, which is empty if the team season was not calculated.
+        """
+        return self._totals.get((team_id, season_id)) or TeamSeasonScheduleTotals()
+
+    def get_team_season_schedule_averages(self, team_id: str, season_id: int) -> TeamSeasonScheduleAverages:
+        """
+        Gets the TeamSeasonScheduleAverages of the team season with the specified team_id and season_id.
+
+        :param team_id: The id of the team for which this TeamSeasonScheduleAverages will be fetched.
+        :param season_id: The id of the season for which this TeamSeasonScheduleAverages will be fetched.
+
+        :return: The fetched TeamSeasonScheduleAverages, which is empty if the team season was not calculated.
+        """
+        return self._averages.get((team_id, season_id)) or TeamSeasonScheduleAverages()
+
+
+def _calculate_totals(results_by_opponent: Dict[str, List[Tuple[int, int]]],
+                      team_seasons: Dict[str, TeamSeason]) -> TeamSeasonScheduleTotals:
+    games = points_for = points_against = 0
+    schedule_wins = schedule_losses = schedule_ties = 0
+    schedule_games = schedule_points_for = schedule_points_against = 0
+
+    for opponent, results in results_by_opponent.items():
+        opponent_season = team_seasons.get(opponent)
+        if opponent_season is None:
+            continue
+
+        # Each of the n games against the opponent is joined to the opponent's n schedule data rows.
+        count = len(results)
+        game_points_for = sum(result[0] for result in results)
+        game_points_against = sum(result[1] for result in results)
+
+        games += count * count
+        points_for += count * game_points_for
+        points_against += count * game_points_against
+        schedule_wins += count * count * opponent_season.wins
+        schedule_losses += count * count * opponent_season.losses
+        schedule_ties += count * count * opponent_season.ties
+        schedule_games += count * count * (opponent_season.games - 1)
+        schedule_points_for += count * (count * opponent_season.points_for - game_points_against)
+        schedule_points_against += count * (count * opponent_season.points_against - game_points_for)
+
+    if games == 0:
+        # Aggregates over no rows: COUNT is 0 and every SUM is NULL.
+        return TeamSeasonScheduleTotals(games=0)
+
+    schedule_record_games = schedule_wins + schedule_losses + schedule_ties
+    if schedule_record_games == 0:
+        schedule_winning_percentage = None
+    else:
+        schedule_winning_percentage = float(
+            (Decimal(2 * schedule_wins + schedule_ties) / Decimal(2 * schedule_record_games))
+            .quantize(WINNING_PERCENTAGE_PLACES, rounding=ROUND_HALF_UP)
+        )
+
+    return TeamSeasonScheduleTotals(
+        games=games,
+        points_for=points_for,
+        points_against=points_against,
+        schedule_wins=schedule_wins,
+        schedule_losses=schedule_losses,
+        schedule_ties=schedule_ties,
+        schedule_winning_percentage=schedule_winning_percentage,
+        schedule_games=schedule_games,
+        schedule_points_for=schedule_points_for,
+        schedule_points_against=schedule_points_against
+    )
+
+
+def _calculate_averages(totals: TeamSeasonScheduleTotals) -> TeamSeasonScheduleAverages:
+    return TeamSeasonScheduleAverages(
+        points_for=_average(totals.points_for, totals.games),
+        points_against=_average(totals.points_against, totals.games),
+        schedule_points_for=_average(totals.schedule_points_for, totals.schedule_games),
+        schedule_points_against=_average(totals.schedule_points_against, totals.schedule_games)
+    )
+
+
+def _average(total: int | None, count: int | None) -> float | None:
+    # ROUND(CAST(total as float) / count, 2), or NULL when count is 0 or either value is NULL.
+    if total is None or not count:
+        return None
+    return float(Decimal(total / count).quantize(AVERAGE_PLACES, rounding=ROUND_HALF_UP))
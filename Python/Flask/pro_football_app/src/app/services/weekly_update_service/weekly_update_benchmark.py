@@ -0,0 +1,356 @@
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, Dict, List, Tuple
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.data.models.game import Game
+from app.data.models.league import League
+from app.data.models.league_season import LeagueSeason
+from app.data.models.league_season_totals import LeagueSeasonTotals
+from app.data.models.season import Season
+from app.data.models.team import Team
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_ratings import RANKINGS
+from app.data.models.team_season_schedule_averages import TeamSeasonScheduleAverages
+from app.data.models.team_season_schedule_totals import TeamSeasonScheduleTotals
+from app.data.models.team_season_week_rating import TeamSeasonWeekRating
+from app.data.repositories.league_season_totals_repository import LeagueSeasonTotalsRepository
+from app.data.repositories.team_season_schedule_repository import TeamSeasonScheduleRepository
+from app.data.sqla import sqla
+from app.services.game_service.team_season_delta import fold_games
+from app.services.utilities.query_counter import QueryCounter
+from app.services.utilities.utils import is_app_database
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+STORED_PROCEDURE = 'stored_procedure'
+IN_PROCESS = 'in_process'
+MODES = (STORED_PROCEDURE, IN_PROCESS)
+
+DEFAULT_BENCHMARK_SEASON_COUNT = 3
+DEFAULT_MATCH_TOLERANCE = 1e-9
+LEAGUE_IDS = (1, 2)
+TEAM_COUNT = 32
+WEEK_COUNT = 17
+
+# fn_GetTeamSeasonGames, fn_GetTeamSeasonScheduleData, fn_GetTeamSeasonScheduleProfile, and
+# fn_GetTeamSeasonScheduleTotals, translated to SQLite.
+_SCHEDULE_TOTALS_CTE = """
+WITH tsg AS (
+    SELECT id, host_name AS opponent, guest_score AS points_for, host_score AS points_against
+    FROM game WHERE guest_name = :team_id AND season_id = :season_id
+    UNION
+    SELECT id, guest_name AS opponent, host_score AS points_for, guest_score AS points_against
+    FROM game WHERE host_name = :team_id AND season_id = :season_id
+),
+tssd AS (
+    SELECT tsg.id, tsg.opponent, ts.wins, ts.losses, ts.ties,
+        ts.games - 1 AS weighted_games,
+        ts.points_for - tsg.points_against AS weighted_points_for,
+        ts.points_against - tsg.points_for AS weighted_points_against
+    FROM team_season AS ts INNER JOIN tsg ON ts.team_id = tsg.opponent
+    WHERE ts.season_id = :season_id
+),
+tssp AS (
+    SELECT tsg.id, tsg.opponent, tsg.points_for AS game_points_for, tsg.points_against AS game_points_against
+    FROM tsg INNER JOIN tssd ON tsg.id = tssd.id
+),
+totals AS (
+    SELECT
+        COUNT(tssp.opponent) AS games,
+        SUM(tssp.game_points_for) AS points_for,
+        SUM(tssp.game_points_against) AS points_against,
+        SUM(tssd.wins) AS schedule_wins,
+        SUM(tssd.losses) AS schedule_losses,
+        SUM(tssd.ties) AS schedule_ties,
+        CASE
+            WHEN (SUM(tssd.wins) + SUM(tssd.losses) + SUM(tssd.ties)) = 0 THEN NULL
+            ELSE CAST(2 * SUM(tssd.wins) + SUM(tssd.ties) AS REAL)
+                / (2 * (SUM(tssd.wins) + SUM(tssd.losses) + SUM(tssd.ties)))
+        END AS schedule_winning_percentage,
+        SUM(tssd.weighted_games) AS schedule_games,
+        SUM(tssd.weighted_points_for) AS schedule_points_for,
+        SUM(tssd.weighted_points_against) AS schedule_points_against
+    FROM tssp INNER JOIN tssd ON tssp.opponent = tssd.opponent
+)
+"""
+
+# sp_GetTeamSeasonScheduleTotals, sp_GetTeamSeasonScheduleAverages, and sp_GetLeagueSeasonTotals, translated to SQLite.
+_SCHEDULE_TOTALS_SQL = text(_SCHEDULE_TOTALS_CTE + "SELECT * FROM totals")
+_SCHEDULE_AVERAGES_SQL = text(_SCHEDULE_TOTALS_CTE + """
+SELECT
+    CASE WHEN games = 0 THEN NULL ELSE ROUND(CAST(points_for AS REAL) / games, 2) END,
+    CASE WHEN games = 0 THEN NULL ELSE ROUND(CAST(points_against AS REAL) / games, 2) END,
+    CASE WHEN schedule_games = 0 THEN NULL ELSE ROUND(CAST(schedule_points_for AS REAL) / schedule_games, 2) END,
+    CASE WHEN schedule_games = 0 THEN NULL ELSE ROUND(CAST(schedule_points_against AS REAL) / schedule_games, 2) END
+FROM totals
+""")
+_LEAGUE_SEASON_TOTALS_SQL = text("""
+SELECT SUM(games), SUM(points_for) FROM team_season WHERE league_id = :league_id AND season_id = :season_id
+""")
+
+# The values compared between the modes, by table, keyed by each row's natural key.
+_OUTPUTS: Dict[str, Tuple[type, Tuple[str, ...], Tuple[str, ...]]] = {
+    'team_season': (TeamSeason, ('team_id', 'season_id'), RANKINGS),
+    'league_season': (LeagueSeason, ('league_id', 'season_id'), ('total_games', 'total_points', 'average_points')),
+    'season': (Season, ('id',), ('num_of_weeks_completed',)),
+    'team_season_week_rating': (
+        TeamSeasonWeekRating, ('team_id', 'season_id', 'week'),
+        ('offensive_index', 'defensive_index', 'final_expected_winning_percentage')
+    ),
+}
+
+
+class WeeklyUpdateBenchmarkResult:
+    """
+    Class to report the cost of running the weekly updates of a dataset in one mode.
+    """
+
+    def __init__(self, mode: str, elapsed_seconds: float, query_count: int, peak_memory_bytes: int) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateBenchmarkResult class.
+
+        :param mode: One of MODES.
+        :param elapsed_seconds: The time taken by the weekly updates.
+        :param query_count: The number of statements the weekly updates executed.
+        :param peak_memory_bytes: The most memory allocated by Python at once during the weekly updates.
+        """
+        self.mode = mode
+        self.elapsed_seconds = elapsed_seconds
+        self.query_count = query_count
+        self.peak_memory_bytes = peak_memory_bytes
+
+    def __repr__(self):
+        return f"{type(self).__name__}(mode={self.mode}, elapsed_seconds={self.elapsed_seconds}, " \
+               f"query_count={self.query_count}, peak_memory_bytes={self.peak_memory_bytes})"
+
+    def __str__(self):
+        return f"{self.mode.replace('_', ' ')}: {self.elapsed_seconds:.3f}s, {self.query_count} queries, " \
+               f"{self.peak_memory_bytes / 2 ** 20:.1f} MiB peak"
+
+
+class WeeklyUpdateBenchmarkSummary:
+    """
+    Class to report whether two modes of the weekly update wrote the same values, and what each cost.
+    """
+
+    def __init__(self, tolerance: float) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateBenchmarkSummary class.
+
+        :param tolerance: The largest difference, absolute or relative, at which two values are taken to match.
+        """
+        self.tolerance = tolerance
+        self.results: Dict[str, WeeklyUpdateBenchmarkResult] = {}
+        self.fields_compared = 0
+        self.max_difference = 0.0
+        self.mismatches: List[str] = []
+
+    def __repr__(self):
+        return f"{type(self).__name__}(results={list(self.results.values())}, " \
+               f"fields_compared={self.fields_compared}, mismatches={len(self.mismatches)})"
+
+    @property
+    def matched(self) -> bool:
+        """
+        Gets whether every value written in one mode matched the value written in the other.
+
+        :return: True if there were no mismatches.
+        """
+        return len(self.mismatches) == 0
+
+
+def benchmark_weekly_update_paths(database_uri: str = None,
+                                  season_count: int = DEFAULT_BENCHMARK_SEASON_COUNT,
+                                  tolerance: float = DEFAULT_MATCH_TOLERANCE) -> WeeklyUpdateBenchmarkSummary:
+    """
+    Runs the weekly updates of the same synthetic dataset in two modes, and compares everything each mode wrote.
+
+    The benchmark runs on SQLite only. In the stored procedure mode, each league season is updated in turn with
+    run_weekly_update, its league totals and each team's schedule totals and averages fetched by SQLite translations
+    of the stored procedures, run once per call as the procedures would be. In the in-process mode, each season is
+    updated with run_season_weekly_update, its league totals summed in one grouped query and every schedule calculated
+    from the season's games by TeamSeasonScheduleCalculator.
+
+    Each mode starts from a freshly created and seeded schema, of season_count seasons of two leagues of 16 teams
+    each, and the schema is dropped once it finishes. The rankings of every team season, the totals of every league
+    season, the weeks completed of every season, and every team season's recorded week ratings are compared. The peak
+    memory is that traced by tracemalloc, which slows both modes alike.
+
+    :param database_uri:
+    The URI of the scratch SQLite database, whose tables will be created and dropped. None to use a temporary SQLite
+    file. It must not be the database of the current app, if any.
+    :param season_count: The number of seasons of games to update.
+    :param tolerance: The largest difference, absolute or relative, at which two values are taken to match.
+
+    :return: The cost of each mode, and every value that did not match.
+
+    :raises ValueError:
+    If database_uri is not that of a SQLite database or is that of the current app's database, season_count is less
+    than 1, or tolerance is less than 0.
+    """
+    if database_uri is not None and make_url(database_uri).get_backend_name() != 'sqlite':
+        raise ValueError("database_uri must be that of a SQLite database, on which the procedures are translated.")
+    if database_uri is not None and is_app_database(database_uri):
+        raise ValueError("database_uri must not be the app's database, whose tables the benchmark drops.")
+    if season_count < 1:
+        raise ValueError("season_count must be at least 1.")
+    if tolerance < 0:
+        raise ValueError("tolerance must not be less than 0.")
+
+    summary = WeeklyUpdateBenchmarkSummary(tolerance)
+    outputs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config.from_mapping(
+            SQLALCHEMY_DATABASE_URI=database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.sqlite3')}",
+            SQLALCHEMY_TRACK_MODIFICATIONS=False
+        )
+        sqla.init_app(app)
+
+        with app.app_context():
+            for mode in MODES:
+                sqla.create_all()
+                try:
+                    _seed(season_count)
+                    summary.results[mode] = _run_mode(mode, season_count)
+                    outputs[mode] = _get_outputs()
+                finally:
+                    sqla.session.remove()
+                    sqla.drop_all()
+
+            sqla.engine.dispose()
+
+    _compare_outputs(outputs[STORED_PROCEDURE], outputs[IN_PROCESS], summary)
+    return summary
+
+
+class _SqliteTeamSeasonScheduleRepository(TeamSeasonScheduleRepository):
+    # Runs the SQLite translations of the schedule procedures, one statement per call.
+    def get_team_season_schedule_totals(self, team_id: str, season_id: int) -> TeamSeasonScheduleTotals:
+        totals = sqla.session.execute(_SCHEDULE_TOTALS_SQL, dict(team_id=team_id, season_id=season_id)).first()
+        if totals is None:
+            return TeamSeasonScheduleTotals()
+        return TeamSeasonScheduleTotals(*totals)
+
+    def get_team_season_schedule_averages(self, team_id: str, season_id: int) -> TeamSeasonScheduleAverages:
+        averages = sqla.session.execute(_SCHEDULE_AVERAGES_SQL, dict(team_id=team_id, season_id=season_id)).first()
+        if averages is None:
+            return TeamSeasonScheduleAverages()
+        return TeamSeasonScheduleAverages(*averages)
+
+
+class _SqliteLeagueSeasonTotalsRepository(LeagueSeasonTotalsRepository):
+    # Runs the SQLite translation of sp_GetLeagueSeasonTotals.
+    def get_league_season_totals(self, league_id: int, season_id: int) -> LeagueSeasonTotals:
+        totals = sqla.session.execute(_LEAGUE_SEASON_TOTALS_SQL,
+                                      dict(league_id=league_id, season_id=season_id)).first()
+        return LeagueSeasonTotals(total_games=totals[0], total_points=totals[1])
+
+
+def _run_mode(mode: str, season_count: int) -> WeeklyUpdateBenchmarkResult:
+    if mode == STORED_PROCEDURE:
+        service = WeeklyUpdateService(league_season_totals_repository=_SqliteLeagueSeasonTotalsRepository(),
+                                      team_season_schedule_repository=_SqliteTeamSeasonScheduleRepository())
+
+        def run_season(season_id: int) -> None:
+            for league_id in LEAGUE_IDS:
+                service.run_weekly_update(league_id, season_id)
+    else:
+        service = WeeklyUpdateService(calculate_schedules_in_process=True)
+
+        def run_season(season_id: int) -> None:
+            service.run_season_weekly_update(season_id)
+
+    return _measure(mode, lambda: [run_season(season_id) for season_id in range(1, season_count + 1)])
+
+
+def _measure(mode: str, action: Callable[[], object]) -> WeeklyUpdateBenchmarkResult:
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        with QueryCounter() as query_counter:
+            action()
+        elapsed_seconds = time.perf_counter() - start_time
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return WeeklyUpdateBenchmarkResult(mode, elapsed_seconds, query_counter.count, peak_memory_bytes)
+
+
+def _get_outputs() -> Dict[tuple, object]:
+    sqla.session.expire_all()
+    outputs = {}
+    for table, (model, key_names, value_names) in _OUTPUTS.items():
+        for row in model.query:
+            key = tuple(str(getattr(row, name)) for name in key_names)
+            for name in value_names:
+                outputs[(table, key, name)] = getattr(row, name)
+    return outputs
+
+
+def _compare_outputs(expected: Dict[tuple, object], actual: Dict[tuple, object],
+                     summary: WeeklyUpdateBenchmarkSummary) -> None:
+    for field in sorted(expected.keys() | actual.keys(), key=str):
+        table, key, name = field
+        description = f"{table} {', '.join(key)} {name}"
+        if field not in actual or field not in expected:
+            summary.mismatches.append(f"{description}: written in only one mode")
+            continue
+
+        summary.fields_compared += 1
+        expected_value = expected[field]
+        actual_value = actual[field]
+        if expected_value is None or actual_value is None:
+            if expected_value is not actual_value:
+                summary.mismatches.append(f"{description}: {expected_value} != {actual_value}")
+            continue
+
+        summary.max_difference = max(summary.max_difference, abs(actual_value - expected_value))
+        if not math.isclose(actual_value, expected_value, rel_tol=summary.tolerance, abs_tol=summary.tolerance):
+            summary.mismatches.append(f"{description}: {expected_value} != {actual_value}")
+
+
+def _seed(season_count: int) -> None:
+    for season_id in range(1, season_count + 1):
+        sqla.session.add(Season(id=season_id, year=2000 + season_id, num_of_weeks_scheduled=WEEK_COUNT))
+    sqla.session.flush()
+
+    for league_id in LEAGUE_IDS:
+        sqla.session.add(League(id=league_id, short_name=f'BL{league_id}', long_name=f'Benchmark League {league_id}',
+                                first_season_id=1))
+    team_names = [f"Team {i:02d}" for i in range(1, TEAM_COUNT + 1)]
+    for team_name in team_names:
+        sqla.session.add(Team(name=team_name))
+
+    # Seeded, so both modes update the same games.
+    generator = random.Random(season_count)
+    for season_id in range(1, season_count + 1):
+        games = []
+        for week in range(1, WEEK_COUNT + 1):
+            order = generator.sample(team_names, TEAM_COUNT)
+            for i in range(0, TEAM_COUNT, 2):
+                games.append(Game(season_id=season_id, week=week,
+                                  guest_name=order[i], guest_score=generator.randint(0, 45),
+                                  host_name=order[i + 1], host_score=generator.randint(0, 45)))
+        for game in games:
+            game.decide_winner_and_loser()
+
+        for league_id in LEAGUE_IDS:
+            sqla.session.add(LeagueSeason(league_id=league_id, season_id=season_id))
+        for (team_id, _), delta in sorted(fold_games(games).items()):
+            team_season = TeamSeason(team_id=team_id, season_id=season_id,
+                                     league_id=LEAGUE_IDS[team_names.index(team_id) % len(LEAGUE_IDS)],
+                                     games=0, wins=0, losses=0, ties=0, points_for=0, points_against=0)
+            delta.apply_to(team_season)
+            sqla.session.add(team_season)
+        sqla.session.add_all(games)
+    sqla.session.commit()
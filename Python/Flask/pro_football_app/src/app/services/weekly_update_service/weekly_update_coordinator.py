@@ -0,0 +1,140 @@
+import os
+import socket
+import threading
+import uuid
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+from flask import current_app
+
+from app.data.repositories.weekly_update_lock_repository import WeeklyUpdateLockRepository
+from app.data.timestamps import utc_now
+from app.services.weekly_update_service.weekly_update_report import WeeklyUpdateReport
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+MAX_REQUEST_ATTEMPTS = 5
+
+
+class WeeklyUpdateCoordinator:
+    """
+    Runs weekly updates so that at most one process, on any host sharing the data store, updates a league season at
+    a time.
+
+    A request for a league season whose update is already running does not wait or run its own update. It asks the
+    running process to run the update once more when it finishes, and any number of such requests made during one
+    run are coalesced into that one follow-up run.
+
+    While the holder runs updates, it renews its lease on the lock every third of the lease, so the lock is only
+    taken from a holder that has stopped renewing it.
+    """
+
+    def __init__(self,
+                 weekly_update_service: WeeklyUpdateService = None,
+                 weekly_update_lock_repository: WeeklyUpdateLockRepository = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateCoordinator class.
+
+        :param weekly_update_service: The service by which league seasons will be updated.
+        :param weekly_update_lock_repository: The repository by which weekly update locks will be accessed.
+
+        :param lease_seconds:
+        The time after taking or last renewing the lock after which it may be taken by another process, in case its
+        holder died without releasing it.
+
+        :raises ValueError: If lease_seconds is not greater than 0.
+        """
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be greater than 0.")
+
+        self._weekly_update_service = weekly_update_service or WeeklyUpdateService()
+        self._weekly_update_lock_repository = weekly_update_lock_repository or WeeklyUpdateLockRepository()
+        self._lease_seconds = lease_seconds
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def __repr__(self):
+        return f"{type(self).__name__}(weekly_update_service={self._weekly_update_service}, " \
+               f"weekly_update_lock_repository={self._weekly_update_lock_repository}, " \
+               f"lease_seconds={self._lease_seconds})"
+
+    def request_weekly_update(self, league_id: str, season_id: int,
+                              incremental: bool = False) -> List[WeeklyUpdateReport]:
+        """
+        Runs the weekly update of a league season, unless another process is already running it, in which case that
+        process is asked to run it once more when it finishes.
+
+        :param league_id: The league_id of the league_season within which a weekly update will be run.
+        :param season_id: The season_id of the league_season within which a weekly update will be run.
+        :param incremental: True to only recalculate the rankings that may have changed since the last update.
+
+        :return: The reports of the updates run by the caller, which are none if its request was coalesced.
+
+        :raises RuntimeError: If the lock was repeatedly released and taken by others while the request was made.
+        """
+        for _ in range(MAX_REQUEST_ATTEMPTS):
+            now = utc_now()
+            if self._weekly_update_lock_repository.acquire_weekly_update_lock(
+                    league_id, season_id, self._owner, now, now + timedelta(seconds=self._lease_seconds)
+            ):
+                return self._run_while_requested(league_id, season_id, incremental)
+
+            if self._weekly_update_lock_repository.request_weekly_update_rerun(league_id, season_id, incremental):
+                return []
+
+            # The holder released the lock between the two statements, so it can be taken again.
+
+        raise RuntimeError(f"{type(self).__name__}.request_weekly_update: could not take or queue the weekly update "
+                           f"of league {league_id} season {season_id}.")
+
+    def _run_while_requested(self, league_id: str, season_id: int, incremental: bool) -> List[WeeklyUpdateReport]:
+        reports = []
+        try:
+            with self._renewing_lease(league_id, season_id):
+                while True:
+                    reports.append(self._weekly_update_service.run_weekly_update(league_id, season_id, incremental))
+                    if self._weekly_update_lock_repository.release_weekly_update_lock(league_id, season_id,
+                                                                                      self._owner):
+                        return reports
+
+                    # Only the holder clears a requested run, so the lock is kept only if one was requested.
+                    rerun_incremental = self._weekly_update_lock_repository.take_weekly_update_rerun(
+                        league_id, season_id, self._owner, self._get_lease_expiry()
+                    )
+                    if rerun_incremental is None:
+                        # The lease ran out during the update, and another process has taken the lock.
+                        return reports
+                    incremental = rerun_incremental
+        except BaseException:
+            self._weekly_update_lock_repository.release_weekly_update_lock(league_id, season_id, self._owner,
+                                                                           force=True)
+            raise
+
+    @contextmanager
+    def _renewing_lease(self, league_id: str, season_id: int) -> Iterator[None]:
+        app = current_app._get_current_object()
+        stopped = threading.Event()
+
+        def renew_lease() -> None:
+            # The thread has its own app context, and so its own session.
+            with app.app_context():
+                while not stopped.wait(self._lease_seconds / 3):
+                    if not self._weekly_update_lock_repository.renew_weekly_update_lock(
+                            league_id, season_id, self._owner, self._get_lease_expiry()
+                    ):
+                        # Another process has taken the lock, so it is no longer renewed.
+                        return
+
+        heartbeat = threading.Thread(target=renew_lease, name=f"weekly-update-lease-{league_id}-{season_id}",
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+    def _get_lease_expiry(self) -> datetime:
+        return utc_now() + timedelta(seconds=self._lease_seconds)
@@ -0,0 +1,100 @@
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from app.data.models.weekly_update_run import WeeklyUpdateRun
+
+LEAGUE_TOTALS = 'league_totals'
+WEEK_COUNT = 'week_count'
+SCHEDULE_TOTALS = 'schedule_totals'
+SCHEDULE_AVERAGES = 'schedule_averages'
+RANKING = 'ranking'
+PERSISTENCE = 'persistence'
+
+PHASES = (LEAGUE_TOTALS, WEEK_COUNT, SCHEDULE_TOTALS, SCHEDULE_AVERAGES, RANKING, PERSISTENCE)
+
+
+class WeeklyUpdateReport:
+    """
+    Class to report where the time of one weekly update went.
+
+    Each phase is timed exclusive of any phase timed within it, so the time spent fetching schedules while ranking is
+    counted as schedule time and not ranking time. When the update is retried after a conflict, the phases of every
+    attempt are added together.
+    """
+
+    def __init__(self, league_id: int | None, season_id: int, incremental: bool = False, solved: bool = False) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateReport class.
+
+        :param league_id: The league_id of the updated league season, or None if every league of the season was updated.
+        :param season_id: The season_id of the updated league season.
+        :param incremental: True if the update only recalculated the rankings that may have changed.
+        :param solved: True if the update iterated the season's indices to a fixed point.
+        """
+        self.league_id = league_id
+        self.season_id = season_id
+        self.incremental = incremental
+        self.solved = solved
+        self.phase_seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.attempts = 0
+        self.elapsed_seconds = 0.0
+        self.query_count = 0
+        self.rows_touched = 0
+        self._phases: List[str] = []
+        self._phase_start_time = 0.0
+
+    def __repr__(self):
+        return f"{type(self).__name__}(league_id={self.league_id}, season_id={self.season_id}, " \
+               f"attempts={self.attempts}, elapsed_seconds={self.elapsed_seconds}, query_count={self.query_count}, " \
+               f"rows_touched={self.rows_touched})"
+
+    def __str__(self):
+        phases = ', '.join(f"{phase.replace('_', ' ')} {self.phase_seconds[phase]:.3f}s" for phase in PHASES)
+        leagues = "all leagues" if self.league_id is None else f"league {self.league_id}"
+        return f"Weekly update of {leagues} season {self.season_id} took {self.elapsed_seconds:.3f}s " \
+               f"in {self.attempts} attempt{'' if self.attempts == 1 else 's'}, " \
+               f"with {self.query_count} queries and {self.rows_touched} rows touched " \
+               f"({phases})"
+
+    @contextmanager
+    def time_phase(self, phase: str) -> Iterator[None]:
+        """
+        Times a phase of the update, pausing the phase it is timed within until it finishes.
+
+        :param phase: One of PHASES.
+
+        :return: A context in which the phase runs.
+        """
+        self._switch_phase()
+        self._phases.append(phase)
+        try:
+            yield
+        finally:
+            self._switch_phase()
+            self._phases.pop()
+
+    def to_weekly_update_run(self) -> WeeklyUpdateRun:
+        """
+        Gets the report as a row of the weekly update run history.
+
+        :return: The weekly_update_run.
+        """
+        return WeeklyUpdateRun(
+            league_id=None if self.league_id is None else str(self.league_id),
+            season_id=self.season_id,
+            incremental=self.incremental,
+            solved=self.solved,
+            attempts=self.attempts,
+            elapsed_seconds=self.elapsed_seconds,
+            query_count=self.query_count,
+            rows_touched=self.rows_touched,
+            **{f"{phase}_seconds": seconds for phase, seconds in self.phase_seconds.items()}
+        )
+
+    def _switch_phase(self) -> None:
+        now = time.perf_counter()
+        if self._phases:
+            self.phase_seconds[self._phases[-1]] += now - self._phase_start_time
+        self._phase_start_time = now
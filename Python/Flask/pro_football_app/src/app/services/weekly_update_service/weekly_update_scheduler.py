@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+
+from typing import Callable, Dict, List, Tuple
+
+from flask import Flask
+
+from app.data.repositories.league_season_repository import LeagueSeasonRepository
+from app.data.sqla import sqla
+from app.services.weekly_update_service.weekly_update_coordinator import WeeklyUpdateCoordinator
+
+DEFAULT_QUIET_SECONDS = 5 * 60
+DEFAULT_MAX_DELAY_SECONDS = 30 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class WeeklyUpdateScheduler:
+    """
+    Runs the weekly update of a season automatically, once the season's games have stopped changing.
+
+    Game writes mark their seasons dirty. A season is updated once no game of it has been written for the quiet
+    interval, or once the maximum delay has passed since it was first marked, whichever is sooner, so a game day's
+    results are ranked together and a steady stream of results is still ranked every so often. Every league of the
+    season is updated incrementally, through a WeeklyUpdateCoordinator, so an update already running elsewhere runs
+    once more instead.
+    """
+
+    def __init__(self,
+                 app: Flask,
+                 weekly_update_coordinator: WeeklyUpdateCoordinator = None,
+                 league_season_repository: LeagueSeasonRepository = None,
+                 quiet_seconds: float = DEFAULT_QUIET_SECONDS,
+                 max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initializes a new instance of the WeeklyUpdateScheduler class.
+
+        :param app: The application in whose context the background updates will run.
+        :param weekly_update_coordinator: The coordinator by which league seasons will be updated.
+        :param league_season_repository: The repository by which a season's league seasons will be found.
+        :param quiet_seconds: The time without game writes after which a dirty season is updated.
+        :param max_delay_seconds: The longest time a season stays dirty, however often its games are written.
+        :param clock: The function by which the current time, in seconds, will be read.
+
+        :raises ValueError: If quiet_seconds is less than 0, or max_delay_seconds is less than quiet_seconds.
+        """
+        if quiet_seconds < 0:
+            raise ValueError("quiet_seconds must not be less than 0.")
+        if max_delay_seconds < quiet_seconds:
+            raise ValueError("max_delay_seconds must not be less than quiet_seconds.")
+
+        self._app = app
+        self._weekly_update_coordinator = weekly_update_coordinator or WeeklyUpdateCoordinator()
+        self._league_season_repository = league_season_repository or LeagueSeasonRepository()
+        self._quiet_seconds = quiet_seconds
+        self._max_delay_seconds = max_delay_seconds
+        self._clock = clock
+
+        # The (first, last) times at which each dirty season was marked, keyed by season_id.
+        self._dirty_seasons: Dict[int, Tuple[float, float]] = {}
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def __repr__(self):
+        return f"{type(self).__name__}(weekly_update_coordinator={self._weekly_update_coordinator}, " \
+               f"league_season_repository={self._league_season_repository}, " \
+               f"quiet_seconds={self._quiet_seconds}, max_delay_seconds={self._max_delay_seconds})"
+
+    def mark_season_dirty(self, season_id: int) -> None:
+        """
+        Records that a season's games have changed, and starts the background thread if it is not running.
+
+        :param season_id: The season_id of the changed games.
+
+        :return: None
+        """
+        with self._condition:
+            if self._closed:
+                return
+
+            now = self._clock()
+            first_marked_at, _ = self._dirty_seasons.get(season_id, (now, now))
+            self._dirty_seasons[season_id] = (first_marked_at, now)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='weekly-update-scheduler', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def run_due_updates(self, flush: bool = False) -> List[int]:
+        """
+        Runs the weekly update of every dirty season that is due, in the current application context.
+
+        :param flush: True to update every dirty season, due or not.
+
+        :return: The season_ids of the updated seasons.
+        """
+        with self._condition:
+            now = self._clock()
+            season_ids = sorted(
+                season_id for season_id in self._dirty_seasons
+                if flush or self._get_due_time(season_id) <= now
+            )
+            for season_id in season_ids:
+                # Games written while the season is updated mark it dirty again.
+                del self._dirty_seasons[season_id]
+
+        for season_id in season_ids:
+            try:
+                for league_season in self._league_season_repository.get_league_seasons_by_season(season_id):
+                    self._weekly_update_coordinator.request_weekly_update(league_season.league_id, season_id,
+                                                                          incremental=True)
+            except Exception:
+                sqla.session.rollback()
+                logger.exception("The automatic weekly update of season %s failed.", season_id)
+        return season_ids
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Stops the background thread, and updates the seasons that are still dirty.
+
+        :param flush: True to update the dirty seasons now, in the current application context; otherwise False.
+
+        :return: None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        if flush:
+            self.run_due_updates(flush=True)
+
+    def _get_due_time(self, season_id: int) -> float:
+        first_marked_at, last_marked_at = self._dirty_seasons[season_id]
+        return min(last_marked_at + self._quiet_seconds, first_marked_at + self._max_delay_seconds)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    due_times = [self._get_due_time(season_id) for season_id in self._dirty_seasons]
+                    timeout = None if not due_times else min(due_times) - self._clock()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+
+            with self._app.app_context():
+                try:
+                    self.run_due_updates()
+                finally:
+                    sqla.session.remove()
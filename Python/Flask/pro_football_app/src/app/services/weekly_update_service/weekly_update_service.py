@@ -1,11 +1,36 @@
+import logging
+import time
+
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from app.data.models.game import Game
+from app.data.models.league_season import LeagueSeason
+from app.data.models.league_season_totals import LeagueSeasonTotals
+from app.data.models.season import Season
 from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_ratings import TeamSeasonRatings
+from app.data.models.team_season_schedule_averages import TeamSeasonScheduleAverages
 from app.data.repositories.game_repository import GameRepository
 from app.data.repositories.league_season_repository import LeagueSeasonRepository
 from app.data.repositories.league_season_totals_repository import LeagueSeasonTotalsRepository
 from app.data.repositories.season_repository import SeasonRepository
 from app.data.repositories.team_season_repository import TeamSeasonRepository
 from app.data.repositories.team_season_schedule_repository import TeamSeasonScheduleRepository
+from app.data.repositories.team_season_week_rating_repository import TeamSeasonWeekRatingRepository
+from app.data.repositories.weekly_update_run_repository import WeeklyUpdateRunRepository
+from app.services.utilities.concurrency import retry_on_conflict
+from app.services.utilities.query_counter import QueryCounter
 from app.services.utilities.utils import typename
+from app.services.weekly_update_service.opponent_graph import OpponentGraph
+from app.services.weekly_update_service.team_season_ratings_solver import RatingsSolverReport, \
+    TeamSeasonRatingsSolver
+from app.services.weekly_update_service.team_season_schedule_calculator import TeamSeasonScheduleCalculator
+from app.services.weekly_update_service.weekly_update_report import LEAGUE_TOTALS, PERSISTENCE, RANKING, \
+    SCHEDULE_AVERAGES, SCHEDULE_TOTALS, WEEK_COUNT, WeeklyUpdateReport
+
+DEFAULT_FULL_RECOMPUTE_THRESHOLD = 0.5
+
+logger = logging.getLogger(__name__)
 
 
 class WeeklyUpdateService:
@@ -19,7 +44,12 @@ class WeeklyUpdateService:
                  league_season_repository: LeagueSeasonRepository = None,
                  team_season_repository: TeamSeasonRepository = None,
                  league_season_totals_repository: LeagueSeasonTotalsRepository = None,
-                 team_season_schedule_repository: TeamSeasonScheduleRepository = None):
+                 team_season_schedule_repository: TeamSeasonScheduleRepository = None,
+                 full_recompute_threshold: float = DEFAULT_FULL_RECOMPUTE_THRESHOLD,
+                 ratings_solver: TeamSeasonRatingsSolver = None,
+                 weekly_update_run_repository: WeeklyUpdateRunRepository = None,
+                 team_season_week_rating_repository: TeamSeasonWeekRatingRepository = None,
+                 calculate_schedules_in_process: bool = False):
         """
         Initializes a new instance of the WeeklyUpdateService class.
 
@@ -31,14 +61,48 @@ class WeeklyUpdateService:
         The repository by which LeagueSeasonTotals data will be accessed.
 
         :param team_season_repository: The repository by which TeamSeason data will be accessed.
+
         :param team_season_schedule_repository: The repository by which TeamSeasonSchedule data will be accessed.
+
+        :param full_recompute_threshold:
+        The fraction of a season's team seasons at or beyond which an incremental weekly update recomputes every
+        team's schedule and rankings, or 0 to always recompute them all.
+
+        :param ratings_solver:
+        The solver by which every team season's indices will be iterated to a fixed point over the whole season, or
+        None to rank each team season in one pass against its opponents' schedule averages.
+
+        :param weekly_update_run_repository:
+        The repository by which the history of each weekly update's timings will be recorded.
+
+        :param team_season_week_rating_repository:
+        The repository by which the ratings of every team season after each week will be recorded.
+
+        :param calculate_schedules_in_process:
+        True to calculate the schedules of all the teams in a season at once from the season's games and team seasons
+        when no team_season_schedule_repository is given; otherwise False to fetch each team's schedule from the
+        stored procedures.
+
+        :raises ValueError: If full_recompute_threshold is not between 0 and 1.
         """
+        if not 0 <= full_recompute_threshold <= 1:
+            raise ValueError("full_recompute_threshold must be between 0 and 1.")
+
         self._season_repository = season_repository or SeasonRepository()
         self._game_repository = game_repository or GameRepository()
         self._league_season_repository = league_season_repository or LeagueSeasonRepository()
         self._team_season_repository = team_season_repository or TeamSeasonRepository()
         self._league_season_totals_repository = league_season_totals_repository or LeagueSeasonTotalsRepository()
-        self._team_season_schedule_repository = team_season_schedule_repository or TeamSeasonScheduleRepository()
+        if team_season_schedule_repository is None and not calculate_schedules_in_process:
+            team_season_schedule_repository = TeamSeasonScheduleRepository()
+        self._team_season_schedule_repository = team_season_schedule_repository
+        self._full_recompute_threshold = full_recompute_threshold
+        self._ratings_solver = ratings_solver
+        self._weekly_update_run_repository = weekly_update_run_repository or WeeklyUpdateRunRepository()
+        self._team_season_week_rating_repository = \
+            team_season_week_rating_repository or TeamSeasonWeekRatingRepository()
+        self.last_ratings_solver_report: RatingsSolverReport | None = None
+        self.last_weekly_update_report: WeeklyUpdateReport | None = None
 
     def __repr__(self):
         return f"{typename(self)}(" \
@@ -47,7 +111,11 @@ class WeeklyUpdateService:
                f"league_season_repository={self._league_season_repository}," \
                f"league_season_totals_repository={self._league_season_totals_repository}," \
                f"team_season_repository={self._team_season_repository}," \
-               f"team_season_schedule_repository={self._team_season_schedule_repository})"
+               f"team_season_schedule_repository={self._team_season_schedule_repository}," \
+               f"full_recompute_threshold={self._full_recompute_threshold}," \
+               f"ratings_solver={self._ratings_solver}," \
+               f"weekly_update_run_repository={self._weekly_update_run_repository}," \
+               f"team_season_week_rating_repository={self._team_season_week_rating_repository})"
 
     def __str__(self):
         return format(self)
@@ -60,88 +128,368 @@ class WeeklyUpdateService:
                f"League Season Totals Repository: {self._league_season_totals_repository}," \
                f"Team Season Schedule Repository: {self._team_season_schedule_repository})"
 
-    def run_weekly_update(self, league_id: int, season_id: int) -> None:
+    def run_weekly_update(self, league_id: int, season_id: int, incremental: bool = False) -> WeeklyUpdateReport:
         """
         Runs a weekly update of the data store.
 
+        The league season's totals, the season's week count, and the rankings of its team seasons are all calculated
+        before any rankings are written, and everything is written in one transaction, so readers see either the
+        rankings from before the update or those after it, and never a mix. If another writer changes any of the rows
+        first, the whole update is rolled back and calculated again.
+
+        An incremental update only recalculates the schedules and rankings of the team seasons whose results have
+        changed since their rankings were last written by an incremental update, and of their opponents, and writes
+        every changed ranking in one transaction. The indices of the other team seasons are recalculated from their
+        stored averages and factors, in case their league's average points have changed. If the full recompute
+        threshold of the season's team seasons or more are affected, every team season is recalculated.
+
+        With a ratings solver, every team season in the season is rated at once, whether or not the update is
+        incremental, and the solver's report is kept in last_ratings_solver_report.
+
+        Once the rankings are calculated, the ratings of every team season in the season are recorded as their ratings
+        after the season's latest week, in place of any recorded for that week by an earlier update.
+
+        The time taken by each phase of the update, the statements it executed, and the rows it wrote are logged and
+        recorded in the weekly update run history, and kept in last_weekly_update_report.
+
         :param league_id: The league_id of the league_season within which a weekly update will be run.
         :param season_id: The season_id of the league_season within which a weekly update will be run.
+        :param incremental: True to only recalculate the rankings that may have changed since the last update.
+
+        :return: The timings of the update's phases.
+        """
+        report = WeeklyUpdateReport(league_id, season_id, incremental, solved=self._ratings_solver is not None)
+        self.last_weekly_update_report = report
+
+        start_time = time.perf_counter()
+        with QueryCounter() as query_counter:
+            retry_on_conflict(lambda: self._run_weekly_update(league_id, season_id, incremental, report))
+        report.elapsed_seconds = time.perf_counter() - start_time
+        report.query_count = query_counter.count
+
+        logger.info("%s", report)
+        self._weekly_update_run_repository.add_weekly_update_run(report.to_weekly_update_run())
+        return report
 
-        :return: None
+    def run_season_weekly_update(self, season_id: int, incremental: bool = False) -> WeeklyUpdateReport:
         """
+        Runs a weekly update of every league season of a season in one pass.
+
+        Unlike a run_weekly_update of each league in turn, the season's games are read once, for both the week count
+        and the schedules, its team seasons are read and ranked once, and the totals of every league are summed in one
+        grouped query. Everything is written in one transaction, and the update is otherwise run as run_weekly_update
+        runs it, and recorded in the weekly update run history without a league_id.
+
+        :param season_id: The season_id of the league_seasons within which a weekly update will be run.
+        :param incremental: True to only recalculate the rankings that may have changed since the last update.
+
+        :return: The timings of the update's phases.
+        """
+        report = WeeklyUpdateReport(None, season_id, incremental, solved=self._ratings_solver is not None)
+        self.last_weekly_update_report = report
+
+        start_time = time.perf_counter()
+        with QueryCounter() as query_counter:
+            retry_on_conflict(lambda: self._run_season_weekly_update(season_id, incremental, report))
+        report.elapsed_seconds = time.perf_counter() - start_time
+        report.query_count = query_counter.count
+
+        logger.info("%s", report)
+        self._weekly_update_run_repository.add_weekly_update_run(report.to_weekly_update_run())
+        return report
+
+    def _run_weekly_update(self, league_id: int, season_id: int, incremental: bool,
+                           report: WeeklyUpdateReport) -> None:
+        # Everything is read and calculated before any loaded row is changed, so the session writes nothing until the
+        # end, and the update holds its write locks only while it writes.
+        report.attempts += 1
+        with report.time_phase(LEAGUE_TOTALS):
+            league_season, league_season_totals = self._get_league_season_and_totals(league_id, season_id)
+            updated_average_points = {}
+            if league_season is not None:
+                updated_league_season = LeagueSeason()
+                updated_league_season.update_games_and_points(league_season_totals.total_games,
+                                                              league_season_totals.total_points)
+                updated_average_points[league_season.id] = updated_league_season.average_points
+
+        with report.time_phase(WEEK_COUNT):
+            season_games = self._game_repository.get_games_by_season(season_id)
+            src_week_count = _get_max_week(season_games, season_id)
+            dest_season = None if src_week_count is None else self._season_repository.get_season(season_id)
+
+        team_seasons = []
+        games = []
+        league_average_points = _LeagueAveragePoints(
+            lambda league_id: self._get_league_season_average_points(league_id, season_id, updated_average_points)
+        )
         # These hard-coded values are a bit of a hack at this time, but I intend to make them selectable by the user in
         # the future.
-        self._update_league_season(league_id, season_id)
-        src_week_count = self._update_week_count(season_id)
+        if src_week_count is not None and src_week_count >= 3:
+            with report.time_phase(RANKING):
+                team_seasons = self._team_season_repository.get_team_seasons_by_season(season_id) or []
+                if team_seasons and (
+                        self._ratings_solver is not None or incremental or self._team_season_schedule_repository is None
+                ):
+                    games = season_games
+
+        league_seasons_and_totals = [] if league_season is None else [(league_season, league_season_totals)]
+        self._update_season(report, season_id, league_seasons_and_totals, src_week_count, dest_season, team_seasons,
+                            games, league_average_points, incremental)
+
+    def _run_season_weekly_update(self, season_id: int, incremental: bool, report: WeeklyUpdateReport) -> None:
+        report.attempts += 1
+        with report.time_phase(LEAGUE_TOTALS):
+            league_season_totals = self._league_season_totals_repository.get_league_season_totals_by_season(season_id)
+            league_seasons_and_totals = []
+            average_points_by_league = {}
+            for league_season in self._league_season_repository.get_league_seasons_by_season(season_id):
+                totals = league_season_totals.get(str(league_season.league_id))
+                average_points = league_season.average_points
+                if totals is not None and totals.total_games is not None and totals.total_points is not None:
+                    league_seasons_and_totals.append((league_season, totals))
+                    updated_league_season = LeagueSeason()
+                    updated_league_season.update_games_and_points(totals.total_games, totals.total_points)
+                    average_points = updated_league_season.average_points
+                average_points_by_league[str(league_season.league_id)] = average_points
+
+        with report.time_phase(WEEK_COUNT):
+            games = self._game_repository.get_games_by_season(season_id)
+            src_week_count = _get_max_week(games, season_id)
+            dest_season = None if src_week_count is None else self._season_repository.get_season(season_id)
+
+        team_seasons = []
+        league_average_points = {}
+        if src_week_count is not None and src_week_count >= 3:
+            with report.time_phase(RANKING):
+                team_seasons = self._team_season_repository.get_team_seasons_by_season(season_id) or []
+                league_average_points = {
+                    team_season.league_id: average_points_by_league.get(str(team_season.league_id))
+                    for team_season in team_seasons
+                }
+
+        self._update_season(report, season_id, league_seasons_and_totals, src_week_count, dest_season, team_seasons,
+                            games, league_average_points, incremental)
 
-        if src_week_count >= 3:
-            self._update_rankings(season_id)
+    def _update_season(self, report: WeeklyUpdateReport, season_id: int,
+                       league_seasons_and_totals: List[Tuple[LeagueSeason, LeagueSeasonTotals]],
+                       src_week_count: int | None, dest_season: Season | None, team_seasons: List[TeamSeason],
+                       games: List[Game], league_average_points: Dict[int, float | None], incremental: bool) -> None:
+        apply_rankings = list
+        record_ranked_version = True
+        ranked = src_week_count is not None and src_week_count >= 3 and len(team_seasons) > 0
+        if ranked:
+            with report.time_phase(RANKING):
+                if self._ratings_solver is not None:
+                    apply_rankings = self._solve_rankings(team_seasons, games, league_average_points)
 
-    def _update_league_season(self, league_id: int, season_id: int) -> None:
+                    # Solved factors depend on the league average, so they are not recorded as ranked, and an
+                    # incremental update will recalculate them in one pass.
+                    record_ranked_version = False
+                elif incremental:
+                    apply_rankings = self._calculate_rankings_incrementally(team_seasons, games,
+                                                                            league_average_points)
+                else:
+                    apply_rankings = self._calculate_rankings(team_seasons, games, league_average_points)
+
+        with report.time_phase(PERSISTENCE):
+            rows_touched = 0
+            for league_season, league_season_totals in league_seasons_and_totals:
+                league_season.update_games_and_points(league_season_totals.total_games,
+                                                      league_season_totals.total_points)
+                self._league_season_repository.update_league_season(league_season, commit=False)
+                rows_touched += 1
+
+            if src_week_count is not None and dest_season is not None:
+                dest_season.num_of_weeks_completed = src_week_count
+                self._season_repository.update_season(dest_season, commit=False)
+                rows_touched += 1
+
+            with report.time_phase(RANKING):
+                ranked_team_seasons = apply_rankings()
+
+            if ranked:
+                rows_touched += self._team_season_week_rating_repository.replace_team_season_week_ratings(
+                    season_id, src_week_count, team_seasons, commit=False
+                )
+
+            # The rankings are written last, and commit the league seasons, season, and week's ratings with them.
+            self._team_season_repository.update_team_season_rankings(ranked_team_seasons,
+                                                                     record_ranked_version=record_ranked_version)
+            report.rows_touched = rows_touched + len(ranked_team_seasons)
+
+    def _get_league_season_and_totals(
+            self, league_id: int, season_id: int
+    ) -> Tuple[LeagueSeason | None, LeagueSeasonTotals | None]:
         league_season_totals = self._league_season_totals_repository.get_league_season_totals(league_id, season_id)
         if (
                 league_season_totals is None
                 or league_season_totals.total_games is None
                 or league_season_totals.total_points is None
         ):
-            return
+            return None, None
 
         league_season = self._league_season_repository.get_league_season_by_league_and_season(league_id, season_id)
         if league_season is None:
-            return
+            return None, None
 
-        league_season.update_games_and_points(league_season_totals.total_games, league_season_totals.total_points)
-        self._league_season_repository.update_league_season(league_season)
+        return league_season, league_season_totals
 
-    def _update_week_count(self, season_id: int) -> int:
-        try:
-            src_week_count = max(
-                [game.week for game in self._game_repository.get_games() if game.season_id == season_id]
-            )
-        except TypeError:
-            return 0
-        except ValueError:
-            return 0
+    def _calculate_rankings(self, team_seasons: List[TeamSeason], games: List[Game],
+                            league_average_points: Dict[int, float | None]) -> Callable[[], List[TeamSeason]]:
+        with self.last_weekly_update_report.time_phase(SCHEDULE_TOTALS):
+            team_season_schedules = self._get_team_season_schedules(team_seasons, games)
+
+        rankings = []
+        for team_season in team_seasons:
+            team_season_schedule_averages = \
+                self._get_team_season_schedule_averages(team_season, team_season_schedules)
+            if team_season_schedule_averages is None:
+                continue
 
-        dest_season = self._season_repository.get_season(season_id)
-        if dest_season is not None:
-            dest_season.num_of_weeks_completed = src_week_count
+            average_points = league_average_points[team_season.league_id]
+            if average_points is None:
+                continue
 
-        self._season_repository.update_season(dest_season)
-        return src_week_count
+            rankings.append((team_season, team_season_schedule_averages, average_points))
 
-    def _update_rankings(self, season_id: int) -> None:
-        team_seasons = self._team_season_repository.get_team_seasons_by_season(season_id)
-        if team_seasons is None:
-            return
+        def apply_rankings() -> List[TeamSeason]:
+            for team_season, averages, average_points in rankings:
+                team_season.update_rankings(averages.points_for, averages.points_against, average_points)
+            return [team_season for team_season, _, _ in rankings]
 
+        return apply_rankings
+
+    def _calculate_rankings_incrementally(
+            self, team_seasons: List[TeamSeason], games: List[Game], league_average_points: Dict[int, float | None]
+    ) -> Callable[[], List[TeamSeason]]:
+        affected_team_ids = self._get_affected_team_ids(team_seasons, OpponentGraph(games))
+
+        if self._team_season_schedule_repository is not None:
+            team_season_schedules = self._team_season_schedule_repository
+        else:
+            with self.last_weekly_update_report.time_phase(SCHEDULE_TOTALS):
+                team_season_schedules = TeamSeasonScheduleCalculator(games, team_seasons, affected_team_ids)
+
+        ranked_team_seasons = []
+        schedule_averages = []
+        ranked_league_average_points = []
+        reindexed_team_seasons = []
+        reindexed_league_average_points = []
         for team_season in team_seasons:
-            self._update_rankings_for_team_season(team_season)
+            if league_average_points[team_season.league_id] is None:
+                continue
+
+            if team_season.team_id not in affected_team_ids:
+                reindexed_team_seasons.append(team_season)
+                reindexed_league_average_points.append(league_average_points[team_season.league_id])
+                continue
+
+            team_season_schedule_averages = \
+                self._get_team_season_schedule_averages(team_season, team_season_schedules)
+            if team_season_schedule_averages is not None:
+                # Team seasons that cannot be ranked are not written, so they stay affected until they can be.
+                ranked_team_seasons.append(team_season)
+                schedule_averages.append(team_season_schedule_averages)
+                ranked_league_average_points.append(league_average_points[team_season.league_id])
 
-    def _update_rankings_for_team_season(self, team_season: TeamSeason) -> None:
-        team_season_schedule_totals = self._team_season_schedule_repository.get_team_season_schedule_totals(
-            team_season.team_id, team_season.season_id
+        ranked_ratings = TeamSeasonRatings.from_team_seasons(
+            ranked_team_seasons,
+            [averages.points_for for averages in schedule_averages],
+            [averages.points_against for averages in schedule_averages],
+            ranked_league_average_points
         )
+        reindexed_ratings = TeamSeasonRatings.reindex(reindexed_team_seasons, reindexed_league_average_points)
+
+        def apply_rankings() -> List[TeamSeason]:
+            ranked_ratings.apply_to(ranked_team_seasons)
+
+            # Every ranked team season is written, even if its rankings are unchanged, to record that it is up to
+            # date.
+            return ranked_team_seasons + reindexed_ratings.apply_to(reindexed_team_seasons)
+
+        return apply_rankings
+
+    def _solve_rankings(self, team_seasons: List[TeamSeason], games: List[Game],
+                        league_average_points: Dict[int, float | None]) -> Callable[[], List[TeamSeason]]:
+        ratings, self.last_ratings_solver_report = self._ratings_solver.solve(
+            team_seasons,
+            games,
+            [league_average_points[team_season.league_id] for team_season in team_seasons]
+        )
+
+        # As in a one-pass update, team seasons without a league average keep the rankings they had.
+        positions = [
+            i for i, team_season in enumerate(team_seasons) if league_average_points[team_season.league_id] is not None
+        ]
+        return lambda: ratings.take(positions).apply_to([team_seasons[i] for i in positions])
+
+    def _get_league_season_average_points(self, league_id: int, season_id: int,
+                                          updated_average_points: Dict[int, float | None]) -> float | None:
+        # The league season being updated has not been changed yet, so its new average is looked up by its id.
+        league_season = self._league_season_repository.get_league_season_by_league_and_season(league_id, season_id)
+        if league_season is None:
+            return None
+
+        return updated_average_points.get(league_season.id, league_season.average_points)
+
+    def _get_affected_team_ids(self, team_seasons: List[TeamSeason], opponent_graph: OpponentGraph) -> Set[str]:
+        changed_team_ids = [
+            team_season.team_id for team_season in team_seasons
+            if team_season.ranked_version_id != team_season.version_id
+        ]
+        affected_team_ids = opponent_graph.get_affected_team_ids(changed_team_ids)
+        if len(affected_team_ids) >= self._full_recompute_threshold * len(team_seasons):
+            return {team_season.team_id for team_season in team_seasons}
+
+        return affected_team_ids
+
+    def _get_team_season_schedules(
+            self, team_seasons: List[TeamSeason], games: List[Game]
+    ) -> TeamSeasonScheduleRepository | TeamSeasonScheduleCalculator:
+        if self._team_season_schedule_repository is not None:
+            return self._team_season_schedule_repository
+
+        return TeamSeasonScheduleCalculator(games, team_seasons)
+
+    def _get_team_season_schedule_averages(
+            self, team_season: TeamSeason,
+            team_season_schedules: TeamSeasonScheduleRepository | TeamSeasonScheduleCalculator
+    ) -> TeamSeasonScheduleAverages | None:
+        with self.last_weekly_update_report.time_phase(SCHEDULE_TOTALS):
+            team_season_schedule_totals = team_season_schedules.get_team_season_schedule_totals(
+                team_season.team_id, team_season.season_id
+            )
         if (team_season_schedule_totals is None) or (team_season_schedule_totals.schedule_games is None):
-            return
+            return None
 
-        team_season_schedule_averages = \
-            self._team_season_schedule_repository.get_team_season_schedule_averages(team_season.team_id,
-                                                                                    team_season.season_id)
+        with self.last_weekly_update_report.time_phase(SCHEDULE_AVERAGES):
+            team_season_schedule_averages = \
+                team_season_schedules.get_team_season_schedule_averages(team_season.team_id, team_season.season_id)
         if (
                 team_season_schedule_averages is None
                 or team_season_schedule_averages.points_for is None
                 or team_season_schedule_averages.points_against is None
         ):
-            return
+            return None
+
+        return team_season_schedule_averages
+
+
+class _LeagueAveragePoints(dict):
+    # Looks up the average points of each league the first time one of its team seasons is ranked.
+    def __init__(self, get_average_points: Callable[[int], float | None]) -> None:
+        super().__init__()
+        self._get_average_points = get_average_points
+
+    def __missing__(self, league_id: int) -> float | None:
+        average_points = self[league_id] = self._get_average_points(league_id)
+        return average_points
 
-        league_season = self._league_season_repository.get_league_season_by_league_and_season(
-            team_season.league_id, team_season.season_id
-        )
-        if (league_season is None) or (league_season.average_points is None):
-            return
 
-        team_season.update_rankings(team_season_schedule_averages.points_for,
-                                    team_season_schedule_averages.points_against,
-                                    league_season.average_points)
-        self._team_season_repository.update_team_season(team_season)
+def _get_max_week(games: Iterable[Game] | None, season_id: int) -> int | None:
+    try:
+        return max([game.week for game in games if game.season_id == season_id])
+    except TypeError:
+        return None
+    except ValueError:
+        return None
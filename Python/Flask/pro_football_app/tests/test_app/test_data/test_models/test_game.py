@@ -346,3 +346,14 @@ def test_is_tie_when_guest_score_equals_host_score_should_return_true():
 
     # Assert
     assert result
+
+
+def test_natural_key_should_return_season_week_guest_and_host():
+    # Arrange
+    test_game = Game(season_id=1, week=2, guest_name="Guest", guest_score=0, host_name="Host", host_score=0)
+
+    # Act
+    result = test_game.natural_key()
+
+    # Assert
+    assert result == (1, 2, "Guest", "Host")
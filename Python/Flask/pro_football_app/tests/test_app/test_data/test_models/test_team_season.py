@@ -264,6 +264,38 @@ def test_calculate_winning_percentage_when_team_has_500_record_with_ties(test_te
     assert test_team_season.winning_percentage == Fraction((2 * wins) + ties, (2 * games))
 
 
+def test_calculate_stale_derived_fields_when_derived_fields_are_stale_should_calculate_them(test_team_season):
+    # Arrange
+    test_team_season.games = 2
+    test_team_season.wins = 2
+    test_team_season.ties = 0
+    test_team_season.points_for = 40
+    test_team_season.points_against = 20
+    test_team_season.mark_derived_fields_stale()
+
+    # Act
+    test_team_season.calculate_stale_derived_fields()
+
+    # Assert
+    assert test_team_season.winning_percentage == 1
+    assert test_team_season.expected_wins + test_team_season.expected_losses == pytest.approx(2)
+
+
+def test_calculate_stale_derived_fields_when_derived_fields_are_not_stale_should_not_calculate_them(
+        test_team_season
+):
+    # Arrange
+    test_team_season.games = 2
+    test_team_season.wins = 2
+    test_team_season.ties = 0
+
+    # Act
+    test_team_season.calculate_stale_derived_fields()
+
+    # Assert
+    assert test_team_season.winning_percentage is None
+
+
 def test_update_rankings_when_team_games_is_zero_should_set_all_rankings_to_none(test_team_season):
     # Arrange
     test_team_season.games = 0
@@ -0,0 +1,127 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_ratings import RANKINGS, TeamSeasonRatings, calculate_expected_winning_percentage, \
+    divide, update_rankings
+
+
+def test_divide_when_denominator_is_zero_or_nan_should_return_nan():
+    # Act
+    quotients = divide([10, 10, 10, np.nan], [4, 0, np.nan, 2])
+
+    # Assert
+    assert quotients[0] == 2.5
+    assert np.isnan(quotients[1:]).all()
+
+
+def test_calculate_expected_winning_percentage_when_points_are_zero_should_return_nan():
+    # Act
+    percentages = calculate_expected_winning_percentage([0, 20, 20], [0, 0, 20])
+
+    # Assert
+    assert np.isnan(percentages[0])
+    assert percentages[1:].tolist() == [1.0, 0.5]
+
+
+def test_update_rankings_when_games_is_zero_should_return_nan_rankings():
+    # Act
+    average, factor, index = update_rankings([0, 30], [0, 2], [20, 20], 20)
+
+    # Assert
+    assert np.isnan([average[0], factor[0], index[0]]).all()
+    assert (average[1], factor[1], index[1]) == (15, 0.75, 15)
+
+
+def test_update_rankings_when_schedule_average_points_is_none_should_return_nan_factor_and_index():
+    # Act
+    average, factor, index = update_rankings([30], [2], [None], 20)
+
+    # Assert
+    assert average[0] == 15
+    assert np.isnan([factor[0], index[0]]).all()
+
+
+def test_apply_to_when_indices_cannot_be_calculated_should_leave_final_expected_winning_percentage_unchanged():
+    # Arrange
+    team_season = TeamSeason(team_id="Team 1", season_id=1, league_id=1, games=0, points_for=0, points_against=0,
+                             final_expected_winning_percentage=0.5)
+
+    # Act
+    ratings = TeamSeasonRatings.from_team_seasons([team_season], [20], [20], 20)
+    ratings.apply_to([team_season])
+
+    # Assert
+    assert team_season.offensive_average is None
+    assert team_season.defensive_index is None
+    assert team_season.final_expected_winning_percentage == 0.5
+
+
+def test_team_season_ratings_should_match_team_season_update_rankings():
+    # Arrange
+    generator = random.Random(39)
+    expected_team_seasons = []
+    schedule_average_points_for = []
+    schedule_average_points_against = []
+    league_average_points = []
+    for season_id in range(1, 101):
+        league_average = generator.uniform(15, 30)
+        for team in range(1, 33):
+            games = generator.choice([0, 16, 17])
+            expected_team_seasons.append(TeamSeason(
+                team_id=f"Team {team}", season_id=season_id, league_id=1, games=games,
+                points_for=games * generator.randint(0, 40), points_against=games * generator.randint(0, 40)
+            ))
+            schedule_average_points_for.append(generator.choice([0.0, round(generator.uniform(10, 35), 2)]))
+            schedule_average_points_against.append(round(generator.uniform(10, 35), 2))
+            league_average_points.append(league_average)
+
+    actual_team_seasons = [
+        TeamSeason(team_id=team_season.team_id, season_id=team_season.season_id, league_id=1,
+                   games=team_season.games, points_for=team_season.points_for,
+                   points_against=team_season.points_against)
+        for team_season in expected_team_seasons
+    ]
+
+    # Act
+    ratings = TeamSeasonRatings.from_team_seasons(actual_team_seasons, schedule_average_points_for,
+                                                  schedule_average_points_against, league_average_points)
+    ratings.apply_to(actual_team_seasons)
+
+    # Assert
+    assert len(ratings) == 3200
+    for i, expected in enumerate(expected_team_seasons):
+        expected.update_rankings(schedule_average_points_for[i], schedule_average_points_against[i],
+                                 league_average_points[i])
+        for name in RANKINGS:
+            expected_value = getattr(expected, name)
+            actual_value = getattr(actual_team_seasons[i], name)
+            if expected_value is None:
+                assert actual_value is None
+            else:
+                assert math.isclose(actual_value, expected_value, rel_tol=1e-12, abs_tol=1e-12)
+
+
+def test_reindex_should_recalculate_indices_from_stored_averages_and_factors():
+    # Arrange
+    team_season = TeamSeason(team_id="Team 1", season_id=1, league_id=1, games=2, points_for=40, points_against=30)
+    team_season.update_rankings(15, 20, 20)
+    unchanged_team_season = TeamSeason(team_id="Team 2", season_id=1, league_id=1, games=2, points_for=40,
+                                       points_against=30)
+    unchanged_team_season.update_rankings(15, 20, 20)
+    TeamSeasonRatings.reindex([unchanged_team_season], 24).apply_to([unchanged_team_season])
+
+    # Act
+    changed_team_seasons = TeamSeasonRatings.reindex([team_season, unchanged_team_season], 24).apply_to(
+        [team_season, unchanged_team_season]
+    )
+
+    # Assert
+    expected = TeamSeason(team_id="Team 1", season_id=1, league_id=1, games=2, points_for=40, points_against=30)
+    expected.update_rankings(15, 20, 24)
+    assert changed_team_seasons == [team_season]
+    assert [getattr(team_season, name) for name in RANKINGS] == \
+           pytest.approx([getattr(expected, name) for name in RANKINGS], rel=1e-12)
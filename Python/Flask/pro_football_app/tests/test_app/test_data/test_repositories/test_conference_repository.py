@@ -230,10 +230,10 @@ def test_conference_exists_should_query_database(fake_exists, fake_sqla):
     assert conference_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.conference_repository.ConferenceRepository.conference_exists')
-def test_update_conference_when_conference_does_not_exist_should_return_conference(fake_conference_exists):
+@patch('app.data.repositories.conference_repository.sqla')
+def test_update_conference_when_conference_does_not_exist_should_return_conference(fake_sqla):
     # Arrange
-    fake_conference_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -246,24 +246,17 @@ def test_update_conference_when_conference_does_not_exist_should_return_conferen
         conference_updated = test_repo.update_conference(conference_to_update)
 
     # Assert
-    fake_conference_exists.assert_called_once_with(conference_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert conference_updated is conference_to_update
 
 
 @patch('app.data.repositories.conference_repository.sqla')
-@patch('app.data.repositories.conference_repository.ConferenceRepository.get_conference')
-@patch('app.data.repositories.conference_repository.ConferenceRepository.conference_exists')
-def test_update_conference_when_conference_exists_should_update_and_return_conference(
-        fake_conference_exists, fake_get_conference, fake_sqla
-):
+def test_update_conference_when_conference_exists_should_update_and_return_conference(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_conference_exists.return_value = True
-        old_conference = Conference(
-            id=1, short_name="A", long_name="A", league_id=1, first_season_id=1, last_season_id=2
-        )
-        fake_get_conference.return_value = old_conference
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_conference = Conference(
             id=1, short_name="Z", long_name="Z", league_id=97, first_season_id=98, last_season_id=99
@@ -274,22 +267,22 @@ def test_update_conference_when_conference_exists_should_update_and_return_confe
         conference_updated = test_repo.update_conference(new_conference)
 
     # Assert
-    fake_conference_exists.assert_called_once_with(old_conference.id)
-    fake_get_conference.assert_called_once_with(old_conference.id)
-    assert conference_updated.short_name == new_conference.short_name
-    assert conference_updated.long_name == new_conference.long_name
-    assert conference_updated.league_id == new_conference.league_id
-    assert conference_updated.first_season_id == new_conference.first_season_id
-    assert conference_updated.last_season_id == new_conference.last_season_id
-    fake_sqla.session.add.assert_called_once_with(old_conference)
+    fake_sqla.session.execute.assert_called_once()
+    statement = fake_sqla.session.execute.call_args.args[0]
+    assert str(statement.whereclause) == "conference.id = :id_1"
+    assert statement.compile().params == {
+        'id_1': 1, 'short_name': "Z", 'long_name': "Z", 'league_id': 97, 'first_season_id': 98,
+        'last_season_id': 99
+    }
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert conference_updated is new_conference
 
 
-@patch('app.data.repositories.conference_repository.ConferenceRepository.conference_exists')
-def test_delete_conference_when_conference_does_not_exist_should_return_none(fake_conference_exists):
+@patch('app.data.repositories.conference_repository.sqla')
+def test_delete_conference_when_conference_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_conference_exists.return_value = False
+    fake_sqla.session.get.return_value = None
     id = 1
 
     test_app = create_app()
@@ -299,16 +292,14 @@ def test_delete_conference_when_conference_does_not_exist_should_return_none(fak
         conference_deleted = test_repo.delete_conference(id=id)
 
     # Assert
-    fake_conference_exists.assert_called_once_with(id)
+    fake_sqla.session.get.assert_called_once_with(Conference, id)
+    fake_sqla.session.delete.assert_not_called()
     assert conference_deleted is None
 
 
 @patch('app.data.repositories.conference_repository.sqla')
-@patch('app.data.repositories.conference_repository.ConferenceRepository.get_conference')
-@patch('app.data.repositories.conference_repository.ConferenceRepository.conference_exists')
-def test_delete_conference_when_conference_exists_should_return_conference(fake_conference_exists, fake_get_conference, fake_sqla):
+def test_delete_conference_when_conference_exists_should_return_conference(fake_sqla):
     # Arrange
-    fake_conference_exists.return_value = True
     id = 1
 
     test_app = create_app()
@@ -318,8 +309,7 @@ def test_delete_conference_when_conference_exists_should_return_conference(fake_
         conference_deleted = test_repo.delete_conference(id=id)
 
     # Assert
-    fake_conference_exists.assert_called_once_with(id)
-    fake_get_conference.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_conference.return_value)
+    fake_sqla.session.get.assert_called_once_with(Conference, id)
+    fake_sqla.session.delete.assert_called_once_with(fake_sqla.session.get.return_value)
     fake_sqla.session.commit.assert_called_once()
-    return conference_deleted is fake_get_conference.return_value
+    assert conference_deleted is fake_sqla.session.get.return_value
@@ -229,10 +229,10 @@ def test_division_exists_should_query_database(fake_exists, fake_sqla):
     assert division_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.division_repository.DivisionRepository.division_exists')
-def test_update_division_when_division_does_not_exist_should_return_division(fake_division_exists):
+@patch('app.data.repositories.division_repository.sqla')
+def test_update_division_when_division_does_not_exist_should_return_division(fake_sqla):
     # Arrange
-    fake_division_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -244,24 +244,17 @@ def test_update_division_when_division_does_not_exist_should_return_division(fak
         division_updated = test_repo.update_division(division_to_update)
 
     # Assert
-    fake_division_exists.assert_called_once_with(division_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert division_updated is division_to_update
 
 
 @patch('app.data.repositories.division_repository.sqla')
-@patch('app.data.repositories.division_repository.DivisionRepository.get_division')
-@patch('app.data.repositories.division_repository.DivisionRepository.division_exists')
-def test_update_division_when_division_exists_should_update_and_return_division(
-        fake_division_exists, fake_get_division, fake_sqla
-):
+def test_update_division_when_division_exists_should_update_and_return_division(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_division_exists.return_value = True
-        old_division = Division(
-            id=1, name="A", league_id=1, conference_id=1, first_season_id=1, last_season_id=2
-        )
-        fake_get_division.return_value = old_division
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_division = Division(
             id=1, name="Z", league_id=96, conference_id=97, first_season_id=98, last_season_id=99
@@ -272,22 +265,22 @@ def test_update_division_when_division_exists_should_update_and_return_division(
         division_updated = test_repo.update_division(new_division)
 
     # Assert
-    fake_division_exists.assert_called_once_with(old_division.id)
-    fake_get_division.assert_called_once_with(old_division.id)
-    assert division_updated.name == new_division.name
-    assert division_updated.league_id == new_division.league_id
-    assert division_updated.conference_id == new_division.conference_id
-    assert division_updated.first_season_id == new_division.first_season_id
-    assert division_updated.last_season_id == new_division.last_season_id
-    fake_sqla.session.add.assert_called_once_with(old_division)
+    fake_sqla.session.execute.assert_called_once()
+    statement = fake_sqla.session.execute.call_args.args[0]
+    assert str(statement.whereclause) == "division.id = :id_1"
+    assert statement.compile().params == {
+        'id_1': 1, 'name': "Z", 'league_id': 96, 'conference_id': 97, 'first_season_id': 98,
+        'last_season_id': 99
+    }
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert division_updated is new_division
 
 
-@patch('app.data.repositories.division_repository.DivisionRepository.division_exists')
-def test_delete_division_when_division_does_not_exist_should_return_none(fake_division_exists):
+@patch('app.data.repositories.division_repository.sqla')
+def test_delete_division_when_division_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_division_exists.return_value = False
+    fake_sqla.session.get.return_value = None
     id = 1
 
     test_app = create_app()
@@ -297,16 +290,14 @@ def test_delete_division_when_division_does_not_exist_should_return_none(fake_di
         division_deleted = test_repo.delete_division(id=id)
 
     # Assert
-    fake_division_exists.assert_called_once_with(id)
+    fake_sqla.session.get.assert_called_once_with(Division, id)
+    fake_sqla.session.delete.assert_not_called()
     assert division_deleted is None
 
 
 @patch('app.data.repositories.division_repository.sqla')
-@patch('app.data.repositories.division_repository.DivisionRepository.get_division')
-@patch('app.data.repositories.division_repository.DivisionRepository.division_exists')
-def test_delete_division_when_division_exists_should_return_division(fake_division_exists, fake_get_division, fake_sqla):
+def test_delete_division_when_division_exists_should_return_division(fake_sqla):
     # Arrange
-    fake_division_exists.return_value = True
     id = 1
 
     test_app = create_app()
@@ -316,8 +307,7 @@ def test_delete_division_when_division_exists_should_return_division(fake_divisi
         division_deleted = test_repo.delete_division(id=id)
 
     # Assert
-    fake_division_exists.assert_called_once_with(id)
-    fake_get_division.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_division.return_value)
+    fake_sqla.session.get.assert_called_once_with(Division, id)
+    fake_sqla.session.delete.assert_called_once_with(fake_sqla.session.get.return_value)
     fake_sqla.session.commit.assert_called_once()
-    return division_deleted is fake_get_division.return_value
+    assert division_deleted is fake_sqla.session.get.return_value
@@ -162,10 +162,10 @@ def test_game_exists_should_query_database(fake_exists, fake_sqla):
     assert game_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.game_repository.GameRepository.game_exists')
-def test_update_game_when_game_does_not_exist_should_return_game(fake_game_exists):
+@patch('app.data.repositories.game_repository.sqla')
+def test_update_game_when_game_does_not_exist_should_return_game(fake_sqla):
     # Arrange
-    fake_game_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -175,22 +175,17 @@ def test_update_game_when_game_does_not_exist_should_return_game(fake_game_exist
         game_updated = test_repo.update_game(game_to_update)
 
     # Assert
-    fake_game_exists.assert_called_once_with(game_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert game_updated is game_to_update
 
 
 @patch('app.data.repositories.game_repository.sqla')
-@patch('app.data.repositories.game_repository.GameRepository.get_game')
-@patch('app.data.repositories.game_repository.GameRepository.game_exists')
-def test_update_game_when_game_exists_should_update_and_return_game(
-        fake_game_exists, fake_get_game, fake_sqla
-):
+def test_update_game_when_game_exists_should_update_and_return_game(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_game_exists.return_value = True
-        old_game = Game(season_id=1, week=1, guest_name="Guest1", guest_score=1, host_name="Host1", host_score=2)
-        fake_get_game.return_value = old_game
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_game = Game(season_id=99, week=99, guest_name="Guest99", guest_score=99, host_name="Host99", host_score=99)
 
@@ -199,23 +194,16 @@ def test_update_game_when_game_exists_should_update_and_return_game(
         game_updated = test_repo.update_game(new_game)
 
     # Assert
-    fake_game_exists.assert_called_once_with(old_game.id)
-    fake_get_game.assert_called_once_with(old_game.id)
-    assert game_updated.season_id == new_game.season_id
-    assert game_updated.week == new_game.week
-    assert game_updated.guest_name == new_game.guest_name
-    assert game_updated.guest_score == new_game.guest_score
-    assert game_updated.host_name == new_game.host_name
-    assert game_updated.host_score == new_game.host_score
-    fake_sqla.session.add.assert_called_once_with(old_game)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert game_updated is new_game
 
 
-@patch('app.data.repositories.game_repository.GameRepository.game_exists')
-def test_delete_game_when_game_does_not_exist_should_return_none(fake_game_exists):
+@patch('app.data.repositories.game_repository.sqla')
+def test_delete_game_when_game_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_game_exists.return_value = False
+    fake_sqla.session.execute.return_value.scalar_one_or_none.return_value = None
     id = 1
 
     test_app = create_app()
@@ -225,16 +213,15 @@ def test_delete_game_when_game_does_not_exist_should_return_none(fake_game_exist
         game_deleted = test_repo.delete_game(id=id)
 
     # Assert
-    fake_game_exists.assert_called_once_with(id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert game_deleted is None
 
 
 @patch('app.data.repositories.game_repository.sqla')
-@patch('app.data.repositories.game_repository.GameRepository.get_game')
-@patch('app.data.repositories.game_repository.GameRepository.game_exists')
-def test_delete_game_when_game_exists_should_return_game(fake_game_exists, fake_get_game, fake_sqla):
+def test_delete_game_when_game_exists_should_return_game(fake_sqla):
     # Arrange
-    fake_game_exists.return_value = True
+    deleted = fake_sqla.session.execute.return_value.scalar_one_or_none.return_value
     id = 1
 
     test_app = create_app()
@@ -244,8 +231,126 @@ def test_delete_game_when_game_exists_should_return_game(fake_game_exists, fake_
         game_deleted = test_repo.delete_game(id=id)
 
     # Assert
-    fake_game_exists.assert_called_once_with(id)
-    fake_get_game.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_game.return_value)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.expunge.assert_called_once_with(deleted)
     fake_sqla.session.commit.assert_called_once()
-    return game_deleted is fake_get_game.return_value
+    assert game_deleted is deleted
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_get_existing_natural_keys_when_games_arg_is_empty_should_not_query_database(fake_sqla):
+    # Arrange
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        natural_keys = test_repo.get_existing_natural_keys(())
+
+    # Assert
+    fake_sqla.session.execute.assert_not_called()
+    assert natural_keys == set()
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_get_existing_natural_keys_when_games_arg_is_not_empty_should_return_matching_keys_from_one_query(fake_sqla):
+    # Arrange
+    games = (
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=2, guest_name="Team 2", guest_score=20, host_name="Team 1", host_score=10),
+    )
+    fake_sqla.session.execute.return_value.all.return_value = [
+        (1, 1, "Team 1", "Team 2"),
+        (1, 1, "Team 2", "Team 1"),
+    ]
+
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        natural_keys = test_repo.get_existing_natural_keys(games)
+
+    # Assert
+    fake_sqla.session.execute.assert_called_once()
+    assert natural_keys == {(1, 1, "Team 1", "Team 2")}
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_get_team_season_results_should_total_results_in_one_query(fake_sqla):
+    # Arrange
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        results = test_repo.get_team_season_results(first_season_id=1, last_season_id=100)
+
+    # Assert
+    fake_sqla.session.execute.assert_called_once()
+    assert results == fake_sqla.session.execute.return_value.all.return_value
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_insert_games_should_insert_games_in_one_statement_and_set_ids(fake_sqla):
+    # Arrange
+    games = (
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 4", host_score=10),
+    )
+    fake_sqla.session.execute.return_value.scalars.return_value.all.return_value = [7, 8]
+
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        games_inserted = test_repo.insert_games(games, commit=False)
+
+    # Assert
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
+    assert [game.id for game in games_inserted] == [7, 8]
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_update_games_when_games_arg_is_empty_should_only_commit(fake_sqla):
+    # Arrange
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        test_repo.update_games(())
+
+    # Assert
+    fake_sqla.session.execute.assert_not_called()
+    fake_sqla.session.commit.assert_called_once()
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_delete_games_should_delete_games_in_one_statement(fake_sqla):
+    # Arrange
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        test_repo.delete_games({1, 2})
+
+    # Assert
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_called_once()
+
+
+@patch('app.data.repositories.game_repository.sqla')
+def test_delete_games_by_season_and_week_should_delete_games_in_one_statement_and_return_them(fake_sqla):
+    # Arrange
+    deleted = [Game(id=1), Game(id=2)]
+    fake_sqla.session.execute.return_value.scalars.return_value.all.return_value = deleted
+
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = GameRepository()
+        games_deleted = test_repo.delete_games_by_season_and_week(season_id=1, week=1, commit=False)
+
+    # Assert
+    fake_sqla.session.execute.assert_called_once()
+    assert fake_sqla.session.expunge.call_count == 2
+    fake_sqla.session.commit.assert_not_called()
+    assert games_deleted is deleted
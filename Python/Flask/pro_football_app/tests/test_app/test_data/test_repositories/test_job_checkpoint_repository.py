@@ -0,0 +1,67 @@
+import pytest
+
+from flask import Flask
+from unittest.mock import patch
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.data.sqla import sqla
+from app.data.timestamps import utc_now
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        JobCheckpoint.__table__.create(sqla.engine)
+        yield app
+        sqla.session.remove()
+
+
+def test_save_job_checkpoint_should_replace_earlier_checkpoint_of_job(sqlite_app):
+    # Arrange
+    test_repo = JobCheckpointRepository()
+    test_repo.save_job_checkpoint("backfill-weekly-updates:1-3", 1, None, 'weekly_update')
+
+    # Act
+    test_repo.save_job_checkpoint("backfill-weekly-updates:1-3", 2, 'NFL', 'weekly_update')
+
+    # Assert
+    job_checkpoint = JobCheckpoint.query.one()
+    assert (job_checkpoint.season_id, job_checkpoint.league_id) == (2, 'NFL')
+    assert test_repo.get_job_checkpoint("backfill-weekly-updates:1-3") is job_checkpoint
+    assert test_repo.get_job_checkpoint("rebuild-team-seasons:1-3") is None
+
+
+def test_save_job_checkpoint_should_record_naive_utc_time_of_each_save(sqlite_app):
+    # Arrange
+    test_repo = JobCheckpointRepository()
+    before = utc_now()
+
+    # Act
+    test_repo.save_job_checkpoint("backfill-weekly-updates:1-3", 1, None, 'weekly_update')
+    first_updated_at = JobCheckpoint.query.one().updated_at
+    with patch('app.data.timestamps.datetime') as fake_datetime:
+        fake_datetime.now.return_value = before.replace(year=before.year + 1)
+        test_repo.save_job_checkpoint("backfill-weekly-updates:1-3", 2, None, 'weekly_update')
+
+    # Assert
+    assert first_updated_at.tzinfo is None
+    assert before <= first_updated_at <= utc_now()
+    assert JobCheckpoint.query.one().updated_at > first_updated_at
+
+
+def test_delete_job_checkpoint_should_delete_checkpoint_of_job(sqlite_app):
+    # Arrange
+    test_repo = JobCheckpointRepository()
+    test_repo.save_job_checkpoint("rebuild-team-seasons:1-3", 1, None, 'rebuild')
+
+    # Act
+    deleted = test_repo.delete_job_checkpoint("rebuild-team-seasons:1-3")
+
+    # Assert
+    assert deleted.season_id == 1
+    assert JobCheckpoint.query.count() == 0
+    assert test_repo.delete_job_checkpoint("rebuild-team-seasons:1-3") is None
@@ -229,10 +229,10 @@ def test_league_exists_should_query_database(fake_exists, fake_sqla):
     assert league_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.league_repository.LeagueRepository.league_exists')
-def test_update_league_when_league_does_not_exist_should_return_league(fake_league_exists):
+@patch('app.data.repositories.league_repository.sqla')
+def test_update_league_when_league_does_not_exist_should_return_league(fake_sqla):
     # Arrange
-    fake_league_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -244,24 +244,17 @@ def test_update_league_when_league_does_not_exist_should_return_league(fake_leag
         league_updated = test_repo.update_league(league_to_update)
 
     # Assert
-    fake_league_exists.assert_called_once_with(league_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert league_updated is league_to_update
 
 
 @patch('app.data.repositories.league_repository.sqla')
-@patch('app.data.repositories.league_repository.LeagueRepository.get_league')
-@patch('app.data.repositories.league_repository.LeagueRepository.league_exists')
-def test_update_league_when_league_exists_should_update_and_return_league(
-        fake_league_exists, fake_get_league, fake_sqla
-):
+def test_update_league_when_league_exists_should_update_and_return_league(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_league_exists.return_value = True
-        old_league = League(
-            id=1, short_name="A", long_name="A", first_season_id=1, last_season_id=2
-        )
-        fake_get_league.return_value = old_league
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_league = League(
             id=1, short_name="Z", long_name="Z", first_season_id=98, last_season_id=99
@@ -272,21 +265,19 @@ def test_update_league_when_league_exists_should_update_and_return_league(
         league_updated = test_repo.update_league(new_league)
 
     # Assert
-    fake_league_exists.assert_called_once_with(old_league.id)
-    fake_get_league.assert_called_once_with(old_league.id)
-    assert league_updated.short_name == new_league.short_name
-    assert league_updated.long_name == new_league.long_name
-    assert league_updated.first_season_id == new_league.first_season_id
-    assert league_updated.last_season_id == new_league.last_season_id
-    fake_sqla.session.add.assert_called_once_with(old_league)
+    fake_sqla.session.execute.assert_called_once()
+    statement = fake_sqla.session.execute.call_args.args[0]
+    assert str(statement.whereclause) == "league.id = :id_1"
+    assert statement.compile().params == {'id_1': 1, 'short_name': "Z", 'long_name': "Z", 'first_season_id': 98, 'last_season_id': 99}
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert league_updated is new_league
 
 
-@patch('app.data.repositories.league_repository.LeagueRepository.league_exists')
-def test_delete_league_when_league_does_not_exist_should_return_none(fake_league_exists):
+@patch('app.data.repositories.league_repository.sqla')
+def test_delete_league_when_league_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_league_exists.return_value = False
+    fake_sqla.session.get.return_value = None
     id = 1
 
     test_app = create_app()
@@ -296,16 +287,14 @@ def test_delete_league_when_league_does_not_exist_should_return_none(fake_league
         league_deleted = test_repo.delete_league(id=id)
 
     # Assert
-    fake_league_exists.assert_called_once_with(id)
+    fake_sqla.session.get.assert_called_once_with(League, id)
+    fake_sqla.session.delete.assert_not_called()
     assert league_deleted is None
 
 
 @patch('app.data.repositories.league_repository.sqla')
-@patch('app.data.repositories.league_repository.LeagueRepository.get_league')
-@patch('app.data.repositories.league_repository.LeagueRepository.league_exists')
-def test_delete_league_when_league_exists_should_return_league(fake_league_exists, fake_get_league, fake_sqla):
+def test_delete_league_when_league_exists_should_return_league(fake_sqla):
     # Arrange
-    fake_league_exists.return_value = True
     id = 1
 
     test_app = create_app()
@@ -315,8 +304,7 @@ def test_delete_league_when_league_exists_should_return_league(fake_league_exist
         league_deleted = test_repo.delete_league(id=id)
 
     # Assert
-    fake_league_exists.assert_called_once_with(id)
-    fake_get_league.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_league.return_value)
+    fake_sqla.session.get.assert_called_once_with(League, id)
+    fake_sqla.session.delete.assert_called_once_with(fake_sqla.session.get.return_value)
     fake_sqla.session.commit.assert_called_once()
-    return league_deleted is fake_get_league.return_value
+    assert league_deleted is fake_sqla.session.get.return_value
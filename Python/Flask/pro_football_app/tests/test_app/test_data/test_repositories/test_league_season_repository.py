@@ -226,10 +226,10 @@ def test_league_season_exists_should_query_database(fake_exists, fake_sqla):
     assert league_season_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.league_season_exists')
-def test_update_league_season_when_league_season_does_not_exist_should_return_league_season(fake_league_season_exists):
+@patch('app.data.repositories.league_season_repository.sqla')
+def test_update_league_season_when_league_season_does_not_exist_should_return_league_season(fake_sqla):
     # Arrange
-    fake_league_season_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -241,24 +241,17 @@ def test_update_league_season_when_league_season_does_not_exist_should_return_le
         league_season_updated = test_repo.update_league_season(league_season_to_update)
 
     # Assert
-    fake_league_season_exists.assert_called_once_with(league_season_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert league_season_updated is league_season_to_update
 
 
 @patch('app.data.repositories.league_season_repository.sqla')
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.get_league_season')
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.league_season_exists')
-def test_update_league_season_when_league_season_exists_should_update_and_return_league_season(
-        fake_league_season_exists, fake_get_league_season, fake_sqla
-):
+def test_update_league_season_when_league_season_exists_should_update_and_return_league_season(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_league_season_exists.return_value = True
-        old_league_season = LeagueSeason(
-            league_id=1, season_id=1, total_games=100, total_points=2000, average_points=20
-        )
-        fake_get_league_season.return_value = old_league_season
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_league_season = LeagueSeason(
             league_id=2, season_id=2, total_games=200, total_points=5000, average_points=25
@@ -269,19 +262,16 @@ def test_update_league_season_when_league_season_exists_should_update_and_return
         league_season_updated = test_repo.update_league_season(new_league_season)
 
     # Assert
-    fake_league_season_exists.assert_called_once_with(old_league_season.id)
-    fake_get_league_season.assert_called_once_with(old_league_season.id)
-    assert league_season_updated.league_id == new_league_season.league_id
-    assert league_season_updated.season_id == new_league_season.season_id
-    fake_sqla.session.add.assert_called_once_with(old_league_season)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert league_season_updated is new_league_season
 
 
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.league_season_exists')
-def test_delete_league_season_when_league_season_does_not_exist_should_return_none(fake_league_season_exists):
+@patch('app.data.repositories.league_season_repository.sqla')
+def test_delete_league_season_when_league_season_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_league_season_exists.return_value = False
+    fake_sqla.session.execute.return_value.scalar_one_or_none.return_value = None
     id = 1
 
     test_app = create_app()
@@ -291,16 +281,15 @@ def test_delete_league_season_when_league_season_does_not_exist_should_return_no
         league_season_deleted = test_repo.delete_league_season(id)
 
     # Assert
-    fake_league_season_exists.assert_called_once_with(id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert league_season_deleted is None
 
 
 @patch('app.data.repositories.league_season_repository.sqla')
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.get_league_season')
-@patch('app.data.repositories.league_season_repository.LeagueSeasonRepository.league_season_exists')
-def test_delete_league_season_when_league_season_exists_should_return_league_season(fake_league_season_exists, fake_get_league_season, fake_sqla):
+def test_delete_league_season_when_league_season_exists_should_return_league_season(fake_sqla):
     # Arrange
-    fake_league_season_exists.return_value = True
+    deleted = fake_sqla.session.execute.return_value.scalar_one_or_none.return_value
     id = 1
 
     test_app = create_app()
@@ -310,8 +299,7 @@ def test_delete_league_season_when_league_season_exists_should_return_league_sea
         league_season_deleted = test_repo.delete_league_season(id)
 
     # Assert
-    fake_league_season_exists.assert_called_once_with(id)
-    fake_get_league_season.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_league_season.return_value)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.expunge.assert_called_once_with(deleted)
     fake_sqla.session.commit.assert_called_once()
-    return league_season_deleted is fake_get_league_season.return_value
+    assert league_season_deleted is deleted
@@ -1,7 +1,12 @@
 from unittest.mock import patch
 
+from flask import Flask
+
 from app.data.models.league_season_totals import LeagueSeasonTotals
+from app.data.models.team import Team  # noqa: F401 - create_all needs the tables TeamSeason references.
+from app.data.models.team_season import TeamSeason
 from app.data.repositories.league_season_totals_repository import LeagueSeasonTotalsRepository
+from app.data.sqla import sqla
 
 
 @patch('app.data.repositories.league_season_totals_repository.sqla')
@@ -26,3 +31,30 @@ def test_get_league_season_totals_should_get_league_season_totals(fake_sqla):
     assert isinstance(result, LeagueSeasonTotals)
     assert result.total_games == total_games
     assert result.total_points == total_points
+
+
+def test_get_league_season_totals_by_season_should_sum_team_seasons_of_each_league():
+    # Arrange
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+        sqla.session.add_all([
+            TeamSeason(team_id="Team 1", season_id=1, league_id=1, games=3, points_for=60, points_against=40),
+            TeamSeason(team_id="Team 2", season_id=1, league_id=1, games=3, points_for=45, points_against=50),
+            TeamSeason(team_id="Team 3", season_id=1, league_id=2, games=2, points_for=30, points_against=20),
+            TeamSeason(team_id="Team 1", season_id=2, league_id=1, games=1, points_for=10, points_against=7),
+        ])
+        sqla.session.commit()
+
+        # Act
+        test_repository = LeagueSeasonTotalsRepository()
+        result = test_repository.get_league_season_totals_by_season(1)
+
+        sqla.session.remove()
+
+    # Assert
+    assert result.keys() == {"1", "2"}
+    assert (result["1"].total_games, result["1"].total_points) == (6, 105)
+    assert (result["2"].total_games, result["2"].total_points) == (2, 30)
@@ -230,10 +230,10 @@ def test_season_exists_should_query_database(fake_exists, fake_sqla):
     assert season_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.season_repository.SeasonRepository.season_exists')
-def test_update_season_when_season_does_not_exist_should_return_season(fake_season_exists):
+@patch('app.data.repositories.season_repository.sqla')
+def test_update_season_when_season_does_not_exist_should_return_season(fake_sqla):
     # Arrange
-    fake_season_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -243,42 +243,40 @@ def test_update_season_when_season_does_not_exist_should_return_season(fake_seas
         season_updated = test_repo.update_season(season_to_update)
 
     # Assert
-    fake_season_exists.assert_called_once_with(season_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert season_updated is season_to_update
 
 
 @patch('app.data.repositories.season_repository.sqla')
-@patch('app.data.repositories.season_repository.SeasonRepository.get_season')
-@patch('app.data.repositories.season_repository.SeasonRepository.season_exists')
-def test_update_season_when_season_exists_should_update_and_return_season(
-        fake_season_exists, fake_get_season, fake_sqla
-):
+def test_update_season_when_season_exists_should_update_and_return_season(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_season_exists.return_value = True
-        old_season = Season(id=1, year=1)
-        fake_get_season.return_value = old_season
+        fake_sqla.session.execute.return_value.rowcount = 1
 
-        new_season = Season(id=1, year=99)
+        new_season = Season(id=1, year=99, num_of_weeks_scheduled=17, num_of_weeks_completed=5)
 
         # Act
         test_repo = SeasonRepository()
         season_updated = test_repo.update_season(new_season)
 
     # Assert
-    fake_season_exists.assert_called_once_with(old_season.id)
-    fake_get_season.assert_called_once_with(old_season.id)
-    assert season_updated.year == new_season.year
-    fake_sqla.session.add.assert_called_once_with(old_season)
+    fake_sqla.session.execute.assert_called_once()
+    statement = fake_sqla.session.execute.call_args.args[0]
+    assert str(statement.whereclause) == "season.id = :id_1"
+    assert statement.compile().params == {
+        'id_1': 1, 'year': 99, 'num_of_weeks_scheduled': 17, 'num_of_weeks_completed': 5
+    }
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert season_updated is new_season
 
 
-@patch('app.data.repositories.season_repository.SeasonRepository.season_exists')
-def test_delete_season_when_season_does_not_exist_should_return_none(fake_season_exists):
+@patch('app.data.repositories.season_repository.sqla')
+def test_delete_season_when_season_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_season_exists.return_value = False
+    fake_sqla.session.get.return_value = None
     id = 1
 
     test_app = create_app()
@@ -288,16 +286,14 @@ def test_delete_season_when_season_does_not_exist_should_return_none(fake_season
         season_deleted = test_repo.delete_season(id)
 
     # Assert
-    fake_season_exists.assert_called_once_with(id)
+    fake_sqla.session.get.assert_called_once_with(Season, id)
+    fake_sqla.session.delete.assert_not_called()
     assert season_deleted is None
 
 
 @patch('app.data.repositories.season_repository.sqla')
-@patch('app.data.repositories.season_repository.SeasonRepository.get_season')
-@patch('app.data.repositories.season_repository.SeasonRepository.season_exists')
-def test_delete_season_when_season_exists_should_return_season(fake_season_exists, fake_get_season, fake_sqla):
+def test_delete_season_when_season_exists_should_return_season(fake_sqla):
     # Arrange
-    fake_season_exists.return_value = True
     id = 1
 
     test_app = create_app()
@@ -307,8 +303,7 @@ def test_delete_season_when_season_exists_should_return_season(fake_season_exist
         season_deleted = test_repo.delete_season(id)
 
     # Assert
-    fake_season_exists.assert_called_once_with(id)
-    fake_get_season.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_season.return_value)
+    fake_sqla.session.get.assert_called_once_with(Season, id)
+    fake_sqla.session.delete.assert_called_once_with(fake_sqla.session.get.return_value)
     fake_sqla.session.commit.assert_called_once()
-    return season_deleted is fake_get_season.return_value
+    assert season_deleted is fake_sqla.session.get.return_value
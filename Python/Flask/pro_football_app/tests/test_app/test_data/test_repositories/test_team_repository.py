@@ -229,10 +229,10 @@ def test_team_exists_should_query_database(fake_exists, fake_sqla):
     assert team_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.team_repository.TeamRepository.team_exists')
-def test_update_team_when_team_does_not_exist_should_return_team(fake_team_exists):
+@patch('app.data.repositories.team_repository.sqla')
+def test_update_team_when_team_does_not_exist_should_return_team(fake_sqla):
     # Arrange
-    fake_team_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -242,22 +242,17 @@ def test_update_team_when_team_does_not_exist_should_return_team(fake_team_exist
         team_updated = test_repo.update_team(team_to_update)
 
     # Assert
-    fake_team_exists.assert_called_once_with(team_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert team_updated is team_to_update
 
 
 @patch('app.data.repositories.team_repository.sqla')
-@patch('app.data.repositories.team_repository.TeamRepository.get_team')
-@patch('app.data.repositories.team_repository.TeamRepository.team_exists')
-def test_update_team_when_team_exists_should_update_and_return_team(
-        fake_team_exists, fake_get_team, fake_sqla
-):
+def test_update_team_when_team_exists_should_update_and_return_team(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_team_exists.return_value = True
-        old_team = Team(id=1, name="A")
-        fake_get_team.return_value = old_team
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_team = Team(id=1, name="Z")
 
@@ -266,18 +261,19 @@ def test_update_team_when_team_exists_should_update_and_return_team(
         team_updated = test_repo.update_team(new_team)
 
     # Assert
-    fake_team_exists.assert_called_once_with(old_team.id)
-    fake_get_team.assert_called_once_with(old_team.id)
-    assert team_updated.name == new_team.name
-    fake_sqla.session.add.assert_called_once_with(old_team)
+    fake_sqla.session.execute.assert_called_once()
+    statement = fake_sqla.session.execute.call_args.args[0]
+    assert str(statement.whereclause) == "team.id = :id_1"
+    assert statement.compile().params == {'id_1': 1, 'name': "Z"}
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert team_updated is new_team
 
 
-@patch('app.data.repositories.team_repository.TeamRepository.team_exists')
-def test_delete_team_when_team_does_not_exist_should_return_none(fake_team_exists):
+@patch('app.data.repositories.team_repository.sqla')
+def test_delete_team_when_team_does_not_exist_should_return_none(fake_sqla):
     # Arrange
-    fake_team_exists.return_value = False
+    fake_sqla.session.get.return_value = None
     id = 1
 
     test_app = create_app()
@@ -287,16 +283,14 @@ def test_delete_team_when_team_does_not_exist_should_return_none(fake_team_exist
         team_deleted = test_repo.delete_team(id=id)
 
     # Assert
-    fake_team_exists.assert_called_once_with(id)
+    fake_sqla.session.get.assert_called_once_with(Team, id)
+    fake_sqla.session.delete.assert_not_called()
     assert team_deleted is None
 
 
 @patch('app.data.repositories.team_repository.sqla')
-@patch('app.data.repositories.team_repository.TeamRepository.get_team')
-@patch('app.data.repositories.team_repository.TeamRepository.team_exists')
-def test_delete_team_when_team_exists_should_return_team(fake_team_exists, fake_get_team, fake_sqla):
+def test_delete_team_when_team_exists_should_return_team(fake_sqla):
     # Arrange
-    fake_team_exists.return_value = True
     id = 1
 
     test_app = create_app()
@@ -306,8 +300,7 @@ def test_delete_team_when_team_exists_should_return_team(fake_team_exists, fake_
         team_deleted = test_repo.delete_team(id=id)
 
     # Assert
-    fake_team_exists.assert_called_once_with(id)
-    fake_get_team.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_team.return_value)
+    fake_sqla.session.get.assert_called_once_with(Team, id)
+    fake_sqla.session.delete.assert_called_once_with(fake_sqla.session.get.return_value)
     fake_sqla.session.commit.assert_called_once()
-    return team_deleted is fake_get_team.return_value
+    assert team_deleted is fake_sqla.session.get.return_value
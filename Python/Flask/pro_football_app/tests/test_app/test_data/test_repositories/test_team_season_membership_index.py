@@ -0,0 +1,175 @@
+import pytest
+
+from unittest.mock import Mock
+
+from flask import Flask
+
+# create_all needs every table TeamSeason references, and their mappers need each other.
+from app.data.models.game import Game  # noqa: F401
+from app.data.models.league_season import LeagueSeason  # noqa: F401
+from app.data.models.season import Season  # noqa: F401
+from app.data.models.team import Team  # noqa: F401
+from app.data.models.team_season import TeamSeason
+from app.data.repositories.team_season_membership_index import TeamSeasonMembershipIndex
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.sqla import sqla
+
+
+@pytest.fixture()
+def test_index():
+    team_season_repository = Mock(TeamSeasonRepository)
+    team_season_repository.get_team_ids_by_season.side_effect = \
+        lambda season_id: {1: ["Team 1", "Team 2"], 2: ["Team 3"]}.get(season_id, [])
+    return TeamSeasonMembershipIndex(team_season_repository)
+
+
+@pytest.fixture()
+def test_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+        sqla.session.add(TeamSeason(team_id="Team 1", season_id=1, league_id=1))
+        sqla.session.commit()
+        yield app
+        sqla.session.remove()
+
+
+def test_contains_when_team_has_team_season_in_season_should_return_true(test_index):
+    # Act and Assert
+    assert test_index.contains("Team 1", 1)
+    assert test_index.contains("Team 3", 2)
+
+
+def test_contains_when_team_has_team_season_in_other_season_only_should_return_false(test_index):
+    # Act and Assert
+    assert not test_index.contains("Team 3", 1)
+    assert not test_index.contains("Team 1", 2)
+
+
+def test_contains_should_load_each_season_once(test_index):
+    # Act
+    for team_id in ("Team 1", "Team 2", "Team 3", "Team 1"):
+        test_index.contains(team_id, 1)
+
+    # Assert
+    test_index._team_season_repository.get_team_ids_by_season.assert_called_once_with(1)
+
+
+def test_invalidate_should_reload_only_invalidated_season(test_index):
+    # Arrange
+    test_index.contains("Team 1", 1)
+    test_index.contains("Team 3", 2)
+
+    # Act
+    test_index.invalidate(1)
+    test_index.contains("Team 1", 1)
+    test_index.contains("Team 3", 2)
+
+    # Assert
+    assert test_index._team_season_repository.get_team_ids_by_season.call_count == 3
+
+
+def test_contains_when_team_season_is_added_and_committed_should_reload_season(test_app):
+    # Arrange
+    test_index = TeamSeasonMembershipIndex()
+    assert not test_index.contains("Team 2", 1)
+
+    # Act
+    sqla.session.add(TeamSeason(team_id="Team 2", season_id=1, league_id=1))
+    sqla.session.flush()
+    assert not test_index.contains("Team 2", 1)
+    sqla.session.commit()
+
+    # Assert
+    assert test_index.contains("Team 2", 1)
+
+
+def test_contains_when_team_season_is_deleted_should_reload_season(test_app):
+    # Arrange
+    test_index = TeamSeasonMembershipIndex()
+    assert test_index.contains("Team 1", 1)
+    team_season_id = TeamSeason.query.filter_by(team_id="Team 1").one().id
+
+    # Act
+    TeamSeasonRepository().delete_team_season(team_season_id)
+
+    # Assert
+    assert not test_index.contains("Team 1", 1)
+
+
+def test_contains_when_team_season_add_is_rolled_back_should_keep_season(test_app):
+    # Arrange
+    test_index = TeamSeasonMembershipIndex()
+    test_index.contains("Team 1", 1)
+    test_index._team_season_repository = Mock(TeamSeasonRepository)
+
+    # Act
+    sqla.session.add(TeamSeason(team_id="Team 2", season_id=1, league_id=1))
+    sqla.session.flush()
+    sqla.session.rollback()
+    sqla.session.commit()
+
+    # Assert
+    assert not test_index.contains("Team 2", 1)
+    test_index._team_season_repository.get_team_ids_by_season.assert_not_called()
+
+
+def add_team_season_in_other_season():
+    sqla.session.add(TeamSeason(team_id="Team 3", season_id=2, league_id=1))
+    sqla.session.commit()
+
+
+def test_contains_when_team_season_results_are_updated_should_keep_season(test_app):
+    # Arrange
+    test_index = TeamSeasonMembershipIndex()
+    test_index.contains("Team 1", 1)
+    test_index._team_season_repository = Mock(TeamSeasonRepository)
+    team_season = TeamSeason.query.filter_by(team_id="Team 1").one()
+    sqla.session.expunge(team_season)
+    team_season.games = 1
+    team_season.wins = 1
+
+    # Act
+    TeamSeasonRepository().update_team_season(team_season)
+
+    # Assert
+    assert test_index.contains("Team 1", 1)
+    test_index._team_season_repository.get_team_ids_by_season.assert_not_called()
+
+
+def test_contains_when_team_season_moves_to_other_season_should_reload_only_both_seasons(test_app):
+    # Arrange
+    add_team_season_in_other_season()
+    sqla.session.add(TeamSeason(team_id="Team 4", season_id=3, league_id=1))
+    sqla.session.commit()
+    test_index = TeamSeasonMembershipIndex()
+    for team_id, season_id in (("Team 1", 1), ("Team 3", 2), ("Team 4", 3)):
+        assert test_index.contains(team_id, season_id)
+    team_season = TeamSeason.query.filter_by(team_id="Team 1").one()
+    sqla.session.expunge(team_season)
+    team_season.season_id = 2
+
+    # Act
+    TeamSeasonRepository().update_team_season(team_season)
+
+    # Assert
+    assert set(test_index._team_ids_by_season) == {3}
+    assert not test_index.contains("Team 1", 1)
+    assert test_index.contains("Team 1", 2)
+
+
+def test_contains_when_team_season_is_deleted_should_reload_only_its_season(test_app):
+    # Arrange
+    add_team_season_in_other_season()
+    test_index = TeamSeasonMembershipIndex()
+    test_index.contains("Team 1", 1)
+    test_index.contains("Team 3", 2)
+    team_season_id = TeamSeason.query.filter_by(team_id="Team 1").one().id
+
+    # Act
+    TeamSeasonRepository().delete_team_season(team_season_id)
+
+    # Assert
+    assert set(test_index._team_ids_by_season) == {2}
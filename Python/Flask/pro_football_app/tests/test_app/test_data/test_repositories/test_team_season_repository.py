@@ -2,11 +2,17 @@ import pytest
 
 from unittest.mock import patch, call
 
+from flask import Flask
+from sqlalchemy.orm.exc import StaleDataError
+
 from app import create_app
 from app.data.models.game import Game
 from app.data.models.league_season import LeagueSeason
+from app.data.models.season import Season  # noqa: F401 - create_all needs the tables TeamSeason references.
+from app.data.models.team import Team  # noqa: F401
 from app.data.models.team_season import TeamSeason
 from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.sqla import sqla
 
 
 @patch('app.data.repositories.team_season_repository.TeamSeason')
@@ -127,8 +133,8 @@ def test_get_team_seasons_by_season_when_team_seasons_is_not_empty_and_team_seas
 
     # Assert
     fake_team_season.query.filter_by.assert_called_once_with(season_id=3)
-    fake_team_season.query.filter_by.return_value.fetchall.assert_called_once()
-    assert team_season == fake_team_season.query.filter_by.return_value.fetchall.return_value
+    fake_team_season.query.filter_by.return_value.all.assert_called_once()
+    assert team_season == fake_team_season.query.filter_by.return_value.all.return_value
 
 
 @patch('app.data.repositories.team_season_repository.TeamSeason')
@@ -150,8 +156,36 @@ def test_get_team_season_by_season_when_team_seasons_is_not_empty_and_team_seaso
 
     # Assert
     fake_team_season.query.filter_by.assert_called_once_with(season_id=1)
-    fake_team_season.query.filter_by.return_value.fetchall.assert_called_once()
-    assert team_season == fake_team_season.query.filter_by.return_value.fetchall.return_value
+    fake_team_season.query.filter_by.return_value.all.assert_called_once()
+    assert team_season == fake_team_season.query.filter_by.return_value.all.return_value
+
+
+@patch('app.data.repositories.team_season_repository.TeamSeason')
+def test_get_team_seasons_by_season_and_teams_should_filter_by_season_and_teams(fake_team_season):
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = TeamSeasonRepository()
+        team_seasons = test_repo.get_team_seasons_by_season_and_teams(season_id=1, team_ids={"Team 1", "Team 2"})
+
+    # Assert
+    fake_team_season.query.filter.assert_called_once()
+    fake_team_season.team_id.in_.assert_called_once_with({"Team 1", "Team 2"})
+    assert team_seasons == fake_team_season.query.filter.return_value.all.return_value
+
+
+@patch('app.data.repositories.team_season_repository.TeamSeason')
+def test_get_team_seasons_by_season_range_should_filter_by_season_range(fake_team_season):
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = TeamSeasonRepository()
+        team_seasons = test_repo.get_team_seasons_by_season_range(first_season_id=1, last_season_id=100)
+
+    # Assert
+    fake_team_season.season_id.between.assert_called_once_with(1, 100)
+    fake_team_season.query.filter.assert_called_once_with(fake_team_season.season_id.between.return_value)
+    assert team_seasons == fake_team_season.query.filter.return_value.all.return_value
 
 
 @patch('app.data.repositories.team_season_repository.TeamSeasonRepository.get_team_seasons')
@@ -292,10 +326,10 @@ def test_team_season_exists_should_query_database(fake_exists, fake_sqla):
     assert team_season_exists == fake_sqla.session.query.return_value.scalar.return_value
 
 
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.team_season_exists')
-def test_update_team_season_when_team_season_does_not_exist_should_return_team_season(fake_team_season_exists):
+@patch('app.data.repositories.team_season_repository.sqla')
+def test_update_team_season_when_team_season_does_not_exist_should_return_team_season(fake_sqla):
     # Arrange
-    fake_team_season_exists.return_value = False
+    fake_sqla.session.execute.return_value.rowcount = 0
 
     test_app = create_app()
     with test_app.app_context():
@@ -327,44 +361,17 @@ def test_update_team_season_when_team_season_does_not_exist_should_return_team_s
         team_season_updated = test_repo.update_team_season(team_season_to_update)
 
     # Assert
-    fake_team_season_exists.assert_called_once_with(team_season_to_update.id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert team_season_updated is team_season_to_update
 
 
 @patch('app.data.repositories.team_season_repository.sqla')
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.get_team_season')
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.team_season_exists')
-def test_update_team_season_when_team_season_exists_should_update_and_return_team_season(
-        fake_team_season_exists, fake_get_team_season, fake_sqla
-):
+def test_update_team_season_when_team_season_exists_should_update_and_return_team_season(fake_sqla):
     # Arrange
     test_app = create_app()
     with test_app.app_context():
-        fake_team_season_exists.return_value = True
-        old_team_season = TeamSeason(
-            team_id=1,
-            season_id=1,
-            league_id=1,
-            conference_id=1,
-            division_id=1,
-            games=3,
-            wins=1,
-            losses=1,
-            ties=1,
-            winning_percentage=0.5,
-            points_for=75,
-            points_against=75,
-            expected_wins=1.5,
-            expected_losses=1.5,
-            offensive_average=25.00,
-            offensive_factor=2.000,
-            offensive_index=25.00,
-            defensive_average=25.00,
-            defensive_factor=0.500,
-            defensive_index=25.00,
-            final_expected_winning_percentage=0.750
-        )
-        fake_get_team_season.return_value = old_team_season
+        fake_sqla.session.execute.return_value.rowcount = 1
 
         new_team_season = TeamSeason(
             team_id=99,
@@ -395,19 +402,38 @@ def test_update_team_season_when_team_season_exists_should_update_and_return_tea
         team_season_updated = test_repo.update_team_season(new_team_season)
 
     # Assert
-    fake_team_season_exists.assert_called_once_with(old_team_season.id)
-    fake_get_team_season.assert_called_once_with(old_team_season.id)
-    assert team_season_updated.team_id == new_team_season.team_id
-    assert team_season_updated.season_id == new_team_season.season_id
-    fake_sqla.session.add.assert_called_once_with(old_team_season)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.add.assert_not_called()
     fake_sqla.session.commit.assert_called_once()
     assert team_season_updated is new_team_season
 
 
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.team_season_exists')
-def test_delete_team_season_when_team_season_does_not_exist_should_return_none(fake_team_season_exists):
+@patch('app.data.repositories.team_season_repository.sqla')
+def test_update_team_seasons_should_update_team_seasons_in_one_commit(fake_sqla):
     # Arrange
-    fake_team_season_exists.return_value = False
+    test_app = create_app()
+    with test_app.app_context():
+        # Act
+        test_repo = TeamSeasonRepository()
+        team_seasons_in = (
+            TeamSeason(team_id="Team 1", season_id=1),
+            TeamSeason(team_id="Team 2", season_id=1),
+        )
+        team_seasons_out = test_repo.update_team_seasons(team_seasons_in)
+
+    # Assert
+    fake_sqla.session.add.assert_has_calls([
+        call(team_seasons_in[0]),
+        call(team_seasons_in[1]),
+    ])
+    fake_sqla.session.commit.assert_called_once()
+    assert team_seasons_out is team_seasons_in
+
+
+@patch('app.data.repositories.team_season_repository.sqla')
+def test_delete_team_season_when_team_season_does_not_exist_should_return_none(fake_sqla):
+    # Arrange
+    fake_sqla.session.execute.return_value.scalar_one_or_none.return_value = None
     id = 1
 
     test_app = create_app()
@@ -417,16 +443,15 @@ def test_delete_team_season_when_team_season_does_not_exist_should_return_none(f
         team_season_deleted = test_repo.delete_team_season(id)
 
     # Assert
-    fake_team_season_exists.assert_called_once_with(id)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.commit.assert_not_called()
     assert team_season_deleted is None
 
 
 @patch('app.data.repositories.team_season_repository.sqla')
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.get_team_season')
-@patch('app.data.repositories.team_season_repository.TeamSeasonRepository.team_season_exists')
-def test_delete_team_season_when_team_season_exists_should_return_team_season(fake_team_season_exists, fake_get_team_season, fake_sqla):
+def test_delete_team_season_when_team_season_exists_should_return_team_season(fake_sqla):
     # Arrange
-    fake_team_season_exists.return_value = True
+    deleted = fake_sqla.session.execute.return_value.scalar_one_or_none.return_value
     id = 1
 
     test_app = create_app()
@@ -436,8 +461,111 @@ def test_delete_team_season_when_team_season_exists_should_return_team_season(fa
         team_season_deleted = test_repo.delete_team_season(id)
 
     # Assert
-    fake_team_season_exists.assert_called_once_with(id)
-    fake_get_team_season.assert_called_once_with(id)
-    fake_sqla.session.delete.assert_called_once_with(fake_get_team_season.return_value)
+    fake_sqla.session.execute.assert_called_once()
+    fake_sqla.session.expunge.assert_called_once_with(deleted)
     fake_sqla.session.commit.assert_called_once()
-    return team_season_deleted is fake_get_team_season.return_value
+    assert team_season_deleted is deleted
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+        sqla.session.add(TeamSeason(team_id="Team 1", season_id=1, league_id=1))
+        sqla.session.add(TeamSeason(team_id="Team 2", season_id=2, league_id=1))
+        sqla.session.commit()
+        yield app
+        sqla.session.remove()
+
+
+@pytest.mark.parametrize('team_id, season_id, expected', [
+    ("Team 1", 1, True), ("Team 1", 2, False), ("Team 2", 1, False), ("Team 3", 1, False),
+])
+def test_team_season_exists_with_team_and_season_should_match_both_team_and_season(
+        sqlite_app, team_id, season_id, expected
+):
+    # Act
+    test_repo = TeamSeasonRepository()
+    team_season_exists = test_repo.team_season_exists_with_team_and_season(team_id, season_id)
+
+    # Assert
+    assert team_season_exists == expected
+
+
+def test_get_team_ids_by_season_should_get_team_ids_in_season(sqlite_app):
+    # Act
+    test_repo = TeamSeasonRepository()
+    team_ids = test_repo.get_team_ids_by_season(1)
+
+    # Assert
+    assert team_ids == ["Team 1"]
+
+
+def test_update_team_season_totals_should_write_totals_and_increment_version(sqlite_app):
+    # Arrange
+    team_season = TeamSeason(id=1, team_id="Team 1", season_id=1, league_id=1, games=1, wins=1, losses=0, ties=0,
+                             winning_percentage=1.0, points_for=20, points_against=10, expected_wins=0.8,
+                             expected_losses=0.2)
+
+    # Act
+    test_repo = TeamSeasonRepository()
+    test_repo.update_team_season_totals([team_season])
+
+    # Assert
+    sqla.session.expire_all()
+    stored = TeamSeason.query.get(1)
+    assert (stored.games, stored.wins, stored.points_for, stored.points_against) == (1, 1, 20, 10)
+    assert stored.winning_percentage == 1.0
+    assert stored.version_id == 2
+
+
+def test_lock_team_seasons_by_season_and_teams_should_get_team_seasons_in_team_order(sqlite_app):
+    # Arrange
+    sqla.session.add(TeamSeason(team_id="Team 0", season_id=1, league_id=1))
+    sqla.session.commit()
+
+    # Act
+    test_repo = TeamSeasonRepository()
+    team_seasons = test_repo.lock_team_seasons_by_season_and_teams(1, {"Team 1", "Team 0", "Team 2"})
+
+    # Assert
+    assert [team_season.team_id for team_season in team_seasons] == ["Team 0", "Team 1"]
+
+
+def test_update_team_season_rankings_should_write_rankings_and_record_ranked_version(sqlite_app):
+    # Arrange
+    team_season = TeamSeason.query.get(1)
+    team_season.offensive_average = 20.0
+    team_season.final_expected_winning_percentage = 0.6
+
+    # Act
+    test_repo = TeamSeasonRepository()
+    test_repo.update_team_season_rankings([team_season])
+
+    # Assert
+    sqla.session.expire_all()
+    stored = TeamSeason.query.get(1)
+    assert (stored.offensive_average, stored.final_expected_winning_percentage) == (20.0, 0.6)
+    assert stored.version_id == stored.ranked_version_id == 2
+
+
+def test_update_team_season_rankings_when_team_season_was_modified_after_read_should_raise_stale_data_error(
+        sqlite_app
+):
+    # Arrange
+    team_season = TeamSeason(id=1, team_id="Team 1", season_id=1, league_id=1, version_id=1, offensive_average=20.0)
+    TeamSeasonRepository().update_team_season_totals([TeamSeason.query.get(1)])
+
+    # Act
+    test_repo = TeamSeasonRepository()
+    with pytest.raises(StaleDataError):
+        test_repo.update_team_season_rankings([team_season], commit=False)
+
+    # Assert
+    sqla.session.rollback()
+    stored = TeamSeason.query.get(1)
+    assert stored.offensive_average is None
+    assert stored.ranked_version_id is None
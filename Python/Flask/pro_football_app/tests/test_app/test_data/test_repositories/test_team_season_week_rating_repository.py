@@ -0,0 +1,75 @@
+import pytest
+
+from flask import Flask
+
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_week_rating import TeamSeasonWeekRating
+from app.data.repositories.team_season_week_rating_repository import TeamSeasonWeekRatingRepository
+from app.data.sqla import sqla
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        TeamSeasonWeekRating.__table__.create(sqla.engine)
+        yield app
+        sqla.session.remove()
+
+
+def create_team_season(team_id: str, league_id: int, final_expected_winning_percentage: float | None) -> TeamSeason:
+    return TeamSeason(team_id=team_id, season_id=1, league_id=league_id, offensive_index=20.0, defensive_index=18.0,
+                      final_expected_winning_percentage=final_expected_winning_percentage)
+
+
+def test_replace_team_season_week_ratings_should_replace_ratings_recorded_for_week(sqlite_app):
+    # Arrange
+    test_repo = TeamSeasonWeekRatingRepository()
+    test_repo.replace_team_season_week_ratings(1, 3, [create_team_season("Team 1", 1, 0.4),
+                                                      create_team_season("Team 2", 1, 0.6)])
+    test_repo.replace_team_season_week_ratings(1, 4, [create_team_season("Team 1", 1, 0.45)])
+
+    # Act
+    count = test_repo.replace_team_season_week_ratings(1, 3, [create_team_season("Team 1", 1, 0.5)])
+
+    # Assert
+    assert count == 1
+    assert [(rating.team_id, rating.week, rating.final_expected_winning_percentage)
+            for rating in TeamSeasonWeekRating.query.order_by(TeamSeasonWeekRating.week)] == \
+           [("Team 1", 3, 0.5), ("Team 1", 4, 0.45)]
+
+
+def test_get_team_season_week_ratings_by_team_and_season_should_get_ratings_in_week_order(sqlite_app):
+    # Arrange
+    test_repo = TeamSeasonWeekRatingRepository()
+    for week, final_expected_winning_percentage in ((5, 0.55), (3, 0.4), (4, 0.5)):
+        test_repo.replace_team_season_week_ratings(1, week, [
+            create_team_season("Team 1", 1, final_expected_winning_percentage), create_team_season("Team 2", 1, 0.5)
+        ])
+
+    # Act
+    ratings = test_repo.get_team_season_week_ratings_by_team_and_season("Team 1", 1)
+
+    # Assert
+    assert [(rating.week, rating.final_expected_winning_percentage) for rating in ratings] == \
+           [(3, 0.4), (4, 0.5), (5, 0.55)]
+
+
+def test_get_team_season_week_ratings_by_season_and_week_should_get_best_ratings_first(sqlite_app):
+    # Arrange
+    test_repo = TeamSeasonWeekRatingRepository()
+    test_repo.replace_team_season_week_ratings(1, 3, [
+        create_team_season("Team 1", 1, None), create_team_season("Team 2", 1, 0.4),
+        create_team_season("Team 3", 2, 0.7), create_team_season("Team 4", 1, 0.6)
+    ])
+
+    # Act
+    ratings = test_repo.get_team_season_week_ratings_by_season_and_week(1, 3)
+    league_ratings = test_repo.get_team_season_week_ratings_by_season_and_week(1, 3, league_id=1)
+
+    # Assert
+    assert [rating.team_id for rating in ratings] == ["Team 3", "Team 4", "Team 2", "Team 1"]
+    assert [rating.team_id for rating in league_ratings] == ["Team 4", "Team 2", "Team 1"]
+    assert {rating.league_id for rating in league_ratings} == {"1"}
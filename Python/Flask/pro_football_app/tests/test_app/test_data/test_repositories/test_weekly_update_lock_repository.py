@@ -0,0 +1,47 @@
+import pytest
+
+from datetime import datetime
+
+from flask import Flask
+
+from app.data.models.weekly_update_lock import WeeklyUpdateLock
+from app.data.repositories.weekly_update_lock_repository import WeeklyUpdateLockRepository
+from app.data.sqla import sqla
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        WeeklyUpdateLock.__table__.create(sqla.engine)
+        yield app
+        sqla.session.remove()
+
+
+def test_renew_weekly_update_lock_when_caller_holds_lock_should_extend_lease(sqlite_app):
+    # Arrange
+    test_repo = WeeklyUpdateLockRepository()
+    test_repo.acquire_weekly_update_lock('NFL', 1, "host:1:0", datetime(2000, 1, 1), datetime(2000, 1, 1, 0, 15))
+
+    # Act
+    renewed = test_repo.renew_weekly_update_lock('NFL', 1, "host:1:0", datetime(2000, 1, 1, 0, 20))
+
+    # Assert
+    assert renewed
+    assert sqla.session.get(WeeklyUpdateLock, ('NFL', 1)).expires_at == datetime(2000, 1, 1, 0, 20)
+
+
+def test_renew_weekly_update_lock_when_another_process_holds_lock_should_not_extend_lease(sqlite_app):
+    # Arrange
+    test_repo = WeeklyUpdateLockRepository()
+    test_repo.acquire_weekly_update_lock('NFL', 1, "other-host:1:0", datetime(2000, 1, 1),
+                                         datetime(2000, 1, 1, 0, 15))
+
+    # Act
+    renewed = test_repo.renew_weekly_update_lock('NFL', 1, "host:1:0", datetime(2000, 1, 1, 0, 20))
+
+    # Assert
+    assert not renewed
+    assert sqla.session.get(WeeklyUpdateLock, ('NFL', 1)).expires_at == datetime(2000, 1, 1, 0, 15)
@@ -0,0 +1,293 @@
+import io
+import threading
+
+import pytest
+
+from flask import Flask
+from sqlalchemy.exc import IntegrityError
+from unittest.mock import Mock, patch
+
+from app.data.errors import EntityNotFoundError
+# Game's mapper can only be configured once every model it is related to has been imported.
+from app.data.models.league_season import LeagueSeason  # noqa: F401
+from app.data.models.season import Season  # noqa: F401
+from app.data.repositories.team_repository import TeamRepository
+from app.services.game_import_service.game_import_service import CSV, JSON, JSON_LINES, GameImportService, \
+    get_file_format, read_rows
+from app.services.game_service.game_service import GameService
+
+CSV_HEADER = "season_id,week,guest_name,guest_score,host_name,host_score,is_playoff,notes\n"
+
+
+def create_fake_team(name: str) -> Mock:
+    # Team validates that its name is unique against the database, so the teams are faked.
+    team = Mock()
+    team.name = name
+    return team
+
+
+@pytest.fixture()
+def test_service():
+    game_service = Mock(GameService)
+    game_service.added_games = []
+
+    def add_games(games):
+        game_service.added_games.append(list(games))
+        return tuple(games)
+
+    game_service.add_games.side_effect = add_games
+
+    team_repository = Mock(TeamRepository)
+    team_repository.get_teams.return_value = [create_fake_team(f"Team {i}") for i in (1, 2, 3)]
+
+    return GameImportService(game_service, team_repository, chunk_size=2)
+
+
+def test_init_when_chunk_size_is_less_than_one_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        GameImportService(Mock(GameService), Mock(TeamRepository), chunk_size=0)
+
+
+def test_import_rows_when_rows_arg_is_none_should_raise_value_error(test_service):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.import_rows(None)
+
+
+def test_import_stream_should_add_games_in_chunks_and_report_progress(test_service):
+    # Arrange
+    stream = io.StringIO(
+        CSV_HEADER
+        + "1,1,Team 1,20,Team 2,10,,\n"
+        + "1,1,team 3,17,TEAM 1,17,false,OT\n"
+        + "1,2,Team 2,24,Team 3,21,1,\n"
+    )
+    progress = Mock()
+
+    # Act
+    summary = test_service.import_stream(stream, CSV, progress)
+
+    # Assert
+    added_games = test_service._game_service.added_games
+    assert [len(chunk) for chunk in added_games] == [2, 1]
+    assert added_games[0][1].guest_name == "Team 3"
+    assert added_games[0][1].host_name == "Team 1"
+    assert added_games[0][1].notes == "OT"
+    assert not added_games[0][1].is_playoff
+    assert added_games[1][0].is_playoff
+    test_service._team_repository.get_teams.assert_called_once()
+    assert progress.call_count == 2
+    assert summary.rows_read == 3
+    assert summary.games_imported == 3
+    assert summary.rows_rejected == 0
+
+
+def test_import_stream_when_rows_are_invalid_should_reject_rows_and_import_the_rest(test_service):
+    # Arrange
+    stream = io.StringIO(
+        CSV_HEADER
+        + "1,1,Team 1,20,Team 2,10,,\n"
+        + "1,1,Team 4,17,Team 3,17,,\n"
+        + "1,1,Team 3,x,Team 2,10,,\n"
+    )
+
+    # Act
+    summary = test_service.import_stream(stream, CSV)
+
+    # Assert
+    assert [len(chunk) for chunk in test_service._game_service.added_games] == [1]
+    assert summary.rows_read == 3
+    assert summary.games_imported == 1
+    assert summary.rows_rejected == 2
+    assert summary.errors[0].startswith("Row 2:")
+    assert summary.errors[1].startswith("Row 3:")
+
+
+def test_import_rows_when_games_are_already_imported_should_report_them_as_skipped(test_service):
+    # Arrange
+    test_service._game_service.add_games.side_effect = lambda games: tuple(games[1:])
+    rows = [
+        dict(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        dict(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 1", host_score=10),
+    ]
+
+    # Act
+    summary = test_service.import_rows(rows)
+
+    # Assert
+    assert summary.games_imported == 1
+    assert summary.games_skipped == 1
+
+
+def test_import_rows_when_no_team_season_exists_for_a_game_should_reject_row_and_import_the_rest(test_service):
+    # Arrange
+    def raise_if_no_team_season(game):
+        if game.season_id == 2:
+            raise EntityNotFoundError(f"Neither {game.guest_name} nor {game.host_name} has a team season.")
+
+    test_service._game_service.raise_if_no_team_season.side_effect = raise_if_no_team_season
+    rows = [
+        dict(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        dict(season_id=2, week=1, guest_name="Team 3", guest_score=20, host_name="Team 1", host_score=10),
+        dict(season_id=1, week=2, guest_name="Team 2", guest_score=20, host_name="Team 3", host_score=10),
+    ]
+
+    # Act
+    summary = test_service.import_rows(rows)
+
+    # Assert
+    assert [[game.week for game in chunk] for chunk in test_service._game_service.added_games] == [[1, 2]]
+    assert summary.games_imported == 2
+    assert summary.rows_rejected == 1
+    assert summary.errors[0].startswith("Row 2: Neither Team 3 nor Team 1")
+
+
+def create_rows(count: int) -> list:
+    return [
+        dict(season_id=1, week=week, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+        for week in range(1, count + 1)
+    ]
+
+
+@pytest.fixture()
+def parallel_service():
+    game_service = Mock(GameService)
+    game_service.writer_threads = set()
+
+    def add_games(games, lock_team_seasons=False):
+        assert lock_team_seasons
+        game_service.writer_threads.add(threading.current_thread().name)
+        return tuple(games)
+
+    game_service.add_games.side_effect = add_games
+
+    team_repository = Mock(TeamRepository)
+    team_repository.get_teams.return_value = [create_fake_team(f"Team {i}") for i in (1, 2)]
+
+    with Flask(__name__).app_context():
+        yield GameImportService(game_service, team_repository, chunk_size=2, workers=4)
+
+
+def test_init_when_workers_is_less_than_one_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        GameImportService(Mock(GameService), Mock(TeamRepository), workers=0)
+
+
+@patch('app.services.game_import_service.game_import_service.supports_row_locking', return_value=True)
+def test_import_rows_when_workers_is_greater_than_one_should_add_chunks_on_worker_threads_with_locks(
+        fake_supports_row_locking, parallel_service
+):
+    # Arrange
+    progress = Mock()
+
+    # Act
+    summary = parallel_service.import_rows(create_rows(25), progress)
+
+    # Assert
+    assert summary.games_imported == 25
+    assert parallel_service._game_service.add_games.call_count == 13
+    assert progress.call_count == 13
+    assert threading.current_thread().name not in parallel_service._game_service.writer_threads
+
+
+@patch('app.services.game_import_service.game_import_service.supports_row_locking', return_value=False)
+def test_import_rows_when_data_store_cannot_lock_rows_should_add_chunks_on_one_writer_thread(
+        fake_supports_row_locking, parallel_service
+):
+    # Act
+    summary = parallel_service.import_rows(create_rows(25))
+
+    # Assert
+    assert summary.games_imported == 25
+    assert len(parallel_service._game_service.writer_threads) == 1
+
+
+@patch('app.services.game_import_service.game_import_service.sqla')
+@patch('app.services.game_import_service.game_import_service.supports_row_locking', return_value=True)
+def test_import_rows_when_another_writer_adds_a_game_first_should_add_chunk_again(
+        fake_supports_row_locking, fake_sqla, parallel_service
+):
+    # Arrange
+    def add_games(games, lock_team_seasons):
+        if parallel_service._game_service.add_games.call_count == 1:
+            for i, game in enumerate(games, start=1):
+                game.id = i
+            raise IntegrityError(None, None, Exception())
+        return ()
+
+    parallel_service._game_service.add_games.side_effect = add_games
+
+    # Act
+    summary = parallel_service.import_rows(create_rows(2))
+
+    # Assert
+    fake_sqla.session.rollback.assert_called_once()
+    first_games, retried_games = (call.args[0] for call in parallel_service._game_service.add_games.call_args_list)
+    assert [game.natural_key() for game in retried_games] == [game.natural_key() for game in first_games]
+    assert all(game.id is None for game in retried_games)
+    assert summary.games_imported == 0
+    assert summary.games_skipped == 2
+
+
+@patch('app.services.game_import_service.game_import_service.supports_row_locking', return_value=True)
+def test_import_rows_when_worker_raises_should_raise(fake_supports_row_locking, parallel_service):
+    # Arrange
+    parallel_service._game_service.add_games.side_effect = EntityNotFoundError()
+
+    # Act and Assert
+    with pytest.raises(EntityNotFoundError):
+        parallel_service.import_rows(create_rows(25))
+
+
+def test_read_rows_when_file_format_is_json_should_read_array_elements_across_buffer_boundaries(monkeypatch):
+    # Arrange
+    monkeypatch.setattr('app.services.game_import_service.game_import_service.READ_BUFFER_SIZE', 7)
+    stream = io.StringIO(' [ {"week": 1, "notes": "a, ]"} ,\n{"week": 2} ] ')
+
+    # Act
+    rows = list(read_rows(stream, JSON))
+
+    # Assert
+    assert rows == [{"week": 1, "notes": "a, ]"}, {"week": 2}]
+
+
+def test_read_rows_when_file_format_is_json_and_file_is_not_an_array_should_raise_value_error():
+    # Arrange
+    stream = io.StringIO('{"week": 1}')
+
+    # Act and Assert
+    with pytest.raises(ValueError):
+        list(read_rows(stream, JSON))
+
+
+def test_read_rows_when_file_format_is_json_lines_should_read_one_row_per_line():
+    # Arrange
+    stream = io.StringIO('{"week": 1}\n\n{"week": 2}\n')
+
+    # Act
+    rows = list(read_rows(stream, JSON_LINES))
+
+    # Assert
+    assert rows == [{"week": 1}, {"week": 2}]
+
+
+def test_read_rows_when_file_format_is_not_supported_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        read_rows(io.StringIO(), 'xml')
+
+
+@pytest.mark.parametrize('path, file_format', [
+    ('week_1.csv', CSV), ('week_1.JSON', JSON), ('week_1.jsonl', JSON_LINES), ('week_1.ndjson', JSON_LINES),
+])
+def test_get_file_format_should_infer_format_from_extension(path, file_format):
+    # Act and Assert
+    assert get_file_format(path) == file_format
+
+
+def test_get_file_format_when_extension_is_not_supported_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        get_file_format('week_1.xlsx')
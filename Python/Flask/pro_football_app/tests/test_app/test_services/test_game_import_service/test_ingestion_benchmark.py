@@ -0,0 +1,37 @@
+import os
+import pytest
+
+from flask import Flask
+
+from app.services.game_import_service.ingestion_benchmark import GAMES_PER_SEASON, benchmark_parallel_ingestion
+
+
+def test_benchmark_parallel_ingestion_when_database_uri_is_that_of_app_should_raise_value_error(tmp_path):
+    # Arrange
+    database_path = tmp_path / 'app.sqlite3'
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI=f"sqlite:///{database_path}")
+
+    # Act and Assert
+    with app.app_context():
+        with pytest.raises(ValueError):
+            benchmark_parallel_ingestion(f"sqlite:///{database_path}", worker_counts=(1,), season_count=1)
+    assert not os.path.exists(database_path)
+
+
+def test_benchmark_parallel_ingestion_when_database_uri_is_not_that_of_app_should_use_database_uri(tmp_path):
+    # Arrange
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.sqlite3'}")
+
+    # Act
+    with app.app_context():
+        results = benchmark_parallel_ingestion(f"sqlite:///{tmp_path / 'scratch.sqlite3'}", worker_counts=(1,),
+                                               season_count=1)
+
+    # Assert
+    [(workers, writers, summary)] = results
+    assert (workers, writers) == (1, 1)
+    assert summary.games_imported == GAMES_PER_SEASON
+    assert os.path.exists(tmp_path / 'scratch.sqlite3')
+    assert not os.path.exists(tmp_path / 'app.sqlite3')
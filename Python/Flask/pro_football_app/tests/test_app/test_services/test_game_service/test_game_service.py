@@ -1,14 +1,15 @@
 import pytest
 
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 from app.data.errors import EntityNotFoundError
 from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
 from app.services.constants import Direction
 from app.services.game_service.game_service import GameService
-from app.services.game_service.process_game_strategy.add_game_strategy import AddGameStrategy
 from app.services.game_service.process_game_strategy.process_game_strategy import ProcessGameStrategy
 from app.services.game_service.process_game_strategy.subtract_game_strategy import SubtractGameStrategy
+from app.services.weekly_update_service.weekly_update_scheduler import WeeklyUpdateScheduler
 
 
 @pytest.fixture()
@@ -16,6 +17,9 @@ from app.services.game_service.process_game_strategy.subtract_game_strategy impo
 @patch('app.services.game_service.game_service.TeamSeasonRepository')
 @patch('app.services.game_service.game_service.GameRepository')
 def test_service(fake_game_repository, fake_team_season_repository, fake_process_game_strategy_factory):
+    fake_team_season_repository.get_team_ids_by_season.return_value = [
+        "Guest", "Host", "Team 1", "Team 2", "Team 3"
+    ]
     test_service = GameService(fake_game_repository, fake_team_season_repository, fake_process_game_strategy_factory)
     return test_service
 
@@ -31,7 +35,7 @@ def test_add_game_when_new_team_season_with_new_game_guest_and_season_is_in_data
         fake_game, test_service
 ):
     # Arrange
-    test_service._team_season_repository.team_season_exists_with_team_and_season.side_effect = (True, False)
+    test_service._team_season_repository.get_team_ids_by_season.return_value = [fake_game.guest_name]
     strategy = Mock(ProcessGameStrategy)
     test_service._process_game_strategy_factory.create_strategy.return_value = strategy
 
@@ -42,9 +46,7 @@ def test_add_game_when_new_team_season_with_new_game_guest_and_season_is_in_data
         assert False
 
     # Assert
-    test_service._team_season_repository.team_season_exists_with_team_and_season.assert_called_once_with(
-        fake_game.guest_name, fake_game.season_id
-    )
+    test_service._team_season_repository.get_team_ids_by_season.assert_called_once_with(fake_game.season_id)
     fake_game.decide_winner_and_loser.assert_called_once()
     test_service._game_repository.add_game.assert_any_call(fake_game)
     test_service._process_game_strategy_factory.create_strategy.assert_any_call(Direction.UP)
@@ -56,7 +58,7 @@ def test_add_game_when_new_team_seasons_with_new_game_guest_and_season_and_with_
         fake_game, test_service
 ):
     # Arrange
-    test_service._team_season_repository.team_season_exists_with_team_and_season.side_effect = (False, True)
+    test_service._team_season_repository.get_team_ids_by_season.return_value = [fake_game.host_name]
     strategy = Mock(ProcessGameStrategy)
     test_service._process_game_strategy_factory.create_strategy.return_value = strategy
 
@@ -67,12 +69,7 @@ def test_add_game_when_new_team_seasons_with_new_game_guest_and_season_and_with_
         assert False
 
     # Assert
-    test_service._team_season_repository.team_season_exists_with_team_and_season.assert_any_call(
-        fake_game.guest_name, fake_game.season_id
-    )
-    test_service._team_season_repository.team_season_exists_with_team_and_season.assert_any_call(
-        fake_game.host_name, fake_game.season_id
-    )
+    test_service._team_season_repository.get_team_ids_by_season.assert_called_once_with(fake_game.season_id)
     fake_game.decide_winner_and_loser.assert_called_once()
     test_service._game_repository.add_game.assert_any_call(fake_game)
     test_service._process_game_strategy_factory.create_strategy.assert_any_call(Direction.UP)
@@ -83,7 +80,7 @@ def test_add_game_when_team_season_with_new_game_guest_and_season_and_team_seaso
         test_service
 ):
     # Arrange
-    test_service._team_season_repository.team_season_exists_with_team_and_season.side_effect = (False, False)
+    test_service._team_season_repository.get_team_ids_by_season.return_value = ["Other"]
 
     new_game = Game(season_id=1, week=1, guest_name="Guest", guest_score=0, host_name="Host", host_score=0)
 
@@ -91,10 +88,153 @@ def test_add_game_when_team_season_with_new_game_guest_and_season_and_team_seaso
     with pytest.raises(EntityNotFoundError):
         test_service.add_game(new_game)
 
-    test_service._team_season_repository.team_season_exists_with_team_and_season.assert_any_call(
-        new_game.guest_name, new_game.season_id
+    test_service._team_season_repository.get_team_ids_by_season.assert_called_once_with(new_game.season_id)
+    test_service._game_repository.add_game.assert_not_called()
+
+
+def test_add_game_when_games_in_same_season_are_added_should_load_season_teams_once(test_service):
+    # Arrange
+    strategy = Mock(ProcessGameStrategy)
+    test_service._process_game_strategy_factory.create_strategy.return_value = strategy
+
+    # Act
+    for week in (1, 2, 3):
+        test_service.add_game(
+            Game(season_id=1, week=week, guest_name="Guest", guest_score=20, host_name="Host", host_score=10)
+        )
+
+    # Assert
+    test_service._team_season_repository.get_team_ids_by_season.assert_called_once_with(1)
+    assert test_service._game_repository.add_game.call_count == 3
+
+
+def test_add_game_when_game_with_same_natural_key_is_in_datastore_should_not_add_game(test_service):
+    # Arrange
+    new_game = Game(season_id=1, week=1, guest_name="Guest", guest_score=20, host_name="Host", host_score=10)
+    test_service._game_repository.get_existing_natural_keys.return_value = {new_game.natural_key()}
+
+    # Act
+    test_service.add_game(new_game)
+
+    # Assert
+    test_service._game_repository.get_existing_natural_keys.assert_called_once_with((new_game,))
+    test_service._game_repository.add_game.assert_not_called()
+    test_service._process_game_strategy_factory.create_strategy.assert_not_called()
+
+
+def test_add_games_when_new_games_arg_is_none_should_raise_value_error(test_service):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.add_games(None)
+
+
+def test_add_games_when_new_games_arg_is_empty_should_add_no_games(test_service):
+    # Act
+    test_service.add_games(())
+
+    # Assert
+    test_service._game_repository.insert_games.assert_not_called()
+    test_service._team_season_repository.update_team_seasons.assert_not_called()
+
+
+def test_add_games_when_no_team_season_exists_for_a_game_should_raise_entity_not_found_error(test_service):
+    # Arrange
+    test_service._team_season_repository.get_team_ids_by_season.return_value = ["Team 1", "Team 2"]
+    new_games = (
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 4", host_score=10),
     )
 
+    # Act and Assert
+    with pytest.raises(EntityNotFoundError):
+        test_service.add_games(new_games)
+
+    test_service._game_repository.insert_games.assert_not_called()
+    test_service._team_season_repository.update_team_seasons.assert_not_called()
+
+
+def test_add_games_when_games_are_in_datastore_or_repeated_should_add_only_new_games(test_service):
+    # Arrange
+    team_season_1 = TeamSeason(team_id="Team 1", season_id=1, games=0, wins=0, losses=0, ties=0,
+                               points_for=0, points_against=0)
+    team_season_2 = TeamSeason(team_id="Team 2", season_id=1, games=0, wins=0, losses=0, ties=0,
+                               points_for=0, points_against=0)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_2
+    ]
+    existing_game = Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(season_id=1, week=2, guest_name="Team 2", guest_score=17, host_name="Team 1", host_score=14)
+    repeated_game = Game(season_id=1, week=2, guest_name="Team 2", guest_score=17, host_name="Team 1", host_score=14)
+    test_service._game_repository.get_existing_natural_keys.return_value = {existing_game.natural_key()}
+
+    # Act
+    added_games = test_service.add_games([existing_game, new_game, repeated_game])
+
+    # Assert
+    test_service._game_repository.get_existing_natural_keys.assert_called_once()
+    assert added_games == (new_game,)
+    test_service._game_repository.insert_games.assert_called_once_with((new_game,), commit=False)
+    assert team_season_1.games == 1
+    assert team_season_1.losses == 1
+    assert team_season_2.games == 1
+    assert team_season_2.wins == 1
+
+
+def test_add_games_when_all_games_are_in_datastore_should_add_no_games(test_service):
+    # Arrange
+    existing_game = Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    test_service._game_repository.get_existing_natural_keys.return_value = {existing_game.natural_key()}
+
+    # Act
+    added_games = test_service.add_games((existing_game,))
+
+    # Assert
+    assert added_games == ()
+    test_service._game_repository.insert_games.assert_not_called()
+    test_service._team_season_repository.update_team_seasons.assert_not_called()
+
+
+def test_add_games_should_add_games_and_update_each_team_season_once(test_service):
+    # Arrange
+    team_season_1 = TeamSeason(team_id="Team 1", season_id=1, games=0, wins=0, losses=0, ties=0,
+                               points_for=0, points_against=0)
+    team_season_2 = TeamSeason(team_id="Team 2", season_id=1, games=0, wins=0, losses=0, ties=0,
+                               points_for=0, points_against=0)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_2
+    ]
+    new_games = (
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=2, guest_name="Team 2", guest_score=17, host_name="Team 1", host_score=17),
+    )
+
+    # Act
+    test_service.add_games(new_games)
+
+    # Assert
+    assert new_games[0].winner_name == "Team 1"
+    assert new_games[0].loser_name == "Team 2"
+    test_service._game_repository.insert_games.assert_called_once_with(new_games, commit=False)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_called_with(
+        1, {"Team 1", "Team 2"}
+    )
+    test_service._team_season_repository.update_team_seasons.assert_called_once_with((team_season_1, team_season_2))
+    test_service._process_game_strategy_factory.create_strategy.assert_not_called()
+
+    assert team_season_1.games == 2
+    assert team_season_1.wins == 1
+    assert team_season_1.losses == 0
+    assert team_season_1.ties == 1
+    assert team_season_1.points_for == 37
+    assert team_season_1.points_against == 27
+    assert team_season_1.winning_percentage == 0.75
+    assert team_season_2.games == 2
+    assert team_season_2.wins == 0
+    assert team_season_2.losses == 1
+    assert team_season_2.ties == 1
+    assert team_season_2.points_for == 27
+    assert team_season_2.points_against == 37
+
 
 def test_edit_game_when_new_game_arg_is_none_should_raise_value_error(test_service):
     # Act and Assert
@@ -125,30 +265,78 @@ def test_edit_game_when_selected_game_not_found_should_raise_entity_not_found_er
     test_service._game_repository.get_game.assert_called_once_with(old_game.id)
 
 
+def create_team_season(team_id: str, games: int = 0, wins: int = 0, losses: int = 0, ties: int = 0,
+                       points_for: int = 0, points_against: int = 0) -> TeamSeason:
+    return TeamSeason(team_id=team_id, season_id=1, games=games, wins=wins, losses=losses, ties=ties,
+                      points_for=points_for, points_against=points_against)
+
+
 def test_edit_game_when_args_are_not_none_and_selected_game_is_found_should_edit_game_in_repository(test_service):
     # Arrange
-    selected_game = Mock(Game)
-    test_service._game_repository.get_game.return_value = selected_game
+    team_season_1 = create_team_season("Team 1", games=1, wins=1, points_for=20, points_against=10)
+    team_season_2 = create_team_season("Team 2", games=1, losses=1, points_for=10, points_against=20)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_2
+    ]
+
+    old_game = Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=24)
+    test_service._game_repository.get_game.return_value = old_game
 
-    subtract_strategy = Mock(SubtractGameStrategy)
-    add_strategy = Mock(AddGameStrategy)
-    test_service._process_game_strategy_factory.create_strategy.side_effect = (subtract_strategy, add_strategy)
+    # Act
+    test_service.edit_game(new_game, old_game)
+
+    # Assert
+    assert new_game.winner_name == "Team 2"
+    test_service._game_repository.update_game.assert_called_once_with(new_game, commit=False)
+    test_service._team_season_repository.update_team_seasons.assert_called_once_with((team_season_1, team_season_2))
+    test_service._process_game_strategy_factory.create_strategy.assert_not_called()
+
+    assert (team_season_1.games, team_season_1.wins, team_season_1.losses) == (1, 0, 1)
+    assert (team_season_1.points_for, team_season_1.points_against) == (20, 24)
+    assert team_season_1.winning_percentage == 0
+    assert (team_season_2.games, team_season_2.wins, team_season_2.losses) == (1, 1, 0)
+    assert (team_season_2.points_for, team_season_2.points_against) == (24, 20)
+    assert team_season_2.winning_percentage == 1
 
-    new_game = Mock(Game)
-    old_game = Mock(Game)
+
+def test_edit_game_when_results_are_unchanged_should_not_update_team_seasons(test_service):
+    # Arrange
+    old_game = Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(id=1, season_id=1, week=2, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10,
+                    notes="Moved to week 2")
+    test_service._game_repository.get_game.return_value = old_game
 
     # Act
     test_service.edit_game(new_game, old_game)
 
     # Assert
-    new_game.decide_winner_and_loser.assert_called()
-    test_service._game_repository.update_game.assert_called_once_with(new_game)
+    test_service._game_repository.update_game.assert_called_once_with(new_game, commit=True)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_not_called()
+    test_service._team_season_repository.update_team_seasons.assert_not_called()
 
-    test_service._process_game_strategy_factory.create_strategy.assert_any_call(Direction.DOWN)
-    subtract_strategy.process_game.assert_called_once_with(old_game)
 
-    test_service._process_game_strategy_factory.create_strategy.assert_any_call(Direction.UP)
-    add_strategy.process_game.assert_called_once_with(new_game)
+def test_edit_game_when_team_is_replaced_should_update_only_affected_team_seasons(test_service):
+    # Arrange
+    team_season_1 = create_team_season("Team 1", games=1, wins=1, points_for=20, points_against=10)
+    team_season_3 = create_team_season("Team 3")
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_3
+    ]
+
+    old_game = Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(id=1, season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 2", host_score=10)
+    test_service._game_repository.get_game.return_value = old_game
+
+    # Act
+    test_service.edit_game(new_game, old_game)
+
+    # Assert
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_called_once_with(
+        1, {"Team 1", "Team 3"}
+    )
+    assert (team_season_1.games, team_season_1.wins, team_season_1.points_for) == (0, 0, 0)
+    assert (team_season_3.games, team_season_3.wins, team_season_3.points_for) == (1, 1, 20)
 
 
 def test_delete_game_when_game_with_passed_id_is_not_found_should_raise_entity_not_found_error(test_service):
@@ -178,3 +366,140 @@ def test_delete_game_when_game_with_passed_id_is_found_should_delete_game_from_r
     test_service._game_repository.delete_game.assert_any_call(id)
     test_service._process_game_strategy_factory.create_strategy.assert_any_call(Direction.DOWN)
     strategy.process_game.assert_called_once_with(old_game)
+
+
+def test_delete_week_should_delete_games_and_subtract_results_from_each_team_season_once(test_service):
+    # Arrange
+    team_season_1 = create_team_season("Team 1", games=2, wins=1, ties=1, points_for=37, points_against=27)
+    team_season_2 = create_team_season("Team 2", games=2, losses=1, ties=1, points_for=27, points_against=37)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_2
+    ]
+    old_games = [
+        Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(id=2, season_id=1, week=1, guest_name="Team 2", guest_score=17, host_name="Team 1", host_score=17),
+    ]
+    test_service._game_repository.delete_games_by_season_and_week.return_value = old_games
+
+    # Act
+    games_deleted = test_service.delete_week(1, 1)
+
+    # Assert
+    assert games_deleted == tuple(old_games)
+    test_service._game_repository.delete_games_by_season_and_week.assert_called_once_with(1, 1, commit=False)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_called_once_with(
+        1, {"Team 1", "Team 2"}
+    )
+    test_service._team_season_repository.update_team_seasons.assert_called_once_with((team_season_1, team_season_2))
+    test_service._process_game_strategy_factory.create_strategy.assert_not_called()
+    assert (team_season_1.games, team_season_1.wins, team_season_1.ties, team_season_1.points_for) == (0, 0, 0, 0)
+    assert (team_season_2.games, team_season_2.losses, team_season_2.ties, team_season_2.points_for) == (0, 0, 0, 0)
+
+
+def test_replace_week_when_new_games_arg_is_none_should_raise_value_error(test_service):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.replace_week(1, 1, None)
+
+
+def test_replace_week_when_new_game_is_of_another_week_should_raise_value_error(test_service):
+    # Arrange
+    new_games = (
+        Game(season_id=1, week=2, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+    )
+
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.replace_week(1, 1, new_games)
+    test_service._game_repository.delete_games_by_season_and_week.assert_not_called()
+
+
+def test_replace_week_should_replace_games_and_apply_net_change_to_each_team_season_once(test_service):
+    # Arrange
+    team_season_1 = create_team_season("Team 1", games=1, wins=1, points_for=20, points_against=10)
+    team_season_3 = create_team_season("Team 3")
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = [
+        team_season_1, team_season_3
+    ]
+    test_service._game_repository.delete_games_by_season_and_week.return_value = [
+        Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+    ]
+    new_games = (
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 2", host_score=10),
+    )
+
+    # Act
+    test_service.replace_week(1, 1, new_games)
+
+    # Assert
+    test_service._game_repository.insert_games.assert_called_once_with(new_games[:1], commit=False)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_called_once_with(
+        1, {"Team 1", "Team 3"}
+    )
+    assert new_games[0].winner_name == "Team 3"
+    assert (team_season_1.games, team_season_1.wins, team_season_1.points_for) == (0, 0, 0)
+    assert (team_season_3.games, team_season_3.wins, team_season_3.points_for) == (1, 1, 20)
+
+
+def test_add_games_when_lock_team_seasons_is_true_should_lock_team_seasons_one_season_at_a_time_in_order(
+        test_service
+):
+    # Arrange
+    test_service._team_season_repository.lock_team_seasons_by_season_and_teams.return_value = []
+    new_games = (
+        Game(season_id=2, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 1", host_score=10),
+    )
+
+    # Act
+    test_service.add_games(new_games, lock_team_seasons=True)
+
+    # Assert
+    assert test_service._team_season_repository.lock_team_seasons_by_season_and_teams.call_args_list == [
+        call(1, {"Team 1", "Team 3"}), call(2, {"Team 1", "Team 2"})
+    ]
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.assert_not_called()
+
+
+def test_add_games_when_weekly_update_scheduler_is_set_should_mark_each_season_dirty_once(test_service):
+    # Arrange
+    test_service._weekly_update_scheduler = Mock(WeeklyUpdateScheduler)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = []
+    new_games = (
+        Game(season_id=2, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=1, guest_name="Team 3", guest_score=20, host_name="Team 1", host_score=10),
+        Game(season_id=2, week=2, guest_name="Team 2", guest_score=20, host_name="Team 1", host_score=10),
+    )
+
+    # Act
+    test_service.add_games(new_games)
+
+    # Assert
+    assert test_service._weekly_update_scheduler.mark_season_dirty.call_args_list == [call(1), call(2)]
+
+
+def test_edit_game_when_weekly_update_scheduler_is_set_should_mark_old_and_new_seasons_dirty(test_service):
+    # Arrange
+    test_service._weekly_update_scheduler = Mock(WeeklyUpdateScheduler)
+    test_service._team_season_repository.get_team_seasons_by_season_and_teams.return_value = []
+    old_game = Game(id=1, season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(id=1, season_id=2, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+
+    # Act
+    test_service.edit_game(new_game, old_game)
+
+    # Assert
+    assert test_service._weekly_update_scheduler.mark_season_dirty.call_args_list == [call(1), call(2)]
+
+
+def test_delete_week_when_weekly_update_scheduler_is_set_should_mark_season_dirty(test_service):
+    # Arrange
+    test_service._weekly_update_scheduler = Mock(WeeklyUpdateScheduler)
+    test_service._game_repository.delete_games_by_season_and_week.return_value = []
+
+    # Act
+    test_service.delete_week(1, 1)
+
+    # Assert
+    test_service._weekly_update_scheduler.mark_season_dirty.assert_called_once_with(1)
@@ -0,0 +1,150 @@
+from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
+from app.services.game_service.team_season_delta import TeamSeasonDelta, fold_games
+
+
+def test_add_result_when_team_wins_should_add_win():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+
+    # Act
+    test_delta.add_result(team_score=20, opponent_score=10)
+
+    # Assert
+    assert test_delta.games == 1
+    assert test_delta.wins == 1
+    assert test_delta.losses == 0
+    assert test_delta.ties == 0
+    assert test_delta.points_for == 20
+    assert test_delta.points_against == 10
+
+
+def test_add_result_when_team_loses_and_sign_is_negative_should_subtract_loss():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+
+    # Act
+    test_delta.add_result(team_score=10, opponent_score=20, sign=-1)
+
+    # Assert
+    assert test_delta.games == -1
+    assert test_delta.wins == 0
+    assert test_delta.losses == -1
+    assert test_delta.ties == 0
+    assert test_delta.points_for == -10
+    assert test_delta.points_against == -20
+
+
+def test_add_result_when_game_is_tied_should_add_tie():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+
+    # Act
+    test_delta.add_result(team_score=17, opponent_score=17)
+
+    # Assert
+    assert test_delta.games == 1
+    assert test_delta.wins == 0
+    assert test_delta.losses == 0
+    assert test_delta.ties == 1
+
+
+def test_is_empty_when_results_cancel_out_should_return_true():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+    test_delta.add_result(team_score=20, opponent_score=10)
+    test_delta.add_result(team_score=20, opponent_score=10, sign=-1)
+
+    # Act
+    is_empty = test_delta.is_empty()
+
+    # Assert
+    assert is_empty
+
+
+def test_is_empty_when_results_do_not_cancel_out_should_return_false():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+    test_delta.add_result(team_score=20, opponent_score=10)
+
+    # Act
+    is_empty = test_delta.is_empty()
+
+    # Assert
+    assert not is_empty
+
+
+def test_apply_to_should_add_totals_and_recalculate_derived_fields():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+    test_delta.add_result(team_score=20, opponent_score=10)
+    test_delta.add_result(team_score=10, opponent_score=20)
+    team_season = TeamSeason(team_id="Team", season_id=1, games=2, wins=2, losses=0, ties=0,
+                             points_for=40, points_against=20)
+
+    # Act
+    test_delta.apply_to(team_season)
+
+    # Assert
+    assert team_season.games == 4
+    assert team_season.wins == 3
+    assert team_season.losses == 1
+    assert team_season.ties == 0
+    assert team_season.points_for == 70
+    assert team_season.points_against == 50
+    assert team_season.winning_percentage == 0.75
+    assert team_season.expected_wins + team_season.expected_losses == 4
+
+
+def test_add_to_should_add_totals_without_recalculating_derived_fields():
+    # Arrange
+    test_delta = TeamSeasonDelta()
+    test_delta.add_result(team_score=20, opponent_score=10)
+    team_season = TeamSeason(team_id="Team", season_id=1, games=0, wins=0, losses=0, ties=0,
+                             points_for=0, points_against=0)
+
+    # Act
+    test_delta.add_to(team_season)
+
+    # Assert
+    assert team_season.games == 1
+    assert team_season.wins == 1
+    assert team_season.points_for == 20
+    assert team_season.points_against == 10
+    assert team_season.winning_percentage is None
+
+
+def test_fold_games_should_return_one_delta_per_team_and_season():
+    # Arrange
+    games = (
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=2, guest_name="Team 2", guest_score=24, host_name="Team 1", host_score=21),
+        Game(season_id=2, week=1, guest_name="Team 1", guest_score=14, host_name="Team 3", host_score=7),
+    )
+
+    # Act
+    deltas = fold_games(games)
+
+    # Assert
+    assert set(deltas.keys()) == {("Team 1", 1), ("Team 2", 1), ("Team 1", 2), ("Team 3", 2)}
+    assert deltas[("Team 1", 1)].games == 2
+    assert deltas[("Team 1", 1)].wins == 1
+    assert deltas[("Team 1", 1)].losses == 1
+    assert deltas[("Team 1", 1)].points_for == 41
+    assert deltas[("Team 1", 1)].points_against == 34
+    assert deltas[("Team 2", 1)].points_for == 34
+    assert deltas[("Team 1", 2)].wins == 1
+    assert deltas[("Team 3", 2)].losses == 1
+
+
+def test_fold_games_when_deltas_arg_is_passed_should_fold_games_into_deltas():
+    # Arrange
+    old_game = Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    new_game = Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+    deltas = fold_games((old_game,), sign=-1)
+
+    # Act
+    deltas = fold_games((new_game,), deltas=deltas)
+
+    # Assert
+    assert all(delta.is_empty() for delta in deltas.values())
@@ -0,0 +1,227 @@
+import threading
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from flask import Flask
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.data.models.game import Game
+from app.data.models.league_season import LeagueSeason
+from app.data.models.league_season_totals import LeagueSeasonTotals
+from app.data.models.season import Season
+from app.data.models.team import Team
+from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_schedule_averages import TeamSeasonScheduleAverages
+from app.data.models.team_season_schedule_totals import TeamSeasonScheduleTotals
+from app.data.repositories.league_season_totals_repository import LeagueSeasonTotalsRepository
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.repositories.team_season_schedule_repository import TeamSeasonScheduleRepository
+from app.data.sqla import sqla
+from app.services.game_service.game_service import GameService
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+SEASON_ID = 1
+LEAGUE_ID = 1
+GUEST = "Guest"
+HOST = "Host"
+TIMEOUT = 10
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_mapping(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'concurrency.sqlite3'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False
+    )
+    sqla.init_app(app)
+
+    with app.app_context():
+        sqla.create_all()
+        sqla.session.add(Season(id=SEASON_ID, year=2022))
+        sqla.session.add(LeagueSeason(league_id=LEAGUE_ID, season_id=SEASON_ID))
+        for name in (GUEST, HOST):
+            sqla.session.add(TeamSeason(team_id=name, season_id=SEASON_ID, league_id=LEAGUE_ID))
+        sqla.session.commit()
+
+        game_service = GameService()
+        for week in (1, 2, 3):
+            game_service.add_game(
+                Game(season_id=SEASON_ID, week=week, guest_name=GUEST, guest_score=20, host_name=HOST, host_score=10)
+            )
+
+    yield app
+
+    with app.app_context():
+        sqla.drop_all()
+        sqla.session.remove()
+
+
+def create_weekly_update_service() -> WeeklyUpdateService:
+    league_season_totals_repository = Mock(LeagueSeasonTotalsRepository)
+    league_season_totals_repository.get_league_season_totals.return_value = \
+        LeagueSeasonTotals(total_games=8, total_points=120)
+
+    team_season_schedule_repository = Mock(TeamSeasonScheduleRepository)
+    team_season_schedule_repository.get_team_season_schedule_totals.return_value = \
+        TeamSeasonScheduleTotals(schedule_games=4)
+    team_season_schedule_repository.get_team_season_schedule_averages.return_value = \
+        TeamSeasonScheduleAverages(points_for=15, points_against=15)
+
+    return WeeklyUpdateService(league_season_totals_repository=league_season_totals_repository,
+                               team_season_schedule_repository=team_season_schedule_repository)
+
+
+def run_in_thread(app: Flask, target) -> tuple:
+    errors = []
+
+    def run():
+        with app.app_context():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                sqla.session.remove()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, errors
+
+
+def verify_team_seasons(games: int, guest_points: int, host_points: int) -> None:
+    guest_season = TeamSeason.query.filter_by(team_id=GUEST, season_id=SEASON_ID).one()
+    host_season = TeamSeason.query.filter_by(team_id=HOST, season_id=SEASON_ID).one()
+
+    assert guest_season.games == games
+    assert guest_season.wins == games
+    assert guest_season.points_for == guest_points
+    assert guest_season.points_against == host_points
+    assert host_season.games == games
+    assert host_season.losses == games
+    assert host_season.points_for == host_points
+    assert host_season.points_against == guest_points
+
+    # Rankings must have been computed from the final totals, not from rows read before the last game was added.
+    assert guest_season.offensive_average == pytest.approx(guest_points / games)
+    assert host_season.offensive_average == pytest.approx(host_points / games)
+
+
+def test_weekly_update_should_retry_rankings_when_game_is_ingested_after_team_seasons_are_read(test_app):
+    # Arrange
+    weekly_update_service = create_weekly_update_service()
+    schedule_repository = weekly_update_service._team_season_schedule_repository
+    team_seasons_read = threading.Event()
+    game_ingested = threading.Event()
+
+    def pause_first_ranking(team_id, season_id):
+        if not team_seasons_read.is_set():
+            team_seasons_read.set()
+            assert game_ingested.wait(TIMEOUT)
+        return TeamSeasonScheduleTotals(schedule_games=4)
+
+    schedule_repository.get_team_season_schedule_totals.side_effect = pause_first_ranking
+
+    # Act
+    thread, errors = run_in_thread(
+        test_app, lambda: weekly_update_service.run_weekly_update(LEAGUE_ID, SEASON_ID)
+    )
+    assert team_seasons_read.wait(TIMEOUT)
+
+    with test_app.app_context():
+        GameService().add_game(
+            Game(season_id=SEASON_ID, week=4, guest_name=GUEST, guest_score=30, host_name=HOST, host_score=10)
+        )
+        sqla.session.remove()
+    game_ingested.set()
+    thread.join(TIMEOUT)
+
+    # Assert
+    assert not errors
+    with test_app.app_context():
+        verify_team_seasons(games=4, guest_points=90, host_points=40)
+
+
+def test_add_game_should_retry_team_season_updates_when_weekly_update_writes_after_team_seasons_are_read(test_app):
+    # Arrange
+    team_seasons_read = threading.Event()
+    weekly_update_done = threading.Event()
+    lookups = []
+    get_team_season = TeamSeasonRepository.get_team_season_by_team_and_season
+
+    def pause_first_attempt(self, team_id, season_id):
+        team_season = get_team_season(self, team_id, season_id)
+        lookups.append(team_id)
+        if lookups == [GUEST, HOST]:
+            # Both team seasons have been read, but not yet changed; let the weekly update write them.
+            team_seasons_read.set()
+            assert weekly_update_done.wait(TIMEOUT)
+        return team_season
+
+    # Act
+    with patch.object(TeamSeasonRepository, 'get_team_season_by_team_and_season', autospec=True,
+                      side_effect=pause_first_attempt):
+        thread, errors = run_in_thread(
+            test_app,
+            lambda: GameService().add_game(
+                Game(season_id=SEASON_ID, week=4, guest_name=GUEST, guest_score=30, host_name=HOST, host_score=10)
+            )
+        )
+        assert team_seasons_read.wait(TIMEOUT)
+
+        with test_app.app_context():
+            create_weekly_update_service().run_weekly_update(LEAGUE_ID, SEASON_ID)
+            sqla.session.remove()
+        weekly_update_done.set()
+        thread.join(TIMEOUT)
+
+    # Assert
+    assert not errors
+    assert len(lookups) > 4
+    with test_app.app_context():
+        guest_season = TeamSeason.query.filter_by(team_id=GUEST, season_id=SEASON_ID).one()
+        assert guest_season.games == 4
+        assert guest_season.wins == 4
+        assert guest_season.points_for == 90
+        assert guest_season.offensive_index is not None
+
+
+def test_add_games_when_team_season_updates_keep_conflicting_should_add_no_games(test_app):
+    # Arrange
+    new_games = [
+        Game(season_id=SEASON_ID, week=week, guest_name=GUEST, guest_score=30, host_name=HOST, host_score=10)
+        for week in (4, 5)
+    ]
+
+    # Act
+    with test_app.app_context():
+        with patch.object(TeamSeasonRepository, 'update_team_seasons', side_effect=StaleDataError()):
+            with pytest.raises(StaleDataError):
+                GameService().add_games(new_games)
+
+        # Assert
+        assert Game.query.count() == 3
+        guest_season = TeamSeason.query.filter_by(team_id=GUEST, season_id=SEASON_ID).one()
+        assert (guest_season.games, guest_season.wins, guest_season.points_for) == (3, 3, 60)
+
+
+def test_edit_game_when_team_season_updates_keep_conflicting_should_not_change_game(test_app):
+    # Arrange
+    with test_app.app_context():
+        old_game = Game.query.filter_by(week=1).one()
+        new_game = Game(id=old_game.id, season_id=SEASON_ID, week=1, guest_name=GUEST, guest_score=10,
+                        host_name=HOST, host_score=20)
+
+        # Act
+        with patch.object(TeamSeasonRepository, 'update_team_seasons', side_effect=StaleDataError()):
+            with pytest.raises(StaleDataError):
+                GameService().edit_game(new_game, old_game)
+
+        # Assert
+        sqla.session.expire_all()
+        edited_game = Game.query.filter_by(week=1).one()
+        assert (edited_game.guest_score, edited_game.host_score, edited_game.winner_name) == (20, 10, GUEST)
+        guest_season = TeamSeason.query.filter_by(team_id=GUEST, season_id=SEASON_ID).one()
+        assert (guest_season.wins, guest_season.losses) == (3, 0)
@@ -0,0 +1,227 @@
+import time
+
+import pytest
+
+from flask import Flask
+
+from app.data.errors import EntityNotFoundError
+from app.data.models.game import Game
+from app.data.models.league_season import LeagueSeason
+from app.data.models.season import Season
+from app.data.models.team import Team
+from app.data.models.team_season import TeamSeason
+from app.data.sqla import sqla
+from app.services.season_state.season_state import SeasonState
+
+SEASON_ID = 1
+
+
+@pytest.fixture()
+def sqlite_app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_mapping(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'season_state.sqlite3'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False
+    )
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+        sqla.session.add(Season(id=SEASON_ID, year=2022))
+        sqla.session.add(LeagueSeason(league_id=1, season_id=SEASON_ID))
+        for team_id in ("Team 1", "Team 2", "Team 3"):
+            sqla.session.add(TeamSeason(team_id=team_id, season_id=SEASON_ID, league_id=1))
+        sqla.session.add(TeamSeason(team_id="Team 1", season_id=2, league_id=1))
+        sqla.session.commit()
+        yield app
+        sqla.session.remove()
+
+
+@pytest.fixture()
+def test_state(sqlite_app):
+    return SeasonState(SEASON_ID).load()
+
+
+def create_game(week: int, guest_name: str, guest_score: int, host_name: str, host_score: int,
+                season_id: int = SEASON_ID) -> Game:
+    return Game(season_id=season_id, week=week, guest_name=guest_name, guest_score=guest_score,
+                host_name=host_name, host_score=host_score)
+
+
+def get_stored_team_season(team_id: str) -> TeamSeason:
+    sqla.session.expire_all()
+    return TeamSeason.query.filter_by(team_id=team_id, season_id=SEASON_ID).one()
+
+
+def test_load_should_load_rows_of_season_only(test_state):
+    # Assert
+    assert sorted(team_season.team_id for team_season in test_state.get_team_seasons()) == \
+           ["Team 1", "Team 2", "Team 3"]
+    assert len(test_state.get_league_seasons()) == 1
+    assert test_state.get_games() == []
+    assert not test_state.is_dirty
+
+
+def test_add_game_should_update_team_seasons_in_memory_without_writing(test_state):
+    # Act
+    added = test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+
+    # Assert
+    assert added
+    assert test_state.is_dirty
+
+    team_season_1 = test_state.get_team_season("Team 1")
+    assert team_season_1.games == 1
+    assert team_season_1.wins == 1
+    assert team_season_1.points_for == 20
+    assert team_season_1.points_against == 10
+    assert team_season_1.winning_percentage == 1.0
+    assert test_state.get_team_season("Team 2").losses == 1
+
+    assert Game.query.count() == 0
+    assert get_stored_team_season("Team 1").games == 0
+
+
+def test_add_game_when_game_is_already_in_memory_should_not_add_it_again(test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+
+    # Act
+    added = test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+
+    # Assert
+    assert not added
+    assert test_state.get_team_season("Team 1").games == 1
+
+
+def test_add_game_when_neither_team_has_team_season_should_raise_entity_not_found_error(test_state):
+    # Act and Assert
+    with pytest.raises(EntityNotFoundError):
+        test_state.add_game(create_game(1, "Team 4", 20, "Team 5", 10))
+
+
+def test_add_game_when_game_is_of_another_season_should_raise_value_error(test_state):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10, season_id=2))
+
+
+def test_flush_should_write_games_and_team_seasons(test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+    test_state.add_game(create_game(1, "Team 3", 7, "Team 1", 7))
+
+    # Act
+    test_state.flush()
+
+    # Assert
+    assert not test_state.is_dirty
+    assert Game.query.count() == 2
+    assert all(game.id is not None for game in test_state.get_games())
+
+    team_season_1 = get_stored_team_season("Team 1")
+    assert team_season_1.games == 2
+    assert team_season_1.wins == 1
+    assert team_season_1.ties == 1
+    assert team_season_1.points_for == 27
+    assert team_season_1.points_against == 17
+    assert team_season_1.winning_percentage == 0.75
+    assert team_season_1.version_id == 2
+    assert test_state.get_team_season("Team 1").version_id == 2
+
+
+def test_edit_game_should_apply_net_change_and_write_game_on_flush(test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+    test_state.flush()
+    id = test_state.get_games()[0].id
+
+    new_game = create_game(1, "Team 1", 10, "Team 2", 24)
+    new_game.id = id
+
+    # Act
+    test_state.edit_game(new_game)
+    test_state.flush()
+
+    # Assert
+    team_season_1 = get_stored_team_season("Team 1")
+    assert (team_season_1.games, team_season_1.wins, team_season_1.losses) == (1, 0, 1)
+    assert (team_season_1.points_for, team_season_1.points_against) == (10, 24)
+
+    stored_game = Game.query.get(id)
+    assert stored_game.host_score == 24
+    assert stored_game.winner_name == "Team 2"
+
+
+def test_edit_game_when_game_is_not_found_should_raise_entity_not_found_error(test_state):
+    # Arrange
+    new_game = create_game(1, "Team 1", 20, "Team 2", 10)
+    new_game.id = 1
+
+    # Act and Assert
+    with pytest.raises(EntityNotFoundError):
+        test_state.edit_game(new_game)
+
+
+def test_delete_game_should_remove_result_and_delete_game_on_flush(test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+    test_state.add_game(create_game(2, "Team 1", 3, "Team 2", 6))
+    test_state.flush()
+    id = test_state.get_games(week=1)[0].id
+
+    # Act
+    test_state.delete_game(id)
+    test_state.flush()
+
+    # Assert
+    assert Game.query.count() == 1
+    assert test_state.get_game(id) is None
+
+    team_season_1 = get_stored_team_season("Team 1")
+    assert (team_season_1.games, team_season_1.wins, team_season_1.losses) == (1, 0, 1)
+    assert (team_season_1.points_for, team_season_1.points_against) == (3, 6)
+
+
+def test_delete_game_when_game_is_not_found_should_raise_entity_not_found_error(test_state):
+    # Act and Assert
+    with pytest.raises(EntityNotFoundError):
+        test_state.delete_game(1)
+
+
+def test_flush_when_write_fails_should_keep_changes(test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+    sqla.session.add(create_game(1, "Team 1", 20, "Team 2", 10))
+    sqla.session.commit()
+
+    # Act
+    with pytest.raises(Exception):
+        test_state.flush()
+
+    # Assert
+    assert test_state.is_dirty
+    assert test_state.get_games()[0].id is None
+    assert get_stored_team_season("Team 1").games == 0
+
+
+def test_start_auto_flush_should_flush_in_background(sqlite_app, test_state):
+    # Arrange
+    test_state.add_game(create_game(1, "Team 1", 20, "Team 2", 10))
+
+    # Act
+    test_state.start_auto_flush(sqlite_app, 0.01)
+    deadline = time.monotonic() + 5
+    while test_state.is_dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    test_state.stop_auto_flush()
+
+    # Assert
+    assert not test_state.is_dirty
+    assert test_state.last_flush_error is None
+    assert get_stored_team_season("Team 1").games == 1
+
+
+def test_start_auto_flush_when_interval_is_not_positive_should_raise_value_error(sqlite_app, test_state):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_state.start_auto_flush(sqlite_app, 0)
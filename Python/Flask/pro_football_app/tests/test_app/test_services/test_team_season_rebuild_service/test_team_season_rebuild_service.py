@@ -0,0 +1,107 @@
+import pytest
+
+from types import SimpleNamespace
+from unittest.mock import Mock, call
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.models.team_season import TeamSeason
+from app.data.repositories.game_repository import GameRepository
+from app.data.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.services.team_season_rebuild_service.team_season_rebuild_service import TeamSeasonRebuildService
+
+
+@pytest.fixture()
+def test_service():
+    return TeamSeasonRebuildService(Mock(GameRepository), Mock(TeamSeasonRepository))
+
+
+def create_result(team_id: str, season_id: int, games: int, wins: int, losses: int, ties: int,
+                  points_for: int, points_against: int) -> SimpleNamespace:
+    return SimpleNamespace(team_id=team_id, season_id=season_id, games=games, wins=wins, losses=losses, ties=ties,
+                           points_for=points_for, points_against=points_against)
+
+
+def test_rebuild_team_seasons_when_last_season_id_is_less_than_first_season_id_should_raise_value_error(
+        test_service
+):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.rebuild_team_seasons(2, 1)
+
+
+def test_rebuild_team_seasons_when_last_season_id_is_none_should_rebuild_first_season_only(test_service):
+    # Arrange
+    test_service._game_repository.get_team_season_results.return_value = []
+    test_service._team_season_repository.get_team_seasons_by_season_range.return_value = []
+
+    # Act
+    test_service.rebuild_team_seasons(5)
+
+    # Assert
+    test_service._game_repository.get_team_season_results.assert_called_once_with(5, 5)
+    test_service._team_season_repository.get_team_seasons_by_season_range.assert_called_once_with(5, 5)
+
+
+def test_rebuild_team_seasons_should_rebuild_totals_and_report_drifted_team_seasons(test_service):
+    # Arrange
+    test_service._game_repository.get_team_season_results.return_value = [
+        create_result("Team 1", 1, games=2, wins=1, losses=0, ties=1, points_for=37, points_against=27),
+        create_result("Team 2", 1, games=2, wins=0, losses=1, ties=1, points_for=27, points_against=37),
+    ]
+    team_season_1 = TeamSeason(team_id="Team 1", season_id=1, games=2, wins=1, losses=0, ties=1,
+                               points_for=37, points_against=27)
+    team_season_2 = TeamSeason(team_id="Team 2", season_id=1, games=3, wins=1, losses=1, ties=1,
+                               points_for=27, points_against=37)
+    team_season_3 = TeamSeason(team_id="Team 3", season_id=1, games=1, wins=1, losses=0, ties=0,
+                               points_for=10, points_against=0)
+    team_seasons = [team_season_1, team_season_2, team_season_3]
+    test_service._team_season_repository.get_team_seasons_by_season_range.return_value = team_seasons
+
+    # Act
+    drifts = test_service.rebuild_team_seasons(1, 2)
+
+    # Assert
+    assert [(drift.team_id, drift.season_id) for drift in drifts] == [("Team 2", 1), ("Team 3", 1)]
+    assert drifts[0].differences == {'games': (3, 2), 'wins': (1, 0)}
+    assert drifts[1].differences == {
+        'games': (1, 0), 'wins': (1, 0), 'points_for': (10, 0)
+    }
+
+    assert (team_season_2.games, team_season_2.wins, team_season_2.losses, team_season_2.ties) == (2, 0, 1, 1)
+    assert team_season_2.winning_percentage == 0.25
+    assert team_season_2.expected_wins + team_season_2.expected_losses == pytest.approx(2)
+    assert (team_season_3.games, team_season_3.wins, team_season_3.points_for) == (0, 0, 0)
+    assert team_season_3.winning_percentage is None
+    assert team_season_1.winning_percentage == 0.75
+    test_service._team_season_repository.update_team_seasons.assert_called_once_with(tuple(team_seasons))
+
+
+def test_init_when_seasons_per_chunk_is_less_than_one_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        TeamSeasonRebuildService(Mock(GameRepository), Mock(TeamSeasonRepository), seasons_per_chunk=0)
+
+
+def test_rebuild_team_seasons_when_checkpoint_should_resume_after_checkpointed_chunk_and_checkpoint_each_chunk():
+    # Arrange
+    test_service = TeamSeasonRebuildService(Mock(GameRepository), Mock(TeamSeasonRepository),
+                                            Mock(JobCheckpointRepository), seasons_per_chunk=2)
+    test_service._game_repository.get_team_season_results.return_value = []
+    test_service._team_season_repository.get_team_seasons_by_season_range.return_value = []
+    test_service._job_checkpoint_repository.get_job_checkpoint.return_value = \
+        JobCheckpoint(job_name="rebuild-team-seasons:1-7", season_id=2, phase='rebuild')
+
+    # Act
+    test_service.rebuild_team_seasons(1, 7, checkpoint=True)
+
+    # Assert
+    assert test_service._game_repository.get_team_season_results.call_args_list == [call(3, 4), call(5, 6), call(7, 7)]
+    assert test_service._job_checkpoint_repository.save_job_checkpoint.call_args_list == [
+        call("rebuild-team-seasons:1-7", 4, None, 'rebuild'),
+        call("rebuild-team-seasons:1-7", 6, None, 'rebuild'),
+        call("rebuild-team-seasons:1-7", 7, None, 'rebuild'),
+    ]
+    test_service._job_checkpoint_repository.delete_job_checkpoint.assert_called_once_with("rebuild-team-seasons:1-7")
+    assert test_service.last_resumed_checkpoint is \
+           test_service._job_checkpoint_repository.get_job_checkpoint.return_value
@@ -0,0 +1,170 @@
+import pytest
+
+from unittest.mock import Mock, call, patch
+
+from app.data.models.job_checkpoint import JobCheckpoint
+from app.data.models.league_season import LeagueSeason
+from app.data.repositories.job_checkpoint_repository import JobCheckpointRepository
+from app.data.repositories.league_season_repository import LeagueSeasonRepository
+from app.services.weekly_update_backfill_service.weekly_update_backfill_service import WeeklyUpdateBackfillService
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+
+@pytest.fixture()
+def test_service():
+    return WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService))
+
+
+def test_init_when_workers_is_less_than_one_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService), workers=0)
+
+
+def test_backfill_when_last_season_id_is_less_than_first_season_id_should_raise_value_error(test_service):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        test_service.backfill(2, 1)
+
+
+def test_backfill_when_last_season_id_is_none_should_backfill_first_season_only(test_service):
+    # Arrange
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = []
+
+    # Act
+    test_service.backfill(5)
+
+    # Assert
+    test_service._league_season_repository.get_league_seasons_by_season_range.assert_called_once_with(5, 5)
+
+
+def test_backfill_should_run_weekly_update_of_each_season_once_and_report_each_season(test_service):
+    # Arrange
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id='NFL', season_id=2), LeagueSeason(league_id='AFL', season_id=1),
+        LeagueSeason(league_id='NFL', season_id=1),
+    ]
+    progress = Mock()
+
+    # Act
+    summary = test_service.backfill(1, 2, progress=progress)
+
+    # Assert
+    assert test_service._weekly_update_service.run_season_weekly_update.call_args_list == [call(1), call(2)]
+    test_service._weekly_update_service.run_weekly_update.assert_not_called()
+    assert [(result.season_id, result.league_ids) for result in summary.seasons] == [(1, ['AFL', 'NFL']), (2, ['NFL'])]
+    assert summary.league_seasons_updated == 3
+    assert summary.workers == 1
+    assert progress.call_count == 2
+
+
+@patch('app.services.weekly_update_backfill_service.weekly_update_backfill_service.supports_row_locking')
+def test_backfill_when_data_store_cannot_lock_rows_should_update_seasons_in_this_process(fake_supports_row_locking):
+    # Arrange
+    fake_supports_row_locking.return_value = False
+    test_service = WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService), workers=4)
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id='NFL', season_id=1)
+    ]
+
+    # Act
+    summary = test_service.backfill(1)
+
+    # Assert
+    test_service._weekly_update_service.run_season_weekly_update.assert_called_once_with(1)
+    assert summary.workers == 1
+
+
+@patch('app.services.weekly_update_backfill_service.weekly_update_backfill_service.WeeklyUpdateService')
+def test_init_when_weekly_update_service_is_none_should_create_weekly_update_service(fake_weekly_update_service):
+    # Act
+    WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository))
+
+    # Assert
+    fake_weekly_update_service.assert_called_once_with(ratings_solver=None)
+
+
+def test_backfill_when_checkpoint_should_resume_after_checkpointed_season_and_checkpoint_each_season():
+    # Arrange
+    test_service = WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService),
+                                               job_checkpoint_repository=Mock(JobCheckpointRepository))
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id='AFL', season_id=1), LeagueSeason(league_id='NFL', season_id=1),
+        LeagueSeason(league_id='AAFC', season_id=2), LeagueSeason(league_id='NFL', season_id=2),
+        LeagueSeason(league_id='NFL', season_id=3),
+    ]
+    test_service._job_checkpoint_repository.get_job_checkpoint.return_value = \
+        JobCheckpoint(job_name="backfill-weekly-updates:1-3", season_id=1, league_id=None, phase='weekly_update')
+
+    # Act
+    summary = test_service.backfill(1, 3, checkpoint=True)
+
+    # Assert
+    test_service._job_checkpoint_repository.get_job_checkpoint.assert_called_once_with("backfill-weekly-updates:1-3")
+    assert test_service._weekly_update_service.run_season_weekly_update.call_args_list == [call(2), call(3)]
+    assert test_service._job_checkpoint_repository.save_job_checkpoint.call_args_list == [
+        call("backfill-weekly-updates:1-3", 2, None, 'weekly_update'),
+        call("backfill-weekly-updates:1-3", 3, None, 'weekly_update'),
+    ]
+    test_service._job_checkpoint_repository.delete_job_checkpoint.assert_called_once_with(
+        "backfill-weekly-updates:1-3"
+    )
+    assert summary.resumed_checkpoint is test_service._job_checkpoint_repository.get_job_checkpoint.return_value
+
+
+def test_backfill_when_checkpoint_has_league_should_run_checkpointed_season_again():
+    # Arrange
+    test_service = WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService),
+                                               job_checkpoint_repository=Mock(JobCheckpointRepository))
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id=2, season_id=9), LeagueSeason(league_id=2, season_id=10),
+        LeagueSeason(league_id=10, season_id=10), LeagueSeason(league_id=2, season_id=11),
+    ]
+    test_service._job_checkpoint_repository.get_job_checkpoint.return_value = \
+        JobCheckpoint(job_name="backfill-weekly-updates:9-11", season_id=10, league_id='2', phase='weekly_update')
+
+    # Act
+    summary = test_service.backfill(9, 11, checkpoint=True)
+
+    # Assert
+    assert test_service._weekly_update_service.run_season_weekly_update.call_args_list == [call(10), call(11)]
+    assert [(result.season_id, result.league_ids) for result in summary.seasons] == [(10, [2, 10]), (11, [2])]
+
+
+def test_backfill_when_restart_should_discard_checkpoint_and_start_from_first_season():
+    # Arrange
+    test_service = WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService),
+                                               job_checkpoint_repository=Mock(JobCheckpointRepository))
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id='NFL', season_id=1)
+    ]
+
+    # Act
+    summary = test_service.backfill(1, checkpoint=True, restart=True)
+
+    # Assert
+    test_service._job_checkpoint_repository.get_job_checkpoint.assert_not_called()
+    test_service._weekly_update_service.run_season_weekly_update.assert_called_once_with(1)
+    assert test_service._job_checkpoint_repository.delete_job_checkpoint.call_count == 2
+    assert summary.resumed_checkpoint is None
+
+
+def test_backfill_when_update_fails_should_keep_checkpoint_of_last_update():
+    # Arrange
+    test_service = WeeklyUpdateBackfillService(Mock(LeagueSeasonRepository), Mock(WeeklyUpdateService),
+                                               job_checkpoint_repository=Mock(JobCheckpointRepository))
+    test_service._league_season_repository.get_league_seasons_by_season_range.return_value = [
+        LeagueSeason(league_id='NFL', season_id=1), LeagueSeason(league_id='NFL', season_id=2)
+    ]
+    test_service._job_checkpoint_repository.get_job_checkpoint.return_value = None
+    test_service._weekly_update_service.run_season_weekly_update.side_effect = [None, RuntimeError()]
+
+    # Act
+    with pytest.raises(RuntimeError):
+        test_service.backfill(1, 2, checkpoint=True)
+
+    # Assert
+    test_service._job_checkpoint_repository.save_job_checkpoint.assert_called_once_with(
+        "backfill-weekly-updates:1-2", 1, None, 'weekly_update'
+    )
+    test_service._job_checkpoint_repository.delete_job_checkpoint.assert_not_called()
@@ -0,0 +1,31 @@
+from app.data.models.game import Game
+from app.services.weekly_update_service.opponent_graph import OpponentGraph
+
+
+def create_game(guest_name: str, host_name: str) -> Game:
+    return Game(season_id=1, week=1, guest_name=guest_name, guest_score=20, host_name=host_name, host_score=10)
+
+
+def test_get_opponents_should_get_guests_and_hosts_played():
+    # Arrange
+    graph = OpponentGraph([create_game("Team 1", "Team 2"), create_game("Team 3", "Team 1")])
+
+    # Act
+    opponents = graph.get_opponents("Team 1")
+
+    # Assert
+    assert opponents == {"Team 2", "Team 3"}
+    assert graph.get_opponents("Team 4") == set()
+
+
+def test_get_affected_team_ids_should_get_changed_teams_and_their_opponents_only():
+    # Arrange
+    graph = OpponentGraph([
+        create_game("Team 1", "Team 2"), create_game("Team 2", "Team 3"), create_game("Team 3", "Team 4")
+    ])
+
+    # Act
+    affected_team_ids = graph.get_affected_team_ids(["Team 1", "Team 5"])
+
+    # Assert
+    assert affected_team_ids == {"Team 1", "Team 2", "Team 5"}
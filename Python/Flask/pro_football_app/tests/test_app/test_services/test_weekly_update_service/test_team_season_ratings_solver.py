@@ -0,0 +1,108 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.data.models.game import Game
+from app.data.models.team_season import TeamSeason
+from app.services.game_service.team_season_delta import fold_games
+from app.services.weekly_update_service.team_season_ratings_solver import TeamSeasonRatingsSolver
+
+
+def create_season(team_count: int, week_count: int, seed: int) -> tuple:
+    generator = random.Random(seed)
+    team_ids = [f"Team {i:02d}" for i in range(1, team_count + 1)]
+    games = []
+    for week in range(1, week_count + 1):
+        order = generator.sample(team_ids, team_count)
+        for i in range(0, team_count, 2):
+            games.append(Game(season_id=1, week=week, guest_name=order[i], guest_score=generator.randint(0, 45),
+                              host_name=order[i + 1], host_score=generator.randint(0, 45)))
+
+    team_seasons = []
+    for (team_id, season_id), delta in fold_games(games).items():
+        team_season = TeamSeason(team_id=team_id, season_id=season_id, league_id=1, games=0, wins=0, losses=0,
+                                 ties=0, points_for=0, points_against=0)
+        delta.add_to(team_season)
+        team_seasons.append(team_season)
+    return team_seasons, games
+
+
+@pytest.mark.parametrize('tolerance, max_iterations', [(0, 100), (1e-9, 0)])
+def test_init_when_tolerance_or_max_iterations_is_out_of_range_should_raise_value_error(tolerance, max_iterations):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        TeamSeasonRatingsSolver(tolerance, max_iterations)
+
+
+def test_solve_when_every_game_is_the_same_should_rate_every_team_at_league_average():
+    # Arrange
+    team_seasons, games = create_season(team_count=4, week_count=3, seed=42)
+    for game in games:
+        game.guest_score = game.host_score = 20
+    for team_season in team_seasons:
+        team_season.points_for = team_season.points_against = 20 * team_season.games
+
+    # Act
+    ratings, report = TeamSeasonRatingsSolver().solve(team_seasons, games, 20)
+
+    # Assert
+    assert report.converged
+    assert ratings.offensive_factor.tolist() == [1.0] * 4
+    assert ratings.defensive_index.tolist() == [20.0] * 4
+    assert ratings.final_expected_winning_percentage.tolist() == [0.5] * 4
+
+
+def test_solve_should_iterate_indices_to_fixed_point():
+    # Arrange
+    team_seasons, games = create_season(team_count=32, week_count=17, seed=42)
+    positions = {team_season.team_id: i for i, team_season in enumerate(team_seasons)}
+    opponents = [[] for _ in team_seasons]
+    for game in games:
+        opponents[positions[game.guest_name]].append(positions[game.host_name])
+        opponents[positions[game.host_name]].append(positions[game.guest_name])
+
+    # Act
+    ratings, report = TeamSeasonRatingsSolver(tolerance=1e-12).solve(team_seasons, games, 22)
+
+    # Assert
+    assert report.converged
+    assert report.iterations < 100
+    assert report.elapsed_seconds < 1
+    for i, team_opponents in enumerate(opponents):
+        schedule_defensive_index = np.mean([ratings.defensive_index[j] for j in team_opponents])
+        schedule_offensive_index = np.mean([ratings.offensive_index[j] for j in team_opponents])
+        assert ratings.offensive_factor[i] == \
+               pytest.approx(ratings.offensive_average[i] / schedule_defensive_index, rel=1e-9)
+        assert ratings.defensive_factor[i] == \
+               pytest.approx(ratings.defensive_average[i] / schedule_offensive_index, rel=1e-9)
+
+
+def test_solve_when_max_iterations_is_reached_should_report_not_converged():
+    # Arrange
+    team_seasons, games = create_season(team_count=8, week_count=7, seed=42)
+
+    # Act
+    ratings, report = TeamSeasonRatingsSolver(max_iterations=1).solve(team_seasons, games, 22)
+
+    # Assert
+    assert report.iterations == 1
+    assert not report.converged
+    assert report.residual > 0
+
+
+def test_solve_when_team_has_no_games_against_team_seasons_should_not_rate_it():
+    # Arrange
+    team_seasons, games = create_season(team_count=4, week_count=3, seed=42)
+    team_seasons.append(TeamSeason(team_id="Team 05", season_id=1, league_id=1, games=1, wins=1, losses=0, ties=0,
+                                   points_for=30, points_against=10))
+    games.append(Game(season_id=1, week=4, guest_name="Team 05", guest_score=30, host_name="Team 99", host_score=10))
+
+    # Act
+    ratings, report = TeamSeasonRatingsSolver().solve(team_seasons, games, 22)
+
+    # Assert
+    assert report.converged
+    assert ratings.get_row(4) == dict(offensive_average=30.0, offensive_factor=None, offensive_index=None,
+                                      defensive_average=10.0, defensive_factor=None, defensive_index=None)
+    assert not np.isnan(ratings.offensive_index[:4]).any()
@@ -0,0 +1,186 @@
+import random
+
+import pytest
+
+from flask import Flask
+from sqlalchemy import text
+
+from app.data.models.game import Game
+from app.data.models.league_season import LeagueSeason  # noqa: F401
+from app.data.models.season import Season  # noqa: F401
+from app.data.models.team import Team  # noqa: F401
+from app.data.models.team_season import TeamSeason
+from app.data.sqla import sqla
+from app.services.game_service.team_season_delta import fold_games
+from app.services.weekly_update_service.team_season_schedule_calculator import TeamSeasonScheduleCalculator
+
+# fn_GetTeamSeasonGames, fn_GetTeamSeasonScheduleData, fn_GetTeamSeasonScheduleProfile,
+# fn_GetTeamSeasonScheduleTotals, and sp_GetTeamSeasonScheduleAverages, translated to SQLite.
+SCHEDULE_SQL = text("""
+WITH tsg AS (
+    SELECT id, host_name AS opponent, guest_score AS points_for, host_score AS points_against
+    FROM game WHERE guest_name = :team_id AND season_id = :season_id
+    UNION
+    SELECT id, guest_name AS opponent, host_score AS points_for, guest_score AS points_against
+    FROM game WHERE host_name = :team_id AND season_id = :season_id
+),
+tssd AS (
+    SELECT tsg.id, tsg.opponent, ts.wins, ts.losses, ts.ties,
+        ts.games - 1 AS weighted_games,
+        ts.points_for - tsg.points_against AS weighted_points_for,
+        ts.points_against - tsg.points_for AS weighted_points_against
+    FROM team_season AS ts INNER JOIN tsg ON ts.team_id = tsg.opponent
+    WHERE ts.season_id = :season_id
+),
+tssp AS (
+    SELECT tsg.id, tsg.opponent, tsg.points_for AS game_points_for, tsg.points_against AS game_points_against
+    FROM tsg INNER JOIN tssd ON tsg.id = tssd.id
+),
+totals AS (
+    SELECT
+        COUNT(tssp.opponent) AS games,
+        SUM(tssp.game_points_for) AS points_for,
+        SUM(tssp.game_points_against) AS points_against,
+        SUM(tssd.wins) AS schedule_wins,
+        SUM(tssd.losses) AS schedule_losses,
+        SUM(tssd.ties) AS schedule_ties,
+        CASE
+            WHEN (SUM(tssd.wins) + SUM(tssd.losses) + SUM(tssd.ties)) = 0 THEN NULL
+            ELSE CAST(2 * SUM(tssd.wins) + SUM(tssd.ties) AS REAL)
+                / (2 * (SUM(tssd.wins) + SUM(tssd.losses) + SUM(tssd.ties)))
+        END AS schedule_winning_percentage,
+        SUM(tssd.weighted_games) AS schedule_games,
+        SUM(tssd.weighted_points_for) AS schedule_points_for,
+        SUM(tssd.weighted_points_against) AS schedule_points_against
+    FROM tssp INNER JOIN tssd ON tssp.opponent = tssd.opponent
+)
+SELECT totals.*,
+    CASE WHEN games = 0 THEN NULL ELSE ROUND(CAST(points_for AS REAL) / games, 2) END,
+    CASE WHEN games = 0 THEN NULL ELSE ROUND(CAST(points_against AS REAL) / games, 2) END,
+    CASE WHEN schedule_games = 0 THEN NULL ELSE ROUND(CAST(schedule_points_for AS REAL) / schedule_games, 2) END,
+    CASE WHEN schedule_games = 0 THEN NULL ELSE ROUND(CAST(schedule_points_against AS REAL) / schedule_games, 2) END
+FROM totals
+""")
+
+TOTALS = ('games', 'points_for', 'points_against', 'schedule_wins', 'schedule_losses', 'schedule_ties',
+          'schedule_winning_percentage', 'schedule_games', 'schedule_points_for', 'schedule_points_against')
+AVERAGES = ('points_for', 'points_against', 'schedule_points_for', 'schedule_points_against')
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+        yield app
+        sqla.session.remove()
+
+
+def create_team_season(team_id: str, games: int, wins: int, losses: int, ties: int,
+                       points_for: int, points_against: int) -> TeamSeason:
+    return TeamSeason(team_id=team_id, season_id=1, league_id=1, games=games, wins=wins, losses=losses, ties=ties,
+                      points_for=points_for, points_against=points_against)
+
+
+def test_get_team_season_schedule_totals_and_averages_should_exclude_head_to_head_game():
+    # Arrange
+    team_seasons = [
+        create_team_season("Team 1", games=1, wins=1, losses=0, ties=0, points_for=20, points_against=10),
+        create_team_season("Team 2", games=2, wins=0, losses=1, ties=1, points_for=27, points_against=37),
+    ]
+    games = [
+        Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+        Game(season_id=1, week=2, guest_name="Team 2", guest_score=17, host_name="Team 3", host_score=17),
+    ]
+
+    # Act
+    calculator = TeamSeasonScheduleCalculator(games, team_seasons)
+    totals = calculator.get_team_season_schedule_totals("Team 1", 1)
+    averages = calculator.get_team_season_schedule_averages("Team 1", 1)
+
+    # Assert
+    assert (totals.games, totals.points_for, totals.points_against) == (1, 20, 10)
+    assert (totals.schedule_wins, totals.schedule_losses, totals.schedule_ties) == (0, 1, 1)
+    assert totals.schedule_winning_percentage == 0.25
+    assert (totals.schedule_games, totals.schedule_points_for, totals.schedule_points_against) == (1, 17, 17)
+    assert (averages.points_for, averages.points_against) == (20.0, 10.0)
+    assert (averages.schedule_points_for, averages.schedule_points_against) == (17.0, 17.0)
+
+
+def test_get_team_season_schedule_totals_when_team_has_no_games_should_return_aggregates_over_no_rows():
+    # Arrange
+    team_seasons = [create_team_season("Team 1", games=0, wins=0, losses=0, ties=0, points_for=0, points_against=0)]
+
+    # Act
+    calculator = TeamSeasonScheduleCalculator([], team_seasons)
+    totals = calculator.get_team_season_schedule_totals("Team 1", 1)
+    averages = calculator.get_team_season_schedule_averages("Team 1", 1)
+
+    # Assert
+    assert totals.games == 0
+    assert totals.schedule_games is None
+    assert averages.points_for is None
+    assert averages.schedule_points_for is None
+
+
+def test_get_team_season_schedule_totals_when_team_season_was_not_calculated_should_return_empty_totals():
+    # Act
+    calculator = TeamSeasonScheduleCalculator([], [])
+    totals = calculator.get_team_season_schedule_totals("Team 1", 1)
+    averages = calculator.get_team_season_schedule_averages("Team 1", 1)
+
+    # Assert
+    assert totals.games is None
+    assert averages.points_for is None
+
+
+def test_team_season_schedule_calculator_should_match_schedule_functions(sqlite_app):
+    # Arrange
+    generator = random.Random(38)
+    team_ids = [f"Team {i}" for i in range(1, 11)]
+    games = []
+    for week in range(1, 15):
+        order = generator.sample(team_ids, len(team_ids))
+        for i in range(0, len(order), 2):
+            games.append(Game(season_id=1, week=week, guest_name=order[i], guest_score=generator.randint(0, 40),
+                              host_name=order[i + 1], host_score=generator.randint(0, 40)))
+
+    # Team 10 has no team season, so its games count for its opponents' records but not their schedules.
+    deltas = fold_games(games)
+    team_seasons = [
+        create_team_season(team_id, games=delta.games, wins=delta.wins, losses=delta.losses, ties=delta.ties,
+                           points_for=delta.points_for, points_against=delta.points_against)
+        for (team_id, season_id), delta in deltas.items() if team_id != "Team 10"
+    ]
+    sqla.session.add_all(games + team_seasons)
+    sqla.session.commit()
+
+    # Act
+    calculator = TeamSeasonScheduleCalculator(games, team_seasons)
+
+    # Assert
+    for team_season in team_seasons:
+        row = sqla.session.execute(SCHEDULE_SQL, dict(team_id=team_season.team_id, season_id=1)).one()
+        totals = calculator.get_team_season_schedule_totals(team_season.team_id, 1)
+        averages = calculator.get_team_season_schedule_averages(team_season.team_id, 1)
+
+        assert [getattr(totals, name) for name in TOTALS] == pytest.approx(list(row[:len(TOTALS)]), abs=1e-10)
+        assert [getattr(averages, name) for name in AVERAGES] == list(row[len(TOTALS):])
+
+
+def test_team_season_schedule_calculator_when_team_ids_are_given_should_calculate_their_schedules_only():
+    # Arrange
+    team_seasons = [
+        create_team_season("Team 1", games=1, wins=1, losses=0, ties=0, points_for=20, points_against=10),
+        create_team_season("Team 2", games=1, wins=0, losses=1, ties=0, points_for=10, points_against=20),
+    ]
+    games = [Game(season_id=1, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)]
+
+    # Act
+    calculator = TeamSeasonScheduleCalculator(games, team_seasons, {"Team 1"})
+
+    # Assert
+    assert calculator.get_team_season_schedule_totals("Team 1", 1).games == 1
+    assert calculator.get_team_season_schedule_totals("Team 2", 1).games is None
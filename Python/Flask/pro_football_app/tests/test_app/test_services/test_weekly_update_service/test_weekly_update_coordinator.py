@@ -0,0 +1,155 @@
+import threading
+
+from datetime import datetime, timedelta
+from unittest.mock import ANY, Mock, call
+
+import pytest
+
+from flask import Flask
+
+from app.data.models.weekly_update_lock import WeeklyUpdateLock
+from app.data.repositories.weekly_update_lock_repository import WeeklyUpdateLockRepository
+from app.data.sqla import sqla
+from app.services.weekly_update_service.weekly_update_coordinator import WeeklyUpdateCoordinator
+from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        WeeklyUpdateLock.__table__.create(sqla.engine)
+        yield app
+        sqla.session.remove()
+
+
+def get_lock() -> WeeklyUpdateLock:
+    sqla.session.expire_all()
+    return WeeklyUpdateLock.query.filter_by(league_id='NFL', season_id=1).one()
+
+
+def test_init_when_lease_seconds_is_not_greater_than_zero_should_raise_value_error():
+    # Act and Assert
+    with pytest.raises(ValueError):
+        WeeklyUpdateCoordinator(Mock(WeeklyUpdateService), Mock(), lease_seconds=0)
+
+
+def test_request_weekly_update_when_not_running_should_run_update_and_release_lock(sqlite_app):
+    # Arrange
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+
+    # Act
+    reports = test_coordinator.request_weekly_update('NFL', 1, incremental=True)
+
+    # Assert
+    test_coordinator._weekly_update_service.run_weekly_update.assert_called_once_with('NFL', 1, True)
+    assert reports == [test_coordinator._weekly_update_service.run_weekly_update.return_value]
+    assert get_lock().owner is None
+
+
+def test_request_weekly_update_when_running_should_coalesce_requests_into_one_follow_up_run(sqlite_app):
+    # Arrange
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+    other_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+    coalesced_reports = []
+
+    def request_during_first_run(league_id, season_id, incremental):
+        if test_coordinator._weekly_update_service.run_weekly_update.call_count == 1:
+            for other_incremental in (True, False, True):
+                coalesced_reports.append(other_coordinator.request_weekly_update(league_id, season_id,
+                                                                                 other_incremental))
+
+    test_coordinator._weekly_update_service.run_weekly_update.side_effect = request_during_first_run
+
+    # Act
+    reports = test_coordinator.request_weekly_update('NFL', 1, incremental=True)
+
+    # Assert
+    assert coalesced_reports == [[], [], []]
+    other_coordinator._weekly_update_service.run_weekly_update.assert_not_called()
+    assert test_coordinator._weekly_update_service.run_weekly_update.call_args_list == [
+        call('NFL', 1, True), call('NFL', 1, False)
+    ]
+    assert len(reports) == 2
+    lock = get_lock()
+    assert (lock.owner, lock.rerun_requested) == (None, False)
+
+
+def test_request_weekly_update_when_holder_lease_has_expired_should_take_lock(sqlite_app):
+    # Arrange
+    sqla.session.add(WeeklyUpdateLock(league_id='NFL', season_id=1, owner="dead-host:1:0",
+                                      expires_at=datetime(2000, 1, 1)))
+    sqla.session.commit()
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+
+    # Act
+    reports = test_coordinator.request_weekly_update('NFL', 1)
+
+    # Assert
+    assert len(reports) == 1
+    assert get_lock().owner is None
+
+
+def test_request_weekly_update_when_holder_lease_has_not_expired_should_not_run_update(sqlite_app):
+    # Arrange
+    sqla.session.add(WeeklyUpdateLock(league_id='NFL', season_id=1, owner="other-host:1:0",
+                                      expires_at=datetime.now() + timedelta(days=1)))
+    sqla.session.commit()
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+
+    # Act
+    reports = test_coordinator.request_weekly_update('NFL', 1, incremental=True)
+
+    # Assert
+    assert reports == []
+    test_coordinator._weekly_update_service.run_weekly_update.assert_not_called()
+    lock = get_lock()
+    assert (lock.owner, lock.rerun_requested, lock.rerun_incremental) == ("other-host:1:0", True, True)
+
+
+def test_request_weekly_update_when_update_fails_should_release_lock(sqlite_app):
+    # Arrange
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService))
+    test_coordinator._weekly_update_service.run_weekly_update.side_effect = RuntimeError()
+
+    # Act
+    with pytest.raises(RuntimeError):
+        test_coordinator.request_weekly_update('NFL', 1)
+
+    # Assert
+    assert get_lock().owner is None
+
+
+def test_request_weekly_update_when_update_outlasts_part_of_lease_should_renew_lease(sqlite_app):
+    # Arrange
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService), Mock(WeeklyUpdateLockRepository),
+                                               lease_seconds=0.03)
+    renewed = threading.Event()
+    test_coordinator._weekly_update_lock_repository.renew_weekly_update_lock.side_effect = \
+        lambda *args: renewed.set() or True
+    test_coordinator._weekly_update_service.run_weekly_update.side_effect = lambda *args: renewed.wait(5)
+
+    # Act
+    test_coordinator.request_weekly_update('NFL', 1)
+
+    # Assert
+    assert renewed.is_set()
+    test_coordinator._weekly_update_lock_repository.renew_weekly_update_lock.assert_called_with(
+        'NFL', 1, test_coordinator._owner, ANY
+    )
+
+
+def test_request_weekly_update_when_lease_cannot_be_renewed_should_stop_renewing_lease(sqlite_app):
+    # Arrange
+    test_coordinator = WeeklyUpdateCoordinator(Mock(WeeklyUpdateService), Mock(WeeklyUpdateLockRepository),
+                                               lease_seconds=0.03)
+    test_coordinator._weekly_update_lock_repository.renew_weekly_update_lock.return_value = False
+    test_coordinator._weekly_update_service.run_weekly_update.side_effect = lambda *args: threading.Event().wait(0.2)
+
+    # Act
+    test_coordinator.request_weekly_update('NFL', 1)
+
+    # Assert
+    test_coordinator._weekly_update_lock_repository.renew_weekly_update_lock.assert_called_once()
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from app.services.weekly_update_service.weekly_update_report import PERSISTENCE, PHASES, RANKING, SCHEDULE_TOTALS, \
+    WeeklyUpdateReport
+
+
+@patch('app.services.weekly_update_service.weekly_update_report.time.perf_counter')
+def test_time_phase_should_not_count_nested_phase_time_in_outer_phase(fake_perf_counter):
+    # Arrange
+    fake_perf_counter.side_effect = [0.0, 1.0, 4.0, 6.0, 10.0, 13.0]
+    report = WeeklyUpdateReport(league_id="APFA", season_id=1)
+
+    # Act
+    with report.time_phase(RANKING):
+        with report.time_phase(SCHEDULE_TOTALS):
+            pass
+        with report.time_phase(SCHEDULE_TOTALS):
+            pass
+
+    # Assert
+    assert report.phase_seconds[RANKING] == 1.0 + 2.0 + 3.0
+    assert report.phase_seconds[SCHEDULE_TOTALS] == 3.0 + 4.0
+    assert report.phase_seconds[PERSISTENCE] == 0.0
+
+
+def test_to_weekly_update_run_should_copy_report():
+    # Arrange
+    report = WeeklyUpdateReport(league_id="APFA", season_id=1, incremental=True)
+    report.attempts = 2
+    report.elapsed_seconds = 1.5
+    report.query_count = 40
+    report.rows_touched = 34
+    report.phase_seconds = {phase: float(i) for i, phase in enumerate(PHASES)}
+
+    # Act
+    weekly_update_run = report.to_weekly_update_run()
+
+    # Assert
+    assert (weekly_update_run.league_id, weekly_update_run.season_id) == ("APFA", 1)
+    assert weekly_update_run.incremental and not weekly_update_run.solved
+    assert (weekly_update_run.attempts, weekly_update_run.elapsed_seconds) == (2, 1.5)
+    assert (weekly_update_run.query_count, weekly_update_run.rows_touched) == (40, 34)
+    assert [getattr(weekly_update_run, f"{phase}_seconds") for phase in PHASES] == list(range(len(PHASES)))
@@ -0,0 +1,153 @@
+import threading
+
+from unittest.mock import Mock, call
+
+import pytest
+
+from flask import Flask, has_app_context
+
+from app.data.models.league_season import LeagueSeason
+from app.data.repositories.league_season_repository import LeagueSeasonRepository
+from app.data.sqla import sqla
+from app.services.weekly_update_service.weekly_update_coordinator import WeeklyUpdateCoordinator
+from app.services.weekly_update_service.weekly_update_scheduler import WeeklyUpdateScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        yield app
+        sqla.session.remove()
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture()
+def test_scheduler(sqlite_app, clock):
+    league_season_repository = Mock(LeagueSeasonRepository)
+    league_season_repository.get_league_seasons_by_season.side_effect = lambda season_id: [
+        LeagueSeason(league_id='AFL', season_id=season_id), LeagueSeason(league_id='NFL', season_id=season_id)
+    ]
+    test_scheduler = WeeklyUpdateScheduler(sqlite_app, Mock(WeeklyUpdateCoordinator), league_season_repository,
+                                           quiet_seconds=300, max_delay_seconds=900, clock=clock)
+    yield test_scheduler
+    test_scheduler.close(flush=False)
+
+
+@pytest.mark.parametrize('quiet_seconds, max_delay_seconds', [(-1, 900), (300, 299)])
+def test_init_when_intervals_are_invalid_should_raise_value_error(sqlite_app, quiet_seconds, max_delay_seconds):
+    # Act and Assert
+    with pytest.raises(ValueError):
+        WeeklyUpdateScheduler(sqlite_app, Mock(WeeklyUpdateCoordinator), Mock(LeagueSeasonRepository),
+                              quiet_seconds=quiet_seconds, max_delay_seconds=max_delay_seconds)
+
+
+def test_run_due_updates_when_season_has_been_quiet_should_update_each_league_season_incrementally(test_scheduler,
+                                                                                                     clock):
+    # Arrange
+    test_scheduler.mark_season_dirty(1)
+    clock.now = 200
+    test_scheduler.mark_season_dirty(1)
+    clock.now = 499
+
+    # Act
+    early_season_ids = test_scheduler.run_due_updates()
+    clock.now = 500
+    season_ids = test_scheduler.run_due_updates()
+
+    # Assert
+    assert early_season_ids == []
+    assert season_ids == [1]
+    assert test_scheduler._weekly_update_coordinator.request_weekly_update.call_args_list == [
+        call('AFL', 1, incremental=True), call('NFL', 1, incremental=True)
+    ]
+    assert test_scheduler.run_due_updates() == []
+
+
+def test_run_due_updates_when_season_keeps_changing_should_update_it_after_max_delay(test_scheduler, clock):
+    # Arrange
+    for now in range(0, 900, 100):
+        clock.now = now
+        test_scheduler.mark_season_dirty(1)
+    test_scheduler.mark_season_dirty(2)
+
+    # Act
+    early_season_ids = test_scheduler.run_due_updates()
+    clock.now = 900
+    season_ids = test_scheduler.run_due_updates()
+
+    # Assert
+    assert early_season_ids == []
+    assert season_ids == [1]
+
+
+def test_run_due_updates_when_a_season_update_fails_should_update_the_other_seasons(test_scheduler, clock):
+    # Arrange
+    test_scheduler._weekly_update_coordinator.request_weekly_update.side_effect = \
+        lambda league_id, season_id, incremental: 1 / (season_id - 1)
+    test_scheduler.mark_season_dirty(1)
+    test_scheduler.mark_season_dirty(2)
+    clock.now = 300
+
+    # Act
+    season_ids = test_scheduler.run_due_updates()
+
+    # Assert
+    assert season_ids == [1, 2]
+    assert test_scheduler._weekly_update_coordinator.request_weekly_update.call_args_list == [
+        call('AFL', 1, incremental=True), call('AFL', 2, incremental=True), call('NFL', 2, incremental=True)
+    ]
+
+
+def test_close_when_flush_is_true_should_update_seasons_that_are_not_yet_due(test_scheduler):
+    # Arrange
+    test_scheduler.mark_season_dirty(1)
+
+    # Act
+    test_scheduler.close()
+
+    # Assert
+    assert test_scheduler._weekly_update_coordinator.request_weekly_update.call_count == 2
+    test_scheduler.mark_season_dirty(2)
+    assert test_scheduler.run_due_updates(flush=True) == []
+
+
+def test_mark_season_dirty_should_run_update_in_background_once_season_is_quiet(sqlite_app):
+    # Arrange
+    updated = threading.Event()
+    in_app_context = []
+
+    def request_weekly_update(league_id, season_id, incremental):
+        in_app_context.append(has_app_context())
+        updated.set()
+
+    coordinator = Mock(WeeklyUpdateCoordinator)
+    coordinator.request_weekly_update.side_effect = request_weekly_update
+    league_season_repository = Mock(LeagueSeasonRepository)
+    league_season_repository.get_league_seasons_by_season.return_value = [LeagueSeason(league_id='NFL', season_id=1)]
+    test_scheduler = WeeklyUpdateScheduler(sqlite_app, coordinator, league_season_repository, quiet_seconds=0.01,
+                                           max_delay_seconds=1)
+
+    # Act
+    test_scheduler.mark_season_dirty(1)
+    finished = updated.wait(5)
+    test_scheduler.close(flush=False)
+
+    # Assert
+    assert finished
+    assert in_app_context == [True]
+    coordinator.request_weekly_update.assert_called_once_with('NFL', 1, incremental=True)
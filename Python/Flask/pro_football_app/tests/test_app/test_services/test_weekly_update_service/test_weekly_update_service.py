@@ -1,21 +1,37 @@
+import random
+
 from decimal import Decimal
 
 from unittest.mock import Mock, call, patch
 
 import pytest
 
+from flask import Flask
+from sqlalchemy.orm.exc import StaleDataError
+
 from app.data.models.game import Game
 from app.data.models.league_season import LeagueSeason
 from app.data.models.league_season_totals import LeagueSeasonTotals
 from app.data.models.season import Season
+from app.data.models.team import Team  # noqa: F401 - create_all needs the tables TeamSeason references.
 from app.data.models.team_season import TeamSeason
+from app.data.models.team_season_ratings import RANKINGS
 from app.data.models.team_season_schedule_averages import TeamSeasonScheduleAverages
 from app.data.models.team_season_schedule_totals import TeamSeasonScheduleTotals
+from app.data.models.team_season_week_rating import TeamSeasonWeekRating
+from app.data.models.weekly_update_run import WeeklyUpdateRun
+from app.data.repositories.league_season_totals_repository import LeagueSeasonTotalsRepository
+from app.data.repositories.team_season_repository import TeamSeasonRepository
+from app.data.sqla import sqla
+from app.services.game_service.game_service import GameService
+from app.services.game_service.team_season_delta import fold_games
+from app.services.weekly_update_service.team_season_ratings_solver import TeamSeasonRatingsSolver
 
 from app.services.weekly_update_service.weekly_update_service import WeeklyUpdateService
 
 
 @pytest.fixture()
+@patch('app.services.weekly_update_service.weekly_update_service.TeamSeasonWeekRatingRepository')
 @patch('app.services.weekly_update_service.weekly_update_service.TeamSeasonScheduleRepository')
 @patch('app.services.weekly_update_service.weekly_update_service.LeagueSeasonTotalsRepository')
 @patch('app.services.weekly_update_service.weekly_update_service.TeamSeasonRepository')
@@ -24,14 +40,17 @@ from app.services.weekly_update_service.weekly_update_service import WeeklyUpdat
 @patch('app.services.weekly_update_service.weekly_update_service.SeasonRepository')
 def test_service(
         fake_season_repository, fake_game_repository, fake_league_season_repository, fake_team_season_repository,
-        fake_league_season_totals_repository, fake_team_season_schedule_repository
+        fake_league_season_totals_repository, fake_team_season_schedule_repository,
+        fake_team_season_week_rating_repository
 ):
+    fake_team_season_week_rating_repository.replace_team_season_week_ratings.return_value = 0
     test_service = WeeklyUpdateService(fake_season_repository,
                                        fake_game_repository,
                                        fake_league_season_repository,
                                        fake_team_season_repository,
                                        fake_league_season_totals_repository,
-                                       fake_team_season_schedule_repository)
+                                       fake_team_season_schedule_repository,
+                                       team_season_week_rating_repository=fake_team_season_week_rating_repository)
     return test_service
 
 
@@ -43,7 +62,7 @@ def test_run_weekly_update_when_league_season_totals_is_none_and_games_is_none_s
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = None
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -57,14 +76,16 @@ def test_run_weekly_update_when_league_season_totals_is_none_and_games_is_none_s
     test_service._league_season_repository.get_league_season_by_league_and_season.assert_not_called()
     fake_league_season.update_games_and_points.assert_not_called()
     test_service._league_season_repository.update_league_season.assert_not_called()
-    test_service._game_repository.get_games.assert_called()
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_league_season_totals_total_games_is_none_and_games_is_none_should_not_update_anything(
@@ -76,7 +97,7 @@ def test_run_weekly_update_when_league_season_totals_total_games_is_none_and_gam
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = None
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -90,14 +111,16 @@ def test_run_weekly_update_when_league_season_totals_total_games_is_none_and_gam
     test_service._league_season_repository.get_league_season_by_league_and_season.assert_not_called()
     fake_league_season.update_games_and_points.assert_not_called()
     test_service._league_season_repository.update_league_season.assert_not_called()
-    test_service._game_repository.get_games.assert_called()
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_league_season_totals_total_points_is_none_and_games_is_none_should_not_update_anything(
@@ -109,7 +132,7 @@ def test_run_weekly_update_when_league_season_totals_total_points_is_none_and_ga
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = None
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -123,14 +146,16 @@ def test_run_weekly_update_when_league_season_totals_total_points_is_none_and_ga
     test_service._league_season_repository.get_league_season_by_league_and_season.assert_not_called()
     fake_league_season.update_games_and_points.assert_not_called()
     test_service._league_season_repository.update_league_season.assert_not_called()
-    test_service._game_repository.get_games.assert_called()
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_league_season_is_none_and_games_is_none_should_not_update_anything(test_service):
@@ -139,7 +164,7 @@ def test_run_weekly_update_when_league_season_is_none_and_games_is_none_should_n
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = None
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -155,14 +180,16 @@ def test_run_weekly_update_when_league_season_is_none_and_games_is_none_should_n
     )
     fake_league_season.update_games_and_points.assert_not_called()
     test_service._league_season_repository.update_league_season.assert_not_called()
-    test_service._game_repository.get_games.assert_called()
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_league_season_totals_and_league_season_are_not_none_and_games_is_none_should_update_league_season_total_points_and_games(
@@ -176,7 +203,7 @@ def test_run_weekly_update_when_league_season_totals_and_league_season_are_not_n
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = fake_league_season
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -193,15 +220,17 @@ def test_run_weekly_update_when_league_season_totals_and_league_season_are_not_n
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_games_is_none_should_not_update_week_count(test_service):
@@ -213,7 +242,7 @@ def test_run_weekly_update_when_games_is_none_should_not_update_week_count(test_
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = fake_league_season
-    test_service._game_repository.get_games.return_value = None
+    test_service._game_repository.get_games_by_season.return_value = None
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -230,15 +259,17 @@ def test_run_weekly_update_when_games_is_none_should_not_update_week_count(test_
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_games_is_empty_should_not_update_week_count(test_service):
@@ -250,7 +281,7 @@ def test_run_weekly_update_when_games_is_empty_should_not_update_week_count(test
 
     fake_league_season = Mock(LeagueSeason)
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = fake_league_season
-    test_service._game_repository.get_games.return_value = []
+    test_service._game_repository.get_games_by_season.return_value = []
     fake_team_season = Mock(TeamSeason)
 
     league_id = 1
@@ -267,15 +298,17 @@ def test_run_weekly_update_when_games_is_empty_should_not_update_week_count(test
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_not_called()
     test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_games_has_no_games_for_specified_year_should_not_update_week_count(test_service):
@@ -289,7 +322,7 @@ def test_run_weekly_update_when_games_has_no_games_for_specified_year_should_not
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = fake_league_season
 
     season_id = 1
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=0, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -308,17 +341,19 @@ def test_run_weekly_update_when_games_has_no_games_for_specified_year_should_not
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_called_once_with(season_id)
     test_service._season_repository.update_season.assert_called_once_with(
-        test_service._season_repository.get_season.return_value
+        test_service._season_repository.get_season.return_value, commit=False
     )
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_for_specified_year_is_none_should_not_update_week_count(
@@ -334,7 +369,7 @@ def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_fo
     test_service._league_season_repository.get_league_season_by_league_and_season.return_value = fake_league_season
 
     season_id = 1
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=1, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -356,18 +391,18 @@ def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_fo
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == 0
-    test_service._season_repository.update_season.assert_called_once_with(
-        test_service._season_repository.get_season.return_value
-    )
+    test_service._season_repository.update_season.assert_not_called()
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_for_specified_year_is_not_none_should_update_week_count(
@@ -384,7 +419,7 @@ def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_fo
 
     season_id = 1
     week_count = 1
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -406,16 +441,18 @@ def test_run_weekly_update_when_games_has_games_for_specified_year_and_season_fo
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_less_than_three_should_not_update_rankings(test_service):
@@ -430,7 +467,7 @@ def test_run_weekly_update_when_week_count_is_less_than_three_should_not_update_
 
     season_id = 1
     week_count = 2
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -452,16 +489,18 @@ def test_run_weekly_update_when_week_count_is_less_than_three_should_not_update_
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_three_should_update_rankings(test_service):
@@ -476,7 +515,7 @@ def test_run_weekly_update_when_week_count_is_three_should_update_rankings(test_
 
     season_id = 1
     week_count = 3
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -499,16 +538,18 @@ def test_run_weekly_update_when_week_count_is_three_should_update_rankings(test_
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_should_update_rankings(test_service):
@@ -523,7 +564,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_should_update_r
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -546,16 +587,18 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_should_update_r
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_none_should_not_update_rankings_for_any_team_season(
@@ -572,7 +615,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -594,16 +637,18 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     )
     fake_league_season.update_games_and_points.assert_any_call(league_season_totals.total_games,
                                                                league_season_totals.total_points)
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_empty_should_not_update_rankings_for_any_team_season(
@@ -620,7 +665,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -643,16 +688,18 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_not_called()
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_is_none_should_not_update_rankings_for_any_team_season(
@@ -669,7 +716,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -696,18 +743,20 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
     )
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_none_should_not_update_rankings_for_any_team_season(
@@ -724,7 +773,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -753,18 +802,20 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
     )
     test_service._team_season_schedule_repository.get_team_season_schedule_averages.assert_not_called()
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_averages_is_none_should_not_update_rankings_for_any_team_season(
@@ -781,7 +832,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -812,11 +863,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -825,7 +876,9 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         fake_team_season.team_id, fake_team_season.season_id
     )
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_average_points_for_is_none_should_not_update_rankings_for_any_team_season(
@@ -842,7 +895,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -875,11 +928,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -888,7 +941,9 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         fake_team_season.team_id, fake_team_season.season_id
     )
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_average_points_against_is_none_should_not_update_rankings_for_any_team_season(
@@ -905,7 +960,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -938,11 +993,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -951,7 +1006,9 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         fake_team_season.team_id, fake_team_season.season_id
     )
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_average_points_for_and_points_against_are_not_none_and_league_season_is_none_should_not_update_rankings_for_any_team_season(
@@ -970,7 +1027,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
 
     season_id = 1
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -1005,11 +1062,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -1018,7 +1075,9 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         fake_team_season.team_id, fake_team_season.season_id
     )
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_average_points_for_and_points_against_are_not_none_and_league_season_average_points_is_none_should_not_update_rankings_for_any_team_season(
@@ -1038,7 +1097,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
                                                                                                  league_season)
 
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -1071,11 +1130,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -1084,7 +1143,9 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         fake_team_season.team_id, fake_team_season.season_id
     )
     fake_team_season.update_rankings.assert_not_called()
-    test_service._team_season_repository.update_team_season.assert_not_called()
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [], record_ranked_version=True
+    )
 
 
 def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_seasons_for_specified_year_is_not_empty_and_team_season_schedule_totals_schedule_games_is_not_none_and_team_season_schedule_average_points_for_and_points_against_are_not_none_and_league_season_average_points_is_not_none_should_update_rankings_for_team_season(
@@ -1104,7 +1165,7 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
                                                                                                  league_season)
 
     week_count = 4
-    test_service._game_repository.get_games.return_value = [
+    test_service._game_repository.get_games_by_season.return_value = [
         Game(season_id=season_id, week=week_count, guest_name="Guest", guest_score=0, host_name="Host", host_score=0),
     ]
 
@@ -1137,11 +1198,11 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
     fake_league_season.update_games_and_points.assert_any_call(
         league_season_totals.total_games, league_season_totals.total_points
     )
-    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season)
-    test_service._game_repository.get_games.assert_called()
+    test_service._league_season_repository.update_league_season.assert_any_call(fake_league_season, commit=False)
+    test_service._game_repository.get_games_by_season.assert_called_with(season_id)
     test_service._season_repository.get_season.assert_any_call(season_id)
     assert season.num_of_weeks_completed == week_count
-    test_service._season_repository.update_season.assert_any_call(season)
+    test_service._season_repository.update_season.assert_any_call(season, commit=False)
     test_service._team_season_repository.get_team_seasons_by_season.assert_any_call(season_id)
     test_service._team_season_schedule_repository.get_team_season_schedule_totals.assert_any_call(
         fake_team_season.team_id, fake_team_season.season_id
@@ -1154,4 +1215,358 @@ def test_run_weekly_update_when_week_count_is_greater_than_three_and_team_season
         team_season_schedule_averages.points_against,
         league_season.average_points
     )
-    test_service._team_season_repository.update_team_season.assert_any_call(fake_team_season)
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        [fake_team_season], record_ranked_version=True
+    )
+
+
+def test_run_weekly_update_when_team_season_schedule_repository_is_none_should_calculate_schedules_once_per_season(
+        sqlite_app
+):
+    # Arrange
+    test_service = WeeklyUpdateService(Mock(), Mock(), Mock(), Mock(), Mock(), None,
+                                       weekly_update_run_repository=Mock(), calculate_schedules_in_process=True)
+    test_service._league_season_totals_repository.get_league_season_totals.return_value = None
+
+    season_id = 1
+    league_id = 1
+    games = [
+        Game(season_id=season_id, week=week, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10)
+        for week in (1, 2, 3)
+    ]
+    test_service._game_repository.get_games_by_season.return_value = games
+    test_service._season_repository.get_season.return_value = Season(id=season_id, num_of_weeks_completed=0)
+
+    team_seasons = [
+        TeamSeason(team_id="Team 1", season_id=season_id, league_id=league_id, games=3, wins=3, losses=0, ties=0,
+                   points_for=60, points_against=30),
+        TeamSeason(team_id="Team 2", season_id=season_id, league_id=league_id, games=3, wins=0, losses=3, ties=0,
+                   points_for=30, points_against=60),
+    ]
+    test_service._team_season_repository.get_team_seasons_by_season.return_value = team_seasons
+
+    league_season = LeagueSeason(league_id=league_id, season_id=season_id, total_games=3, total_points=90,
+                                 average_points=15)
+    test_service._league_season_repository.get_league_season_by_league_and_season.return_value = league_season
+
+    # Act
+    test_service.run_weekly_update(league_id, season_id)
+
+    # Assert
+    test_service._game_repository.get_games_by_season.assert_called_once_with(season_id)
+    test_service._team_season_repository.update_team_season_rankings.assert_called_once_with(
+        team_seasons, record_ranked_version=True
+    )
+    assert all(team_season.offensive_average is not None for team_season in team_seasons)
+
+
+def test_run_weekly_update_when_season_is_none_should_read_only_its_games_and_not_update_season(sqlite_app):
+    # Arrange
+    test_service = WeeklyUpdateService(Mock(), Mock(), Mock(), Mock(), Mock(), Mock(),
+                                       weekly_update_run_repository=Mock())
+    test_service._league_season_totals_repository.get_league_season_totals.return_value = None
+
+    season_id = 1
+    test_service._game_repository.get_games_by_season.return_value = [
+        Game(season_id=season_id, week=1, guest_name="Team 1", guest_score=20, host_name="Team 2", host_score=10),
+    ]
+    test_service._season_repository.get_season.return_value = None
+
+    # Act
+    test_service.run_weekly_update(1, season_id)
+
+    # Assert
+    test_service._game_repository.get_games_by_season.assert_called_once_with(season_id)
+    test_service._game_repository.get_games.assert_not_called()
+    test_service._season_repository.update_season.assert_not_called()
+    assert test_service.last_weekly_update_report.rows_touched == 0
+
+
+@pytest.fixture()
+def sqlite_app():
+    app = Flask(__name__)
+    app.config.from_mapping(SQLALCHEMY_DATABASE_URI='sqlite://', SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    sqla.init_app(app)
+    with app.app_context():
+        sqla.create_all()
+
+        generator = random.Random(40)
+        team_ids = [f"Team {i:02d}" for i in range(1, 21)]
+        games = []
+        for week in range(1, 4):
+            order = generator.sample(team_ids, len(team_ids))
+            for i in range(0, len(order), 2):
+                games.append(Game(season_id=1, week=week, guest_name=order[i], guest_score=generator.randint(0, 40),
+                                  host_name=order[i + 1], host_score=generator.randint(0, 40)))
+
+        sqla.session.add(Season(id=1, year=2022))
+        sqla.session.add(LeagueSeason(league_id=1, season_id=1, average_points=20.0))
+        for (team_id, season_id), delta in fold_games(games).items():
+            team_season = TeamSeason(team_id=team_id, season_id=season_id, league_id=1, games=0, wins=0, losses=0,
+                                     ties=0, points_for=0, points_against=0)
+            delta.apply_to(team_season)
+            sqla.session.add(team_season)
+        sqla.session.add_all(games)
+        sqla.session.commit()
+        yield app
+        sqla.session.remove()
+
+
+def create_sqlite_service(full_recompute_threshold: float = 0.5,
+                          ratings_solver: TeamSeasonRatingsSolver = None) -> WeeklyUpdateService:
+    league_season_totals_repository = Mock()
+    league_season_totals_repository.get_league_season_totals.return_value = None
+    return WeeklyUpdateService(league_season_totals_repository=league_season_totals_repository,
+                               full_recompute_threshold=full_recompute_threshold, ratings_solver=ratings_solver,
+                               calculate_schedules_in_process=True)
+
+
+def get_stored_team_seasons() -> dict:
+    sqla.session.expire_all()
+    return {team_season.team_id: team_season for team_season in TeamSeason.query.filter_by(season_id=1)}
+
+
+def get_stored_rankings() -> dict:
+    return {
+        team_id: tuple(getattr(team_season, name) for name in RANKINGS)
+        for team_id, team_season in get_stored_team_seasons().items()
+    }
+
+
+def assert_rankings_match(actual: dict, expected: dict) -> None:
+    # NumPy's power may differ from math's in the last bit, so the final expected winning percentages can too.
+    assert actual.keys() == expected.keys()
+    for team_id, rankings in expected.items():
+        assert actual[team_id] == pytest.approx(rankings, rel=1e-12)
+
+
+def test_init_when_full_recompute_threshold_is_out_of_range_should_raise_value_error():
+    # Act
+    with pytest.raises(ValueError):
+        WeeklyUpdateService(Mock(), Mock(), Mock(), Mock(), Mock(), None, full_recompute_threshold=1.5)
+
+
+@patch('app.services.weekly_update_service.weekly_update_service.TeamSeasonScheduleRepository')
+def test_init_when_team_season_schedule_repository_is_none_should_use_stored_procedures(
+        fake_team_season_schedule_repository
+):
+    # Act
+    test_service = WeeklyUpdateService(Mock(), Mock(), Mock(), Mock(), Mock(), None)
+
+    # Assert
+    assert test_service._team_season_schedule_repository is fake_team_season_schedule_repository.return_value
+
+
+def test_init_when_calculate_schedules_in_process_is_true_should_not_use_stored_procedures():
+    # Act
+    test_service = WeeklyUpdateService(Mock(), Mock(), Mock(), Mock(), Mock(), None,
+                                       calculate_schedules_in_process=True)
+
+    # Assert
+    assert test_service._team_season_schedule_repository is None
+
+
+def test_run_weekly_update_when_incremental_and_nothing_was_ranked_should_match_full_update(sqlite_app):
+    # Arrange
+    test_service = create_sqlite_service()
+
+    # Act
+    test_service.run_weekly_update(1, 1, incremental=True)
+    incremental_rankings = get_stored_rankings()
+    test_service.run_weekly_update(1, 1)
+
+    # Assert
+    assert_rankings_match(incremental_rankings, get_stored_rankings())
+
+
+def test_run_weekly_update_when_incremental_and_one_game_was_added_should_rank_affected_team_seasons_only(
+        sqlite_app
+):
+    # Arrange
+    test_service = create_sqlite_service()
+    test_service.run_weekly_update(1, 1, incremental=True)
+
+    GameService().add_game(Game(season_id=1, week=4, guest_name="Team 01", guest_score=27, host_name="Team 02",
+                                host_score=24))
+    opponents = {game.host_name for game in Game.query.filter_by(guest_name="Team 01")} \
+        | {game.guest_name for game in Game.query.filter_by(host_name="Team 01")} \
+        | {game.host_name for game in Game.query.filter_by(guest_name="Team 02")} \
+        | {game.guest_name for game in Game.query.filter_by(host_name="Team 02")}
+    versions_before = {team_id: team_season.version_id for team_id, team_season in get_stored_team_seasons().items()}
+
+    # Act
+    test_service.run_weekly_update(1, 1, incremental=True)
+    incremental_rankings = get_stored_rankings()
+    versions_after = {team_id: team_season.version_id for team_id, team_season in get_stored_team_seasons().items()}
+    test_service.run_weekly_update(1, 1)
+
+    # Assert
+    rewritten_team_ids = {team_id for team_id in versions_after if versions_after[team_id] != versions_before[team_id]}
+    assert rewritten_team_ids == opponents | {"Team 01", "Team 02"}
+    assert_rankings_match(incremental_rankings, get_stored_rankings())
+
+
+def test_run_weekly_update_when_incremental_and_league_average_changed_should_reindex_unaffected_team_seasons(
+        sqlite_app
+):
+    # Arrange
+    test_service = create_sqlite_service()
+    test_service.run_weekly_update(1, 1, incremental=True)
+    LeagueSeason.query.one().average_points = 22.5
+    sqla.session.commit()
+
+    # Act
+    test_service.run_weekly_update(1, 1, incremental=True)
+    incremental_rankings = get_stored_rankings()
+    test_service.run_weekly_update(1, 1)
+
+    # Assert
+    assert_rankings_match(incremental_rankings, get_stored_rankings())
+
+
+def test_run_weekly_update_when_ratings_solver_is_given_should_write_solved_rankings_without_recording_them_as_ranked(
+        sqlite_app
+):
+    # Arrange
+    test_service = create_sqlite_service(ratings_solver=TeamSeasonRatingsSolver())
+
+    # Act
+    test_service.run_weekly_update(1, 1, incremental=True)
+
+    # Assert
+    team_seasons = get_stored_team_seasons()
+    assert test_service.last_ratings_solver_report.converged
+    assert test_service.last_ratings_solver_report.teams == 20
+    assert all(team_season.offensive_index is not None for team_season in team_seasons.values())
+    assert all(team_season.ranked_version_id is None for team_season in team_seasons.values())
+
+
+def test_run_weekly_update_should_write_league_season_season_and_rankings_in_one_commit(sqlite_app):
+    # Arrange
+    test_service = create_sqlite_service()
+    test_service._league_season_totals_repository.get_league_season_totals.return_value = \
+        LeagueSeasonTotals(total_games=30, total_points=1230)
+    test_service._weekly_update_run_repository = Mock()
+
+    # Act
+    with patch.object(sqla.session, 'commit', wraps=sqla.session.commit) as commit:
+        test_service.run_weekly_update(1, 1)
+
+    # Assert
+    commit.assert_called_once_with()
+    sqla.session.expire_all()
+    assert LeagueSeason.query.one().average_points == 41.0
+    assert sqla.session.get(Season, 1).num_of_weeks_completed == 3
+    assert all(team_season.offensive_index is not None for team_season in get_stored_team_seasons().values())
+
+
+def test_run_weekly_update_when_rankings_conflict_should_roll_back_league_season_and_season(sqlite_app):
+    # Arrange
+    test_service = create_sqlite_service()
+    test_service._league_season_totals_repository.get_league_season_totals.return_value = \
+        LeagueSeasonTotals(total_games=30, total_points=1230)
+    rankings_before = get_stored_rankings()
+
+    # Act
+    with patch.object(TeamSeasonRepository, 'update_team_season_rankings', side_effect=StaleDataError()):
+        with pytest.raises(StaleDataError):
+            test_service.run_weekly_update(1, 1)
+
+    # Assert
+    sqla.session.expire_all()
+    assert LeagueSeason.query.one().average_points == 20.0
+    assert sqla.session.get(Season, 1).num_of_weeks_completed != 3
+    assert get_stored_rankings() == rankings_before
+
+
+def test_run_weekly_update_should_record_phase_timings_in_run_history(sqlite_app):
+    # Arrange
+    test_service = create_sqlite_service()
+
+    # Act
+    report = test_service.run_weekly_update(1, 1, incremental=True)
+
+    # Assert
+    weekly_update_run = WeeklyUpdateRun.query.one()
+    assert (weekly_update_run.league_id, weekly_update_run.season_id) == ("1", 1)
+    assert weekly_update_run.incremental and weekly_update_run.attempts == 1
+    assert weekly_update_run.rows_touched == report.rows_touched == 41
+    assert weekly_update_run.query_count == report.query_count > 0
+    assert weekly_update_run.ranking_seconds > 0
+    assert weekly_update_run.persistence_seconds > 0
+    assert weekly_update_run.elapsed_seconds >= sum(report.phase_seconds.values())
+
+
+def add_second_league() -> None:
+    sqla.session.add(LeagueSeason(league_id=2, season_id=1, average_points=20.0))
+    for team_season in TeamSeason.query.filter(TeamSeason.team_id > "Team 10"):
+        team_season.league_id = 2
+    sqla.session.commit()
+
+
+def get_stored_average_points() -> dict:
+    sqla.session.expire_all()
+    return {league_season.league_id: league_season.average_points for league_season in LeagueSeason.query}
+
+
+def test_run_season_weekly_update_should_match_weekly_update_of_each_league_with_fewer_queries(sqlite_app):
+    # Arrange
+    add_second_league()
+    test_service = WeeklyUpdateService(calculate_schedules_in_process=True)
+    per_league_service = create_sqlite_service()
+    per_league_service._league_season_totals_repository.get_league_season_totals.side_effect = \
+        lambda league_id, season_id: LeagueSeasonTotalsRepository().get_league_season_totals_by_season(season_id)[
+            str(league_id)
+        ]
+
+    # Act
+    report = test_service.run_season_weekly_update(1)
+    season_rankings = get_stored_rankings()
+    season_average_points = get_stored_average_points()
+    per_league_reports = [per_league_service.run_weekly_update(league_id, 1) for league_id in (1, 2)]
+
+    # Assert
+    assert_rankings_match(season_rankings, get_stored_rankings())
+    assert season_average_points == get_stored_average_points()
+    assert season_average_points['1'] != season_average_points['2']
+    assert all(rankings[0] is not None for rankings in season_rankings.values())
+    assert report.rows_touched == 43
+    assert report.query_count < sum(per_league_report.query_count for per_league_report in per_league_reports)
+
+    weekly_update_run = WeeklyUpdateRun.query.order_by(WeeklyUpdateRun.id).first()
+    assert (weekly_update_run.league_id, weekly_update_run.season_id) == (None, 1)
+
+
+def test_run_season_weekly_update_when_incremental_should_match_full_update(sqlite_app):
+    # Arrange
+    add_second_league()
+    test_service = WeeklyUpdateService(calculate_schedules_in_process=True)
+
+    # Act
+    test_service.run_season_weekly_update(1, incremental=True)
+    incremental_rankings = get_stored_rankings()
+    test_service.run_season_weekly_update(1)
+
+    # Assert
+    assert_rankings_match(incremental_rankings, get_stored_rankings())
+
+
+def test_run_weekly_update_should_record_ratings_of_every_team_season_after_latest_week(sqlite_app):
+    # Arrange
+    test_service = create_sqlite_service()
+    test_service.run_weekly_update(1, 1)
+
+    # Act
+    test_service.run_weekly_update(1, 1, incremental=True)
+
+    # Assert
+    team_seasons = get_stored_team_seasons()
+    week_ratings = TeamSeasonWeekRating.query.all()
+    assert len(week_ratings) == len(team_seasons) == 20
+    for week_rating in week_ratings:
+        team_season = team_seasons[week_rating.team_id]
+        assert (week_rating.season_id, week_rating.week) == (1, 3)
+        assert (week_rating.offensive_index, week_rating.defensive_index,
+                week_rating.final_expected_winning_percentage) == \
+               (team_season.offensive_index, team_season.defensive_index,
+                team_season.final_expected_winning_percentage)
@@ -108,6 +108,18 @@ GO
 IF OBJECT_ID(N'dbo.Season', 'U') IS NOT NULL
     DROP TABLE dbo.Season;
 GO
+IF OBJECT_ID(N'dbo.WeeklyUpdateRun', 'U') IS NOT NULL
+    DROP TABLE dbo.WeeklyUpdateRun;
+GO
+IF OBJECT_ID(N'dbo.JobCheckpoint', 'U') IS NOT NULL
+    DROP TABLE dbo.JobCheckpoint;
+GO
+IF OBJECT_ID(N'dbo.WeeklyUpdateLock', 'U') IS NOT NULL
+    DROP TABLE dbo.WeeklyUpdateLock;
+GO
+IF OBJECT_ID(N'dbo.TeamSeasonWeekRating', 'U') IS NOT NULL
+    DROP TABLE dbo.TeamSeasonWeekRating;
+GO
 
 -- --------------------------------------------------
 -- Creating all tables
@@ -187,6 +199,7 @@ CREATE TABLE dbo.LeagueSeason (
     total_games smallint NOT NULL DEFAULT 0,
     total_points smallint NOT NULL DEFAULT 0,
     average_points float,
+    version_id int NOT NULL DEFAULT 1,
 );
 GO
 
@@ -214,6 +227,64 @@ CREATE TABLE dbo.TeamSeason (
     defensive_factor float,
     defensive_index float,
     final_expected_winning_percentage float,
+    version_id int NOT NULL DEFAULT 1,
+    ranked_version_id int NULL,
+);
+GO
+
+-- Creating table 'WeeklyUpdateRun'
+CREATE TABLE dbo.WeeklyUpdateRun (
+    id int IDENTITY(1,1) NOT NULL,
+    league_id varchar(5) NULL,
+    season_id smallint NOT NULL,
+    started_at datetime2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    incremental bit NOT NULL DEFAULT 0,
+    solved bit NOT NULL DEFAULT 0,
+    attempts smallint NOT NULL DEFAULT 1,
+    elapsed_seconds float NOT NULL DEFAULT 0,
+    league_totals_seconds float NOT NULL DEFAULT 0,
+    week_count_seconds float NOT NULL DEFAULT 0,
+    schedule_totals_seconds float NOT NULL DEFAULT 0,
+    schedule_averages_seconds float NOT NULL DEFAULT 0,
+    ranking_seconds float NOT NULL DEFAULT 0,
+    persistence_seconds float NOT NULL DEFAULT 0,
+    query_count int NOT NULL DEFAULT 0,
+    rows_touched int NOT NULL DEFAULT 0,
+);
+GO
+
+-- Creating table 'JobCheckpoint'
+CREATE TABLE dbo.JobCheckpoint (
+    id int IDENTITY(1,1) NOT NULL,
+    job_name varchar(100) NOT NULL,
+    season_id smallint NOT NULL,
+    league_id varchar(5) NULL,
+    phase varchar(50) NOT NULL,
+    updated_at datetime2 NOT NULL DEFAULT SYSUTCDATETIME(),
+);
+GO
+
+-- Creating table 'WeeklyUpdateLock'
+CREATE TABLE dbo.WeeklyUpdateLock (
+    league_id varchar(5) NOT NULL,
+    season_id smallint NOT NULL,
+    owner varchar(100) NULL,
+    expires_at datetime2 NULL,
+    rerun_requested bit NOT NULL DEFAULT 0,
+    rerun_incremental bit NOT NULL DEFAULT 1,
+);
+GO
+
+-- Creating table 'TeamSeasonWeekRating'
+CREATE TABLE dbo.TeamSeasonWeekRating (
+    id int IDENTITY(1,1) NOT NULL,
+    team_id varchar(50) NOT NULL,
+    season_id smallint NOT NULL,
+    league_id varchar(5) NOT NULL,
+    week smallint NOT NULL,
+    offensive_index float NULL,
+    defensive_index float NULL,
+    final_expected_winning_percentage float NULL,
 );
 GO
 
@@ -269,6 +340,30 @@ ADD CONSTRAINT PK_TeamSeason
     PRIMARY KEY CLUSTERED (id ASC);
 GO
 
+-- Creating primary key on id in table 'WeeklyUpdateRun'
+ALTER TABLE dbo.WeeklyUpdateRun
+ADD CONSTRAINT PK_WeeklyUpdateRun
+    PRIMARY KEY CLUSTERED (id ASC);
+GO
+
+-- Creating primary key on id in table 'JobCheckpoint'
+ALTER TABLE dbo.JobCheckpoint
+ADD CONSTRAINT PK_JobCheckpoint
+    PRIMARY KEY CLUSTERED (id ASC);
+GO
+
+-- Creating primary key on league_id, season_id in table 'WeeklyUpdateLock'
+ALTER TABLE dbo.WeeklyUpdateLock
+ADD CONSTRAINT PK_WeeklyUpdateLock
+    PRIMARY KEY CLUSTERED (league_id ASC, season_id ASC);
+GO
+
+-- Creating primary key on id in table 'TeamSeasonWeekRating'
+ALTER TABLE dbo.TeamSeasonWeekRating
+ADD CONSTRAINT PK_TeamSeasonWeekRating
+    PRIMARY KEY CLUSTERED (id ASC);
+GO
+
 -- --------------------------------------------------
 -- Creating all UNIQUE constraints
 -- --------------------------------------------------
@@ -327,6 +422,24 @@ ADD CONSTRAINT UK_TeamSeason_LeagueId_SeasonId
     UNIQUE (team_id, season_id);
 GO
 
+-- Creating unique key on season_id, week, guest_name, host_name in table 'Game'
+ALTER TABLE dbo.Game
+ADD CONSTRAINT UK_Game_SeasonId_Week_GuestName_HostName
+    UNIQUE (season_id, week, guest_name, host_name);
+GO
+
+-- Creating unique key on job_name in table 'JobCheckpoint'
+ALTER TABLE dbo.JobCheckpoint
+ADD CONSTRAINT UK_JobCheckpoint_JobName
+    UNIQUE (job_name);
+GO
+
+-- Creating unique key on team_id, season_id, week in table 'TeamSeasonWeekRating'
+ALTER TABLE dbo.TeamSeasonWeekRating
+ADD CONSTRAINT UK_TeamSeasonWeekRating_TeamId_SeasonId_Week
+    UNIQUE (team_id, season_id, week);
+GO
+
 ---- --------------------------------------------------
 ---- Creating all FOREIGN KEY constraints
 ---- --------------------------------------------------
@@ -646,6 +759,18 @@ ON dbo.TeamSeason
     (division_id);
 GO
 
+-- Creating non-clustered index on league_id, season_id, started_at in table 'WeeklyUpdateRun'
+CREATE INDEX IX_WeeklyUpdateRun_LeagueId_SeasonId_StartedAt
+ON dbo.WeeklyUpdateRun
+    (league_id, season_id, started_at);
+GO
+
+-- Creating non-clustered index on season_id, week, team_id in table 'TeamSeasonWeekRating'
+CREATE INDEX IX_TeamSeasonWeekRating_SeasonId_Week_TeamId
+ON dbo.TeamSeasonWeekRating
+    (season_id, week, team_id);
+GO
+
 -- --------------------------------------------------
 -- Populating all tables
 -- --------------------------------------------------